@@ -0,0 +1,325 @@
+"""
+Performance benchmarks of the backtesting stack on synthetic market data.
+
+Each case times ``Backtester.run`` for one strategy on a synthetic database
+of a given scale (tickers × years, see ``data/synthetic.py``) and records:
+
+- wall time of the backtest (building the backtester and running it);
+- peak RSS of the process running it;
+- SQL statements executed and connections opened against the database.
+
+Every case runs in a freshly spawned process, so peak RSS and the SQL counts
+belong to that case alone and no panel or feature cache carries over between
+cases. Databases (and the GBM model trained for a scale) are kept in a work
+directory and reused across runs with the same scale and seed.
+
+Results are appended as one run to a JSON file, to track over time::
+
+    {"runs": [{"started_at": ..., "git_commit": ..., "machine": {...},
+               "settings": {...}, "results": [{"strategy": ..., ...}]}]}
+"""
+
+import json
+import logging
+import multiprocessing as mp
+import platform
+import sqlite3
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent.parent
+
+DEFAULT_SCALES = [(100, 3), (500, 5)]
+DEFAULT_STRATEGIES = ['screening', 'market_cap', 'gbm_ranking']
+
+# Strategy sections of the benchmark backtests
+STRATEGY_CONFIGS: Dict[str, Dict[str, Any]] = {
+    'screening': {'max_positions': 20, 'min_score': 0.3},
+    'market_cap': {'max_positions': 20, 'weighting': 'equal', 'min_market_cap': 0},
+    'gbm_ranking': {
+        'model_type': 'lite',
+        'selection_method': 'top_n',
+        'num_positions': 20,
+        'min_prediction': float('-inf'),
+    },
+}
+
+# Small, fast LightGBM model: the benchmark times scoring, not training
+GBM_PARAMS = {
+    'objective': 'regression',
+    'num_leaves': 15,
+    'min_child_samples': 20,
+    'learning_rate': 0.1,
+    'num_iterations': 50,
+    'verbose': -1,
+    'seed': 0,
+}
+
+
+def parse_scale(spec: str) -> Tuple[int, int]:
+    """``'500x5'`` -> (500 tickers, 5 years)."""
+    tickers, sep, years = spec.lower().partition('x')
+    if not sep or not tickers.isdigit() or not years.isdigit():
+        raise ValueError(f'Invalid scale {spec!r}, expected TICKERSxYEARS (e.g. 500x5)')
+    return int(tickers), int(years)
+
+
+class SqlCounter:
+    """
+    Count statements and connections of every ``sqlite3.connect`` in the process.
+
+    The data providers and strategies open their own connections through
+    ``sqlite3.connect``; while active, this wraps it to install a trace
+    callback on each new connection.
+    """
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.statements = 0
+        self.selects = 0
+        self._connect = None
+
+    def _trace(self, statement: str) -> None:
+        self.statements += 1
+        keyword = statement.split(None, 1)[0].upper() if statement.strip() else ''
+        if keyword in ('SELECT', 'WITH'):
+            self.selects += 1
+
+    def __enter__(self) -> 'SqlCounter':
+        self._connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            conn = self._connect(*args, **kwargs)
+            self.connections += 1
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        sqlite3.connect = connect
+        return self
+
+    def __exit__(self, *exc) -> None:
+        sqlite3.connect = self._connect
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process so far, in MB (None if unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 ** 2 if platform.system() == 'Darwin' else 1024)
+
+
+def prepare_market(workdir: Path, n_tickers: int, years: int, seed: int = 0):
+    """The synthetic database of a scale, generated on first use."""
+    from ..data.synthetic import generate_market_db, market_summary
+
+    db_path = workdir / f'synthetic_{n_tickers}x{years}_seed{seed}.db'
+    if db_path.exists():
+        return market_summary(str(db_path))
+    logger.info(f'Generating synthetic market {n_tickers}x{years} (seed {seed})')
+    return generate_market_db(str(db_path), n_tickers=n_tickers, years=years, seed=seed)
+
+
+def _gbm_model(market, workdir: Path):
+    """LightGBM model trained on the snapshots matured by the backtest start (cached)."""
+    from .walk_forward import WalkForwardRetrainer
+
+    retrainer = WalkForwardRetrainer(
+        {
+            'checkpoint_dir': str(workdir / f'{Path(market.db_path).stem}_gbm'),
+            'min_train_samples': 0,
+            'params': GBM_PARAMS,
+        },
+        db_path=market.db_path,
+    )
+    return retrainer.model_for(market.start_date)
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Time one backtest; meant to run in its own process (see ``run_benchmarks``).
+
+    Parameters
+    ----------
+    case : Dict[str, Any]
+        strategy, n_tickers, years, seed, workdir, rebalance_frequency, data_mode
+
+    Returns
+    -------
+    Dict[str, Any]
+        The case's settings plus wall_time_s, peak_rss_mb, sql_statements,
+        sql_selects, sql_connections, rebalances, trades and final_value,
+        or an error message
+    """
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('backtesting').setLevel(logging.WARNING)
+
+    from ..strategies import create_strategy
+    from .engine import Backtester
+
+    result = {key: case[key] for key in
+              ('strategy', 'n_tickers', 'years', 'seed', 'rebalance_frequency', 'data_mode')}
+    try:
+        workdir = Path(case['workdir'])
+        market = prepare_market(workdir, case['n_tickers'], case['years'], case['seed'])
+
+        strategy_config = dict(STRATEGY_CONFIGS[case['strategy']], db_path=market.db_path)
+        strategy = create_strategy(case['strategy'], strategy_config)
+        if case['strategy'] == 'gbm_ranking':
+            strategy.set_model(_gbm_model(market, workdir))
+
+        config = {
+            'name': f"benchmark_{case['strategy']}",
+            'start_date': market.start_date,
+            'end_date': market.end_date,
+            'universe': market.tickers,
+            'benchmark': market.benchmark,
+            'rebalance_frequency': case['rebalance_frequency'],
+            'data_mode': case['data_mode'],
+            'strategy_type': case['strategy'],
+            'strategy': strategy_config,
+            'db_path': market.db_path,
+        }
+        setup_rss = peak_rss_mb()
+
+        with SqlCounter() as sql:
+            start = time.perf_counter()
+            results = Backtester(config).run(strategy)
+            wall_time = time.perf_counter() - start
+
+        summary = results.get_summary()
+        result.update({
+            'wall_time_s': round(wall_time, 3),
+            'peak_rss_mb': peak_rss_mb(),
+            'setup_peak_rss_mb': setup_rss,
+            'sql_statements': sql.statements,
+            'sql_selects': sql.selects,
+            'sql_connections': sql.connections,
+            'rebalances': len(results.holdings_history),
+            'trades': summary['number_of_trades'],
+            'final_value': summary['final_value'],
+            'status': 'success',
+        })
+    except Exception as e:
+        logger.exception(f"Benchmark case {case['strategy']} {case['n_tickers']}x{case['years']} failed")
+        result.update({'status': 'failed', 'error': f'{type(e).__name__}: {e}'})
+    return result
+
+
+def run_benchmarks(scales: Sequence[Tuple[int, int]] = DEFAULT_SCALES,
+                   strategies: Sequence[str] = DEFAULT_STRATEGIES,
+                   workdir: Optional[str] = None, seed: int = 0,
+                   rebalance_frequency: str = 'monthly',
+                   data_mode: str = 'panel') -> List[Dict[str, Any]]:
+    """
+    Run every (scale, strategy) case, each in a freshly spawned process.
+
+    Parameters
+    ----------
+    scales : sequence of (int, int)
+        (tickers, years) of the synthetic databases
+    strategies : sequence of str
+        Strategy types (keys of ``STRATEGY_CONFIGS``)
+    workdir : str, optional
+        Where synthetic databases and GBM models are kept
+        (default: models/backtesting/benchmarks/data)
+    seed : int
+        Seed of the synthetic data
+    rebalance_frequency : str
+        monthly, quarterly or annually
+    data_mode : str
+        'panel' or 'query' (see BacktestConfig)
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        One result per case (see ``run_case``), in scale then strategy order
+    """
+    unknown = set(strategies) - set(STRATEGY_CONFIGS)
+    if unknown:
+        raise ValueError(f'Unknown strategies: {sorted(unknown)}')
+
+    workdir = Path(workdir or Path(__file__).parent.parent / 'benchmarks' / 'data')
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    context = mp.get_context('spawn')
+    for n_tickers, years in scales:
+        # Generate the database up front so no case's numbers include it
+        prepare_market(workdir, n_tickers, years, seed)
+        for strategy in strategies:
+            case = {
+                'strategy': strategy,
+                'n_tickers': n_tickers,
+                'years': years,
+                'seed': seed,
+                'workdir': str(workdir),
+                'rebalance_frequency': rebalance_frequency,
+                'data_mode': data_mode,
+            }
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(run_case, case).result()
+            logger.info(
+                f"{strategy} {n_tickers}x{years}: {result.get('wall_time_s')}s, "
+                f"{result.get('peak_rss_mb')} MB, {result.get('sql_statements')} statements"
+            )
+            results.append(result)
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_report(results: List[Dict[str, Any]], output: str,
+                  settings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Append a benchmark run to a JSON results file (created if missing).
+
+    Returns
+    -------
+    Dict[str, Any]
+        The run as written
+    """
+    run = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'machine': {
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': mp.cpu_count(),
+            'python': platform.python_version(),
+        },
+        'settings': settings or {},
+        'results': results,
+    }
+
+    path = Path(output)
+    history = {'runs': []}
+    if path.exists():
+        with open(path) as f:
+            history = json.load(f)
+    history['runs'].append(run)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2, default=str)
+    return run
@@ -4,11 +4,14 @@ Backtesting engine for evaluating investment strategies historically.
 
 import logging
 from dataclasses import dataclass
+from datetime import timedelta
 from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
 
 from ..data.historical import HistoricalDataProvider
+from ..data.panel import PanelDataProvider
+from .equity import PRICE_LEAD_DAYS, DailyEquityCurve, holdings_tickers
 from .metrics import PerformanceMetrics
 from .portfolio import Portfolio
 from .type_utils import ensure_python_types
@@ -33,6 +36,9 @@ class BacktestConfig:
     name: str = 'backtest'  # Name of the backtest
     strategy_type: str = 'screening'  # Strategy type: 'screening' or 'pipeline'
     strategy: Dict[str, Any] = None  # Strategy configuration
+    data_mode: str = 'panel'  # 'panel' (preload universe once) or 'query' (per-call DB queries)
+    walk_forward: Dict[str, Any] = None  # Retrain the strategy's model as of each window (see walk_forward.py)
+    db_path: Optional[str] = None  # SQLite database (default: data/stock_data.db)
 
     def __post_init__(self):
         self.start_date = pd.to_datetime(self.start_date)
@@ -44,11 +50,15 @@ class BacktestConfig:
 class Backtester:
     """Main backtesting engine."""
 
-    def __init__(self, config: Dict[str, Any]) -> None:
-        """Initialize backtester with configuration."""
+    # Price history each rebalance looks back over
+    LOOKBACK_DAYS = 365
+
+    def __init__(self, config: Dict[str, Any],
+                 data_provider: Optional[HistoricalDataProvider] = None) -> None:
+        """Initialize backtester with configuration and an optional shared data provider."""
         self.config = BacktestConfig(**config)
-        self.data_provider = HistoricalDataProvider()
-        self.portfolio = Portfolio(self.config.initial_capital)
+        self.data_provider = data_provider or self._create_data_provider()
+        self.portfolio = Portfolio(self.config.initial_capital, tickers=self.config.universe)
         self.results: Optional['BacktestResults'] = None
 
     def run(self, strategy) -> 'BacktestResults':
@@ -70,10 +80,19 @@ class Backtester:
         # Generate rebalance dates
         rebalance_dates = self._generate_rebalance_dates()
 
-        # Initialize tracking
+        # Walk-forward mode: retrain the strategy's model on data available as of each window
+        retrainer = None
+        if self.config.walk_forward:
+            from .walk_forward import WalkForwardRetrainer
+            retrainer = WalkForwardRetrainer(
+                self.config.walk_forward,
+                db_path=self.config.walk_forward.get('db_path') or self.data_provider.db_path,
+            )
+
+        # Initialize tracking (trades are recorded in the portfolio's trade log)
         portfolio_values = []
-        transactions = []
         holdings_history = []
+        first_trade = self.portfolio.n_trades
 
         # Run strategy at each rebalance date
         for date in rebalance_dates:
@@ -83,7 +102,7 @@ class Backtester:
             market_data = self.data_provider.get_data_as_of(
                 date=date,
                 tickers=self.config.universe,
-                lookback_days=365  # 1 year of history for analysis
+                lookback_days=self.LOOKBACK_DAYS  # 1 year of history for analysis
             )
 
             # --- Auto-liquidate delisted positions -------------------------
@@ -107,7 +126,7 @@ class Backtester:
                         '(%.2f shares @ $%.2f, last available price)',
                         ticker, shares, last_price
                     )
-                    trade = self.portfolio._execute_sell(
+                    self.portfolio._execute_sell(
                         ticker=ticker,
                         shares=shares,
                         price=last_price,
@@ -115,9 +134,11 @@ class Backtester:
                         slippage=self.config.slippage,
                         date=date,
                     )
-                    transactions.append(trade)
             # ---------------------------------------------------------------
 
+            if retrainer is not None:
+                retrainer.update(strategy, date)
+
             # Get strategy signals
             signals = strategy.generate_signals(
                 market_data=market_data,
@@ -143,25 +164,31 @@ class Backtester:
                 market_data['current_prices'].update(additional_data['current_prices'])
                 logger.info(f"After fetch, have prices for {len(market_data['current_prices'])} stocks")
 
+                # Selected tickers still without a price (e.g. delisted) can't be bought
+                unpriced = [t for t in selected_tickers if t not in market_data['current_prices']]
+                if unpriced:
+                    logger.warning(f'No price on {date} for selected {sorted(unpriced)}, skipping them')
+                    signals = {t: w for t, w in signals.items() if t in market_data['current_prices']}
+
             # Execute trades
-            trades = self.portfolio.rebalance(
+            self.portfolio.rebalance(
                 target_weights=signals,
                 current_prices=market_data['current_prices'],
                 transaction_cost=self.config.transaction_cost,
-                slippage=self.config.slippage
+                slippage=self.config.slippage,
+                date=date,
             )
 
-            transactions.extend(trades)
-
             # Track portfolio value
+            holdings = self.portfolio.get_holdings()
             portfolio_values.append({
                 'date': date,
                 'value': self.portfolio.get_value(market_data['current_prices']),
                 'cash': self.portfolio.cash,
-                'holdings': self.portfolio.get_holdings().copy()
+                'holdings': holdings,
             })
 
-            holdings_history.append(self.portfolio.get_holdings().copy())
+            holdings_history.append(holdings)
 
         # Calculate final portfolio value at end date
         final_prices = self.data_provider.get_prices(
@@ -171,18 +198,43 @@ class Backtester:
 
         final_value = self.portfolio.get_value(final_prices)
 
+        # Daily closes of everything held, for the daily equity curve
+        daily_closes = self.data_provider._get_price_history_range(
+            holdings_tickers(holdings_history),
+            self.config.start_date - timedelta(days=PRICE_LEAD_DAYS),
+            self.config.end_date,
+        )
+
         # Create results
         self.results = BacktestResults(
             config=self.config,
             portfolio_values=portfolio_values,
-            transactions=transactions,
+            transactions=self.portfolio.trades_frame(self.portfolio.trades[first_trade:]),
             holdings_history=holdings_history,
             final_value=final_value,
-            benchmark_data=self._get_benchmark_data()
+            benchmark_data=self._get_benchmark_data(),
+            daily_closes=daily_closes,
         )
 
         return self.results
 
+    def _create_data_provider(self) -> HistoricalDataProvider:
+        """Data provider for ``config.data_mode``."""
+        if self.config.data_mode == 'query' or not self.config.universe:
+            return HistoricalDataProvider(db_path=self.config.db_path)
+        if self.config.data_mode != 'panel':
+            raise ValueError(f"Unknown data mode: {self.config.data_mode}")
+
+        tickers = list(self.config.universe)
+        if self.config.benchmark and self.config.benchmark != 'null':
+            tickers.append(self.config.benchmark)
+        return PanelDataProvider(
+            tickers=tickers,
+            start_date=self.config.start_date - timedelta(days=self.LOOKBACK_DAYS),
+            end_date=self.config.end_date,
+            db_path=self.config.db_path,
+        )
+
     def _generate_rebalance_dates(self) -> List[pd.Timestamp]:
         """Generate rebalancing dates based on frequency."""
         dates = []
@@ -218,11 +270,16 @@ class BacktestResults:
     """Container for backtest results."""
 
     def __init__(self, config: BacktestConfig, portfolio_values: List[Dict[str, Any]],
-                 transactions: List[Dict[str, Any]], holdings_history: List[Dict[str, float]],
-                 final_value: Union[float, pd.Series], benchmark_data: Optional[pd.DataFrame]) -> None:
+                 transactions: Union[pd.DataFrame, List[Dict[str, Any]]],
+                 holdings_history: List[Dict[str, float]],
+                 final_value: Union[float, pd.Series], benchmark_data: Optional[pd.DataFrame],
+                 daily_closes: Optional[pd.DataFrame] = None) -> None:
         self.config = config
         self.portfolio_values = pd.DataFrame(portfolio_values)
-        self.transactions = pd.DataFrame(transactions) if transactions else pd.DataFrame()
+        if isinstance(transactions, pd.DataFrame):
+            self.transactions = transactions
+        else:
+            self.transactions = pd.DataFrame(transactions) if transactions else pd.DataFrame()
         self.holdings_history = holdings_history
         self.final_value = final_value  # Could be Series due to bug - handled in get_summary
         self.benchmark_data = benchmark_data
@@ -241,11 +298,17 @@ class BacktestResults:
                 pd.DataFrame([final_row])
             ], ignore_index=True)
 
+        # Daily NAV between rebalances (built from the DB by the metrics if no closes given)
+        self.equity_curve: Optional[DailyEquityCurve] = None
+        if daily_closes is not None and len(self.portfolio_values) > 0:
+            self.equity_curve = DailyEquityCurve(self.portfolio_values, daily_closes)
+
         # Calculate metrics
         self.metrics = PerformanceMetrics.calculate(
             portfolio_values=self.portfolio_values,
             initial_value=config.initial_capital,
-            benchmark_data=benchmark_data
+            benchmark_data=benchmark_data,
+            equity_curve=self.equity_curve,
         )
 
     @ensure_python_types
@@ -270,6 +333,12 @@ class BacktestResults:
             'portfolio_turnover': self.metrics['turnover']
         }
 
+    def rolling_metrics(self, window: int = 252) -> pd.DataFrame:
+        """Rolling return, volatility, Sharpe, Sortino and drawdown (daily if available)."""
+        return PerformanceMetrics.calculate_rolling_metrics(
+            self.portfolio_values, window=window, equity_curve=self.equity_curve
+        )
+
     def generate_report(self, filepath: str):
         """Generate detailed HTML report."""
         from ..reports.generator import ReportGenerator
@@ -0,0 +1,158 @@
+"""
+Daily equity curve of a backtest.
+
+A backtest only records its value on rebalance dates. Between two rebalances
+the portfolio is fixed (shares and cash of the earlier rebalance), so its
+value on any trading day is ``cash + shares · closes``. ``DailyEquityCurve``
+lays the holdings out as a periods × tickers share matrix and the closes as a
+days × tickers matrix, maps every day to its holding period with one
+searchsorted, and values all days in one pass: O(days × positions), no
+per-period loops.
+
+Daily-resolution metrics (intra-period drawdown, rolling Sharpe/Sortino,
+turnover, benchmark beta) are all derived from the curve.
+"""
+
+import logging
+import sqlite3
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Closes are needed from a little before the first rebalance, so positions
+# opened on a non-trading day are valued at their last close
+PRICE_LEAD_DAYS = 10
+
+
+def holdings_tickers(holdings_history: List[Dict[str, float]]) -> List[str]:
+    """Every ticker held at some rebalance, in first-held order."""
+    tickers: Dict[str, None] = {}
+    for holdings in holdings_history:
+        if isinstance(holdings, dict):
+            tickers.update(dict.fromkeys(holdings))
+    return list(tickers)
+
+
+def load_daily_closes(db_path: str, tickers: List[str],
+                      start_date: pd.Timestamp, end_date: pd.Timestamp) -> pd.DataFrame:
+    """
+    Daily closes of ``tickers`` from the ``price_history`` table.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dates (any ticker traded) × tickers with rows, NaN where no close
+    """
+    if not tickers:
+        return pd.DataFrame()
+
+    start = (start_date - timedelta(days=PRICE_LEAD_DAYS)).strftime('%Y-%m-%d')
+    placeholders = ','.join('?' for _ in tickers)
+    conn = sqlite3.connect(db_path)
+    try:
+        price_df = pd.read_sql_query(
+            f'SELECT ticker, date, close FROM price_history '
+            f'WHERE ticker IN ({placeholders}) AND date >= ? AND date <= ?',
+            conn,
+            params=[*tickers, start, end_date.strftime('%Y-%m-%d')],
+        )
+    finally:
+        conn.close()
+
+    if price_df.empty:
+        return pd.DataFrame()
+    price_df['date'] = pd.to_datetime(price_df['date'])
+    return price_df.pivot_table(index='date', columns='ticker', values='close')
+
+
+class DailyEquityCurve:
+    """
+    Trading-day NAV of a backtest between its rebalance dates.
+
+    Parameters
+    ----------
+    portfolio_values : pd.DataFrame
+        One row per rebalance with 'date', 'value', 'cash' and 'holdings'
+        (ticker -> shares held after the rebalance). The last row closes the
+        curve: its value is taken as is (e.g. the final liquidation).
+    closes : pd.DataFrame
+        Daily closes, dates × tickers (NaN where missing); rows before the
+        first rebalance are used to carry closes forward
+    """
+
+    def __init__(self, portfolio_values: pd.DataFrame, closes: pd.DataFrame) -> None:
+        self.rebalance_dates = pd.DatetimeIndex(pd.to_datetime(portfolio_values['date']))
+        holdings = list(portfolio_values['holdings']) if 'holdings' in portfolio_values else []
+        self.tickers = holdings_tickers(holdings)
+
+        # Shares held in each period [date_i, date_i+1)
+        index = pd.Index(self.tickers)
+        self.shares = np.zeros((len(portfolio_values), len(self.tickers)))
+        for i, period_holdings in enumerate(holdings):
+            if isinstance(period_holdings, dict) and period_holdings:
+                cols = index.get_indexer(list(period_holdings))
+                self.shares[i, cols] = list(period_holdings.values())
+        self.cash = portfolio_values['cash'].to_numpy(dtype=float)
+
+        # Last known close of each held ticker on each day (0 if none yet)
+        if closes.empty:
+            closes = pd.DataFrame(index=pd.DatetimeIndex([]), columns=self.tickers, dtype=float)
+        closes = closes.reindex(columns=self.tickers).sort_index().ffill()
+        first, last = self.rebalance_dates[0], self.rebalance_dates[-1]
+        days = closes.index[(closes.index >= first) & (closes.index < last)]
+        self.days = days.union(self.rebalance_dates[:-1])
+        self.closes = np.nan_to_num(closes.reindex(self.days, method='ffill').to_numpy(dtype=float))
+
+        # Holding period of each day
+        self.period = np.searchsorted(self.rebalance_dates, self.days, side='right') - 1
+
+        values = self.cash[self.period] + np.einsum('dt,dt->d', self.shares[self.period], self.closes)
+        self.values = pd.concat([
+            pd.Series(values, index=self.days),
+            pd.Series([float(portfolio_values['value'].iloc[-1])], index=self.rebalance_dates[-1:]),
+        ])
+        self.values = self.values[~self.values.index.duplicated(keep='last')]
+        self.values.index.name = 'date'
+        self.values.name = 'value'
+
+    def traded_value(self, exclude_last: bool = True) -> float:
+        """
+        Value traded over the backtest: |change in shares| × close at each rebalance.
+
+        Parameters
+        ----------
+        exclude_last : bool
+            Leave out the last row's trades (the final liquidation)
+        """
+        n_rows = len(self.rebalance_dates) - (1 if exclude_last else 0)
+        if n_rows <= 0 or not self.tickers or not len(self.days):
+            return 0.0
+        rows = np.searchsorted(self.days, self.rebalance_dates[:n_rows])
+        rows = np.minimum(rows, len(self.days) - 1)
+        prices = self.closes[rows]
+        previous = np.vstack([np.zeros((1, len(self.tickers))), self.shares[:n_rows - 1]])
+        return float((np.abs(self.shares[:n_rows] - previous) * prices).sum())
+
+    def drawdown(self) -> pd.Series:
+        """Drawdown from the running peak on each day (fraction, <= 0)."""
+        running_max = np.maximum.accumulate(self.values.to_numpy())
+        return (self.values - running_max) / running_max
+
+    @classmethod
+    def from_database(cls, portfolio_values: pd.DataFrame,
+                      db_path: str) -> Optional['DailyEquityCurve']:
+        """Curve with closes loaded from the database (None if it can't be built)."""
+        if 'holdings' not in portfolio_values.columns or len(portfolio_values) < 2:
+            return None
+        tickers = holdings_tickers(list(portfolio_values['holdings']))
+        dates = pd.to_datetime(portfolio_values['date'])
+        try:
+            closes = load_daily_closes(db_path, tickers, dates.min(), dates.max())
+        except Exception as e:
+            logger.warning('Could not load daily closes: %s', e)
+            return None
+        return cls(portfolio_values, closes)
@@ -3,15 +3,18 @@ Performance metrics calculation for backtesting.
 """
 
 import logging
-import sqlite3
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional
 
 import numpy as np
 import pandas as pd
 
+from .equity import DailyEquityCurve
+
 logger = logging.getLogger(__name__)
 
+TRADING_DAYS_PER_YEAR = 252
+
 
 class PerformanceMetrics:
     """Calculate various performance metrics for backtest results."""
@@ -33,141 +36,23 @@ class PerformanceMetrics:
         return 365.25 / median_gap
 
     @staticmethod
-    def _compute_intra_period_max_drawdown(
-        portfolio_values: pd.DataFrame,
-    ) -> Optional[float]:
+    def _load_equity_curve(portfolio_values: pd.DataFrame) -> Optional[DailyEquityCurve]:
         """
-        Compute max drawdown from daily-resolution portfolio values.
-
-        Reconstructs daily portfolio value between rebalance dates by
-        looking up daily closes from the price_history DB table.
+        Daily equity curve with closes read from the price_history DB table.
 
-        Returns the max drawdown as a negative percentage (e.g. -35.2),
-        or None if daily data is unavailable.
+        Fallback for callers that don't pass a curve; returns None if daily
+        data is unavailable.
         """
-        if 'holdings' not in portfolio_values.columns:
-            return None
-
         db_path = Path(__file__).parent.parent.parent / 'data' / 'stock_data.db'
-        if not db_path.exists():
-            return None
-
-        try:
-            dates = pd.to_datetime(portfolio_values['date']).tolist()
-            holdings_list: List[Dict[str, float]] = portfolio_values['holdings'].tolist()
-            cash_list: List[float] = portfolio_values['cash'].tolist()
-
-            if len(dates) < 2:
-                return None
-
-            # Collect all tickers held across all periods
-            all_tickers = set()
-            for h in holdings_list:
-                if isinstance(h, dict):
-                    all_tickers.update(h.keys())
-
-            if not all_tickers:
-                return None
-
-            # Query daily prices for all relevant tickers in one go
-            start_date = min(dates).strftime('%Y-%m-%d')
-            end_date = max(dates).strftime('%Y-%m-%d')
-            placeholders = ','.join('?' for _ in all_tickers)
-
-            conn = sqlite3.connect(str(db_path))
-            try:
-                query = (
-                    f'SELECT ticker, date, close FROM price_history '
-                    f'WHERE ticker IN ({placeholders}) '
-                    f'AND date >= ? AND date <= ? '
-                    f'ORDER BY date'
-                )
-                params = list(all_tickers) + [start_date, end_date]
-                price_df = pd.read_sql_query(query, conn, params=params)
-            finally:
-                conn.close()
-
-            if price_df.empty:
-                return None
-
-            price_df['date'] = pd.to_datetime(price_df['date'])
-
-            # Pivot to get daily close for each ticker
-            price_pivot = price_df.pivot_table(
-                index='date', columns='ticker', values='close'
-            )
-
-            # Build daily portfolio value series across all periods
-            daily_values = []
-
-            for i in range(len(dates) - 1):
-                period_start = dates[i]
-                period_end = dates[i + 1]
-                holdings = holdings_list[i]
-                cash = cash_list[i]
-
-                if not isinstance(holdings, dict) or not holdings:
-                    # No holdings in this period — portfolio is just cash
-                    daily_values.append(
-                        pd.Series([cash], index=pd.DatetimeIndex([period_start]))
-                    )
-                    continue
-
-                # Get daily prices for this period
-                mask = (price_pivot.index >= period_start) & (
-                    price_pivot.index < period_end
-                )
-                period_prices = price_pivot.loc[mask]
-
-                if period_prices.empty:
-                    continue
-
-                # Compute daily value: sum(shares * close) + cash
-                held_tickers = [t for t in holdings if t in period_prices.columns]
-                if not held_tickers:
-                    # None of the held tickers have daily data
-                    daily_values.append(
-                        pd.Series([cash], index=pd.DatetimeIndex([period_start]))
-                    )
-                    continue
-
-                shares = pd.Series(
-                    {t: holdings[t] for t in held_tickers}
-                )
-                period_daily = (
-                    period_prices[held_tickers].ffill() * shares
-                ).sum(axis=1) + cash
-
-                daily_values.append(period_daily)
-
-            if not daily_values:
-                return None
-
-            full_daily = pd.concat(daily_values)
-            # Remove duplicate indices (period boundaries), keep last
-            full_daily = full_daily[~full_daily.index.duplicated(keep='last')]
-            full_daily = full_daily.sort_index()
-
-            if len(full_daily) < 2:
-                return None
-
-            # Compute max drawdown from daily series
-            running_max = full_daily.expanding().max()
-            drawdown = (full_daily - running_max) / running_max
-            max_dd = float(drawdown.min()) * 100
-
-            return max_dd
-
-        except Exception as e:
-            logger.warning(
-                'Could not compute intra-period max drawdown: %s', e
-            )
+        if not db_path.exists() or 'cash' not in portfolio_values.columns:
             return None
+        return DailyEquityCurve.from_database(portfolio_values, str(db_path))
 
     @staticmethod
     def calculate(portfolio_values: pd.DataFrame,
                   initial_value: float,
-                  benchmark_data: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+                  benchmark_data: Optional[pd.DataFrame] = None,
+                  equity_curve: Optional[DailyEquityCurve] = None) -> Dict[str, Any]:
         """
         Calculate comprehensive performance metrics.
 
@@ -179,6 +64,10 @@ class PerformanceMetrics:
             Initial portfolio value
         benchmark_data : pd.DataFrame, optional
             Benchmark price data for comparison
+        equity_curve : DailyEquityCurve, optional
+            Daily NAV of the backtest; intra-period drawdown, turnover and
+            benchmark beta are computed from it (default: built from the
+            database when holdings are available)
 
         Returns
         -------
@@ -224,11 +113,10 @@ class PerformanceMetrics:
         metrics['max_drawdown'] = max_drawdown
 
         # Intra-period max drawdown (daily resolution, best-effort)
-        intra_dd = PerformanceMetrics._compute_intra_period_max_drawdown(
-            portfolio_values
-        )
-        if intra_dd is not None:
-            metrics['intra_period_max_drawdown'] = intra_dd
+        if equity_curve is None:
+            equity_curve = PerformanceMetrics._load_equity_curve(portfolio_values)
+        if equity_curve is not None and len(equity_curve.values) >= 2:
+            metrics['intra_period_max_drawdown'] = float(equity_curve.drawdown().min()) * 100
         else:
             metrics['intra_period_max_drawdown'] = max_drawdown
 
@@ -277,22 +165,29 @@ class PerformanceMetrics:
         sortino = excess_return / downside_std if downside_std > 0 else 0
         metrics['sortino_ratio'] = sortino
 
-        # Portfolio Turnover (estimated from value changes)
+        # Portfolio Turnover
         # Exclude final liquidation row if flagged by the engine
         if 'is_liquidation' in portfolio_values.columns:
-            turnover_mask = ~portfolio_values['is_liquidation'].fillna(False).astype(bool)
-            pv_for_turnover = portfolio_values.loc[turnover_mask, 'value']
+            liquidation = portfolio_values['is_liquidation'].fillna(False).astype(bool)
+        else:
+            liquidation = pd.Series(False, index=portfolio_values.index)
+        if equity_curve is not None and len(equity_curve.values) >= 2:
+            # One-way annual turnover: half the traded value over the average daily NAV
+            traded = equity_curve.traded_value(exclude_last=bool(liquidation.iloc[-1]))
+            avg_value = equity_curve.values.mean()
+            turnover = traded / 2 / (avg_value * years) if years > 0 and avg_value > 0 else 0
         else:
-            pv_for_turnover = portfolio_values['value']
-        value_changes = pv_for_turnover.diff().abs()
-        avg_value = pv_for_turnover.mean()
-        turnover = value_changes.sum() / (avg_value * years) if years > 0 else 0
+            # Estimated from value changes between rebalances
+            pv_for_turnover = portfolio_values.loc[~liquidation, 'value']
+            value_changes = pv_for_turnover.diff().abs()
+            avg_value = pv_for_turnover.mean()
+            turnover = value_changes.sum() / (avg_value * years) if years > 0 else 0
         metrics['turnover'] = turnover
 
         # Benchmark comparison if provided
         if benchmark_data is not None:
             benchmark_metrics = PerformanceMetrics._calculate_benchmark_metrics(
-                portfolio_values, benchmark_data, initial_value
+                portfolio_values, benchmark_data, initial_value, equity_curve
             )
             metrics.update(benchmark_metrics)
 
@@ -301,8 +196,14 @@ class PerformanceMetrics:
     @staticmethod
     def _calculate_benchmark_metrics(portfolio_values: pd.DataFrame,
                                       benchmark_data: pd.DataFrame,
-                                      initial_value: float) -> Dict[str, Any]:
-        """Calculate metrics relative to benchmark."""
+                                      initial_value: float,
+                                      equity_curve: Optional[DailyEquityCurve] = None) -> Dict[str, Any]:
+        """
+        Calculate metrics relative to benchmark.
+
+        Beta and information ratio use daily returns: of the equity curve
+        when given, else of the rebalance values forward-filled to days.
+        """
         metrics = {}
 
         # Align dates
@@ -337,17 +238,24 @@ class PerformanceMetrics:
             # Beta (correlation with benchmark)
             # Resample both to common (daily) frequency to avoid misalignment
             try:
-                # Build daily portfolio values, forward-fill sparse rebalance dates
-                portfolio_vals = portfolio_values.set_index('date')['value']
-                portfolio_vals.index = pd.to_datetime(portfolio_vals.index)
-                portfolio_vals = portfolio_vals[~portfolio_vals.index.duplicated(keep='last')]
-                portfolio_vals = portfolio_vals.resample('D').ffill().dropna()
-                portfolio_daily = portfolio_vals.pct_change().dropna()
-
                 benchmark_series_idx = benchmark_period.copy()
                 benchmark_series_idx.index = pd.to_datetime(benchmark_series_idx.index)
                 benchmark_series_idx = benchmark_series_idx[~benchmark_series_idx.index.duplicated(keep='last')]
-                benchmark_daily = benchmark_series_idx.resample('D').ffill().dropna().pct_change().dropna()
+
+                if equity_curve is not None and len(equity_curve.values) >= 2:
+                    # Trading-day returns of both on their common days
+                    benchmark_closes = benchmark_series_idx.dropna()
+                    common = equity_curve.values.index.intersection(benchmark_closes.index)
+                    portfolio_daily = equity_curve.values.loc[common].pct_change().dropna()
+                    benchmark_daily = benchmark_closes.loc[common].pct_change().dropna()
+                else:
+                    # Build daily portfolio values, forward-fill sparse rebalance dates
+                    portfolio_vals = portfolio_values.set_index('date')['value']
+                    portfolio_vals.index = pd.to_datetime(portfolio_vals.index)
+                    portfolio_vals = portfolio_vals[~portfolio_vals.index.duplicated(keep='last')]
+                    portfolio_vals = portfolio_vals.resample('D').ffill().dropna()
+                    portfolio_daily = portfolio_vals.pct_change().dropna()
+                    benchmark_daily = benchmark_series_idx.resample('D').ffill().dropna().pct_change().dropna()
 
                 # Ensure both are Series, not DataFrames
                 if isinstance(portfolio_daily, pd.DataFrame):
@@ -371,9 +279,12 @@ class PerformanceMetrics:
                 metrics['beta'] = beta
 
                 # Information Ratio
-                periods_per_year = PerformanceMetrics._infer_periods_per_year(
-                    pd.Series(aligned.index)
-                )
+                if equity_curve is not None and len(equity_curve.values) >= 2:
+                    periods_per_year = TRADING_DAYS_PER_YEAR
+                else:
+                    periods_per_year = PerformanceMetrics._infer_periods_per_year(
+                        pd.Series(aligned.index)
+                    )
                 tracking_error = (aligned['portfolio'] - aligned['benchmark']).std() * np.sqrt(periods_per_year)
                 info_ratio = (alpha / 100) / tracking_error if tracking_error > 0 else 0
                 metrics['information_ratio'] = info_ratio
@@ -382,7 +293,8 @@ class PerformanceMetrics:
 
     @staticmethod
     def calculate_rolling_metrics(portfolio_values: pd.DataFrame,
-                                   window: int = 252) -> pd.DataFrame:
+                                   window: int = 252,
+                                   equity_curve: Optional[DailyEquityCurve] = None) -> pd.DataFrame:
         """
         Calculate rolling performance metrics.
 
@@ -391,19 +303,24 @@ class PerformanceMetrics:
         portfolio_values : pd.DataFrame
             Portfolio value history
         window : int
-            Rolling window size in days
+            Rolling window size in observations (trading days for a curve)
+        equity_curve : DailyEquityCurve, optional
+            Daily NAV to compute the metrics over instead of the rebalance values
 
         Returns
         -------
         pd.DataFrame
             DataFrame with rolling metrics
         """
-        portfolio_values = portfolio_values.copy()
+        if equity_curve is not None:
+            portfolio_values = equity_curve.values.reset_index()
+            periods_per_year = TRADING_DAYS_PER_YEAR
+        else:
+            portfolio_values = portfolio_values.copy()
+            # Infer observation frequency for correct annualization
+            periods_per_year = PerformanceMetrics._infer_periods_per_year(portfolio_values['date'])
         portfolio_values['returns'] = portfolio_values['value'].pct_change()
 
-        # Infer observation frequency for correct annualization
-        periods_per_year = PerformanceMetrics._infer_periods_per_year(portfolio_values['date'])
-
         rolling_metrics = pd.DataFrame(index=portfolio_values.index)
         rolling_metrics['date'] = portfolio_values['date']
 
@@ -413,17 +330,23 @@ class PerformanceMetrics:
         )
 
         # Rolling volatility
-        rolling_metrics['rolling_volatility'] = (
-            portfolio_values['returns'].rolling(window).std() * np.sqrt(periods_per_year) * 100
-        )
+        rolling_std = portfolio_values['returns'].rolling(window).std()
+        rolling_metrics['rolling_volatility'] = rolling_std * np.sqrt(periods_per_year) * 100
 
         # Rolling Sharpe
         risk_free_rate = 0.02 / periods_per_year  # Per-period risk-free rate
         excess_returns = portfolio_values['returns'] - risk_free_rate
+        rolling_excess = excess_returns.rolling(window).mean()
 
         rolling_metrics['rolling_sharpe'] = (
-            excess_returns.rolling(window).mean() /
-            portfolio_values['returns'].rolling(window).std() * np.sqrt(periods_per_year)
+            rolling_excess / rolling_std * np.sqrt(periods_per_year)
+        )
+
+        # Rolling Sortino (downside deviation below zero)
+        downside = portfolio_values['returns'].clip(upper=0)
+        downside_dev = np.sqrt((downside ** 2).rolling(window).mean())
+        rolling_metrics['rolling_sortino'] = (
+            rolling_excess / downside_dev.where(downside_dev > 0) * np.sqrt(periods_per_year)
         )
 
         # Rolling max drawdown
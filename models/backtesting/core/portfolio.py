@@ -1,17 +1,42 @@
 """
 Portfolio management for backtesting.
+
+Positions are stored as share and cost-basis vectors over a ticker index
+(seeded with the backtest universe, extended when a new ticker is traded),
+and every execution is appended to a preallocated structured array of
+``TRADE_DTYPE`` records. A rebalance prices, sizes and books all of its
+sells and buys as array operations, so daily rebalances over thousands of
+names cost a few numpy calls rather than a Python loop per position.
 """
 
 import logging
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
 from .type_utils import validate_price_dict
 
 logger = logging.getLogger(__name__)
 
+BUY, SELL = 1, -1
+ACTIONS = {BUY: 'buy', SELL: 'sell'}
+
+# Positions below this many shares are closed
+DUST_SHARES = 0.001
+
+TRADE_DTYPE = np.dtype([
+    ('date', 'datetime64[ns]'),
+    ('ticker', np.int32),  # position in Portfolio.tickers
+    ('action', np.int8),  # BUY or SELL
+    ('shares', np.float64),
+    ('price', np.float64),  # execution price, after slippage
+    ('value', np.float64),
+    ('commission', np.float64),
+    ('slippage_cost', np.float64),
+])
+
 
 @dataclass
 class Trade:
@@ -34,17 +59,95 @@ class Trade:
 class Portfolio:
     """Portfolio manager for backtesting."""
 
-    def __init__(self, initial_capital: float) -> None:
-        """Initialize portfolio with starting capital."""
+    def __init__(self, initial_capital: float, tickers: Optional[Iterable[str]] = None,
+                 trade_capacity: int = 1024) -> None:
+        """
+        Initialize portfolio with starting capital.
+
+        Parameters
+        ----------
+        initial_capital : float
+            Starting cash
+        tickers : Iterable[str], optional
+            Ticker index to preallocate (e.g. the backtest universe); tickers
+            outside it are appended when first traded
+        trade_capacity : int
+            Initial number of trade records to preallocate
+        """
         self.initial_capital = initial_capital
         self.cash = initial_capital
-        self.holdings: Dict[str, float] = {}  # {ticker: shares}
-        self.cost_basis: Dict[str, float] = {}  # {ticker: average_cost_per_share}
-        self.trade_history: List[Trade] = []
+
+        self.tickers: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.shares = np.zeros(0)
+        self.cost = np.zeros(0)  # average cost per share
+        self.add_tickers(tickers or [])
+
+        self._trades = np.zeros(max(int(trade_capacity), 1), dtype=TRADE_DTYPE)
+        self.n_trades = 0
+
+    # ------------------------------------------------------------------
+    # Ticker index
+    # ------------------------------------------------------------------
+
+    def add_tickers(self, tickers: Iterable[str]) -> None:
+        """Append unseen tickers to the index, growing the position vectors."""
+        new = [t for t in dict.fromkeys(tickers) if t not in self._index]
+        if not new:
+            return
+        for ticker in new:
+            self._index[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        capacity = len(self.shares)
+        if len(self.tickers) > capacity:
+            capacity = max(len(self.tickers), 2 * capacity)
+            self.shares = np.concatenate([self.shares, np.zeros(capacity - len(self.shares))])
+            self.cost = np.concatenate([self.cost, np.zeros(capacity - len(self.cost))])
+
+    def codes(self, tickers: Sequence[str]) -> np.ndarray:
+        """Positions of ``tickers`` in the index (unseen tickers are added)."""
+        self.add_tickers(tickers)
+        return np.fromiter((self._index[t] for t in tickers), dtype=np.intp, count=len(tickers))
+
+    def price_vector(self, current_prices: Dict[str, float],
+                     tickers: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Prices over the ticker index, NaN where ``current_prices`` has none.
+
+        Only the held positions and ``tickers`` are looked up, so a price dict
+        covering a large universe is not scanned.
+        """
+        codes = np.union1d(self.codes(tickers or []), self._held_codes())
+        prices = np.full(len(self.shares), np.nan)
+        if len(codes):
+            lookup = validate_price_dict({
+                self.tickers[i]: current_prices[self.tickers[i]]
+                for i in codes if self.tickers[i] in current_prices
+            })
+            for i in codes:
+                prices[i] = lookup.get(self.tickers[i], np.nan)
+        return prices
+
+    def _held_codes(self) -> np.ndarray:
+        return np.flatnonzero(self.shares)
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    @property
+    def holdings(self) -> Dict[str, float]:
+        """Open positions as {ticker: shares}."""
+        return {self.tickers[i]: float(self.shares[i]) for i in self._held_codes()}
+
+    @property
+    def cost_basis(self) -> Dict[str, float]:
+        """Average cost per share of the open positions."""
+        return {self.tickers[i]: float(self.cost[i]) for i in self._held_codes()}
 
     def get_holdings(self) -> Dict[str, float]:
         """Get current holdings."""
-        return self.holdings.copy()
+        return self.holdings
 
     def get_value(self, current_prices: Dict[str, float]) -> float:
         """
@@ -60,36 +163,36 @@ class Portfolio:
         float
             Total portfolio value (cash + holdings) as Python float
         """
-        # Validate and convert prices to ensure they're Python floats
-        validated_prices = validate_price_dict(current_prices)
+        return self.value_at(self.price_vector(current_prices))
 
-        holdings_value = sum(
-            shares * validated_prices.get(ticker, 0.0)
-            for ticker, shares in self.holdings.items()
-        )
-        # Ensure we return a Python float, not a pandas scalar
-        return float(self.cash + holdings_value)
+    def value_at(self, prices: np.ndarray) -> float:
+        """Total value given prices over the ticker index (missing prices count as 0)."""
+        held = self._held_codes()
+        return float(self.cash + np.nansum(self.shares[held] * prices[held]))
 
     def get_weights(self, current_prices: Dict[str, float]) -> Dict[str, float]:
         """Get current portfolio weights."""
-        total_value = self.get_value(current_prices)
+        prices = self.price_vector(current_prices)
+        total_value = self.value_at(prices)
 
         if total_value == 0:
             return {}
 
-        weights = {}
-        for ticker, shares in self.holdings.items():
-            position_value = shares * current_prices.get(ticker, 0)
-            weights[ticker] = position_value / total_value
-
+        held = self._held_codes()
+        position_values = np.nan_to_num(self.shares[held] * prices[held])
+        weights = {self.tickers[i]: float(v / total_value) for i, v in zip(held, position_values)}
         weights['cash'] = self.cash / total_value
         return weights
 
+    # ------------------------------------------------------------------
+    # Trading
+    # ------------------------------------------------------------------
+
     def rebalance(self, target_weights: Dict[str, float],
                   current_prices: Dict[str, float],
                   transaction_cost: float = 0.001,
                   slippage: float = 0.001,
-                  date: pd.Timestamp = None) -> List[Trade]:
+                  date: pd.Timestamp = None) -> np.ndarray:
         """
         Rebalance portfolio to target weights.
 
@@ -108,157 +211,253 @@ class Portfolio:
 
         Returns
         -------
-        List[Trade]
-            List of executed trades
+        np.ndarray
+            The executed trades as ``TRADE_DTYPE`` records (see ``trades_frame``)
+        """
+        tickers = list(target_weights)
+        codes = self.codes(tickers)
+        prices = self.price_vector(current_prices, tickers)
+        missing = [t for t, i in zip(tickers, codes) if np.isnan(prices[i])]
+        if missing:
+            raise KeyError(f'No price for target tickers: {missing}')
+
+        weights = np.zeros(len(self.shares))
+        weights[codes] = np.fromiter(target_weights.values(), dtype=float, count=len(codes))
+        return self.rebalance_to(
+            weights, prices, transaction_cost, slippage, date, buy_order=codes,
+        )
+
+    def rebalance_to(self, target_weights: np.ndarray, prices: np.ndarray,
+                     transaction_cost: float = 0.001, slippage: float = 0.001,
+                     date: pd.Timestamp = None,
+                     buy_order: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rebalance to weights over the ticker index.
+
+        All positions above target are sold first; then the buys are filled
+        in ``buy_order`` (default: index order), each only if its cost plus
+        transaction cost and slippage fits in the cash left at that point.
+
+        Parameters
+        ----------
+        target_weights : np.ndarray
+            Target weight per index position (0 = no position)
+        prices : np.ndarray
+            Price per index position (NaN = no price)
+        transaction_cost : float
+            Transaction cost as percentage
+        slippage : float
+            Slippage as percentage
+        date : pd.Timestamp
+            Date of rebalancing
+        buy_order : np.ndarray, optional
+            Index positions in the order buys are filled
+
+        Returns
+        -------
+        np.ndarray
+            The executed trades as ``TRADE_DTYPE`` records
         """
-        trades = []
-        total_value = self.get_value(current_prices)
+        first_trade = self.n_trades
+        total_value = self.value_at(prices)
 
-        # Calculate target positions
-        target_positions = {}
-        for ticker, weight in target_weights.items():
-            target_value = total_value * weight
-            target_shares = target_value / current_prices[ticker]
-            target_positions[ticker] = target_shares
+        target = np.zeros(len(self.shares))
+        wanted = np.flatnonzero(target_weights)
+        target[wanted] = total_value * target_weights[wanted] / prices[wanted]
 
         # Sell positions not in target or that need reduction
-        for ticker in list(self.holdings.keys()):
-            current_shares = self.holdings[ticker]
-            target_shares = target_positions.get(ticker, 0)
-
-            if current_shares > target_shares:
-                shares_to_sell = current_shares - target_shares
-                trade = self._execute_sell(
-                    ticker=ticker,
-                    shares=shares_to_sell,
-                    price=current_prices[ticker],
-                    transaction_cost=transaction_cost,
-                    slippage=slippage,
-                    date=date
-                )
-                trades.append(trade)
-
-        # Buy new positions or increase existing ones
-        for ticker, target_shares in target_positions.items():
-            current_shares = self.holdings.get(ticker, 0)
-
-            if target_shares > current_shares:
-                shares_to_buy = target_shares - current_shares
-
-                # Check if we have enough cash
-                required_cash = shares_to_buy * current_prices[ticker] * (1 + transaction_cost + slippage)
-
-                if required_cash <= self.cash:
-                    trade = self._execute_buy(
-                        ticker=ticker,
-                        shares=shares_to_buy,
-                        price=current_prices[ticker],
-                        transaction_cost=transaction_cost,
-                        slippage=slippage,
-                        date=date
-                    )
-                    trades.append(trade)
-                else:
-                    logger.warning(f"Insufficient cash to buy {shares_to_buy} shares of {ticker}")
-
-        self.trade_history.extend(trades)
-        return trades
+        sells = np.flatnonzero(self.shares > target)
+        if len(sells):
+            if np.isnan(prices[sells]).any():
+                unpriced = [self.tickers[i] for i in sells[np.isnan(prices[sells])]]
+                raise KeyError(f'No price for held tickers: {unpriced}')
+            self._sell(sells, self.shares[sells] - target[sells], prices[sells],
+                       transaction_cost, slippage, date)
+
+        # Buy new positions or increase existing ones, while cash lasts
+        order = wanted if buy_order is None else np.asarray(buy_order, dtype=np.intp)
+        order = order[target[order] > self.shares[order]]
+        if len(order):
+            quantity = target[order] - self.shares[order]
+            notional = quantity * prices[order]
+            required = notional * (1 + transaction_cost + slippage)
+            spend = notional * (1 + slippage) * (1 + transaction_cost)
+            filled = self._fill_in_order(required, spend)
+            if not filled.all():
+                skipped = [self.tickers[i] for i in order[~filled]]
+                logger.warning(f'Insufficient cash for {len(skipped)} buys: {skipped[:10]}')
+            self._buy(order[filled], quantity[filled], prices[order[filled]],
+                      transaction_cost, slippage, date)
+
+        return self._trades[first_trade:self.n_trades].copy()
+
+    def _fill_in_order(self, required: np.ndarray, spend: np.ndarray) -> np.ndarray:
+        """
+        Which buys a sequential fill executes.
 
-    def _execute_buy(self, ticker: str, shares: float, price: float,
-                     transaction_cost: float, slippage: float,
-                     date: pd.Timestamp) -> Trade:
-        """Execute a buy trade."""
-        # Apply slippage (pay slightly more)
-        execution_price = price * (1 + slippage)
+        Buy ``i`` executes if ``required[i]`` is at most the cash left after
+        the earlier executed buys, each of which spends ``spend[j]``. Runs of
+        buys that all fit are resolved with one cumulative sum; buys that no
+        longer fit the remaining cash are dropped in bulk, since cash only
+        decreases.
+        """
+        filled = np.zeros(len(required), dtype=bool)
+        cash = self.cash
+        pending = np.arange(len(required))
+        while len(pending):
+            pending = pending[required[pending] <= cash]
+            if not len(pending):
+                break
+            cash_before = cash - (np.cumsum(spend[pending]) - spend[pending])
+            short = np.flatnonzero(required[pending] > cash_before)
+            stop = short[0] if len(short) else len(pending)
+            filled[pending[:stop]] = True
+            cash -= spend[pending[:stop]].sum()
+            pending = pending[stop + 1:]
+        return filled
+
+    def _sell(self, codes: np.ndarray, shares: np.ndarray, prices: np.ndarray,
+              transaction_cost: float, slippage: float, date: pd.Timestamp) -> None:
+        """Sell ``shares`` of the positions at ``codes`` (receive slightly less)."""
+        execution_price = prices * (1 - slippage)
         value = shares * execution_price
         commission = value * transaction_cost
-        slippage_cost = shares * price * slippage
-
-        # Update portfolio
-        self.cash -= (value + commission)
-
-        if ticker in self.holdings:
-            # Update average cost basis
-            old_shares = self.holdings[ticker]
-            old_cost = self.cost_basis[ticker] * old_shares
-            new_cost = old_cost + value
-            self.holdings[ticker] += shares
-            self.cost_basis[ticker] = new_cost / self.holdings[ticker]
-        else:
-            self.holdings[ticker] = shares
-            self.cost_basis[ticker] = execution_price
 
-        return Trade(
-            date=date,
-            ticker=ticker,
-            action='buy',
-            shares=shares,
-            price=execution_price,
-            value=value,
-            commission=commission,
-            slippage_cost=slippage_cost
+        self.cash += float(np.sum(value - commission))
+        self.shares[codes] -= shares
+
+        # Remove positions that are essentially closed
+        closed = codes[self.shares[codes] < DUST_SHARES]
+        self.shares[closed] = 0.0
+        self.cost[closed] = 0.0
+
+        self._record(date, codes, SELL, shares, execution_price, value, commission,
+                     shares * prices * slippage)
+
+    def _buy(self, codes: np.ndarray, shares: np.ndarray, prices: np.ndarray,
+             transaction_cost: float, slippage: float, date: pd.Timestamp) -> None:
+        """Buy ``shares`` of the positions at ``codes`` (pay slightly more)."""
+        execution_price = prices * (1 + slippage)
+        value = shares * execution_price
+        commission = value * transaction_cost
+
+        self.cash -= float(np.sum(value + commission))
+
+        # Update average cost basis
+        old_shares = self.shares[codes]
+        self.shares[codes] = old_shares + shares
+        self.cost[codes] = np.where(
+            old_shares > 0,
+            (self.cost[codes] * old_shares + value) / self.shares[codes],
+            execution_price,
         )
 
+        self._record(date, codes, BUY, shares, execution_price, value, commission,
+                     shares * prices * slippage)
+
+    def _execute_buy(self, ticker: str, shares: float, price: float,
+                     transaction_cost: float, slippage: float,
+                     date: pd.Timestamp) -> Trade:
+        """Execute a buy trade."""
+        self._buy(self.codes([ticker]), np.array([shares]), np.array([price], dtype=float),
+                  transaction_cost, slippage, date)
+        return self._trade(self.n_trades - 1)
+
     def _execute_sell(self, ticker: str, shares: float, price: float,
                       transaction_cost: float, slippage: float,
                       date: pd.Timestamp) -> Trade:
         """Execute a sell trade."""
-        # Apply slippage (receive slightly less)
-        execution_price = price * (1 - slippage)
-        value = shares * execution_price
-        commission = value * transaction_cost
-        slippage_cost = shares * price * slippage
+        self._sell(self.codes([ticker]), np.array([shares]), np.array([price], dtype=float),
+                   transaction_cost, slippage, date)
+        return self._trade(self.n_trades - 1)
+
+    # ------------------------------------------------------------------
+    # Trade log
+    # ------------------------------------------------------------------
+
+    def _record(self, date: Optional[pd.Timestamp], codes: np.ndarray, action: int,
+                shares: np.ndarray, price: np.ndarray, value: np.ndarray,
+                commission: np.ndarray, slippage_cost: np.ndarray) -> None:
+        """Append trade records, doubling the preallocated log when full."""
+        start, end = self.n_trades, self.n_trades + len(codes)
+        if end > len(self._trades):
+            grown = np.zeros(max(end, 2 * len(self._trades)), dtype=TRADE_DTYPE)
+            grown[:start] = self._trades[:start]
+            self._trades = grown
+
+        records = self._trades[start:end]
+        records['date'] = np.datetime64('NaT') if date is None else pd.Timestamp(date).to_datetime64()
+        records['ticker'] = codes
+        records['action'] = action
+        records['shares'] = shares
+        records['price'] = price
+        records['value'] = value
+        records['commission'] = commission
+        records['slippage_cost'] = slippage_cost
+        self.n_trades = end
 
-        # Update portfolio
-        self.cash += (value - commission)
-        self.holdings[ticker] -= shares
+    @property
+    def trades(self) -> np.ndarray:
+        """All executed trades as ``TRADE_DTYPE`` records (a view of the log)."""
+        return self._trades[:self.n_trades]
 
-        # Remove ticker if position is closed
-        if self.holdings[ticker] < 0.001:  # Essentially zero
-            del self.holdings[ticker]
-            if ticker in self.cost_basis:
-                del self.cost_basis[ticker]
+    def trades_frame(self, records: Optional[np.ndarray] = None) -> pd.DataFrame:
+        """
+        Trades as a DataFrame with the columns of ``Trade``.
 
+        Parameters
+        ----------
+        records : np.ndarray, optional
+            ``TRADE_DTYPE`` records (default: the whole trade log)
+        """
+        records = self.trades if records is None else records
+        frame = pd.DataFrame({name: records[name] for name in TRADE_DTYPE.names})
+        frame['ticker'] = np.asarray(self.tickers, dtype=object)[records['ticker']] if len(records) else []
+        frame['action'] = np.where(records['action'] == BUY, 'buy', 'sell')
+        return frame
+
+    def _trade(self, i: int) -> Trade:
+        record = self._trades[i]
+        date = pd.Timestamp(record['date'])
         return Trade(
-            date=date,
-            ticker=ticker,
-            action='sell',
-            shares=shares,
-            price=execution_price,
-            value=value,
-            commission=commission,
-            slippage_cost=slippage_cost
+            date=None if pd.isna(date) else date,
+            ticker=self.tickers[record['ticker']],
+            action=ACTIONS[int(record['action'])],
+            shares=float(record['shares']),
+            price=float(record['price']),
+            value=float(record['value']),
+            commission=float(record['commission']),
+            slippage_cost=float(record['slippage_cost']),
         )
 
+    @property
+    def trade_history(self) -> List[Trade]:
+        """All executed trades as ``Trade`` objects."""
+        return [self._trade(i) for i in range(self.n_trades)]
+
     def get_realized_pnl(self) -> float:
         """Calculate realized P&L from closed positions."""
-        realized_pnl = 0
-
-        # Group trades by ticker
-        trades_by_ticker = {}
-        for trade in self.trade_history:
-            if trade.ticker not in trades_by_ticker:
-                trades_by_ticker[trade.ticker] = []
-            trades_by_ticker[trade.ticker].append(trade)
-
-        # Calculate P&L for each ticker
-        for ticker, trades in trades_by_ticker.items():
-            buy_cost = sum(t.total_cost for t in trades if t.action == 'buy')
-            sell_proceeds = sum(t.value - t.commission for t in trades if t.action == 'sell')
-
-            # Only count fully closed positions
-            if ticker not in self.holdings:
-                realized_pnl += (sell_proceeds - buy_cost)
+        trades = self.trades
+        n = len(self.tickers)
+        buys = trades['action'] == BUY
+        buy_cost = np.bincount(
+            trades['ticker'][buys],
+            weights=(trades['value'] + trades['commission'] + trades['slippage_cost'])[buys],
+            minlength=n,
+        )
+        sell_proceeds = np.bincount(
+            trades['ticker'][~buys],
+            weights=(trades['value'] - trades['commission'])[~buys],
+            minlength=n,
+        )
 
-        return realized_pnl
+        # Only count fully closed positions
+        traded = np.bincount(trades['ticker'], minlength=n) > 0
+        closed = traded & (self.shares[:n] == 0)
+        return float(np.sum(sell_proceeds[closed] - buy_cost[closed]))
 
     def get_unrealized_pnl(self, current_prices: Dict[str, float]) -> float:
         """Calculate unrealized P&L for open positions."""
-        unrealized_pnl = 0
-
-        for ticker, shares in self.holdings.items():
-            current_value = shares * current_prices.get(ticker, 0)
-            cost_basis_value = shares * self.cost_basis.get(ticker, 0)
-            unrealized_pnl += (current_value - cost_basis_value)
-
-        return unrealized_pnl
+        prices = np.nan_to_num(self.price_vector(current_prices))
+        held = self._held_codes()
+        return float(np.sum(self.shares[held] * (prices[held] - self.cost[held])))
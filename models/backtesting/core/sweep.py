@@ -0,0 +1,252 @@
+"""
+Parameter sweeps: many backtest variants over one preloaded price panel.
+
+``expand_grid`` turns a base config and a parameter grid into one config per
+grid point. ``run_variants`` loads one ``PanelDataProvider`` per database,
+covering the universes and date windows of the variants that read it, then
+runs the variants on a process pool. Workers are forked after the panel is loaded, so they all read the
+parent's arrays copy-on-write instead of each re-querying the database (where
+fork is unavailable the providers are pickled to each worker once). Variants
+the engine would not run on a panel (an empty universe, which lets the
+strategy pick from the whole database, or ``data_mode: query``) keep their
+per-call query provider.
+"""
+
+import copy
+import itertools
+import logging
+import multiprocessing as mp
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ..data.historical import DEFAULT_DB_PATH
+from ..data.panel import PanelDataProvider
+from .engine import BacktestConfig, Backtester
+
+logger = logging.getLogger(__name__)
+
+# Benchmark comparison metrics copied into the comparison table when present
+BENCHMARK_METRICS = ['benchmark_return', 'alpha', 'beta', 'information_ratio']
+
+# Providers shared by the worker processes, by database path (set before
+# forking / by the initializer)
+_shared_providers: Dict[str, PanelDataProvider] = {}
+
+
+def _set_path(config: Dict[str, Any], key: str, value: Any) -> None:
+    """Set ``config[key]``; dotted keys address nested sections (``strategy.num_positions``)."""
+    *parents, leaf = key.split('.')
+    node = config
+    for part in parents:
+        node = node.setdefault(part, {})
+    node[leaf] = value
+
+
+def expand_grid(base: Dict[str, Any],
+                grid: Dict[str, Sequence[Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    One config per point of a parameter grid.
+
+    Parameters
+    ----------
+    base : Dict[str, Any]
+        Base backtest config (as loaded from a YAML file)
+    grid : Dict[str, Sequence[Any]]
+        Parameter -> values to try; dotted keys address the nested
+        ``strategy`` section (e.g. ``strategy.num_positions``)
+
+    Returns
+    -------
+    List[Tuple[str, Dict[str, Any]]]
+        (label, config) pairs, in grid order (last key varies fastest). The
+        label is ``key=value,...`` and is appended to each config's name.
+    """
+    keys = list(grid)
+    variants = []
+    for values in itertools.product(*(grid[key] for key in keys)):
+        config = copy.deepcopy(base)
+        for key, value in zip(keys, values):
+            _set_path(config, key, value)
+        label = ','.join(f'{key}={value}' for key, value in zip(keys, values)) or 'base'
+        config['name'] = f"{base.get('name', 'backtest')}[{label}]"
+        variants.append((label, config))
+    return variants
+
+
+def _uses_shared_panel(config: Dict[str, Any]) -> bool:
+    """Whether the engine would run ``config`` on a panel (see ``Backtester._create_data_provider``)."""
+    return bool(config.get('universe')) and config.get('data_mode', 'panel') != 'query'
+
+
+def _config_db_path(config: Dict[str, Any]) -> str:
+    """Database ``config`` reads (its ``db_path`` or the default)."""
+    return str(config.get('db_path') or DEFAULT_DB_PATH)
+
+
+def create_shared_provider(configs: Sequence[Dict[str, Any]],
+                           db_path: Optional[str] = None) -> Optional[PanelDataProvider]:
+    """
+    Load one panel provider that serves every panel-mode config.
+
+    The panel covers the union of universes and benchmarks over the earliest
+    start (minus the rebalance lookback) to the latest end. Configs with an
+    empty universe or in query mode are skipped: they run on the query
+    provider, as they would alone. All configs are served from ``db_path``;
+    ``run_variants`` builds one provider per database its configs read.
+
+    Parameters
+    ----------
+    configs : sequence of Dict[str, Any]
+        Backtest configs
+    db_path : str, optional
+        SQLite database (default: the backtesting database)
+
+    Returns
+    -------
+    PanelDataProvider or None
+        Provider with its price and fundamental panels already loaded; None
+        if no config runs on a panel
+    """
+    parsed = [BacktestConfig(**config) for config in configs if _uses_shared_panel(config)]
+    if not parsed:
+        return None
+    start = min(c.start_date for c in parsed) - timedelta(days=Backtester.LOOKBACK_DAYS)
+    end = max(c.end_date for c in parsed)
+
+    tickers: List[str] = []
+    for c in parsed:
+        tickers.extend(c.universe)
+        if c.benchmark and c.benchmark != 'null':
+            tickers.append(c.benchmark)
+
+    provider = PanelDataProvider(tickers, start, end, db_path=db_path)
+
+    # Load now, before any worker forks
+    provider.prices
+    provider.fundamentals
+    return provider
+
+
+def _init_worker(providers: Optional[Dict[str, PanelDataProvider]] = None) -> None:
+    """Pool initializer; silences per-rebalance logging in workers."""
+    global _shared_providers
+    if providers is not None:
+        _shared_providers = providers
+    logging.getLogger('backtesting').setLevel(logging.WARNING)
+
+
+def _run_variant(task: Tuple[str, Dict[str, Any], Callable, Optional[str]]) -> Dict[str, Any]:
+    """Run one variant on its database's shared provider; returns its comparison-table row."""
+    label, config, strategy_factory, summary_path = task
+    row: Dict[str, Any] = {'variant': label}
+    try:
+        strategy = strategy_factory(config)
+        provider = _shared_providers[_config_db_path(config)] if _uses_shared_panel(config) else None
+        results = Backtester(config, data_provider=provider).run(strategy)
+        if summary_path:
+            results.to_csv(summary_path)
+        row.update(results.get_summary())
+        for metric in BENCHMARK_METRICS:
+            value = results.metrics.get(metric)
+            if value is not None:
+                # Some metrics come back as a one-element Series
+                row[metric] = float(value.iloc[-1] if hasattr(value, 'iloc') else value)
+        row['status'] = 'success'
+    except Exception as e:
+        logger.error(f'Variant {label} failed: {e}')
+        row['status'] = 'failed'
+        row['error'] = ''.join(traceback.format_exception_only(type(e), e)).strip()
+    return row
+
+
+def default_strategy_factory(config: Dict[str, Any]):
+    """Strategy named by the config's ``strategy_type`` / ``strategy`` section."""
+    from ..strategies import create_strategy
+
+    return create_strategy(config.get('strategy_type', 'screening'), config.get('strategy', {}))
+
+
+def run_variants(variants: Sequence[Tuple[str, Dict[str, Any]]], workers: int = 1,
+                 db_path: Optional[str] = None,
+                 strategy_factory: Callable[[Dict[str, Any]], Any] = default_strategy_factory,
+                 provider: Optional[PanelDataProvider] = None,
+                 output_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Run backtest variants over shared data providers, one per database.
+
+    Parameters
+    ----------
+    variants : sequence of (str, Dict[str, Any])
+        (label, config) pairs, e.g. from ``expand_grid``
+    workers : int
+        Worker processes (1 = run in this process)
+    db_path : str, optional
+        SQLite database of variants that set no ``db_path`` of their own
+        (default: the backtesting database)
+    strategy_factory : callable, optional
+        Builds a strategy from a config (must be picklable, i.e. module level)
+    provider : PanelDataProvider, optional
+        Preloaded provider covering all panel-mode variants on its
+        ``db_path`` (default: built with ``create_shared_provider``, as are
+        providers for any other database)
+    output_dir : str, optional
+        Directory for each variant's ``{name}_{timestamp}_summary.csv`` (and
+        its portfolio values and transactions), as written by
+        ``run_backtest.py``; nothing is written if omitted
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per variant, in input order: label, the backtest summary,
+        benchmark metrics, and status/error
+    """
+    global _shared_providers
+    if not variants:
+        return pd.DataFrame()
+
+    if db_path is not None:
+        # Variants off the shared panel open their own provider on the same database
+        variants = [(label, {'db_path': db_path, **config}) for label, config in variants]
+
+    by_db: Dict[str, List[Dict[str, Any]]] = {}
+    for _, config in variants:
+        if _uses_shared_panel(config):
+            by_db.setdefault(_config_db_path(config), []).append(config)
+    providers = {
+        path: provider if provider is not None and provider.db_path == path
+        else create_shared_provider(configs, path)
+        for path, configs in by_db.items()
+    }
+    summary_paths: List[Optional[str]] = [None] * len(variants)
+    if output_dir is not None:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        summary_paths = [
+            str(Path(output_dir) / f"{config.get('name', 'backtest')}_{timestamp}_summary.csv")
+            for _, config in variants
+        ]
+    tasks = [(label, config, strategy_factory, path)
+             for (label, config), path in zip(variants, summary_paths)]
+    workers = max(1, min(workers, len(tasks)))
+    logger.info(f'Running {len(tasks)} backtest variants on {workers} worker(s)')
+
+    _shared_providers = providers
+    try:
+        if workers == 1:
+            rows = [_run_variant(task) for task in tasks]
+        else:
+            fork = 'fork' in mp.get_all_start_methods()
+            ctx = mp.get_context('fork' if fork else 'spawn')
+            initargs = () if fork else (providers,)
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=_init_worker, initargs=initargs) as pool:
+                rows = list(pool.map(_run_variant, tasks))
+    finally:
+        _shared_providers = {}
+
+    return pd.DataFrame(rows)
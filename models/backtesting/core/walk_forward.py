@@ -0,0 +1,297 @@
+"""
+Walk-forward retraining of the GBM ranker during a backtest.
+
+A backtest scored with one fixed model trained on the full history is not out
+of sample. In walk-forward mode the backtester retrains the model at a
+configurable interval, each time on the snapshots whose forward return was
+already known on that date (snapshot date + target horizon <= cutoff).
+
+Retraining does not re-run the training script per window:
+
+- Lags, changes and rolling stats only look back along a ticker's snapshots,
+  price features only at prices on or before the snapshot date, and the
+  cross-sectional normalization is per snapshot date. So the training matrix
+  is engineered and normalized once over the full history, and every window
+  is a date prefix of it. The matrix is cached on disk under a fingerprint of
+  the raw snapshots, forward returns and price table;
+- each window's Booster is stored under its cutoff, together with a key
+  hashing the window's training rows and parameters. A window whose key was
+  trained before (in this run or an earlier one, e.g. two cutoffs without a
+  newly matured snapshot date) loads that Booster instead of retraining.
+
+Config (``walk_forward`` section of a backtest config)::
+
+    walk_forward:
+      retrain_frequency: annually   # monthly, quarterly, annually
+      target_horizon: 1y            # forward_returns horizon to train on
+      checkpoint_dir: models/neural_network/models/gbm/walk_forward
+      min_train_samples: 1000       # keep the previous model below this
+      params: {...}                 # LightGBM params (trainer defaults if omitted)
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+
+# Add neural_network/training to path for imports
+training_path = Path(__file__).parent.parent.parent / 'neural_network' / 'training'
+sys.path.insert(0, str(training_path))
+
+import gbm_feature_config
+from gbm_feature_store import feature_config_version, load_raw_snapshots, snapshot_hashes
+from train_gbm_stock_ranker import GBMStockRanker
+
+logger = logging.getLogger(__name__)
+
+# Calendar days until a snapshot's forward return is known
+HORIZON_DAYS = {'1y': 365, '3y': 1095}
+
+RETRAIN_OFFSETS = {
+    'monthly': pd.DateOffset(months=1),
+    'quarterly': pd.DateOffset(months=3),
+    'annually': pd.DateOffset(years=1),
+}
+
+DEFAULT_CHECKPOINT_DIR = (
+    Path(__file__).parent.parent.parent / 'neural_network' / 'models' / 'gbm' / 'walk_forward'
+)
+
+# Bump when the training pipeline changes in a way the cache keys can't see
+CHECKPOINT_SCHEMA_VERSION = 1
+
+
+def _digest(*parts: bytes) -> str:
+    sha = hashlib.sha1()
+    for part in parts:
+        sha.update(part)
+    return sha.hexdigest()
+
+
+def dataset_fingerprint(db_path: str, target_horizon: str) -> str:
+    """
+    Hash of everything the engineered training matrix is built from.
+
+    Covers the raw snapshot rows, the horizon's forward returns, the size and
+    end of price_history and the feature config, without engineering anything.
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        raw = load_raw_snapshots(conn, gbm_feature_config)
+        returns = pd.read_sql(
+            'SELECT snapshot_id, return_pct FROM forward_returns WHERE horizon = ? ORDER BY snapshot_id',
+            conn,
+            params=(target_horizon,),
+        )
+        prices = conn.execute('SELECT COUNT(*), MAX(date) FROM price_history').fetchone()
+    finally:
+        conn.close()
+
+    return _digest(
+        snapshot_hashes(raw).tobytes(),
+        pd.util.hash_pandas_object(returns, index=False).to_numpy().tobytes(),
+        json.dumps([list(prices), target_horizon, CHECKPOINT_SCHEMA_VERSION]).encode(),
+        feature_config_version('standard', gbm_feature_config).encode(),
+    )
+
+
+class WalkForwardRetrainer:
+    """
+    Retrains a strategy's GBM model on the data available at each cutoff.
+
+    Parameters
+    ----------
+    config : Dict[str, Any]
+        The backtest config's ``walk_forward`` section (see module docstring)
+    db_path : str
+        SQLite database with fundamental_history, forward_returns and price_history
+    """
+
+    def __init__(self, config: Dict[str, Any], db_path: str) -> None:
+        self.db_path = str(db_path)
+        self.target_horizon = config.get('target_horizon', '1y')
+        if self.target_horizon not in HORIZON_DAYS:
+            raise ValueError(f'Unknown target horizon: {self.target_horizon}')
+
+        frequency = config.get('retrain_frequency', 'annually')
+        if frequency not in RETRAIN_OFFSETS:
+            raise ValueError(f'Unknown retrain frequency: {frequency}')
+        self.retrain_offset = RETRAIN_OFFSETS[frequency]
+
+        self.checkpoint_dir = Path(config.get('checkpoint_dir') or DEFAULT_CHECKPOINT_DIR)
+        self.min_train_samples = config.get('min_train_samples', 1000)
+        self.params: Optional[Dict[str, Any]] = config.get('params')
+
+        self.stats = {'trained': 0, 'loaded': 0, 'reused': 0, 'skipped': 0}
+
+        self._dataset: Optional[pd.DataFrame] = None
+        self._numeric_features: List[str] = []
+        self._categorical_features: List[str] = []
+        self._last_retrain: Optional[pd.Timestamp] = None
+        self._current_key: Optional[str] = None
+        self._current_model: Optional[lgb.Booster] = None
+
+    @property
+    def feature_columns(self) -> List[str]:
+        """Model input columns, in training order."""
+        self._training_matrix()
+        return self._numeric_features + self._categorical_features
+
+    def _training_matrix(self) -> pd.DataFrame:
+        """Engineered, normalized rows with a forward return (built or loaded once)."""
+        if self._dataset is not None:
+            return self._dataset
+
+        fingerprint = dataset_fingerprint(self.db_path, self.target_horizon)
+        cache_path = self.checkpoint_dir / f'features_{self.target_horizon}_{fingerprint[:16]}.pkl'
+
+        if cache_path.exists():
+            logger.info(f'Loading engineered training matrix from {cache_path}')
+            cached = pd.read_pickle(cache_path)
+        else:
+            logger.info('Engineering training matrix over the full history (cached for later runs)')
+            trainer = GBMStockRanker(db_path=self.db_path, target_horizon=self.target_horizon)
+            df = trainer.engineer_features(trainer.load_data())
+            df, numeric_features, categorical_features = trainer.prepare_training_data(df)
+            cached = {
+                'data': df.sort_values('snapshot_date', kind='mergesort').reset_index(drop=True),
+                'numeric_features': numeric_features,
+                'categorical_features': categorical_features,
+            }
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self.checkpoint_dir.glob(f'features_{self.target_horizon}_*.pkl'):
+                stale.unlink()
+            pd.to_pickle(cached, cache_path)
+
+        self._dataset = cached['data']
+        self._numeric_features = cached['numeric_features']
+        self._categorical_features = cached['categorical_features']
+        return self._dataset
+
+    def training_window(self, cutoff: pd.Timestamp) -> pd.DataFrame:
+        """
+        Training rows whose forward return is known on ``cutoff``.
+
+        Returns
+        -------
+        pd.DataFrame
+            Rows of the training matrix, sorted by snapshot date
+        """
+        df = self._training_matrix()
+        known_by = df['snapshot_date'] + pd.Timedelta(days=HORIZON_DAYS[self.target_horizon])
+        return df[known_by <= pd.Timestamp(cutoff)].reset_index(drop=True)
+
+    def window_key(self, window: pd.DataFrame) -> str:
+        """Cache key of a training window: its rows, features and training parameters."""
+        columns = ['snapshot_id'] + self.feature_columns + ['forward_return']
+        rows = pd.util.hash_pandas_object(window[columns], index=False).to_numpy()
+        return _digest(
+            rows.tobytes(),
+            json.dumps(
+                [self.target_horizon, self.params, columns, CHECKPOINT_SCHEMA_VERSION],
+                sort_keys=True,
+                default=str,
+            ).encode(),
+        )
+
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        path = self.checkpoint_dir / 'manifest.json'
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.checkpoint_dir / 'manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+    def model_for(self, cutoff: pd.Timestamp) -> Optional[lgb.Booster]:
+        """
+        Booster trained on the data available on ``cutoff``.
+
+        Reuses the current model or a stored checkpoint when the window's key
+        is unchanged; returns None if the window is too small to train on.
+        """
+        cutoff = pd.Timestamp(cutoff)
+        window = self.training_window(cutoff)
+        if len(window) < self.min_train_samples:
+            logger.warning(f'Walk-forward {cutoff.date()}: {len(window)} training samples '
+                           f'(< {self.min_train_samples}), keeping the current model')
+            self.stats['skipped'] += 1
+            return None
+
+        key = self.window_key(window)
+        if key == self._current_key:
+            logger.info(f'Walk-forward {cutoff.date()}: no new training data, reusing model')
+            self.stats['reused'] += 1
+            return self._current_model
+
+        manifest = self._read_manifest()
+        stored = next(
+            (entry for entry in manifest.values()
+             if entry['key'] == key and (self.checkpoint_dir / entry['model']).exists()),
+            None,
+        )
+        if stored is not None:
+            logger.info(f'Walk-forward {cutoff.date()}: loading checkpoint {stored["model"]}')
+            model = lgb.Booster(model_file=str(self.checkpoint_dir / stored['model']))
+            model_file = stored['model']
+            self.stats['loaded'] += 1
+        else:
+            logger.info(f'Walk-forward {cutoff.date()}: training on {len(window)} samples '
+                        f'up to {window["snapshot_date"].max().date()}')
+            trainer = GBMStockRanker(db_path=self.db_path, target_horizon=self.target_horizon)
+            try:
+                trainer.train(window, self._numeric_features, self._categorical_features, self.params)
+            except IndexError:
+                # purged_group_time_series_split found no train/validation fold
+                logger.warning(f'Walk-forward {cutoff.date()}: too little history for a '
+                               f'validation fold, keeping the current model')
+                self.stats['skipped'] += 1
+                return None
+            model = trainer.model
+            model_file = f'gbm_{self.target_horizon}_{cutoff.strftime("%Y%m%d")}.txt'
+            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+            model.save_model(str(self.checkpoint_dir / model_file))
+            self.stats['trained'] += 1
+
+        manifest[cutoff.date().isoformat()] = {
+            'key': key,
+            'model': model_file,
+            'train_samples': len(window),
+            'last_snapshot': window['snapshot_date'].max().date().isoformat(),
+        }
+        self._write_manifest(manifest)
+
+        self._current_key = key
+        self._current_model = model
+        return model
+
+    def update(self, strategy, date: pd.Timestamp) -> bool:
+        """
+        Retrain ``strategy``'s model if a retrain is due on ``date``.
+
+        Returns
+        -------
+        bool
+            Whether the strategy's model was replaced
+        """
+        if self._last_retrain is not None and date < self._last_retrain + self.retrain_offset:
+            return False
+        if not hasattr(strategy, 'set_model'):
+            raise ValueError(f'{type(strategy).__name__} does not support walk-forward retraining')
+
+        self._last_retrain = pd.Timestamp(date)
+        model = self.model_for(date)
+        if model is None:
+            return False
+        strategy.set_model(model)
+        return True
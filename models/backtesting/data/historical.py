@@ -6,7 +6,7 @@ import logging
 import sqlite3
 from datetime import timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 import numpy as np
 import pandas as pd
@@ -14,6 +14,106 @@ import pandas as pd
 logger = logging.getLogger(__name__)
 
 
+# (metric, trading days back) for the period returns
+RETURN_PERIODS = [('return_1m', 21), ('return_3m', 63), ('return_6m', 126), ('return_1y', 252)]
+RSI_PERIOD = 14
+
+# Fundamental-data reporting lag (companies don't publish financials on period-end date)
+REPORTING_LAG_DAYS = 45
+
+# Database read when no db_path is given
+DEFAULT_DB_PATH = str(Path(__file__).parent.parent.parent / 'data' / 'stock_data.db')
+
+# Tickers per IN (...) list (SQLite bound-parameter limit; the price query binds each twice)
+TICKER_CHUNK = 400
+
+
+def _chunks(items: Sequence[str], size: int) -> Iterable[Sequence[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _right_aligned(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Each row's non-NaN values packed against the right edge (NaN to the left).
+
+    Column -k of the result is a row's k-th most recent valid value, i.e. what
+    ``series.dropna().iloc[-k]`` gives. Also returns the valid count per row.
+    """
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=1)
+    # Valid values after each one in its row
+    after = counts[:, None] - np.cumsum(valid, axis=1)
+    out = np.full(values.shape, np.nan)
+    rows, cols = np.nonzero(valid)
+    out[rows, values.shape[1] - 1 - after[rows, cols]] = values[rows, cols]
+    return out, counts
+
+
+def _price_metrics(price_history: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
+    """
+    Price-based screening metrics of every ticker (column) at once.
+
+    Each ticker's closes are its non-missing values in the window, as with
+    ``price_history[ticker].dropna()``; metrics match the per-ticker pandas
+    code they replace (returns, annualized volatility of daily returns,
+    close vs. 50/200-day moving average, 14-day simple-average RSI).
+    Tickers without any close are left out.
+    """
+    if price_history.empty:
+        return {}
+
+    prices, counts = _right_aligned(price_history.to_numpy(dtype=float).T)
+    n_tickers, length = prices.shape
+    last = prices[:, -1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = {}
+        for name, days in RETURN_PERIODS:
+            if length >= days:
+                returns[name] = ((last / prices[:, -days] - 1) * 100, counts > days)
+            else:
+                returns[name] = (np.full(n_tickers, np.nan), np.zeros(n_tickers, dtype=bool))
+
+        # Sample std of daily returns (NaN with fewer than two returns)
+        daily = prices[:, 1:] / prices[:, :-1] - 1
+        valid = ~np.isnan(daily)
+        n_returns = valid.sum(axis=1)
+        mean = np.where(valid, daily, 0.0).sum(axis=1) / n_returns
+        sq_dev = np.where(valid, (daily - mean[:, None]) ** 2, 0.0).sum(axis=1)
+        volatility = np.where(n_returns > 1, np.sqrt(sq_dev / (n_returns - 1)), np.nan) * np.sqrt(252) * 100
+
+        above_ma = {}
+        for name, window in [('above_ma50', 50), ('above_ma200', 200)]:
+            if length >= window:
+                above_ma[name] = (last > prices[:, -window:].mean(axis=1), counts > window)
+            else:
+                above_ma[name] = (np.zeros(n_tickers, dtype=bool), np.zeros(n_tickers, dtype=bool))
+
+        # RSI over the last RSI_PERIOD price changes
+        rsi = np.full(n_tickers, np.nan)
+        if length > RSI_PERIOD:
+            delta = np.diff(prices[:, -(RSI_PERIOD + 1):], axis=1)
+            gain = np.where(delta > 0, delta, 0.0).mean(axis=1)
+            loss = np.where(delta < 0, -delta, 0.0).mean(axis=1)
+            rsi = np.where(counts > RSI_PERIOD, 100 - (100 / (1 + gain / loss)), np.nan)
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for i, ticker in enumerate(price_history.columns):
+        if counts[i] == 0:
+            continue
+        ticker_metrics = {
+            name: values[i] if has_window[i] else None
+            for name, (values, has_window) in returns.items()
+        }
+        ticker_metrics['volatility'] = volatility[i]
+        for name, (above, has_window) in above_ma.items():
+            ticker_metrics[name] = above[i] if has_window[i] else None
+        ticker_metrics['rsi'] = rsi[i] if not np.isnan(rsi[i]) else None
+        metrics[ticker] = ticker_metrics
+    return metrics
+
+
 class HistoricalDataProvider:
     """
     Provides historical data for backtesting.
@@ -25,12 +125,11 @@ class HistoricalDataProvider:
         """Initialize data provider with optional cache directory and database path."""
         self.cache_dir = cache_dir
         self._price_cache: Dict[str, pd.DataFrame] = {}
-        self._fundamental_cache: Dict[str, Dict[str, Any]] = {}
+        # db path -> symbol -> {'id', 'sector', 'industry'} (assets metadata is stable)
+        self._asset_meta: Dict[str, Dict[str, Dict[str, Any]]] = {}
 
         # Database path for price history
-        if db_path is None:
-            db_path = Path(__file__).parent.parent.parent / 'data' / 'stock_data.db'
-        self.db_path = str(db_path)
+        self.db_path = str(db_path) if db_path is not None else DEFAULT_DB_PATH
 
         logger.info(f'Initialized HistoricalDataProvider with database: {self.db_path}')
 
@@ -107,11 +206,33 @@ class HistoricalDataProvider:
     def get_prices(self, tickers: List[str], date: pd.Timestamp) -> Dict[str, float]:
         """Get prices for specific tickers on a specific date from the database."""
         prices: Dict[str, float] = {}
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return prices
 
-        for ticker in tickers:
-            price = self._get_single_price(ticker, date)
-            if price is not None:
-                prices[ticker] = price
+        date_str = date.strftime('%Y-%m-%d')
+        try:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                for chunk in _chunks(tickers, TICKER_CHUNK):
+                    placeholders = ','.join('?' for _ in chunk)
+                    # Each ticker's last row on or before the date
+                    query = f'''
+                        SELECT ph.ticker, ph.close
+                        FROM price_history ph
+                        JOIN (
+                            SELECT ticker, MAX(date) AS date FROM price_history
+                            WHERE ticker IN ({placeholders}) AND date <= ?
+                            GROUP BY ticker
+                        ) last ON ph.ticker = last.ticker AND ph.date = last.date
+                    '''
+                    for ticker, close in conn.execute(query, (*chunk, date_str)).fetchall():
+                        if close is not None:
+                            prices[ticker] = close
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f'Error fetching prices from database: {e}')
 
         return prices
 
@@ -170,6 +291,15 @@ class HistoricalDataProvider:
         else:
             return pd.DataFrame()
 
+    def _get_asset_meta(self, conn: sqlite3.Connection) -> Dict[str, Dict[str, Any]]:
+        """Asset metadata (id, sector, industry) by symbol, read once per database."""
+        if self.db_path not in self._asset_meta:
+            self._asset_meta[self.db_path] = {
+                row[1]: {'id': row[0], 'sector': row[2], 'industry': row[3]}
+                for row in conn.execute('SELECT id, symbol, sector, industry FROM assets').fetchall()
+            }
+        return self._asset_meta[self.db_path]
+
     def _get_fundamentals_as_of(self, tickers: List[str],
                                  date: pd.Timestamp) -> Dict[str, Dict]:
         """
@@ -178,104 +308,139 @@ class HistoricalDataProvider:
         Uses the fundamental_history table (point-in-time snapshots) instead of
         yfinance's current data to avoid look-ahead bias. Applies a reporting
         lag of 45 days (companies don't publish financials on period-end date).
+
+        The latest two snapshots of every ticker come from one window query
+        (per chunk of tickers) rather than one query per ticker. A chunk whose
+        query fails leaves only its own tickers with empty fundamentals.
         """
-        fundamentals = {}
-        reporting_lag_days = 45  # Conservative lag for financial reporting
+        snapshots: Dict[str, List[Dict[str, Any]]] = {}
+        failed: List[str] = []
+
+        # Most recent snapshots available before (date - reporting lag):
+        # what an investor would actually know at that date
+        available_date = (date - timedelta(days=REPORTING_LAG_DAYS)).strftime('%Y-%m-%d')
 
         try:
             conn = sqlite3.connect(self.db_path)
+            try:
+                asset_meta = self._get_asset_meta(conn)
+                ticker_by_id = {
+                    asset_meta[t]['id']: t for t in dict.fromkeys(tickers)
+                    if asset_meta.get(t, {}).get('id') is not None
+                }
 
-            # Pre-fetch asset metadata (sector, industry) — these are stable
-            asset_meta = {}
-            meta_query = 'SELECT id, symbol, sector, industry FROM assets'
-            for row in conn.execute(meta_query).fetchall():
-                asset_meta[row[1]] = {'id': row[0], 'sector': row[2], 'industry': row[3]}
+                for chunk in _chunks(list(ticker_by_id), TICKER_CHUNK):
+                    placeholders = ','.join('?' for _ in chunk)
+                    query = f'''
+                        SELECT * FROM (
+                            SELECT *, ROW_NUMBER() OVER (
+                                PARTITION BY asset_id ORDER BY snapshot_date DESC, id DESC
+                            ) AS snapshot_rank
+                            FROM fundamental_history
+                            WHERE asset_id IN ({placeholders})
+                            AND snapshot_date <= ?
+                        )
+                        WHERE snapshot_rank <= 2
+                        ORDER BY asset_id, snapshot_rank
+                    '''
+                    try:
+                        cursor = conn.execute(query, (*chunk, available_date))
+                        col_names = [desc[0] for desc in cursor.description]
+                        rows = cursor.fetchall()
+                    except Exception as e:
+                        logger.error(f"Error fetching fundamentals for {len(chunk)} tickers from database: {e}")
+                        failed.extend(ticker_by_id[asset_id] for asset_id in chunk)
+                        continue
+                    for row in rows:
+                        record = dict(zip(col_names, row))
+                        snapshots.setdefault(ticker_by_id[record['asset_id']], []).append(record)
+            finally:
+                conn.close()
 
-            for ticker in tickers:
-                meta = asset_meta.get(ticker, {})
-                asset_id = meta.get('id')
+        except Exception as e:
+            logger.error(f"Error fetching fundamentals from database: {e}")
+            # Return empty dicts rather than crashing
+            return {ticker: {} for ticker in tickers}
 
-                if asset_id is None:
-                    fundamentals[ticker] = {
-                        'sector': meta.get('sector'),
-                        'industry': meta.get('industry'),
-                    }
-                    continue
+        fundamentals = self._fundamental_records(
+            tickers,
+            {ticker: (rows[0], rows[1] if len(rows) > 1 else None) for ticker, rows in snapshots.items()},
+            asset_meta,
+            date,
+        )
+        # Tickers of a failed chunk get empty dicts, as if the whole read had failed
+        fundamentals.update({ticker: {} for ticker in failed})
+        return fundamentals
 
-                # Get the most recent snapshot available before (date - reporting_lag)
-                # This simulates what an investor would actually know at that date
-                available_date = (date - timedelta(days=reporting_lag_days)).strftime('%Y-%m-%d')
+    def _fundamental_records(self, tickers: List[str],
+                             snapshots: Dict[str, Tuple[Dict[str, Any], Optional[Dict[str, Any]]]],
+                             asset_meta: Dict[str, Dict[str, Any]],
+                             date: pd.Timestamp) -> Dict[str, Dict]:
+        """
+        Screening fundamentals per ticker from its (latest, previous) snapshots.
 
-                query = '''
-                    SELECT * FROM fundamental_history
-                    WHERE asset_id = ?
-                    AND snapshot_date <= ?
-                    ORDER BY snapshot_date DESC
-                    LIMIT 2
-                '''
-                cursor = conn.execute(query, (asset_id, available_date))
-                col_names = [desc[0] for desc in cursor.description]
-                rows = cursor.fetchall()
-
-                if not rows:
-                    fundamentals[ticker] = {
-                        'sector': meta.get('sector'),
-                        'industry': meta.get('industry'),
-                    }
-                    continue
-
-                latest = dict(zip(col_names, rows[0]))
-                previous = dict(zip(col_names, rows[1])) if len(rows) > 1 else None
-
-                # Compute P/E from price_history + trailing_eps if pe_ratio is empty
-                pe_ratio = latest.get('pe_ratio')
-                if pe_ratio is None and latest.get('trailing_eps'):
-                    price_on_date = self._get_single_price(ticker, date)
-                    if price_on_date and latest['trailing_eps'] > 0:
-                        pe_ratio = price_on_date / latest['trailing_eps']
-
-                # Compute revenue_growth from consecutive snapshots
-                revenue_growth = latest.get('revenue_growth')
-                if revenue_growth is None and previous:
-                    prev_rps = previous.get('revenue_per_share')
-                    curr_rps = latest.get('revenue_per_share')
-                    if prev_rps and curr_rps and prev_rps > 0:
-                        revenue_growth = (curr_rps - prev_rps) / prev_rps
-
-                fundamental_data = {
-                    'market_cap': latest.get('market_cap'),
-                    'pe_ratio': pe_ratio,
-                    'pb_ratio': latest.get('price_to_book'),
-                    'ps_ratio': latest.get('price_to_sales'),
-                    'debt_to_equity': latest.get('debt_to_equity'),
-                    'roe': latest.get('return_on_equity'),
-                    'roa': latest.get('return_on_assets'),
-                    'current_ratio': latest.get('current_ratio'),
-                    'quick_ratio': latest.get('quick_ratio'),
-                    'gross_margins': latest.get('gross_margins'),
-                    'operating_margins': latest.get('operating_margins'),
-                    'profit_margins': latest.get('profit_margins'),
-                    'revenue_growth': revenue_growth,
-                    'earnings_growth': latest.get('earnings_growth'),
-                    'free_cash_flow': latest.get('free_cashflow'),
-                    'dividend_yield': latest.get('dividend_yield'),
-                    'beta': latest.get('beta'),
+        Prices for the P/E fallback (snapshots without a P/E but with a
+        trailing EPS) are fetched in one ``get_prices`` call for all tickers.
+        """
+        needs_price = [
+            ticker for ticker, (latest, _) in snapshots.items()
+            if latest.get('pe_ratio') is None and latest.get('trailing_eps')
+        ]
+        prices = self.get_prices(needs_price, date) if needs_price else {}
+
+        fundamentals = {}
+        for ticker in tickers:
+            meta = asset_meta.get(ticker, {})
+            if ticker not in snapshots:
+                fundamentals[ticker] = {
                     'sector': meta.get('sector'),
                     'industry': meta.get('industry'),
                 }
+                continue
+            latest, previous = snapshots[ticker]
+            fundamentals[ticker] = self._fundamental_record(latest, previous, meta, prices.get(ticker))
+        return fundamentals
 
-                fundamentals[ticker] = fundamental_data
-
-            conn.close()
-
-        except Exception as e:
-            logger.error(f"Error fetching fundamentals from database: {e}")
-            # Return empty dicts rather than crashing
-            for ticker in tickers:
-                if ticker not in fundamentals:
-                    fundamentals[ticker] = {}
+    def _fundamental_record(self, latest: Dict[str, Any],
+                            previous: Optional[Dict[str, Any]],
+                            meta: Dict[str, Any],
+                            price_on_date: Optional[float] = None) -> Dict[str, Any]:
+        """Screening fundamentals from a ticker's latest (and previous) snapshot row."""
+        # Compute P/E from the price on the date + trailing_eps if pe_ratio is empty
+        pe_ratio = latest.get('pe_ratio')
+        if pe_ratio is None and latest.get('trailing_eps'):
+            if price_on_date and latest['trailing_eps'] > 0:
+                pe_ratio = price_on_date / latest['trailing_eps']
+
+        # Compute revenue_growth from consecutive snapshots
+        revenue_growth = latest.get('revenue_growth')
+        if revenue_growth is None and previous:
+            prev_rps = previous.get('revenue_per_share')
+            curr_rps = latest.get('revenue_per_share')
+            if prev_rps and curr_rps and prev_rps > 0:
+                revenue_growth = (curr_rps - prev_rps) / prev_rps
 
-        return fundamentals
+        return {
+            'market_cap': latest.get('market_cap'),
+            'pe_ratio': pe_ratio,
+            'pb_ratio': latest.get('price_to_book'),
+            'ps_ratio': latest.get('price_to_sales'),
+            'debt_to_equity': latest.get('debt_to_equity'),
+            'roe': latest.get('return_on_equity'),
+            'roa': latest.get('return_on_assets'),
+            'current_ratio': latest.get('current_ratio'),
+            'quick_ratio': latest.get('quick_ratio'),
+            'gross_margins': latest.get('gross_margins'),
+            'operating_margins': latest.get('operating_margins'),
+            'profit_margins': latest.get('profit_margins'),
+            'revenue_growth': revenue_growth,
+            'earnings_growth': latest.get('earnings_growth'),
+            'free_cash_flow': latest.get('free_cashflow'),
+            'dividend_yield': latest.get('dividend_yield'),
+            'beta': latest.get('beta'),
+            'sector': meta.get('sector'),
+            'industry': meta.get('industry'),
+        }
 
     def _get_single_price(self, ticker: str, date: pd.Timestamp) -> Optional[float]:
         """Get the most recent closing price on or before a given date."""
@@ -353,32 +518,12 @@ class HistoricalDataProvider:
                                   fundamentals: Dict[str, Dict],
                                   date: pd.Timestamp) -> Dict[str, Dict]:
         """Calculate screening metrics based on point-in-time data."""
+        price_metrics = _price_metrics(price_history)
         metrics = {}
 
         for ticker in tickers:
-            ticker_metrics = {}
-
-            # Price-based metrics
-            if ticker in price_history.columns:
-                prices = price_history[ticker].dropna()
-
-                if len(prices) > 0:
-                    # Returns
-                    ticker_metrics['return_1m'] = (prices.iloc[-1] / prices.iloc[-21] - 1) * 100 if len(prices) > 21 else None
-                    ticker_metrics['return_3m'] = (prices.iloc[-1] / prices.iloc[-63] - 1) * 100 if len(prices) > 63 else None
-                    ticker_metrics['return_6m'] = (prices.iloc[-1] / prices.iloc[-126] - 1) * 100 if len(prices) > 126 else None
-                    ticker_metrics['return_1y'] = (prices.iloc[-1] / prices.iloc[-252] - 1) * 100 if len(prices) > 252 else None
-
-                    # Volatility
-                    returns = prices.pct_change()
-                    ticker_metrics['volatility'] = returns.std() * np.sqrt(252) * 100
-
-                    # Moving averages
-                    ticker_metrics['above_ma50'] = prices.iloc[-1] > prices.rolling(50).mean().iloc[-1] if len(prices) > 50 else None
-                    ticker_metrics['above_ma200'] = prices.iloc[-1] > prices.rolling(200).mean().iloc[-1] if len(prices) > 200 else None
-
-                    # Relative strength
-                    ticker_metrics['rsi'] = self._calculate_rsi(prices)
+            # Price-based metrics (only for tickers with prices in the window)
+            ticker_metrics = dict(price_metrics.get(ticker, {}))
 
             # Fundamental metrics
             if ticker in fundamentals:
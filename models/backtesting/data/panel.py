@@ -0,0 +1,469 @@
+"""
+Panel-mode historical data provider: one load per backtest, array lookups after.
+
+``HistoricalDataProvider`` opens a sqlite connection for every single-price
+lookup and every per-ticker price history, and queries fundamental_history
+at every rebalance. ``PanelDataProvider`` answers the same calls from data
+loaded once:
+
+- ``PricePanel``: dates × tickers arrays of open/high/low/close/volume, plus a
+  forward-filled "last row on or before" index, so as-of prices, delisting
+  checks and history windows are index lookups;
+- ``FundamentalPanel``: every snapshot of the universe sorted by (ticker, date),
+  so the latest snapshot before the reporting lag is one vectorized binary
+  search for all tickers.
+
+Results are the same as the query-per-call provider. Calls outside the loaded
+window (or for tickers not loaded yet) are handled too: unknown tickers are
+loaded and merged in, and dates before the window fall back to the parent's
+database queries.
+"""
+
+import logging
+import sqlite3
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .historical import REPORTING_LAG_DAYS, TICKER_CHUNK, HistoricalDataProvider, _chunks
+
+logger = logging.getLogger(__name__)
+
+# Day span per ticker in the fundamentals search key
+_DAY_SPAN = np.int64(1 << 24)
+_DAY_OFFSET = np.int64(1 << 23)
+
+PRICE_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _day(date: pd.Timestamp) -> np.datetime64:
+    """Calendar day of a timestamp (queries compare at day resolution)."""
+    return np.datetime64(pd.Timestamp(date).normalize().to_datetime64(), 'ns')
+
+
+class PricePanel:
+    """
+    Daily prices of a ticker universe as dense dates × tickers arrays.
+
+    Holds every price row in ``[start, end]`` plus each ticker's last row
+    before ``start``, so any "last row on or before d" lookup with
+    ``start <= d <= end`` and any window inside ``[start, end]`` is exact.
+
+    Parameters
+    ----------
+    rows : pd.DataFrame
+        Long price rows: ticker, date (datetime64) and PRICE_FIELDS
+    tickers : sequence of str
+        Tickers the rows were loaded for (including ones without rows)
+    start, end : pd.Timestamp
+        Window the rows cover
+    """
+
+    def __init__(self, rows: pd.DataFrame, tickers: Sequence[str],
+                 start: pd.Timestamp, end: pd.Timestamp) -> None:
+        self.rows = rows
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+        self.tickers = pd.Index(list(dict.fromkeys(tickers)))
+
+        self.dates = np.unique(rows['date'].to_numpy(dtype='datetime64[ns]'))
+        row_idx = np.searchsorted(self.dates, rows['date'].to_numpy(dtype='datetime64[ns]'))
+        col_idx = self.tickers.get_indexer(rows['ticker'])
+        shape = (len(self.dates), len(self.tickers))
+
+        self.has_row = np.zeros(shape, dtype=bool)
+        self.has_row[row_idx, col_idx] = True
+
+        self.fields: Dict[str, np.ndarray] = {}
+        for field in PRICE_FIELDS:
+            values = np.full(shape, np.nan)
+            values[row_idx, col_idx] = pd.to_numeric(rows[field], errors='coerce').to_numpy(dtype=float)
+            self.fields[field] = values
+
+        # Index of each ticker's last row on or before each date (-1: none yet)
+        last = np.where(self.has_row, np.arange(shape[0])[:, None], -1)
+        self.last_row = np.maximum.accumulate(last, axis=0) if shape[0] else last
+
+    @classmethod
+    def load(cls, db_path: str, tickers: Sequence[str],
+             start: pd.Timestamp, end: pd.Timestamp) -> 'PricePanel':
+        """Load the panel's price rows from the ``price_history`` table."""
+        tickers = list(dict.fromkeys(tickers))
+        start_str = pd.Timestamp(start).strftime('%Y-%m-%d')
+        end_str = pd.Timestamp(end).strftime('%Y-%m-%d')
+
+        frames = []
+        conn = sqlite3.connect(db_path)
+        try:
+            for chunk in _chunks(tickers, TICKER_CHUNK):
+                placeholders = ','.join('?' for _ in chunk)
+                # Rows in the window, plus each ticker's last row before it
+                query = f'''
+                    SELECT ticker, date, open, high, low, close, volume
+                    FROM price_history
+                    WHERE ticker IN ({placeholders})
+                    AND date >= ? AND date <= ?
+                    UNION ALL
+                    SELECT ph.ticker, ph.date, ph.open, ph.high, ph.low, ph.close, ph.volume
+                    FROM price_history ph
+                    JOIN (
+                        SELECT ticker, MAX(date) AS date FROM price_history
+                        WHERE ticker IN ({placeholders}) AND date < ?
+                        GROUP BY ticker
+                    ) last ON ph.ticker = last.ticker AND ph.date = last.date
+                '''
+                params = (*chunk, start_str, end_str, *chunk, start_str)
+                frames.append(pd.read_sql(query, conn, params=params))
+        finally:
+            conn.close()
+
+        rows = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['ticker', 'date'] + PRICE_FIELDS
+        )
+        rows['date'] = pd.to_datetime(rows['date'])
+        logger.info(f'Loaded price panel: {len(rows)} rows for {len(tickers)} tickers')
+        return cls(rows, tickers, start, end)
+
+    def merge(self, other: 'PricePanel') -> 'PricePanel':
+        """Panel over the tickers of both (same window)."""
+        return PricePanel(
+            pd.concat([self.rows, other.rows], ignore_index=True),
+            list(self.tickers) + list(other.tickers),
+            self.start,
+            self.end,
+        )
+
+    def covers(self, start: pd.Timestamp, end: pd.Timestamp) -> bool:
+        """Whether every lookup between ``start`` and ``end`` is exact."""
+        return self.start <= pd.Timestamp(start).normalize() and pd.Timestamp(end).normalize() <= self.end
+
+    def codes(self, tickers: Sequence[str]) -> np.ndarray:
+        """Column index of each ticker (-1 if not in the panel)."""
+        return self.tickers.get_indexer(list(tickers))
+
+    def row_as_of(self, date: pd.Timestamp) -> int:
+        """Index of the last panel date on or before ``date`` (-1 if none)."""
+        return int(np.searchsorted(self.dates, _day(date), side='right')) - 1
+
+    def last_rows(self, codes: np.ndarray, date: pd.Timestamp) -> np.ndarray:
+        """Each ticker's last price row on or before ``date`` (-1 if none)."""
+        row = self.row_as_of(date)
+        out = np.full(len(codes), -1, dtype=np.int64)
+        known = codes >= 0
+        if row >= 0:
+            out[known] = self.last_row[row, codes[known]]
+        return out
+
+    def window(self, start: pd.Timestamp, end: pd.Timestamp) -> slice:
+        """Row slice of the dates in ``[start, end]``."""
+        lo = int(np.searchsorted(self.dates, _day(start), side='left'))
+        hi = int(np.searchsorted(self.dates, _day(end), side='right'))
+        return slice(lo, hi)
+
+
+class FundamentalPanel:
+    """
+    All fundamental_history snapshots of a ticker universe, sorted by
+    (ticker, snapshot_date, id), for vectorized as-of lookups. Snapshots
+    sharing a date rank by id, as in the query provider's
+    ``ORDER BY snapshot_date DESC, id DESC``.
+
+    Parameters
+    ----------
+    records : list of dict
+        Snapshot rows (``fundamental_history`` columns, values as sqlite
+        returns them) with an extra ``symbol`` key
+    meta : dict
+        symbol -> {'id', 'sector', 'industry'} for every asset
+    tickers : sequence of str
+        Tickers the snapshots were loaded for
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], meta: Dict[str, Dict[str, Any]],
+                 tickers: Sequence[str]) -> None:
+        self.meta = meta
+        self.tickers = pd.Index(list(dict.fromkeys(tickers)))
+
+        codes = self.tickers.get_indexer([r['symbol'] for r in records])
+        dates = pd.to_datetime([r['snapshot_date'] for r in records], errors='coerce')
+        keep = (codes >= 0) & ~dates.isna()
+        days = dates.values.astype('datetime64[D]').astype(np.int64)
+
+        keys = codes.astype(np.int64) * _DAY_SPAN + days + _DAY_OFFSET
+        ids = np.array([-1 if r.get('id') is None else r['id'] for r in records], dtype=np.int64)
+        order = np.flatnonzero(keep)[np.lexsort((ids[keep], keys[keep]))]
+        self.records = [records[i] for i in order]
+        self.codes = codes[order]
+        self.keys = keys[order]
+
+    @classmethod
+    def load(cls, db_path: str, tickers: Sequence[str],
+             meta: Optional[Dict[str, Dict[str, Any]]] = None) -> 'FundamentalPanel':
+        """Load every snapshot of ``tickers`` (and the assets metadata)."""
+        tickers = list(dict.fromkeys(tickers))
+        records: List[Dict[str, Any]] = []
+
+        conn = sqlite3.connect(db_path)
+        try:
+            if meta is None:
+                meta = {
+                    row[1]: {'id': row[0], 'sector': row[2], 'industry': row[3]}
+                    for row in conn.execute('SELECT id, symbol, sector, industry FROM assets').fetchall()
+                }
+            for chunk in _chunks(tickers, TICKER_CHUNK):
+                placeholders = ','.join('?' for _ in chunk)
+                cursor = conn.execute(f'''
+                    SELECT a.symbol AS symbol, fh.*
+                    FROM fundamental_history fh
+                    JOIN assets a ON fh.asset_id = a.id
+                    WHERE a.symbol IN ({placeholders})
+                ''', tuple(chunk))
+                columns = [desc[0] for desc in cursor.description]
+                records.extend(dict(zip(columns, row)) for row in cursor.fetchall())
+        finally:
+            conn.close()
+
+        logger.info(f'Loaded fundamentals panel: {len(records)} snapshots for {len(tickers)} tickers')
+        return cls(records, meta, tickers)
+
+    def merge(self, other: 'FundamentalPanel') -> 'FundamentalPanel':
+        """Panel over the tickers of both."""
+        return FundamentalPanel(
+            self.records + other.records,
+            self.meta,
+            list(self.tickers) + list(other.tickers),
+        )
+
+    def as_of(self, tickers: Sequence[str], date: pd.Timestamp) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Latest and previous snapshot on or before ``date`` per ticker.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            Record indexes (latest, previous); -1 where there is none
+        """
+        codes = self.tickers.get_indexer(list(tickers)).astype(np.int64)
+        day = np.int64(pd.Timestamp(date).normalize().to_datetime64().astype('datetime64[D]').astype(np.int64))
+        pos = np.searchsorted(self.keys, codes * _DAY_SPAN + day + _DAY_OFFSET, side='right') - 1
+
+        def same_ticker(p: np.ndarray) -> np.ndarray:
+            ok = (p >= 0) & (codes >= 0)
+            ok[ok] = self.codes[p[ok]] == codes[ok]
+            return np.where(ok, p, -1)
+
+        latest = same_ticker(pos)
+        previous = same_ticker(np.where(latest >= 0, latest - 1, -1))
+        return latest, previous
+
+
+class PanelDataProvider(HistoricalDataProvider):
+    """
+    ``HistoricalDataProvider`` backed by in-memory price and fundamental panels.
+
+    Panels are loaded on first use (or passed in, e.g. shared by several
+    backtests over the same universe).
+
+    Parameters
+    ----------
+    tickers : sequence of str
+        Universe to preload (include the benchmark)
+    start_date, end_date : pd.Timestamp
+        Price window to preload; start should include the lookback of the
+        first rebalance
+    db_path : str, optional
+        SQLite database (default: the backtesting database)
+    prices : PricePanel, optional
+        Preloaded price panel
+    fundamentals : FundamentalPanel, optional
+        Preloaded fundamentals panel
+    """
+
+    def __init__(self, tickers: Sequence[str], start_date: pd.Timestamp,
+                 end_date: pd.Timestamp, db_path: Optional[str] = None,
+                 prices: Optional[PricePanel] = None,
+                 fundamentals: Optional[FundamentalPanel] = None) -> None:
+        super().__init__(db_path=db_path)
+        self.universe = list(dict.fromkeys(t for t in tickers if t))
+        self.start_date = pd.Timestamp(start_date)
+        self.end_date = pd.Timestamp(end_date)
+        self._prices = prices
+        self._fundamentals = fundamentals
+
+    # ── Panels ───────────────────────────────────────────────────────────
+
+    @property
+    def prices(self) -> PricePanel:
+        if self._prices is None:
+            self._prices = PricePanel.load(self.db_path, self.universe, self.start_date, self.end_date)
+        return self._prices
+
+    @property
+    def fundamentals(self) -> FundamentalPanel:
+        if self._fundamentals is None:
+            self._fundamentals = FundamentalPanel.load(self.db_path, self.universe)
+        return self._fundamentals
+
+    def _ensure_tickers(self, tickers: Sequence[str]) -> None:
+        """Load and merge in tickers the panels don't have yet."""
+        missing = [t for t in dict.fromkeys(tickers) if t not in self.prices.tickers]
+        if missing:
+            extra = PricePanel.load(self.db_path, missing, self.prices.start, self.prices.end)
+            self._prices = self.prices.merge(extra)
+
+        missing = [t for t in dict.fromkeys(tickers) if t not in self.fundamentals.tickers]
+        if missing:
+            extra = FundamentalPanel.load(self.db_path, missing, self.fundamentals.meta)
+            self._fundamentals = self.fundamentals.merge(extra)
+
+    # ── HistoricalDataProvider interface ────────────────────────────────
+
+    def get_data_as_of(self, date: pd.Timestamp, tickers: List[str],
+                       lookback_days: int = 365) -> Dict[str, Any]:
+        """Point-in-time data as of ``date``; see ``HistoricalDataProvider``."""
+        start_date = date - timedelta(days=lookback_days)
+        if not self.prices.covers(start_date, date):
+            return super().get_data_as_of(date, tickers, lookback_days)
+
+        logger.info(f'Getting point-in-time data as of {date}')
+        self._ensure_tickers(tickers)
+
+        # --- Survivorship-bias filter: drop delisted tickers --------------
+        available = self.get_available_tickers_as_of(date, tickers)
+        dropped = set(tickers) - available
+        if dropped:
+            for t in sorted(dropped):
+                logger.warning(
+                    'Ticker %s dropped from universe as of %s '
+                    '(no recent price data — likely delisted)', t, date
+                )
+        active_tickers = [t for t in tickers if t in available]
+        # ------------------------------------------------------------------
+
+        price_history = self._get_price_history_range(active_tickers, start_date, date)
+
+        # Last non-missing close per ticker in the window
+        current_prices = {}
+        if not price_history.empty:
+            values = price_history.to_numpy()
+            valid = ~np.isnan(values)
+            last = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+            for j, ticker in enumerate(price_history.columns):
+                if valid[:, j].any():
+                    current_prices[ticker] = values[last[j], j]
+
+        fundamentals = self._get_fundamentals_as_of(active_tickers, date)
+
+        financial_metrics = self._calculate_metrics_as_of(
+            active_tickers, price_history, fundamentals, date
+        )
+
+        return {
+            'date': date,
+            'current_prices': current_prices,
+            'price_history': price_history,
+            'fundamentals': fundamentals,
+            'financial_metrics': financial_metrics,
+            'dropped_tickers': dropped,
+        }
+
+    def get_prices(self, tickers: List[str], date: pd.Timestamp) -> Dict[str, float]:
+        """Last close on or before ``date`` per ticker (tickers without one are omitted)."""
+        if not self.prices.covers(date, date):
+            return super().get_prices(tickers, date)
+        self._ensure_tickers(tickers)
+
+        codes = self.prices.codes(tickers)
+        rows = self.prices.last_rows(codes, date)
+        close = self.prices.fields['close']
+        prices: Dict[str, float] = {}
+        for ticker, code, row in zip(tickers, codes, rows):
+            if row >= 0 and not np.isnan(close[row, code]):
+                prices[ticker] = close[row, code]
+        return prices
+
+    def get_price_history(self, ticker: str, start_date: pd.Timestamp,
+                          end_date: pd.Timestamp) -> pd.DataFrame:
+        """Daily OHLCV rows of one ticker between two dates."""
+        if not self.prices.covers(start_date, end_date):
+            return super().get_price_history(ticker, start_date, end_date)
+        self._ensure_tickers([ticker])
+
+        code = self.prices.codes([ticker])[0]
+        window = self.prices.window(start_date, end_date)
+        rows = np.flatnonzero(self.prices.has_row[window, code]) + window.start
+        if not len(rows):
+            return pd.DataFrame(columns=PRICE_FIELDS, index=pd.DatetimeIndex([], name='date'))
+
+        return pd.DataFrame(
+            {field.capitalize(): self.prices.fields[field][rows, code] for field in PRICE_FIELDS},
+            index=pd.DatetimeIndex(self.prices.dates[rows], name='date'),
+        )
+
+    def _get_price_history_range(self, tickers: List[str],
+                                 start_date: pd.Timestamp,
+                                 end_date: pd.Timestamp) -> pd.DataFrame:
+        """Closes of several tickers (dates any of them traded × tickers with rows)."""
+        if not self.prices.covers(start_date, end_date):
+            return super()._get_price_history_range(tickers, start_date, end_date)
+        self._ensure_tickers(tickers)
+
+        window = self.prices.window(start_date, end_date)
+        codes = self.prices.codes(tickers)
+        has_row = self.prices.has_row[window]
+
+        keep = np.array([c >= 0 and has_row[:, c].any() for c in codes], dtype=bool)
+        if not keep.any():
+            return pd.DataFrame()
+        cols = codes[keep]
+        rows = np.flatnonzero(has_row[:, cols].any(axis=1))
+
+        return pd.DataFrame(
+            self.prices.fields['close'][window][rows][:, cols],
+            index=pd.DatetimeIndex(self.prices.dates[window][rows], name='date'),
+            columns=[t for t, k in zip(tickers, keep) if k],
+        )
+
+    def _get_fundamentals_as_of(self, tickers: List[str],
+                                date: pd.Timestamp) -> Dict[str, Dict]:
+        """Latest snapshot before the reporting lag per ticker; see parent."""
+        self._ensure_tickers(tickers)
+        panel = self.fundamentals
+        latest, previous = panel.as_of(tickers, date - timedelta(days=REPORTING_LAG_DAYS))
+
+        snapshots = {
+            ticker: (panel.records[i], panel.records[j] if j >= 0 else None)
+            for ticker, i, j in zip(tickers, latest, previous) if i >= 0
+        }
+        return self._fundamental_records(tickers, snapshots, panel.meta, date)
+
+    def _get_single_price(self, ticker: str, date: pd.Timestamp) -> Optional[float]:
+        """Most recent close on or before ``date``."""
+        if not self.prices.covers(date, date):
+            return super()._get_single_price(ticker, date)
+        self._ensure_tickers([ticker])
+
+        code = self.prices.codes([ticker])
+        row = self.prices.last_rows(code, date)[0]
+        if row < 0:
+            return None
+        close = self.prices.fields['close'][row, code[0]]
+        return None if np.isnan(close) else float(close)
+
+    def get_available_tickers_as_of(self, date: pd.Timestamp,
+                                    tickers: List[str],
+                                    max_gap_calendar_days: int = 7) -> Set[str]:
+        """Tickers whose last price row is within ``max_gap_calendar_days`` of ``date``."""
+        if not tickers:
+            return set()
+        if not self.prices.covers(date, date):
+            return super().get_available_tickers_as_of(date, tickers, max_gap_calendar_days)
+        self._ensure_tickers(tickers)
+
+        rows = self.prices.last_rows(self.prices.codes(tickers), date)
+        cutoff = _day(date - timedelta(days=max_gap_calendar_days))
+        has_recent = rows >= 0
+        has_recent[has_recent] = self.prices.dates[rows[has_recent]] >= cutoff
+        return {t for t, ok in zip(tickers, has_recent) if ok}
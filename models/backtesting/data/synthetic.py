@@ -0,0 +1,358 @@
+"""
+Synthetic market database for benchmarking the backtesting stack offline.
+
+Builds a SQLite file with the tables the backtester, its data providers and
+the GBM training pipeline read (assets, price_history, fundamental_history,
+forward_returns), filled with random but plausible data:
+
+- daily closes from a one-factor model (market return times a per-ticker
+  beta plus idiosyncratic noise), with some tickers listing late and some
+  delisting before the end, so the survivorship code paths are exercised;
+- quarterly fundamental snapshots whose ratios drift around a per-ticker
+  level, with market cap, P/E, P/B and P/S tied to the simulated close;
+- 1y forward returns of every snapshot whose horizon fits in the price data.
+
+Nothing here is meant to be realistic enough to evaluate a strategy; it only
+needs the same shape and density as data/stock_data.db.
+"""
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SECTORS = ['Technology', 'Healthcare', 'Financial Services', 'Energy', 'Industrials',
+           'Consumer Cyclical', 'Consumer Defensive', 'Utilities', 'Real Estate']
+
+SCHEMA = '''
+    CREATE TABLE assets (
+        id INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL UNIQUE,
+        asset_type TEXT,
+        sector TEXT,
+        industry TEXT
+    );
+    CREATE TABLE price_history (
+        ticker TEXT NOT NULL,
+        date DATE NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume REAL,
+        PRIMARY KEY (ticker, date)
+    );
+    CREATE TABLE fundamental_history (
+        id INTEGER PRIMARY KEY,
+        asset_id INTEGER NOT NULL REFERENCES assets(id),
+        snapshot_date DATE NOT NULL,
+        volume REAL,
+        market_cap REAL,
+        shares_outstanding REAL,
+        pe_ratio REAL,
+        pb_ratio REAL,
+        ps_ratio REAL,
+        price_to_book REAL,
+        price_to_sales REAL,
+        enterprise_to_revenue REAL,
+        enterprise_to_ebitda REAL,
+        profit_margins REAL,
+        operating_margins REAL,
+        gross_margins REAL,
+        return_on_assets REAL,
+        return_on_equity REAL,
+        revenue_growth REAL,
+        earnings_growth REAL,
+        revenue_per_share REAL,
+        debt_to_equity REAL,
+        current_ratio REAL,
+        quick_ratio REAL,
+        operating_cashflow REAL,
+        free_cashflow REAL,
+        trailing_eps REAL,
+        book_value REAL,
+        dividend_yield REAL,
+        payout_ratio REAL,
+        beta REAL,
+        vix REAL,
+        treasury_10y REAL,
+        UNIQUE (asset_id, snapshot_date)
+    );
+    CREATE TABLE forward_returns (
+        id INTEGER PRIMARY KEY,
+        snapshot_id INTEGER NOT NULL,
+        horizon TEXT NOT NULL,
+        return_pct REAL,
+        UNIQUE (snapshot_id, horizon)
+    );
+    CREATE INDEX idx_price_history_date ON price_history(date);
+    CREATE TABLE synthetic_market (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+'''
+
+# (column, per-ticker level range, quarterly noise sd) of ratios drifting around a level
+RATIO_COLUMNS = [
+    ('gross_margins', (0.15, 0.7), 0.02),
+    ('operating_margins', (-0.05, 0.35), 0.02),
+    ('profit_margins', (-0.08, 0.25), 0.02),
+    ('return_on_equity', (-0.05, 0.35), 0.03),
+    ('return_on_assets', (-0.03, 0.15), 0.01),
+    ('revenue_growth', (-0.1, 0.3), 0.05),
+    ('earnings_growth', (-0.2, 0.4), 0.1),
+    ('debt_to_equity', (0.0, 2.5), 0.1),
+    ('current_ratio', (0.6, 3.0), 0.1),
+    ('quick_ratio', (0.4, 2.5), 0.1),
+    ('dividend_yield', (0.0, 0.05), 0.002),
+    ('payout_ratio', (0.0, 0.8), 0.05),
+    ('enterprise_to_ebitda', (5.0, 30.0), 1.0),
+    ('enterprise_to_revenue', (0.5, 10.0), 0.3),
+]
+
+
+@dataclass
+class SyntheticMarket:
+    """Summary of a generated database."""
+    db_path: str
+    tickers: List[str]
+    benchmark: str
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+    price_rows: int
+    snapshot_rows: int
+
+
+def _price_paths(rng: np.random.Generator, n_tickers: int, n_days: int) -> Dict[str, np.ndarray]:
+    """Benchmark and ticker closes from a one-factor model (days × tickers)."""
+    market = rng.normal(0.0003, 0.01, n_days)
+    betas = rng.uniform(0.5, 1.6, n_tickers)
+    noise = rng.normal(0.0, 1.0, (n_days, n_tickers)) * rng.uniform(0.008, 0.03, n_tickers)
+    log_returns = market[:, None] * betas + noise
+    closes = rng.uniform(10, 300, n_tickers) * np.exp(np.cumsum(log_returns, axis=0))
+    return {
+        'benchmark': 400 * np.exp(np.cumsum(market)),
+        'closes': closes,
+        'betas': betas,
+    }
+
+
+def _listing_windows(rng: np.random.Generator, n_tickers: int, n_days: int,
+                     late_listing_rate: float, delisting_rate: float) -> np.ndarray:
+    """[first, last) trading-day rows of each ticker."""
+    windows = np.tile([0, n_days], (n_tickers, 1))
+    late = rng.random(n_tickers) < late_listing_rate
+    windows[late, 0] = rng.integers(n_days // 10, n_days // 2, late.sum())
+    delisted = rng.random(n_tickers) < delisting_rate
+    windows[delisted, 1] = rng.integers(n_days // 2, n_days - 10, delisted.sum())
+    windows[:, 1] = np.maximum(windows[:, 1], windows[:, 0] + 1)
+    return windows
+
+
+def generate_market_db(db_path: str, n_tickers: int = 500, years: int = 5,
+                       start_date: str = '2012-01-01', history_years: int = 3,
+                       late_listing_rate: float = 0.1, delisting_rate: float = 0.05,
+                       benchmark: str = 'SPY', seed: int = 0) -> SyntheticMarket:
+    """
+    Write a synthetic market database.
+
+    Parameters
+    ----------
+    db_path : str
+        SQLite file to create (replaced if it exists)
+    n_tickers : int
+        Number of stocks (the benchmark is added on top)
+    years : int
+        Years of backtestable data after the history lead-in
+    start_date : str
+        First date of price data
+    history_years : int
+        Lead-in years before the backtest window, so the first rebalance has
+        price lookback, lagged snapshots and matured forward returns to use
+    late_listing_rate, delisting_rate : float
+        Fraction of tickers that list after the start / delist before the end
+    benchmark : str
+        Ticker of the benchmark series
+    seed : int
+        Random seed (same arguments and seed give the same database)
+
+    Returns
+    -------
+    SyntheticMarket
+        Path, tickers and the backtestable window of the database
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start_date)
+    days = pd.bdate_range(start, start + pd.DateOffset(years=history_years + years) - pd.Timedelta(days=1))
+    n_days = len(days)
+    tickers = [f'S{i:05d}' for i in range(n_tickers)]
+
+    paths = _price_paths(rng, n_tickers, n_days)
+    closes = paths['closes']
+    windows = _listing_windows(rng, n_tickers, n_days, late_listing_rate, delisting_rate)
+    volumes = rng.lognormal(13, 1, n_tickers)
+
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        path.unlink()
+    conn = sqlite3.connect(str(path))
+    try:
+        conn.executescript(SCHEMA)
+
+        sectors = rng.choice(SECTORS, n_tickers)
+        conn.executemany(
+            'INSERT INTO assets (id, symbol, asset_type, sector, industry) VALUES (?, ?, ?, ?, ?)',
+            [(i + 1, t, 'stock', s, f'{s} {i % 7}') for i, (t, s) in enumerate(zip(tickers, sectors))]
+            + [(n_tickers + 1, benchmark, 'etf', None, None)],
+        )
+
+        # Prices, one ticker at a time to bound memory
+        day_strings = days.strftime('%Y-%m-%d').to_numpy()
+        price_rows = 0
+
+        def insert_prices(ticker, dates, close, volume):
+            conn.executemany(
+                'INSERT INTO price_history VALUES (?, ?, ?, ?, ?, ?, ?)',
+                zip([ticker] * len(dates), dates, (close * 0.998).tolist(), (close * 1.01).tolist(),
+                    (close * 0.99).tolist(), close.tolist(), volume.tolist()),
+            )
+
+        insert_prices(benchmark, day_strings, paths['benchmark'], rng.lognormal(17, 0.3, n_days))
+        price_rows += n_days
+        for i, ticker in enumerate(tickers):
+            first, last = windows[i]
+            insert_prices(ticker, day_strings[first:last], closes[first:last, i],
+                          volumes[i] * rng.lognormal(0, 0.3, last - first))
+            price_rows += last - first
+
+        snapshot_rows = _write_fundamentals(conn, rng, days, closes, windows, paths['betas'])
+
+        market = SyntheticMarket(
+            db_path=str(path),
+            tickers=tickers,
+            benchmark=benchmark,
+            start_date=start + pd.DateOffset(years=history_years),
+            end_date=days[-1],
+            price_rows=price_rows,
+            snapshot_rows=snapshot_rows,
+        )
+        conn.executemany('INSERT INTO synthetic_market VALUES (?, ?)', [
+            ('benchmark', benchmark),
+            ('start_date', market.start_date.strftime('%Y-%m-%d')),
+            ('end_date', market.end_date.strftime('%Y-%m-%d')),
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+
+    logger.info(f'Synthetic market: {n_tickers} tickers, {price_rows} price rows, '
+                f'{snapshot_rows} snapshots in {path}')
+    return market
+
+
+def market_summary(db_path: str) -> SyntheticMarket:
+    """Summary of a database written by ``generate_market_db``."""
+    conn = sqlite3.connect(db_path)
+    try:
+        meta = dict(conn.execute('SELECT key, value FROM synthetic_market').fetchall())
+        tickers = [row[0] for row in conn.execute(
+            'SELECT symbol FROM assets WHERE symbol != ? ORDER BY id', (meta['benchmark'],)
+        ).fetchall()]
+        price_rows = conn.execute('SELECT COUNT(*) FROM price_history').fetchone()[0]
+        snapshot_rows = conn.execute('SELECT COUNT(*) FROM fundamental_history').fetchone()[0]
+    finally:
+        conn.close()
+    return SyntheticMarket(
+        db_path=db_path,
+        tickers=tickers,
+        benchmark=meta['benchmark'],
+        start_date=pd.Timestamp(meta['start_date']),
+        end_date=pd.Timestamp(meta['end_date']),
+        price_rows=price_rows,
+        snapshot_rows=snapshot_rows,
+    )
+
+
+def _write_fundamentals(conn: sqlite3.Connection, rng: np.random.Generator,
+                        days: pd.DatetimeIndex, closes: np.ndarray, windows: np.ndarray,
+                        betas: np.ndarray) -> int:
+    """Quarterly snapshots of every listed ticker plus their 1y forward returns."""
+    n_days, n_tickers = closes.shape
+    quarter_ends = pd.date_range(days[0], days[-1], freq='QE')
+    # Last trading day on or before each quarter end / one year later
+    rows_at = np.searchsorted(days.values, quarter_ends.values, side='right') - 1
+    horizons = quarter_ends + pd.Timedelta(days=365)
+    horizon_rows = np.searchsorted(days.values, horizons.values, side='right') - 1
+
+    vix = np.clip(18 + np.cumsum(rng.normal(0, 2, len(quarter_ends))), 10, 60)
+    treasury = np.clip(2.5 + np.cumsum(rng.normal(0, 0.2, len(quarter_ends))), 0.1, 8)
+
+    shares = rng.lognormal(19, 1.2, n_tickers)
+    eps_yield = rng.uniform(-0.02, 0.09, n_tickers)
+    book_to_price = rng.uniform(0.1, 0.8, n_tickers)
+    sales_to_price = rng.uniform(0.1, 2.0, n_tickers)
+    levels = {col: rng.uniform(low, high, n_tickers) for col, (low, high), _ in RATIO_COLUMNS}
+
+    snapshots = []
+    for q, (quarter_end, row) in enumerate(zip(quarter_ends, rows_at)):
+        listed = np.flatnonzero((windows[:, 0] <= row) & (windows[:, 1] > row))
+        if not len(listed):
+            continue
+        n = len(listed)
+        price = closes[row, listed]
+        eps = price * (eps_yield[listed] + rng.normal(0, 0.005, n))
+        book = price * book_to_price[listed]
+        revenue = price * sales_to_price[listed]
+        market_cap = shares[listed] * price
+        cashflow = market_cap * (eps_yield[listed] + rng.normal(0.01, 0.01, n))
+
+        snapshot = pd.DataFrame({
+            'asset_id': listed + 1,
+            'snapshot_date': quarter_end.strftime('%Y-%m-%d'),
+            'volume': rng.lognormal(13, 1, n),
+            'market_cap': market_cap,
+            'shares_outstanding': shares[listed],
+            'pe_ratio': np.where(eps > 0, price / np.where(eps > 0, eps, 1.0), np.nan),
+            'pb_ratio': price / book,
+            'ps_ratio': price / revenue,
+            'price_to_book': price / book,
+            'price_to_sales': price / revenue,
+            'revenue_per_share': revenue,
+            'operating_cashflow': cashflow * 1.3,
+            'free_cashflow': cashflow,
+            'trailing_eps': eps,
+            'book_value': book,
+            'beta': betas[listed],
+            'vix': vix[q],
+            'treasury_10y': treasury[q],
+        })
+        for col, _, sd in RATIO_COLUMNS:
+            snapshot[col] = levels[col][listed] + rng.normal(0, sd, n)
+
+        # 1y forward return, if the horizon is inside the data and the ticker still trades then
+        matured = horizons[q] <= days[-1]
+        still_listed = windows[listed, 1] > horizon_rows[q]
+        snapshot['forward_return'] = np.where(
+            matured & still_listed, closes[horizon_rows[q], listed] / price - 1, np.nan,
+        )
+        snapshots.append(snapshot)
+
+    history = pd.concat(snapshots, ignore_index=True)
+    history.insert(0, 'id', np.arange(1, len(history) + 1))
+
+    returns = history.loc[history['forward_return'].notna(), ['id', 'forward_return']]
+    returns = returns.rename(columns={'id': 'snapshot_id', 'forward_return': 'return_pct'})
+    returns.insert(1, 'horizon', '1y')
+
+    history.drop(columns='forward_return').to_sql(
+        'fundamental_history', conn, if_exists='append', index=False,
+    )
+    returns.to_sql('forward_returns', conn, if_exists='append', index=False)
+    return len(history)
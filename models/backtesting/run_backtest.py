@@ -16,11 +16,7 @@ from pathlib import Path
 import yaml
 
 from backtesting.core.engine import Backtester
-from backtesting.strategies.etf_portfolio import ETFPortfolioStrategy
-from backtesting.strategies.gbm_ranking import GBMRankingStrategy
-from backtesting.strategies.market_cap import MarketCapStrategy
-from backtesting.strategies.pipeline_strategy import PipelineStrategy
-from backtesting.strategies.screening import ScreeningStrategy
+from backtesting.strategies import create_strategy
 
 # Setup logging
 logging.basicConfig(
@@ -74,21 +70,8 @@ def main():
     strategy_config = config.get('strategy', {})
     strategy_type = config.get('strategy_type', 'screening')
 
-    if strategy_type == 'gbm_ranking':
-        strategy = GBMRankingStrategy(strategy_config)
-        logger.info(f"Using GBM ranking strategy: {strategy_config.get('model_path')}")
-    elif strategy_type == 'pipeline':
-        strategy = PipelineStrategy(strategy_config)
-        logger.info("Using real analysis pipeline strategy")
-    elif strategy_type == 'market_cap':
-        strategy = MarketCapStrategy(strategy_config)
-        logger.info("Using market cap weighted strategy")
-    elif strategy_type == 'etf_portfolio':
-        strategy = ETFPortfolioStrategy(strategy_config)
-        logger.info(f"Using ETF portfolio strategy: {strategy_config.get('strategy_type', 'core_satellite')}")
-    else:
-        strategy = ScreeningStrategy(strategy_config)
-        logger.info("Using basic screening strategy")
+    strategy = create_strategy(strategy_type, strategy_config)
+    logger.info(f"Using {type(strategy).__name__} ({strategy_type})")
 
     # Run backtest
     logger.info(f"Running backtest from {config['start_date']} to {config['end_date']}")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark Backtester.run on synthetic market data (no real database needed).
+
+Usage:
+    uv run python models/backtesting/run_benchmark.py
+    uv run python models/backtesting/run_benchmark.py --scale 100x3 --scale 2000x10 \\
+        --strategy screening --strategy gbm_ranking --rebalance monthly
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import logging
+from pathlib import Path
+
+from backtesting.core.benchmark import (
+    DEFAULT_SCALES,
+    DEFAULT_STRATEGIES,
+    STRATEGY_CONFIGS,
+    append_report,
+    parse_scale,
+    run_benchmarks,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+BENCHMARK_DIR = Path(__file__).parent / 'benchmarks'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark backtests on synthetic market data')
+    parser.add_argument(
+        '--scale', action='append', type=parse_scale, dest='scales',
+        help='TICKERSxYEARS of a synthetic database (repeatable, default: '
+             + ' '.join(f'{t}x{y}' for t, y in DEFAULT_SCALES) + ')'
+    )
+    parser.add_argument(
+        '--strategy', action='append', choices=sorted(STRATEGY_CONFIGS), dest='strategies',
+        help='Strategy to time (repeatable, default: all)'
+    )
+    parser.add_argument('--rebalance', default='monthly', choices=['monthly', 'quarterly', 'annually'])
+    parser.add_argument('--data-mode', default='panel', choices=['panel', 'query'])
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data')
+    parser.add_argument(
+        '--workdir', default=str(BENCHMARK_DIR / 'data'),
+        help='Where synthetic databases and models are kept between runs'
+    )
+    parser.add_argument(
+        '--output', default=str(BENCHMARK_DIR / 'results.json'),
+        help='JSON file the run is appended to'
+    )
+    args = parser.parse_args()
+
+    settings = {
+        'scales': [f'{t}x{y}' for t, y in args.scales or DEFAULT_SCALES],
+        'strategies': args.strategies or DEFAULT_STRATEGIES,
+        'rebalance_frequency': args.rebalance,
+        'data_mode': args.data_mode,
+        'seed': args.seed,
+    }
+    results = run_benchmarks(
+        scales=args.scales or DEFAULT_SCALES,
+        strategies=args.strategies or DEFAULT_STRATEGIES,
+        workdir=args.workdir,
+        seed=args.seed,
+        rebalance_frequency=args.rebalance,
+        data_mode=args.data_mode,
+    )
+    append_report(results, args.output, settings)
+
+    print(f"\n{'strategy':<12} {'scale':>10} {'wall s':>9} {'peak MB':>9} {'SQL':>8} {'trades':>7}")
+    for r in results:
+        if r['status'] != 'success':
+            print(f"{r['strategy']:<12} {r['n_tickers']}x{r['years']:<7} FAILED: {r['error']}")
+            continue
+        print(f"{r['strategy']:<12} {str(r['n_tickers']) + 'x' + str(r['years']):>10} "
+              f"{r['wall_time_s']:>9.2f} {r['peak_rss_mb'] or float('nan'):>9.0f} "
+              f"{r['sql_statements']:>8} {r['trades']:>7}")
+    print(f'\nResults appended to {args.output}')
+    return 0 if all(r['status'] == 'success' for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
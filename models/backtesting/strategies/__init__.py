@@ -1,3 +1,40 @@
 """Investment strategies for backtesting."""
 
+from typing import Any, Dict, Optional
+
 from .gbm_ranking import GBMRankingStrategy
+
+
+def create_strategy(strategy_type: str, config: Optional[Dict[str, Any]] = None):
+    """
+    Build the strategy a backtest config's ``strategy_type`` names.
+
+    Parameters
+    ----------
+    strategy_type : str
+        'gbm_ranking', 'pipeline', 'market_cap', 'etf_portfolio' or
+        anything else for the basic screening strategy
+    config : Dict[str, Any], optional
+        The config's ``strategy`` section
+
+    Returns
+    -------
+    Strategy
+        Strategy instance
+    """
+    config = config or {}
+
+    if strategy_type == 'gbm_ranking':
+        return GBMRankingStrategy(config)
+    if strategy_type == 'pipeline':
+        from .pipeline_strategy import PipelineStrategy
+        return PipelineStrategy(config)
+    if strategy_type == 'market_cap':
+        from .market_cap import MarketCapStrategy
+        return MarketCapStrategy(config)
+    if strategy_type == 'etf_portfolio':
+        from .etf_portfolio import ETFPortfolioStrategy
+        return ETFPortfolioStrategy(config)
+
+    from .screening import ScreeningStrategy
+    return ScreeningStrategy(config)
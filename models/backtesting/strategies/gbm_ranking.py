@@ -7,7 +7,7 @@ import logging
 import sqlite3
 import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import lightgbm as lgb
 import numpy as np
@@ -38,9 +38,48 @@ from train_gbm_stock_ranker import (
 )
 
 from backtesting.data.fundamental_history_provider import FundamentalHistoryProvider
+from backtesting.data.historical import _right_aligned
+from backtesting.data.panel import PricePanel
 
 logger = logging.getLogger(__name__)
 
+# Days between a snapshot's date and when it can be traded on
+FILING_LAG_DAYS = 60
+
+# Calendar days of price history behind the price features
+PRICE_WINDOW_DAYS = 365
+
+# Fewer price rows than this -> price features stay 0
+MIN_PRICE_ROWS = 20
+
+# (feature, trading days back) for the period returns
+PRICE_RETURN_PERIODS = [('returns_1m', 21), ('returns_3m', 63), ('returns_6m', 126), ('returns_1y', 252)]
+
+# Snapshots a ticker's lag and rolling features reach back over (incl. the current one)
+HISTORY_DEPTH = max(LAG_PERIODS + ROLLING_WINDOWS) + 1
+
+
+def _engineer_history(df: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+    """Lag, change and rolling features plus missingness flags, as in training."""
+    # 2. Lag features
+    df = create_lag_features(df, features, lags=LAG_PERIODS)
+
+    # 3. Change features (QoQ, YoY)
+    df = create_change_features(df, features)
+
+    # 4. Rolling features
+    df = create_rolling_features(df, features, windows=ROLLING_WINDOWS)
+
+    # 5. Missingness flags
+    missing = {f'{feat}_missing': df[feat].isna().astype(int) for feat in features}
+    return pd.concat([df, pd.DataFrame(missing, index=df.index)], axis=1)
+
+
+def _nanmean(values: np.ndarray) -> np.ndarray:
+    """Row means skipping NaN (NaN for all-NaN rows), without the all-NaN warning."""
+    valid = ~np.isnan(values)
+    return np.where(valid, values, 0.0).sum(axis=1) / valid.sum(axis=1)
+
 
 class GBMRankingStrategy:
     """
@@ -48,7 +87,8 @@ class GBMRankingStrategy:
 
     This strategy:
     1. Loads historical fundamental snapshots (no look-ahead bias)
-    2. Engineers same features as training (lags, rolling windows)
+    2. Engineers same features as training (lags, rolling windows), once per
+       backtest; each rebalance slices the snapshots usable on its date
     3. Runs GBM model to predict returns
     4. Ranks stocks and selects top performers
     5. Constructs portfolio with configurable weighting
@@ -68,21 +108,26 @@ class GBMRankingStrategy:
             - num_positions: Number of stocks to hold (if top_n)
             - weighting: 'equal_weight', 'prediction_weighted', 'inverse_volatility'
             - min_prediction: Minimum predicted return to include (default 0.0)
+            - db_path: SQLite database (default: data/stock_data.db)
+
+            model_path may be omitted when a walk-forward backtest supplies
+            the model through ``set_model``.
         """
         self.config = config or {}
 
-        # Model configuration
+        # Model configuration (walk-forward backtests may start without one)
         model_path = self.config.get('model_path')
-        if model_path is None:
-            raise ValueError('model_path must be specified in config')
-
-        self.model_path = Path(model_path)
-        if not self.model_path.exists():
-            raise FileNotFoundError(f'Model not found: {self.model_path}')
-
-        # Load GBM model
-        logger.info(f'Loading GBM model from {self.model_path}')
-        self.model = lgb.Booster(model_file=str(self.model_path))
+        self.model_path = Path(model_path) if model_path is not None else None
+        self.model: Optional[lgb.Booster] = None
+        if self.model_path is not None:
+            if not self.model_path.exists():
+                raise FileNotFoundError(f'Model not found: {self.model_path}')
+
+            # Load GBM model
+            logger.info(f'Loading GBM model from {self.model_path}')
+            self.model = lgb.Booster(model_file=str(self.model_path))
+        else:
+            logger.info('No model_path given; waiting for a model from walk-forward retraining')
 
         # Model type determines minimum snapshot requirement
         self.model_type = self.config.get('model_type', 'full')
@@ -99,9 +144,21 @@ class GBMRankingStrategy:
         # Initialize data provider
         self.fundamental_provider = FundamentalHistoryProvider()
 
+        # Engineered snapshot history and price panel, loaded on first use
+        self.db_path = Path(
+            self.config.get('db_path') or Path(__file__).parent.parent.parent / 'data' / 'stock_data.db'
+        )
+        self._history: Optional[pd.DataFrame] = None
+        self._history_dates: Optional[np.ndarray] = None
+        self._prices: Optional[PricePanel] = None
+
         logger.info(f'Initialized GBMRankingStrategy: {self.selection_method}, '
                    f'{self.weighting}, min_snapshots={self.min_snapshots}')
 
+    def set_model(self, model: lgb.Booster) -> None:
+        """Score with ``model`` from now on (walk-forward retraining)."""
+        self.model = model
+
     def generate_signals(self, market_data: Dict[str, Any],
                         current_portfolio: Dict[str, float],
                         date: pd.Timestamp) -> Dict[str, float]:
@@ -126,6 +183,10 @@ class GBMRankingStrategy:
         """
         logger.info(f'Generating GBM signals for {date}')
 
+        if self.model is None:
+            logger.warning(f'No GBM model available on {date}, holding no positions')
+            return {}
+
         # Load and engineer features using TRAINING PIPELINE
         try:
             features_df = self._load_and_engineer_features(date)
@@ -145,17 +206,23 @@ class GBMRankingStrategy:
                 and features_df[col].dtype in [np.float64, np.int64, np.float32, np.int32]
             ]
 
-            # Feature matrix: numeric + categorical (same as training)
+            # Feature matrix: numeric + categorical (same as training), in
+            # the model's own column order when it was trained on named columns
             feature_cols = numeric_features + CATEGORICAL_FEATURES
+            model_features = self.model.feature_name()
+            if set(model_features) <= set(features_df.columns):
+                feature_cols = model_features
 
             logger.info(f'Using {len(feature_cols)} features for prediction ({len(numeric_features)} numeric + {len(CATEGORICAL_FEATURES)} categorical)')
 
-            # Predict
+            # Predict (one call scores every ticker)
             X = features_df[feature_cols]
-            features_df['predicted_return'] = self.model.predict(X)
 
             # Select stocks
-            pred_df = features_df[['ticker', 'predicted_return']].copy()
+            pred_df = pd.DataFrame({
+                'ticker': features_df['ticker'].to_numpy(),
+                'predicted_return': self.model.predict(X),
+            })
             pred_df['volatility'] = 0.0  # TODO: extract from features if needed
 
             pred_df = pred_df.sort_values('predicted_return', ascending=False)
@@ -182,49 +249,45 @@ class GBMRankingStrategy:
             traceback.print_exc()
             return {}
 
-    def _load_and_engineer_features(self, as_of_date: pd.Timestamp) -> pd.DataFrame:
+    def _snapshot_history(self) -> pd.DataFrame:
         """
-        Load snapshots and engineer features using TRAINING PIPELINE.
+        Every snapshot with its date-independent features, engineered once.
 
-        This ensures exact match with training feature engineering!
+        Lags, changes and rolling stats only look back along a ticker's own
+        snapshots, so building them over the full history and slicing the
+        as-of rows later gives what engineering the as-of rows would. Price
+        features depend on the rebalance date; they are NaN placeholders here
+        (keeping the training column order) and filled in per date.
         """
-        # Get database path
-        db_path = Path(__file__).parent.parent.parent / 'data' / 'stock_data.db'
-        conn = sqlite3.connect(str(db_path))
-
-        # Filing lag: 60 days
-        filing_lag_date = as_of_date - pd.Timedelta(days=60)
+        if self._history is not None:
+            return self._history
 
-        # Load snapshots up to filing lag date
         snapshot_cols = (
             ['a.symbol as ticker', 'a.sector', 's.snapshot_date', 's.id as snapshot_id'] +
             [f's.{col}' for col in FUNDAMENTAL_FEATURES + MARKET_FEATURES + CASHFLOW_FEATURES]
         )
-
         query = f'''
             SELECT
                 {', '.join(snapshot_cols)}
             FROM fundamental_history s
             JOIN assets a ON s.asset_id = a.id
-            WHERE s.snapshot_date <= '{filing_lag_date.strftime('%Y-%m-%d')}'
-            AND s.vix IS NOT NULL
+            WHERE s.vix IS NOT NULL
             ORDER BY a.symbol, s.snapshot_date
         '''
 
-        df = pd.read_sql(query, conn)
+        conn = sqlite3.connect(str(self.db_path))
+        try:
+            df = pd.read_sql(query, conn)
+        finally:
+            conn.close()
         df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
 
         # Convert numeric columns
         for col in FUNDAMENTAL_FEATURES + MARKET_FEATURES + CASHFLOW_FEATURES:
             df[col] = pd.to_numeric(df[col], errors='coerce')
 
-        # Load price features from price_history table
-        df = self._add_price_features(df, conn, filing_lag_date)
-
-        conn.close()
-
-        if len(df) == 0:
-            return pd.DataFrame()
+        for feat in PRICE_FEATURES:
+            df[feat] = np.nan
 
         # Sort by ticker and date
         df = df.sort_values(['ticker', 'snapshot_date']).reset_index(drop=True)
@@ -236,22 +299,46 @@ class GBMRankingStrategy:
         df['ocf_yield'] = df['operating_cashflow'].fillna(0) / (df['market_cap'].fillna(1e9) + 1e9)
         df['earnings_yield'] = df['trailing_eps'].fillna(0) / (df['market_cap'].fillna(1e9) / df['book_value'].fillna(1) + 1e-9)
 
-        # 2. Lag features
-        df = create_lag_features(df, BASE_FEATURES, lags=LAG_PERIODS)
+        # 2-5. Lag, change, rolling features and missingness flags
+        self._history = _engineer_history(df, BASE_FEATURES)
+        self._history_dates = self._history['snapshot_date'].to_numpy(dtype='datetime64[ns]')
+        logger.info(f'Engineered {len(self._history)} snapshots of '
+                    f'{self._history["ticker"].nunique()} tickers')
+        return self._history
 
-        # 3. Change features (QoQ, YoY)
-        df = create_change_features(df, BASE_FEATURES)
+    def _load_and_engineer_features(self, as_of_date: pd.Timestamp) -> pd.DataFrame:
+        """
+        Features of each ticker's latest snapshot usable on ``as_of_date``.
 
-        # 4. Rolling features
-        df = create_rolling_features(df, BASE_FEATURES, windows=ROLLING_WINDOWS)
+        Slices the precomputed snapshot history at the filing lag and adds the
+        price features as of that date, engineered with the TRAINING PIPELINE.
+        """
+        history = self._snapshot_history()
 
-        # 5. Missingness flags
-        for feat in BASE_FEATURES:
-            df[f'{feat}_missing'] = df[feat].isna().astype(int)
+        # Filing lag: 60 days
+        filing_lag_date = (as_of_date - pd.Timedelta(days=FILING_LAG_DAYS)).normalize()
+        df = history[self._history_dates <= filing_lag_date.to_datetime64()]
+
+        if len(df) == 0:
+            return pd.DataFrame()
 
-        # Get most recent snapshot per ticker
         latest_df = df.groupby('ticker').tail(1).reset_index(drop=True)
 
+        # Price features as of the filing lag date, identical for every
+        # snapshot of a ticker; their lags and rolling stats only reach back
+        # HISTORY_DEPTH snapshots
+        recent = df.groupby('ticker').tail(HISTORY_DEPTH)
+        price_features = self._price_features(latest_df['ticker'].to_numpy(), filing_lag_date)
+        price_df = recent[['ticker', 'snapshot_date']].reset_index(drop=True)
+        codes = pd.Index(latest_df['ticker']).get_indexer(price_df['ticker'])
+        for feat in PRICE_FEATURES:
+            price_df[feat] = price_features[feat][codes]
+        price_df = _engineer_history(price_df, PRICE_FEATURES).groupby('ticker').tail(1)
+        price_df = price_df.drop(columns=['ticker', 'snapshot_date']).set_axis(latest_df.index)
+        latest_df = pd.concat(
+            [latest_df.drop(columns=price_df.columns), price_df], axis=1
+        )[latest_df.columns]
+
         # Exclude cashflow base features (only engineered versions are used)
         exclude_cols = CASHFLOW_FEATURES + CATEGORICAL_FEATURES
 
@@ -272,7 +359,6 @@ class GBMRankingStrategy:
         latest_df['sector'] = latest_df['sector'].fillna('Unknown').astype('category')
 
         # Keep only tickers with minimum snapshots
-        # Count snapshots per ticker in original df
         snapshot_counts = df.groupby('ticker').size()
         valid_tickers = snapshot_counts[snapshot_counts >= self.min_snapshots].index
         latest_df = latest_df[latest_df['ticker'].isin(valid_tickers)]
@@ -384,88 +470,72 @@ class GBMRankingStrategy:
         else:
             raise ValueError(f'Unknown weighting method: {self.weighting}')
 
-    def _add_price_features(self, df: pd.DataFrame, conn, as_of_date: pd.Timestamp) -> pd.DataFrame:
+    def _price_features(self, tickers: np.ndarray, as_of_date: pd.Timestamp) -> Dict[str, np.ndarray]:
         """
-        Add price-based features by loading from price_history table.
+        Price-based features of every ticker as of ``as_of_date``.
 
-        Features added:
-        - returns_1m, returns_3m, returns_6m, returns_1y
-        - volatility (annualized standard deviation of daily returns)
-        - volume_trend (ratio of recent to historical average volume)
+        Features (0.0 where there's too little history):
+        - returns_1m, returns_3m, returns_6m, returns_1y (percent)
+        - volatility (annualized standard deviation of daily returns, percent)
+        - volume_trend (ratio of recent 20-day to previous 100-day average volume)
+
+        Computed from each ticker's price rows of the last year, read from a
+        price panel loaded once per backtest.
         """
-        # Initialize all price features to 0
-        for feat in PRICE_FEATURES:
-            df[feat] = 0.0
-
-        # Get unique tickers from df
-        tickers = df['ticker'].unique()
-
-        # For each ticker, calculate price features as of as_of_date
-        for ticker in tickers:
-            try:
-                # Query price history up to as_of_date
-                # Need at least 1 year of data for all features
-                start_date = as_of_date - pd.Timedelta(days=365)
-
-                price_query = '''
-                    SELECT date, close, volume
-                    FROM price_history
-                    WHERE ticker = ?
-                    AND date >= ?
-                    AND date <= ?
-                    ORDER BY date
-                '''
-
-                prices = pd.read_sql(
-                    price_query,
-                    conn,
-                    params=(ticker, start_date.strftime('%Y-%m-%d'), as_of_date.strftime('%Y-%m-%d')),
-                    parse_dates=['date'],
-                    index_col='date'
-                )
-
-                if len(prices) < 20:  # Need at least 20 days of data
-                    continue
-
-                # Calculate returns
-                current_price = prices['close'].iloc[-1]
-
-                # 1-month return (21 trading days)
-                if len(prices) >= 21:
-                    price_1m_ago = prices['close'].iloc[-21]
-                    df.loc[df['ticker'] == ticker, 'returns_1m'] = (current_price / price_1m_ago - 1) * 100
-
-                # 3-month return (63 trading days)
-                if len(prices) >= 63:
-                    price_3m_ago = prices['close'].iloc[-63]
-                    df.loc[df['ticker'] == ticker, 'returns_3m'] = (current_price / price_3m_ago - 1) * 100
-
-                # 6-month return (126 trading days)
-                if len(prices) >= 126:
-                    price_6m_ago = prices['close'].iloc[-126]
-                    df.loc[df['ticker'] == ticker, 'returns_6m'] = (current_price / price_6m_ago - 1) * 100
-
-                # 1-year return (252 trading days)
-                if len(prices) >= 252:
-                    price_1y_ago = prices['close'].iloc[-252]
-                    df.loc[df['ticker'] == ticker, 'returns_1y'] = (current_price / price_1y_ago - 1) * 100
-
-                # Volatility (annualized)
-                daily_returns = prices['close'].pct_change().dropna()
-                if len(daily_returns) > 0:
-                    volatility = daily_returns.std() * np.sqrt(252) * 100  # Annualized percentage
-                    df.loc[df['ticker'] == ticker, 'volatility'] = volatility
-
-                # Volume trend (recent 20 days vs previous 100 days)
-                if len(prices) >= 120:
-                    recent_volume = prices['volume'].iloc[-20:].mean()
-                    historical_volume = prices['volume'].iloc[-120:-20].mean()
-                    if historical_volume > 0:
-                        volume_trend = recent_volume / historical_volume
-                        df.loc[df['ticker'] == ticker, 'volume_trend'] = volume_trend
-
-            except Exception as e:
-                logger.debug(f'Could not calculate price features for {ticker}: {e}')
-                continue
-
-        return df
+        start_date = as_of_date - pd.Timedelta(days=PRICE_WINDOW_DAYS)
+        if self._prices is None or not self._prices.covers(start_date, as_of_date):
+            load_start = start_date if self._prices is None else min(start_date, self._prices.start)
+            load_end = max(as_of_date, pd.Timestamp.today().normalize())
+            self._prices = PricePanel.load(
+                str(self.db_path), self._snapshot_history()['ticker'].unique(), load_start, load_end
+            )
+
+        panel = self._prices
+        window = panel.window(start_date, as_of_date)
+        codes = panel.codes(tickers)
+        known = np.flatnonzero(codes >= 0)
+        length = window.stop - window.start
+
+        # Each ticker's price rows in the window, packed against the right edge
+        row_index = np.full((len(tickers), length), np.nan)
+        has_row = panel.has_row[window][:, codes[known]].T
+        row_index[known] = np.where(has_row, np.arange(length), np.nan)
+        row_index, counts = _right_aligned(row_index)
+        packed = ~np.isnan(row_index)
+        rows, cols = np.nonzero(packed)
+        source = (row_index[rows, cols].astype(np.int64) + window.start, codes[rows])
+
+        closes = np.full(row_index.shape, np.nan)
+        volumes = np.full(row_index.shape, np.nan)
+        closes[rows, cols] = panel.fields['close'][source]
+        volumes[rows, cols] = panel.fields['volume'][source]
+
+        features = {feat: np.zeros(len(tickers)) for feat in PRICE_FEATURES}
+        enough = counts >= MIN_PRICE_ROWS
+        width = closes.shape[1]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            current_price = closes[:, -1] if width else np.full(len(tickers), np.nan)
+            for feat, days in PRICE_RETURN_PERIODS:
+                if width >= days:
+                    has_period = enough & (counts >= days)
+                    features[feat][has_period] = ((current_price / closes[:, -days] - 1) * 100)[has_period]
+
+            # Volatility (annualized): sample std of the non-NaN daily returns
+            daily_returns = closes[:, 1:] / closes[:, :-1] - 1
+            valid = ~np.isnan(daily_returns)
+            n_returns = valid.sum(axis=1)
+            mean = np.where(valid, daily_returns, 0.0).sum(axis=1) / n_returns
+            sq_dev = np.where(valid, (daily_returns - mean[:, None]) ** 2, 0.0).sum(axis=1)
+            volatility = np.where(n_returns > 1, np.sqrt(sq_dev / (n_returns - 1)), np.nan) * np.sqrt(252) * 100
+            has_returns = enough & (n_returns > 0)
+            features['volatility'][has_returns] = volatility[has_returns]
+
+            # Volume trend (recent 20 days vs previous 100 days)
+            if width >= 120:
+                recent_volume = _nanmean(volumes[:, -20:])
+                historical_volume = _nanmean(volumes[:, -120:-20])
+                has_trend = enough & (counts >= 120) & (historical_volume > 0)
+                features['volume_trend'][has_trend] = (recent_volume / historical_volume)[has_trend]
+
+        return features
@@ -0,0 +1,331 @@
+"""
+Array-backed feature engineering and normalization for GBM models.
+
+The training scripts used to build these with one ``groupby('ticker')``
+transform per feature × window, and the rolling slope called
+``scipy.stats.linregress`` once per row. Here each feature column is laid out
+once as a tickers × periods grid (one contiguous row per ticker, NaN padded),
+and every window is evaluated with cumulative-sum closed forms along the rows:
+
+- mean  = S(y) / n
+- std   = sqrt((S(y²) - S(y)² / n) / (n - 1))
+- slope = (S(x·y) - x̄·S(y)) / S((x - x̄)²), x = 0..L-1 within the window
+
+where S(·) is a window sum taken as the difference of two cumsums. Values are
+centered per ticker first so the sums of squares don't cancel catastrophically.
+
+Results follow the pandas semantics of the code they replace: NaNs are
+skipped for mean/std with a ``min_periods`` on the non-NaN count, the slope
+is NaN whenever its window has a NaN, and a window whose values are all equal
+gets exactly that value as its mean and a std/slope of exactly 0. Lags and
+changes are exact; rolling stats agree with pandas to float rounding.
+
+``normalize_by_date`` does the cross-sectional winsorize + z-score the same
+way: one sort by date, then per-date quantiles, means and stds for all
+feature columns as reductions over a single 2-D array.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class _Panel:
+    """Row layout of a frame as a tickers × periods grid (rows in frame order per ticker)."""
+
+    def __init__(self, tickers: pd.Series):
+        codes, uniques = pd.factorize(tickers)
+        rows = np.flatnonzero(codes >= 0)
+        order = np.argsort(codes[rows], kind='stable')
+
+        self.n_rows = len(tickers)
+        self.rows = rows[order]
+        self.code = codes[rows][order]
+
+        counts = np.bincount(self.code, minlength=len(uniques))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]).astype(np.int64)
+        self.period = np.arange(len(self.code)) - starts[self.code]
+        self.shape = (len(uniques), int(counts.max()) if len(counts) else 0)
+
+    def to_grid(self, values: np.ndarray) -> np.ndarray:
+        grid = np.full(self.shape, np.nan)
+        grid[self.code, self.period] = values[self.rows]
+        return grid
+
+    def from_grid(self, grid: np.ndarray) -> np.ndarray:
+        out = np.full(self.n_rows, np.nan)
+        out[self.rows] = grid[self.code, self.period]
+        return out
+
+
+def _numeric(df: pd.DataFrame, col: str) -> np.ndarray:
+    return pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+
+
+def _with_columns(df: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Return a copy of ``df`` with ``columns`` set, added in a single concat."""
+    df = df.drop(columns=[c for c in columns if c in df.columns])
+    if not columns:
+        return df.copy()
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1)
+
+
+def add_lag_features(df: pd.DataFrame, features: List[str], lags: List[int]) -> pd.DataFrame:
+    """Per-ticker ``shift(lag)`` of each feature as ``{feat}_lag{lag}q``."""
+    panel = _Panel(df['ticker'])
+    columns = {}
+
+    for feat in features:
+        if feat not in df.columns:
+            continue
+        grid = panel.to_grid(_numeric(df, feat))
+        for lag in lags:
+            lagged = np.full(panel.shape, np.nan)
+            if lag < panel.shape[1]:
+                lagged[:, lag:] = grid[:, :panel.shape[1] - lag]
+            columns[f'{feat}_lag{lag}q'] = panel.from_grid(lagged)
+
+    return _with_columns(df, columns)
+
+
+def add_change_features(df: pd.DataFrame, features: List[str], yoy_lag: int = 4) -> pd.DataFrame:
+    """
+    QoQ change vs ``{feat}_lag1q`` and YoY change vs ``{feat}_lag{yoy_lag}q``:
+    (F_t - F_lag) / (|F_lag| + 1e-9), using whichever lag columns exist.
+    """
+    columns = {}
+
+    for feat in features:
+        if feat not in df.columns:
+            continue
+        for suffix, lag in (('qoq', 1), ('yoy', yoy_lag)):
+            lag_col = f'{feat}_lag{lag}q'
+            if lag_col not in df.columns:
+                continue
+            lag_vals = _numeric(df, lag_col)
+            denominator = np.where(np.isnan(lag_vals), 0.0, np.abs(lag_vals)) + 1e-9
+            columns[f'{feat}_{suffix}'] = (_numeric(df, feat) - lag_vals) / denominator
+
+    return _with_columns(df, columns)
+
+
+def _window_sum(cumulative: np.ndarray, lo: np.ndarray) -> np.ndarray:
+    """Window sums from a cumsum with a leading zero column: C[j+1] - C[lo]."""
+    return cumulative[:, 1:] - cumulative[:, lo]
+
+
+def _cumsum(values: np.ndarray) -> np.ndarray:
+    return np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)], axis=1)
+
+
+def _rolling_grid(
+    grid: np.ndarray,
+    window: int,
+    min_periods_mean: int,
+    min_periods_slope: int,
+) -> Dict[str, np.ndarray]:
+    """Rolling mean, std and slope for every cell of one feature's grid."""
+    n_tickers, n_periods = grid.shape
+    j = np.arange(n_periods)
+    lo = np.maximum(j + 1 - window, 0)
+    length = (j - lo + 1).astype(float)
+
+    valid = ~np.isnan(grid)
+    counts = valid.sum(axis=1, keepdims=True)
+    center = np.where(valid, grid, 0.0).sum(axis=1, keepdims=True) / np.maximum(counts, 1)
+    z = np.where(valid, grid - center, 0.0)
+
+    n = _window_sum(_cumsum(valid.astype(float)), lo)
+    s1 = _window_sum(_cumsum(z), lo)
+    s2 = _window_sum(_cumsum(z * z), lo)
+    sjz = _window_sum(_cumsum(j * z), lo)
+
+    # Windows whose valid values are all equal: no value change after the
+    # first valid cell of the window
+    last_valid = np.maximum.accumulate(np.where(valid, j, -1), axis=1)
+    prev_valid = np.concatenate([np.full((n_tickers, 1), -1), last_valid[:, :-1]], axis=1)
+    prev_value = np.take_along_axis(grid, np.maximum(prev_valid, 0), axis=1)
+    change = valid & (prev_valid >= 0) & (grid != prev_value)
+    next_valid = np.minimum.accumulate(
+        np.where(valid, j, n_periods)[:, ::-1], axis=1
+    )[:, ::-1]
+    first = np.minimum(next_valid[:, lo], n_periods - 1)
+    first_change = np.take_along_axis(change, first, axis=1)
+    constant = (n > 0) & (_window_sum(_cumsum(change.astype(float)), lo) - first_change == 0)
+    first_value = np.take_along_axis(grid, first, axis=1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(constant, first_value, center + s1 / n)
+        var = np.maximum((s2 - s1 * s1 / n) / (n - 1), 0.0)
+        std = np.where(constant, 0.0, np.sqrt(var))
+
+        x_mean = (length - 1) / 2
+        sxx = length * (length * length - 1) / 12
+        sxy = (sjz - lo * s1) - x_mean * s1
+        slope = np.where(constant, 0.0, sxy / sxx)
+
+    mean = np.where(n >= min_periods_mean, mean, np.nan)
+    std = np.where((n >= min_periods_mean) & (n > 1), std, np.nan)
+    slope = np.where(
+        (n == length) & (length >= min_periods_slope) & (length >= 2), slope, np.nan
+    )
+    return {'mean': mean, 'std': std, 'slope': slope}
+
+
+def add_rolling_features(
+    df: pd.DataFrame,
+    features: List[str],
+    windows: List[int],
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Per-ticker rolling ``{feat}_mean{w}q``, ``{feat}_std{w}q`` and
+    ``{feat}_slope{w}q`` for every feature and window.
+
+    ``min_periods`` applies to all three stats; by default it is
+    ``max(1, w // 2)`` for mean/std and ``max(2, w // 2)`` for the slope.
+    """
+    panel = _Panel(df['ticker'])
+    columns = {}
+
+    for feat in features:
+        if feat not in df.columns:
+            continue
+        grid = panel.to_grid(_numeric(df, feat))
+        for window in windows:
+            stats = _rolling_grid(
+                grid,
+                window,
+                min_periods if min_periods is not None else max(1, window // 2),
+                min_periods if min_periods is not None else max(2, window // 2),
+            )
+            for stat in ('mean', 'std', 'slope'):
+                columns[f'{feat}_{stat}{window}q'] = panel.from_grid(stats[stat])
+
+    return _with_columns(df, columns)
+
+
+class _DateBlocks:
+    """Rows of a frame sorted once by date (stable), as contiguous per-date blocks."""
+
+    def __init__(self, dates: pd.Series):
+        codes, _ = pd.factorize(dates)
+        rows = np.flatnonzero(codes >= 0)
+        self.order = rows[np.argsort(codes[rows], kind='stable')]
+        self.undated = codes < 0
+
+        sorted_codes = codes[self.order]
+        self.starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]) \
+            if len(sorted_codes) else np.zeros(0, dtype=np.int64)
+        self.sizes = np.diff(np.r_[self.starts, len(sorted_codes)])
+
+    def reduce(self, ufunc: np.ufunc, block: np.ndarray) -> np.ndarray:
+        """Per-date reduction of a (rows, features) block -> (dates, features)."""
+        return ufunc.reduceat(block, self.starts, axis=0)
+
+    def expand(self, per_date: np.ndarray) -> np.ndarray:
+        """Broadcast (dates, features) values back to the block's rows."""
+        return np.repeat(per_date, self.sizes, axis=0)
+
+    def sort(self, block: np.ndarray) -> np.ndarray:
+        """Sort every column within each date block (NaNs last)."""
+        # Sorting along contiguous rows of the transpose is much faster
+        # than sorting a tall array along axis 0
+        ordered = np.ascontiguousarray(block.T)
+        for start, size in zip(self.starts, self.sizes):
+            ordered[:, start:start + size].sort(axis=1)
+        return ordered.T
+
+
+def _quantiles(blocks: _DateBlocks, ordered: np.ndarray, pct: float, n_valid: np.ndarray) -> np.ndarray:
+    """
+    Per-date quantiles of every column of a ``_DateBlocks.sort``-ed block,
+    computed like ``Series.quantile`` (``np.quantile`` with linear
+    interpolation on the non-NaN values).
+    """
+    n = n_valid.astype(float)
+    virtual = (n - 1) * pct
+    previous = np.floor(virtual)
+    following = previous + 1
+    above = virtual >= n - 1
+    previous[above] = following[above] = -1
+    below = virtual < 0
+    previous[below] = following[below] = 0
+    gamma = virtual - previous
+
+    def take(index: np.ndarray) -> np.ndarray:
+        # -1 is the last non-NaN value of the date
+        index = np.where(index < 0, n_valid - 1, index).astype(np.int64)
+        rows = np.clip(blocks.starts[:, None] + index, 0, max(len(ordered) - 1, 0))
+        return np.take_along_axis(ordered, rows, axis=0)
+
+    a, b = take(previous), take(following)
+    with np.errstate(invalid='ignore'):
+        diff = b - a
+        result = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    return np.where(n_valid > 0, result, np.nan)
+
+
+def _winsorize_block(blocks: _DateBlocks, block: np.ndarray, lower_pct: float, upper_pct: float) -> np.ndarray:
+    n_valid = blocks.reduce(np.add, (~np.isnan(block)).astype(np.int64))
+    ordered = blocks.sort(block)
+    lower = blocks.expand(_quantiles(blocks, ordered, lower_pct, n_valid))
+    upper = blocks.expand(_quantiles(blocks, ordered, upper_pct, n_valid))
+    # Series.clip: NaN values and NaN bounds leave the value unchanged
+    block = np.where(block < lower, lower, block)
+    return np.where(block > upper, upper, block)
+
+
+def _standardize_block(blocks: _DateBlocks, block: np.ndarray) -> np.ndarray:
+    valid = ~np.isnan(block)
+    n = blocks.reduce(np.add, valid.astype(np.int64))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = blocks.reduce(np.add, np.where(valid, block, 0.0)) / n
+        # A date where every value is equal standardizes to exactly 0
+        low, high = blocks.reduce(np.fmin, block), blocks.reduce(np.fmax, block)
+        mean = np.where(low == high, low, mean)
+
+        deviation = block - blocks.expand(mean)
+        sum_sq = blocks.reduce(np.add, np.where(valid, deviation * deviation, 0.0))
+        std = np.sqrt(sum_sq / (n - 1))
+        return deviation / (blocks.expand(std) + 1e-9)
+
+
+def normalize_by_date(
+    df: pd.DataFrame,
+    features: List[str],
+    winsorize: Optional[Tuple[float, float]] = (0.01, 0.99),
+    standardize: bool = True,
+    date_col: str = 'snapshot_date',
+) -> pd.DataFrame:
+    """
+    Cross-sectional winsorize and/or z-score of all features in one pass.
+
+    Rows are sorted by date once and every per-date quantile, mean and std is
+    a reduction over the whole (rows, features) array; the frame is copied
+    once. Winsorizing clips to the per-date ``winsorize`` quantiles exactly
+    like ``Series.quantile``/``clip``. Z-scores are ``(x - mean) / (std + 1e-9)``
+    with the sample std; a date with a single value gets NaN and a date whose
+    values are all equal gets 0. Rows without a date are left unchanged by
+    winsorizing and get NaN z-scores, as with ``groupby().transform``.
+    """
+    df = df.copy()
+    features = [f for f in features if f in df.columns]
+    if not features or not len(df):
+        return df
+
+    blocks = _DateBlocks(df[date_col])
+    values = df[features].to_numpy(dtype=float, copy=True)
+    block = values[blocks.order]
+
+    if winsorize is not None and len(block):
+        block = _winsorize_block(blocks, block, *winsorize)
+    if standardize:
+        if len(block):
+            block = _standardize_block(blocks, block)
+        values[blocks.undated] = np.nan
+
+    values[blocks.order] = block
+    df[features] = values
+    return df
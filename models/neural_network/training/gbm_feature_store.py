@@ -0,0 +1,507 @@
+"""
+Persisted store of engineered GBM features, keyed by snapshot and config.
+
+Prediction used to re-read three years of ``fundamental_history`` plus the
+joined ``price_history`` and re-engineer every lag, rolling and price feature
+for every snapshot on each run, only to keep the latest snapshot per ticker.
+The store keeps the engineered (pre-normalization) feature rows in the
+database instead, one row per ``(snapshot_id, config_version)``:
+
+- ``config_version`` hashes the variant and its feature config, so changing a
+  feature list, lag or window starts a fresh set of rows;
+- each row records a hash of the raw snapshot it was built from and of the
+  last price date its price window reaches; a refresh re-reads only the raw
+  snapshot columns and each ticker's latest price date, and re-engineers the
+  tickers that have a new, changed or deleted snapshot, or a snapshot whose
+  price window has grown (a snapshot taken today is written before today's
+  close lands); lags and rolling windows reach back across a ticker's
+  history, so the whole ticker is rebuilt;
+- feature values are stored as one float64 blob per row, with the column
+  names and dtypes kept once per version in ``gbm_feature_store_versions``.
+
+Features are engineered over each ticker's full snapshot history, so the
+rows don't depend on the window a caller reads. Price features only look at
+prices on or before the snapshot date; if price_history is backfilled for
+older dates (behind a ticker's latest price), pass ``force=True`` to rebuild.
+
+Works on Postgres and on the SQLite training database.
+"""
+
+import hashlib
+import json
+import sqlite3
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from gbm_price_features import compute_price_features, load_price_window
+
+# Bump when engineering code changes in a way the feature config can't see
+STORE_SCHEMA_VERSION = 1
+
+META_COLUMNS = ['ticker', 'sector', 'snapshot_date', 'snapshot_id']
+
+# Tickers per DELETE statement on SQLite
+SQLITE_TICKER_CHUNK = 500
+
+_CONFIG_ATTRIBUTES = [
+    'FUNDAMENTAL_FEATURES',
+    'MARKET_FEATURES',
+    'PRICE_FEATURES',
+    'CASHFLOW_FEATURES',
+    'BASE_FEATURES',
+    'LAG_PERIODS',
+    'ROLLING_WINDOWS',
+    'ROLLING_STATS',
+    'CATEGORICAL_FEATURES',
+]
+
+
+def feature_config_version(variant: str, feature_config) -> str:
+    """
+    Version key of a variant's engineered feature set.
+
+    Parameters
+    ----------
+    variant : str
+        One of 'standard', 'lite', 'opportunistic'
+    feature_config : module
+        Feature config module of the variant
+
+    Returns
+    -------
+    str
+        ``'{variant}-{hash}'``; changes whenever the config does
+    """
+    spec = {name: getattr(feature_config, name, None) for name in _CONFIG_ATTRIBUTES}
+    spec['store_schema'] = STORE_SCHEMA_VERSION
+    digest = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+    return f'{variant}-{digest[:12]}'
+
+
+def _raw_columns(feature_config) -> List[str]:
+    return (
+        feature_config.FUNDAMENTAL_FEATURES +
+        feature_config.MARKET_FEATURES +
+        feature_config.CASHFLOW_FEATURES
+    )
+
+
+def load_raw_snapshots(conn, feature_config) -> pd.DataFrame:
+    """
+    All fundamental_history snapshots with the columns features are built from.
+
+    Returns
+    -------
+    pd.DataFrame
+        META_COLUMNS + raw feature columns (float), sorted by ticker and date
+    """
+    raw_cols = _raw_columns(feature_config)
+    query = f'''
+        SELECT
+            {', '.join(['a.symbol', 'a.sector', 'fh.snapshot_date', 'fh.id'] + [f'fh.{col}' for col in raw_cols])}
+        FROM fundamental_history fh
+        JOIN assets a ON fh.asset_id = a.id
+        WHERE fh.vix IS NOT NULL
+        ORDER BY a.symbol, fh.snapshot_date
+    '''
+    cursor = conn.cursor()
+    cursor.execute(query)
+    rows = cursor.fetchall()
+    cursor.close()
+
+    df = pd.DataFrame(rows, columns=META_COLUMNS + raw_cols)
+    df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
+    df['snapshot_id'] = df['snapshot_id'].astype(np.int64)
+    for col in raw_cols:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
+    return df
+
+
+def load_last_price_dates(conn) -> pd.Series:
+    """Latest price_history date of every ticker (datetime64, indexed by ticker)."""
+    cursor = conn.cursor()
+    cursor.execute('SELECT ticker, MAX(date) FROM price_history GROUP BY ticker')
+    rows = cursor.fetchall()
+    cursor.close()
+    last = pd.DataFrame(rows, columns=['ticker', 'date'])
+    return pd.Series(pd.to_datetime(last['date']).to_numpy(), index=last['ticker'], dtype='datetime64[ns]')
+
+
+def price_window_ends(raw: pd.DataFrame, last_price_dates: pd.Series) -> pd.Series:
+    """
+    Last date each snapshot's price window can reach.
+
+    The snapshot date, or the ticker's latest price if that is earlier (NaT
+    without prices), so it moves when prices up to the snapshot date land.
+    """
+    last = raw['ticker'].map(last_price_dates).astype('datetime64[ns]')
+    return last.where(last < raw['snapshot_date'], raw['snapshot_date'].where(last.notna()))
+
+
+def snapshot_hashes(raw: pd.DataFrame) -> np.ndarray:
+    """Content hash (int64) of each raw snapshot row."""
+    hashes = pd.util.hash_pandas_object(raw, index=False).to_numpy()
+    return hashes.view(np.int64)
+
+
+def engineer_features(
+    raw: pd.DataFrame,
+    conn,
+    feature_config,
+    training_module,
+) -> pd.DataFrame:
+    """
+    Engineer prediction features for raw snapshots (same steps as training).
+
+    Parameters
+    ----------
+    raw : pd.DataFrame
+        Output of ``load_raw_snapshots`` (any subset of whole tickers)
+    conn : psycopg2 connection or sqlite3.Connection
+        Connection used to load the price windows
+    feature_config : module
+        Feature config module of the variant
+    training_module : module
+        Trainer providing create_lag/change/rolling_features
+
+    Returns
+    -------
+    pd.DataFrame
+        META_COLUMNS + every engineered column, before normalization
+    """
+    df = raw.copy()
+
+    # Price features (0.0 where the window is too short, as in prediction)
+    prices = load_price_window(conn, df)
+    price_df = compute_price_features(df, prices, fallback=0.0)
+    df = pd.concat([df, price_df], axis=1)
+    for feat in feature_config.PRICE_FEATURES:
+        df[feat] = df[feat].fillna(0.0)
+
+    df = df.sort_values(['ticker', 'snapshot_date']).reset_index(drop=True)
+
+    # Computed features
+    df['log_market_cap'] = np.log(df['market_cap'] + 1e9)
+    df['fcf_yield'] = df['free_cashflow'] / (df['market_cap'] + 1e9)
+    df['ocf_yield'] = df['operating_cashflow'] / (df['market_cap'] + 1e9)
+    df['earnings_yield'] = df['trailing_eps'] / (df['market_cap'] / df['book_value'] + 1e-9)
+
+    df = training_module.create_lag_features(
+        df,
+        feature_config.BASE_FEATURES,
+        lags=feature_config.LAG_PERIODS
+    )
+    df = training_module.create_change_features(df, feature_config.BASE_FEATURES)
+    df = training_module.create_rolling_features(
+        df,
+        feature_config.BASE_FEATURES,
+        windows=feature_config.ROLLING_WINDOWS
+    )
+
+    # Missingness flags
+    missing = {f'{feat}_missing': df[feat].isna().astype(int) for feat in feature_config.BASE_FEATURES}
+    return pd.concat([df, pd.DataFrame(missing, index=df.index)], axis=1)
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class GBMFeatureStore:
+    """
+    Engineered GBM features persisted per snapshot and config version.
+
+    Parameters
+    ----------
+    conn : psycopg2 connection or sqlite3.Connection
+        Database holding fundamental_history, price_history and the store
+    variant : str
+        One of 'standard', 'lite', 'opportunistic'
+    feature_config : module
+        Feature config module of the variant
+    training_module : module
+        Trainer providing create_lag/change/rolling_features
+    """
+
+    def __init__(self, conn, variant: str, feature_config, training_module):
+        self.conn = conn
+        self.variant = variant
+        self.feature_config = feature_config
+        self.training_module = training_module
+        self.version = feature_config_version(variant, feature_config)
+        self.is_sqlite = isinstance(conn, sqlite3.Connection)
+
+    def _sql(self, query: str) -> str:
+        return query.replace('%s', '?') if self.is_sqlite else query
+
+    def ensure_schema(self) -> None:
+        """Create the store tables if they don't exist."""
+        blob = 'BLOB' if self.is_sqlite else 'BYTEA'
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            CREATE TABLE IF NOT EXISTS gbm_feature_store (
+                snapshot_id INTEGER NOT NULL,
+                config_version TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                sector TEXT,
+                snapshot_date DATE NOT NULL,
+                source_hash BIGINT NOT NULL,
+                features {blob} NOT NULL,
+                PRIMARY KEY (snapshot_id, config_version)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_gbm_feature_store_version_date
+                ON gbm_feature_store(config_version, snapshot_date)
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS gbm_feature_store_versions (
+                config_version TEXT PRIMARY KEY,
+                variant TEXT NOT NULL,
+                columns TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        self.conn.commit()
+        cursor.close()
+
+    def _stored_columns(self) -> Optional[List[List[str]]]:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self._sql('SELECT columns FROM gbm_feature_store_versions WHERE config_version = %s'),
+            (self.version,),
+        )
+        row = cursor.fetchone()
+        cursor.close()
+        return json.loads(row[0]) if row else None
+
+    def _register_columns(self, columns: List[List[str]]) -> None:
+        stored = self._stored_columns()
+        if stored is None:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                self._sql('''
+                    INSERT INTO gbm_feature_store_versions (config_version, variant, columns)
+                    VALUES (%s, %s, %s)
+                '''),
+                (self.version, self.variant, json.dumps(columns)),
+            )
+            cursor.close()
+        elif stored != columns:
+            raise ValueError(
+                f'Engineered columns no longer match stored version {self.version}; '
+                f'bump STORE_SCHEMA_VERSION'
+            )
+
+    def _stored_hashes(self) -> pd.DataFrame:
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self._sql('''
+                SELECT snapshot_id, ticker, source_hash
+                FROM gbm_feature_store
+                WHERE config_version = %s
+            '''),
+            (self.version,),
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        stored = pd.DataFrame(rows, columns=['snapshot_id', 'ticker', 'source_hash'])
+        return stored.astype({'snapshot_id': np.int64, 'source_hash': np.int64})
+
+    def _dirty_tickers(self, current: pd.DataFrame, stored: pd.DataFrame) -> List[str]:
+        """Tickers with a snapshot that is new, changed, moved or deleted."""
+        merged = current.merge(
+            stored, on='snapshot_id', how='outer', suffixes=('', '_stored'), indicator=True
+        )
+        changed = merged[
+            (merged['_merge'] != 'both')
+            | (merged['source_hash'] != merged['source_hash_stored'])
+            | (merged['ticker'] != merged['ticker_stored'])
+        ]
+        tickers = set(changed['ticker'].dropna()) | set(changed['ticker_stored'].dropna())
+        return sorted(tickers)
+
+    def _delete_tickers(self, tickers: List[str]) -> int:
+        cursor = self.conn.cursor()
+        deleted = 0
+        if self.is_sqlite:
+            for chunk in _chunks(tickers, SQLITE_TICKER_CHUNK):
+                cursor.execute(
+                    f'''DELETE FROM gbm_feature_store
+                        WHERE config_version = ? AND ticker IN ({', '.join(['?'] * len(chunk))})''',
+                    [self.version] + chunk,
+                )
+                deleted += cursor.rowcount
+        elif tickers:
+            cursor.execute(
+                'DELETE FROM gbm_feature_store WHERE config_version = %s AND ticker = ANY(%s)',
+                (self.version, tickers),
+            )
+            deleted = cursor.rowcount
+        cursor.close()
+        return deleted
+
+    def _insert(self, engineered: pd.DataFrame, columns: List[str]) -> int:
+        values = np.ascontiguousarray(engineered[columns].to_numpy(dtype=np.float64))
+        rows = [
+            (int(sid), self.version, ticker, sector, date.date(), int(h), vec.tobytes())
+            for sid, ticker, sector, date, h, vec in zip(
+                engineered['snapshot_id'],
+                engineered['ticker'],
+                engineered['sector'],
+                engineered['snapshot_date'],
+                engineered['source_hash'],
+                values,
+            )
+        ]
+        if not rows:
+            return 0
+        insert_columns = [
+            'snapshot_id', 'config_version', 'ticker', 'sector',
+            'snapshot_date', 'source_hash', 'features',
+        ]
+        if self.is_sqlite:
+            rows = [row[:4] + (row[4].isoformat(),) + row[5:] for row in rows]
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                f'''INSERT OR REPLACE INTO gbm_feature_store ({', '.join(insert_columns)})
+                    VALUES ({', '.join(['?'] * len(insert_columns))})''',
+                rows,
+            )
+            cursor.close()
+            return len(rows)
+
+        from invest.data.db import upsert_rows
+        return upsert_rows(
+            self.conn,
+            'gbm_feature_store',
+            insert_columns,
+            rows,
+            conflict=['snapshot_id', 'config_version'],
+            update=insert_columns[2:],
+        )
+
+    def refresh(self, force: bool = False) -> Dict[str, int]:
+        """
+        Bring the store up to date with fundamental_history.
+
+        Parameters
+        ----------
+        force : bool
+            Re-engineer every ticker, not just those whose snapshots changed
+
+        Returns
+        -------
+        dict
+            snapshots (raw rows seen), tickers (re-engineered),
+            written and deleted (store rows)
+        """
+        self.ensure_schema()
+
+        raw = load_raw_snapshots(self.conn, self.feature_config)
+        window_ends = price_window_ends(raw, load_last_price_dates(self.conn))
+        raw['source_hash'] = snapshot_hashes(
+            raw.drop(columns=['snapshot_id']).assign(price_window_end=window_ends)
+        )
+
+        if force:
+            dirty = sorted(set(raw['ticker']) | set(self._stored_hashes()['ticker']))
+        else:
+            dirty = self._dirty_tickers(
+                raw[['snapshot_id', 'ticker', 'source_hash']], self._stored_hashes()
+            )
+
+        stats = {'snapshots': len(raw), 'tickers': len(dirty), 'written': 0, 'deleted': 0}
+        if not dirty:
+            return stats
+
+        subset = raw[raw['ticker'].isin(dirty)]
+        written = 0
+        if len(subset):
+            engineered = engineer_features(
+                subset.drop(columns=['source_hash']).reset_index(drop=True),
+                self.conn,
+                self.feature_config,
+                self.training_module,
+            )
+            engineered = engineered.merge(
+                subset[['snapshot_id', 'source_hash']], on='snapshot_id', how='left'
+            )
+            columns = [
+                [col, 'int64' if engineered[col].dtype.kind in 'iub' else 'float64']
+                for col in engineered.columns
+                if col not in META_COLUMNS + ['source_hash']
+            ]
+            self._register_columns(columns)
+            stats['deleted'] = self._delete_tickers(dirty)
+            written = self._insert(engineered, [name for name, _ in columns])
+        else:
+            stats['deleted'] = self._delete_tickers(dirty)
+
+        self.conn.commit()
+        stats['written'] = written
+        return stats
+
+    def load(
+        self,
+        since: Optional[pd.Timestamp] = None,
+        as_of: Optional[pd.Timestamp] = None,
+        latest: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Read engineered feature rows.
+
+        Parameters
+        ----------
+        since, as_of : pd.Timestamp, optional
+            Keep snapshots dated on/after ``since`` and on/before ``as_of``
+        latest : bool
+            Keep only the most recent remaining snapshot per ticker
+
+        Returns
+        -------
+        pd.DataFrame
+            META_COLUMNS + engineered columns, sorted by ticker and date
+            (the same frame ``engineer_features`` returns)
+        """
+        columns = self._stored_columns() or []
+        conditions = ['config_version = %s']
+        params = [self.version]
+        if since is not None:
+            conditions.append('snapshot_date >= %s')
+            params.append(pd.Timestamp(since).date().isoformat())
+        if as_of is not None:
+            conditions.append('snapshot_date <= %s')
+            params.append(pd.Timestamp(as_of).date().isoformat())
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            self._sql(f'''
+                SELECT ticker, sector, snapshot_date, snapshot_id, features
+                FROM gbm_feature_store
+                WHERE {' AND '.join(conditions)}
+                ORDER BY ticker, snapshot_date
+            '''),
+            params,
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+
+        meta = pd.DataFrame([row[:4] for row in rows], columns=META_COLUMNS)
+        meta['snapshot_date'] = pd.to_datetime(meta['snapshot_date'])
+        meta['snapshot_id'] = meta['snapshot_id'].astype(np.int64)
+
+        names = [name for name, _ in columns]
+        values = np.frombuffer(b''.join(bytes(row[4]) for row in rows), dtype=np.float64)
+        values = values.reshape(len(rows), len(names))
+        features = pd.DataFrame(values, columns=names)
+        for name, dtype in columns:
+            if dtype == 'int64':
+                features[name] = features[name].astype(np.int64)
+
+        df = pd.concat([meta, features], axis=1)
+        if latest and len(df):
+            df = df.groupby('ticker', sort=False).tail(1).reset_index(drop=True)
+        return df
@@ -0,0 +1,265 @@
+"""
+Vectorized price-based momentum features for GBM models.
+
+Computes the PRICE_FEATURES (returns_1m/3m/6m/1y, volatility, volume_trend)
+for every (ticker, snapshot_date) row at once instead of filtering and
+re-sorting a ticker's price history per snapshot.
+
+Each snapshot's window is the last ``PRICE_LOOKBACK`` price rows on or before
+its date. Window ends come from one grouped searchsorted over all snapshots;
+snapshots are then batched by window length so every feature is a 2-D array
+op with the same float arithmetic (and the same per-row reductions) as the
+original per-snapshot code, i.e. the features are bit-identical.
+
+Only the price rows a snapshot can reach are loaded: per ticker, everything
+between its first and last snapshot plus ``PRICE_LOOKBACK`` rows before the
+first one.
+"""
+
+import sqlite3
+from typing import Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Trading days in the longest (1y) window
+PRICE_LOOKBACK = 252
+
+# Fewer rows than this on/before a snapshot -> all features missing
+MIN_PRICE_ROWS = 21
+
+PRICE_FEATURE_COLUMNS = [
+    'returns_1m',
+    'returns_3m',
+    'returns_6m',
+    'returns_1y',
+    'volatility',
+    'volume_trend',
+]
+
+# Tickers per statement on SQLite (3 bound parameters each)
+SQLITE_TICKER_CHUNK = 300
+
+_POSTGRES_WINDOW_QUERY = '''
+    WITH bounds AS (
+        SELECT * FROM unnest(%s::text[], %s::date[], %s::date[])
+            AS b(ticker, first_date, last_date)
+    ),
+    ranked AS (
+        SELECT
+            ph.ticker, ph.date, ph.close, ph.volume, b.first_date,
+            ROW_NUMBER() OVER (
+                PARTITION BY ph.ticker, ph.date < b.first_date
+                ORDER BY ph.date DESC
+            ) AS rn
+        FROM price_history ph
+        JOIN bounds b ON ph.ticker = b.ticker
+        WHERE ph.date <= b.last_date
+    )
+    SELECT ticker, date, close, volume
+    FROM ranked
+    WHERE date >= first_date OR rn <= %s
+    ORDER BY ticker, date
+'''
+
+_SQLITE_WINDOW_QUERY = '''
+    WITH bounds(ticker, first_date, last_date) AS (VALUES {values}),
+    ranked AS (
+        SELECT
+            ph.ticker, ph.date, ph.close, ph.volume, b.first_date,
+            ROW_NUMBER() OVER (
+                PARTITION BY ph.ticker, date(ph.date) < b.first_date
+                ORDER BY ph.date DESC
+            ) AS rn
+        FROM price_history ph
+        JOIN bounds b ON ph.ticker = b.ticker
+        WHERE date(ph.date) <= b.last_date
+    )
+    SELECT ticker, date, close, volume
+    FROM ranked
+    WHERE date(date) >= first_date OR rn <= ?
+    ORDER BY ticker, date
+'''
+
+
+def _snapshot_bounds(snapshots: pd.DataFrame) -> pd.DataFrame:
+    """First and last snapshot date per ticker."""
+    dates = pd.to_datetime(snapshots['snapshot_date'])
+    return (
+        pd.DataFrame({'ticker': snapshots['ticker'].values, 'date': dates.values})
+        .dropna()
+        .groupby('ticker')['date']
+        .agg(first_date='min', last_date='max')
+        .reset_index()
+    )
+
+
+def _chunks(items: List, size: int) -> Iterable[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def load_price_window(conn, snapshots: pd.DataFrame, lookback: int = PRICE_LOOKBACK) -> pd.DataFrame:
+    """
+    Load the price history the snapshots' feature windows can reach.
+
+    Parameters
+    ----------
+    conn : psycopg2 connection or sqlite3.Connection
+        Database connection with a ``price_history(ticker, date, close, volume)`` table
+    snapshots : pd.DataFrame
+        Rows with ``ticker`` and ``snapshot_date``
+    lookback : int
+        Price rows needed before a ticker's first snapshot
+
+    Returns
+    -------
+    pd.DataFrame
+        ticker, date (datetime64), close, volume sorted by ticker and date
+    """
+    bounds = _snapshot_bounds(snapshots)
+    columns = ['ticker', 'date', 'close', 'volume']
+    rows = []
+
+    cursor = conn.cursor()
+    if isinstance(conn, sqlite3.Connection):
+        records = [
+            (t, f.strftime('%Y-%m-%d'), l.strftime('%Y-%m-%d'))
+            for t, f, l in bounds.itertuples(index=False)
+        ]
+        for chunk in _chunks(records, SQLITE_TICKER_CHUNK):
+            query = _SQLITE_WINDOW_QUERY.format(values=', '.join(['(?, ?, ?)'] * len(chunk)))
+            params = [value for record in chunk for value in record] + [lookback]
+            cursor.execute(query, params)
+            rows.extend(cursor.fetchall())
+    elif len(bounds):
+        cursor.execute(_POSTGRES_WINDOW_QUERY, (
+            bounds['ticker'].tolist(),
+            [d.date() for d in bounds['first_date']],
+            [d.date() for d in bounds['last_date']],
+            lookback,
+        ))
+        rows = cursor.fetchall()
+    cursor.close()
+
+    prices = pd.DataFrame(rows, columns=columns)
+    prices['date'] = pd.to_datetime(prices['date'])
+    prices['close'] = pd.to_numeric(prices['close'], errors='coerce')
+    prices['volume'] = pd.to_numeric(prices['volume'], errors='coerce')
+    return prices
+
+
+def _window_ends(
+    price_codes: np.ndarray,
+    price_dates: np.ndarray,
+    snap_codes: np.ndarray,
+    snap_dates: np.ndarray,
+) -> np.ndarray:
+    """
+    Grouped ``searchsorted(side='right')``: for each snapshot, the index one
+    past the last price row of its ticker dated on or before the snapshot.
+
+    Prices must be sorted by (code, date). Prices and snapshots are merged in
+    one lexsort (prices first on equal dates), so a snapshot's end is the
+    number of price rows ahead of it.
+    """
+    n_prices = len(price_codes)
+    is_snapshot = np.concatenate([
+        np.zeros(n_prices, dtype=np.int8),
+        np.ones(len(snap_codes), dtype=np.int8),
+    ])
+    order = np.lexsort((
+        is_snapshot,
+        np.concatenate([price_dates, snap_dates]),
+        np.concatenate([price_codes, snap_codes]),
+    ))
+    prices_ahead = np.cumsum(is_snapshot[order] == 0)
+
+    ends = np.empty(len(snap_codes), dtype=np.int64)
+    at_snapshot = is_snapshot[order] == 1
+    ends[order[at_snapshot] - n_prices] = prices_ahead[at_snapshot]
+    return ends
+
+
+def _window_features(closes: np.ndarray, volumes: np.ndarray, fallback: float) -> dict:
+    """Features for a batch of equal-length windows (one row per snapshot)."""
+    length = closes.shape[1]
+    n = closes.shape[0]
+
+    def period_return(offset: int, min_rows: int) -> np.ndarray:
+        if length < min_rows:
+            return np.full(n, fallback)
+        return (closes[:, -1] - closes[:, offset]) / closes[:, offset]
+
+    recent_closes = closes[:, -60:] if length >= 60 else closes
+    daily_returns = np.diff(recent_closes, axis=1) / recent_closes[:, :-1]
+
+    vol_avg = np.mean(volumes, axis=1)
+    vol_recent = np.mean(np.ascontiguousarray(volumes[:, -5:]), axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_trend = np.where(vol_avg > 0, (vol_recent - vol_avg) / (vol_avg + 1e-9), fallback)
+
+    return {
+        'returns_1m': period_return(-21, 21),
+        'returns_3m': period_return(-63, 63),
+        'returns_6m': period_return(-126, 126),
+        'returns_1y': period_return(0, 252),
+        'volatility': np.std(daily_returns, axis=1),
+        'volume_trend': volume_trend,
+    }
+
+
+def compute_price_features(
+    snapshots: pd.DataFrame,
+    prices: pd.DataFrame,
+    fallback: float = np.nan,
+) -> pd.DataFrame:
+    """
+    Price features for every snapshot.
+
+    Parameters
+    ----------
+    snapshots : pd.DataFrame
+        Rows with ``ticker`` and ``snapshot_date``
+    prices : pd.DataFrame
+        Price history with ``ticker``, ``date``, ``close``, ``volume``
+    fallback : float
+        Value for a feature whose window is too short (e.g. returns_1y with
+        fewer than 252 rows) or whose volume average is not positive.
+        Snapshots with fewer than 21 price rows get NaN for every feature.
+
+    Returns
+    -------
+    pd.DataFrame
+        PRICE_FEATURE_COLUMNS, aligned to ``snapshots.index``
+    """
+    n_snapshots = len(snapshots)
+    out = {name: np.full(n_snapshots, np.nan) for name in PRICE_FEATURE_COLUMNS}
+
+    prices = prices.assign(date=pd.to_datetime(prices['date']))
+    prices = prices.sort_values(['ticker', 'date'], kind='mergesort')
+    ticker_index = pd.Index(prices['ticker'].unique())
+
+    price_codes = ticker_index.get_indexer(prices['ticker'])
+    snap_codes = ticker_index.get_indexer(snapshots['ticker'])
+    snap_dates = pd.to_datetime(snapshots['snapshot_date']).values.astype('datetime64[ns]').view(np.int64)
+    price_dates = prices['date'].values.astype('datetime64[ns]').view(np.int64)
+
+    # First price row of each ticker; snapshots of unknown tickers get no rows
+    starts = np.searchsorted(price_codes, np.arange(len(ticker_index)), side='left')
+    known = snap_codes >= 0
+    ends = _window_ends(price_codes, price_dates, snap_codes, snap_dates)
+    available = np.where(known, ends - starts[np.maximum(snap_codes, 0)], 0)
+
+    lengths = np.minimum(available, PRICE_LOOKBACK)
+    closes = prices['close'].to_numpy(dtype=float)
+    volumes = prices['volume'].to_numpy(dtype=float)
+
+    for length in np.unique(lengths[lengths >= MIN_PRICE_ROWS]):
+        rows = np.flatnonzero(lengths == length)
+        window = (ends[rows] - length)[:, None] + np.arange(length)
+        features = _window_features(closes[window], volumes[window], fallback)
+        for name, values in features.items():
+            out[name][rows] = values
+
+    return pd.DataFrame(out, index=snapshots.index)
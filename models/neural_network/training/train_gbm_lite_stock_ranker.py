@@ -22,6 +22,12 @@ from typing import Dict, List, Tuple
 import lightgbm as lgb
 import numpy as np
 import pandas as pd
+from gbm_feature_engine import (
+    add_change_features,
+    add_lag_features,
+    add_rolling_features,
+    normalize_by_date,
+)
 
 # Import LITE feature configuration
 from gbm_lite_feature_config import (
@@ -36,7 +42,6 @@ from gbm_lite_feature_config import (
     get_min_quarters_required,
 )
 from scipy import stats
-from scipy.stats import linregress
 from sklearn.metrics import ndcg_score
 
 # Suppress warnings
@@ -101,17 +106,7 @@ def create_lag_features(
     pd.DataFrame
         DataFrame with additional lag columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        for lag in lags:
-            lag_col = f'{feat}_lag{lag}q'
-            df[lag_col] = df.groupby('ticker')[feat].shift(lag)
-
-    return df
+    return add_lag_features(df, features, lags)
 
 
 def create_change_features(
@@ -133,32 +128,8 @@ def create_change_features(
     pd.DataFrame
         DataFrame with additional change columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # QoQ: (F_t - F_{t-1}) / (|F_{t-1}| + 1e-9)
-        lag1_col = f'{feat}_lag1q'
-        if lag1_col in df.columns:
-            lag1_vals = pd.to_numeric(df[lag1_col], errors='coerce')
-            feat_vals = pd.to_numeric(df[feat], errors='coerce')
-            numerator = feat_vals - lag1_vals
-            denominator = lag1_vals.abs().fillna(0) + 1e-9
-            df[f'{feat}_qoq'] = numerator / denominator
-
-        # YoY: Use lag2q as proxy since we don't have lag4q
-        # (This is approximate, but better than nothing)
-        lag2_col = f'{feat}_lag2q'
-        if lag2_col in df.columns:
-            lag2_vals = pd.to_numeric(df[lag2_col], errors='coerce')
-            feat_vals = pd.to_numeric(df[feat], errors='coerce')
-            numerator = feat_vals - lag2_vals
-            denominator = lag2_vals.abs().fillna(0) + 1e-9
-            df[f'{feat}_yoy'] = numerator / denominator
-
-    return df
+    # YoY uses lag2q as a proxy since LITE has no lag4q
+    return add_change_features(df, features, yoy_lag=2)
 
 
 def create_rolling_features(
@@ -183,43 +154,7 @@ def create_rolling_features(
     pd.DataFrame
         DataFrame with additional rolling stat columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        for window in windows:
-            # Rolling mean (min_periods=2 to allow for sparse data)
-            mean_col = f'{feat}_mean{window}q'
-            df[mean_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=2).mean()
-            )
-
-            # Rolling std
-            std_col = f'{feat}_std{window}q'
-            df[std_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=2).std()
-            )
-
-            # Rolling slope (OLS trend)
-            slope_col = f'{feat}_slope{window}q'
-
-            def rolling_slope(series):
-                if len(series) < 2:
-                    return np.nan
-                x = np.arange(len(series))
-                try:
-                    slope, _, _, _, _ = linregress(x, series)
-                    return slope
-                except Exception:
-                    return np.nan
-
-            df[slope_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=2).apply(rolling_slope, raw=False)
-            )
-
-    return df
+    return add_rolling_features(df, features, windows, min_periods=2)
 
 
 def winsorize_by_date(
@@ -247,24 +182,7 @@ def winsorize_by_date(
     pd.DataFrame
         DataFrame with winsorized features
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # Compute percentiles per date
-        lower_vals = df.groupby('snapshot_date')[feat].transform(
-            lambda x: x.quantile(lower_pct)
-        )
-        upper_vals = df.groupby('snapshot_date')[feat].transform(
-            lambda x: x.quantile(upper_pct)
-        )
-
-        # Clip
-        df[feat] = df[feat].clip(lower=lower_vals, upper=upper_vals)
-
-    return df
+    return normalize_by_date(df, features, winsorize=(lower_pct, upper_pct), standardize=False)
 
 
 def standardize_by_date(
@@ -286,18 +204,7 @@ def standardize_by_date(
     pd.DataFrame
         DataFrame with standardized features
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # Z-score per date
-        df[feat] = df.groupby('snapshot_date')[feat].transform(
-            lambda x: (x - x.mean()) / (x.std() + 1e-9)
-        )
-
-    return df
+    return normalize_by_date(df, features, winsorize=None)
 
 
 def purged_group_time_series_split(
@@ -745,13 +652,9 @@ class GBMLiteStockRanker:
 
         categorical_features = CATEGORICAL_FEATURES
 
-        # Winsorize numeric features
-        logger.info('Winsorizing features (1st-99th percentile)')
-        df = winsorize_by_date(df, numeric_features, lower_pct=0.01, upper_pct=0.99)
-
-        # Standardize numeric features
-        logger.info('Standardizing features (z-score per date)')
-        df = standardize_by_date(df, numeric_features)
+        # Winsorize (1st-99th percentile) and z-score numeric features per date
+        logger.info('Winsorizing and standardizing features (cross-sectional, per date)')
+        df = normalize_by_date(df, numeric_features, winsorize=(0.01, 0.99))
 
         # Handle categoricals
         df['sector'] = df['sector'].fillna('Unknown')
@@ -38,8 +38,14 @@ from gbm_feature_config import (
     PRICE_FEATURES,
     ROLLING_WINDOWS,
 )
+from gbm_feature_engine import (
+    add_change_features,
+    add_lag_features,
+    add_rolling_features,
+    normalize_by_date,
+)
+from gbm_price_features import compute_price_features, load_price_window
 from scipy import stats
-from scipy.stats import linregress
 from sklearn.metrics import ndcg_score
 
 # Suppress warnings
@@ -106,17 +112,7 @@ def create_lag_features(
     pd.DataFrame
         DataFrame with additional lag columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        for lag in lags:
-            lag_col = f'{feat}_lag{lag}q'
-            df[lag_col] = df.groupby('ticker')[feat].shift(lag)
-
-    return df
+    return add_lag_features(df, features, lags)
 
 
 def create_change_features(
@@ -138,33 +134,7 @@ def create_change_features(
     pd.DataFrame
         DataFrame with additional change columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # QoQ: (F_t - F_{t-1}) / (|F_{t-1}| + 1e-9)
-        lag1_col = f'{feat}_lag1q'
-        if lag1_col in df.columns:
-            # Convert to numeric first to handle None values
-            lag1_vals = pd.to_numeric(df[lag1_col], errors='coerce')
-            feat_vals = pd.to_numeric(df[feat], errors='coerce')
-            numerator = feat_vals - lag1_vals
-            denominator = lag1_vals.abs().fillna(0) + 1e-9
-            df[f'{feat}_qoq'] = numerator / denominator
-
-        # YoY: (F_t - F_{t-4}) / (|F_{t-4}| + 1e-9)
-        lag4_col = f'{feat}_lag4q'
-        if lag4_col in df.columns:
-            # Convert to numeric first to handle None values
-            lag4_vals = pd.to_numeric(df[lag4_col], errors='coerce')
-            feat_vals = pd.to_numeric(df[feat], errors='coerce')
-            numerator = feat_vals - lag4_vals
-            denominator = lag4_vals.abs().fillna(0) + 1e-9
-            df[f'{feat}_yoy'] = numerator / denominator
-
-    return df
+    return add_change_features(df, features)
 
 
 def create_rolling_features(
@@ -189,43 +159,7 @@ def create_rolling_features(
     pd.DataFrame
         DataFrame with additional rolling stat columns
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        for window in windows:
-            # Rolling mean
-            mean_col = f'{feat}_mean{window}q'
-            df[mean_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=max(1, window//2)).mean()
-            )
-
-            # Rolling std
-            std_col = f'{feat}_std{window}q'
-            df[std_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=max(1, window//2)).std()
-            )
-
-            # Rolling slope (OLS trend)
-            slope_col = f'{feat}_slope{window}q'
-
-            def rolling_slope(series):
-                if len(series) < 2:
-                    return np.nan
-                x = np.arange(len(series))
-                try:
-                    slope, _, _, _, _ = linregress(x, series)
-                    return slope
-                except Exception:
-                    return np.nan
-
-            df[slope_col] = df.groupby('ticker')[feat].transform(
-                lambda x: x.rolling(window, min_periods=max(2, window//2)).apply(rolling_slope, raw=False)
-            )
-
-    return df
+    return add_rolling_features(df, features, windows)
 
 
 def winsorize_by_date(
@@ -253,24 +187,7 @@ def winsorize_by_date(
     pd.DataFrame
         DataFrame with winsorized features
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # Compute percentiles per date
-        lower_vals = df.groupby('snapshot_date')[feat].transform(
-            lambda x: x.quantile(lower_pct)
-        )
-        upper_vals = df.groupby('snapshot_date')[feat].transform(
-            lambda x: x.quantile(upper_pct)
-        )
-
-        # Clip
-        df[feat] = df[feat].clip(lower=lower_vals, upper=upper_vals)
-
-    return df
+    return normalize_by_date(df, features, winsorize=(lower_pct, upper_pct), standardize=False)
 
 
 def standardize_by_date(
@@ -292,18 +209,7 @@ def standardize_by_date(
     pd.DataFrame
         DataFrame with standardized features
     """
-    df = df.copy()
-
-    for feat in features:
-        if feat not in df.columns:
-            continue
-
-        # Z-score per date
-        df[feat] = df.groupby('snapshot_date')[feat].transform(
-            lambda x: (x - x.mean()) / (x.std() + 1e-9)
-        )
-
-    return df
+    return normalize_by_date(df, features, winsorize=None)
 
 
 def purged_group_time_series_split(
@@ -590,85 +496,12 @@ class GBMStockRanker:
         pd.DataFrame
             DataFrame with price features added
         """
-        # Load all price history at once
-        price_query = '''
-            SELECT
-                ticker,
-                date,
-                close,
-                volume
-            FROM price_history
-            ORDER BY ticker, date
-        '''
-        price_df = pd.read_sql(price_query, conn)
-        price_df['date'] = pd.to_datetime(price_df['date'])
+        # Load only the price rows the snapshots' windows reach
+        price_df = load_price_window(conn, df)
 
         logger.info(f'Loaded {len(price_df)} price history records')
 
-        # Group price history by snapshot_id for fast lookup
-        price_groups = price_df.groupby('ticker')
-
-        # Calculate price features efficiently
-        def calc_price_features(row):
-            ticker = row['ticker']
-            snapshot_date = row['snapshot_date']
-
-            # Get price history for this snapshot
-            if ticker not in price_groups.groups:
-                return pd.Series({
-                    'returns_1m': np.nan,
-                    'returns_3m': np.nan,
-                    'returns_6m': np.nan,
-                    'returns_1y': np.nan,
-                    'volatility': np.nan,
-                    'volume_trend': np.nan
-                })
-
-            ticker_prices = price_groups.get_group(ticker)
-            ticker_prices = ticker_prices[ticker_prices['date'] <= snapshot_date].sort_values('date')
-
-            if len(ticker_prices) >= 21:
-                # Get last 252 trading days (~1 year) or available data
-                recent_prices = ticker_prices.tail(252)
-                closes = recent_prices['close'].values
-                volumes = recent_prices['volume'].values
-
-                # Calculate returns for multiple periods
-                returns_1m = (closes[-1] - closes[-21]) / closes[-21] if len(closes) >= 21 else np.nan
-                returns_3m = (closes[-1] - closes[-63]) / closes[-63] if len(closes) >= 63 else np.nan
-                returns_6m = (closes[-1] - closes[-126]) / closes[-126] if len(closes) >= 126 else np.nan
-                returns_1y = (closes[-1] - closes[0]) / closes[0] if len(closes) >= 252 else np.nan
-
-                # Calculate volatility (std of daily returns over last 60 days)
-                recent_closes = closes[-60:] if len(closes) >= 60 else closes
-                daily_returns = np.diff(recent_closes) / recent_closes[:-1]
-                volatility = np.std(daily_returns) if len(daily_returns) > 0 else np.nan
-
-                # Calculate volume trend
-                vol_avg = np.mean(volumes)
-                vol_recent = np.mean(volumes[-5:]) if len(volumes) >= 5 else vol_avg
-                volume_trend = (vol_recent - vol_avg) / (vol_avg + 1e-9) if vol_avg > 0 else np.nan
-
-            else:
-                # Not enough price history - use NaN to indicate missing data
-                returns_1m = np.nan
-                returns_3m = np.nan
-                returns_6m = np.nan
-                returns_1y = np.nan
-                volatility = np.nan
-                volume_trend = np.nan
-
-            return pd.Series({
-                'returns_1m': returns_1m,
-                'returns_3m': returns_3m,
-                'returns_6m': returns_6m,
-                'returns_1y': returns_1y,
-                'volatility': volatility,
-                'volume_trend': volume_trend
-            })
-
-        # Apply calculation to all rows
-        price_features = df.apply(calc_price_features, axis=1)
+        price_features = compute_price_features(df, price_df, fallback=np.nan)
         df = pd.concat([df, price_features], axis=1)
 
         # Keep NaN values - LightGBM can handle them properly
@@ -772,13 +605,9 @@ class GBMStockRanker:
 
         categorical_features = CATEGORICAL_FEATURES
 
-        # Winsorize numeric features (cross-sectional, per date)
-        logger.info('Winsorizing features (1st-99th percentile)')
-        df = winsorize_by_date(df, numeric_features, lower_pct=0.01, upper_pct=0.99)
-
-        # Standardize numeric features (z-score per date)
-        logger.info('Standardizing features (z-score per date)')
-        df = standardize_by_date(df, numeric_features)
+        # Winsorize (1st-99th percentile) and z-score numeric features per date
+        logger.info('Winsorizing and standardizing features (cross-sectional, per date)')
+        df = normalize_by_date(df, numeric_features, winsorize=(0.01, 0.99))
 
         # Handle categoricals
         df['sector'] = df['sector'].fillna('Unknown')
@@ -5,8 +5,6 @@ import sys
 from pathlib import Path
 from typing import Optional, List
 
-import pandas as pd
-
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
@@ -26,32 +24,7 @@ MODELS_TO_RUN = [
 ]
 
 def load_stock_data(ticker: str, reader: StockDataReader) -> Optional[dict]:
-    cache_data = reader.get_stock_data(ticker)
-    if not cache_data:
-        return None
-
-    stock_data = {
-        'info': cache_data.get('info', {}),
-        'financials': cache_data.get('financials', {}),
-        'market_data': reader.get_market_inputs(
-            ticker=ticker,
-            min_price_points=252,
-            max_price_age_days=30,
-            max_rate_age_days=30,
-        ),
-    }
-
-    for stmt in ['cashflow', 'balance_sheet', 'income']:
-        if stmt in cache_data and cache_data[stmt]:
-            try:
-                df = pd.DataFrame(cache_data[stmt])
-                if 'index' in df.columns:
-                    df = df.set_index('index')
-                stock_data[stmt] = df
-            except Exception as e:
-                print(f'Warning: Could not convert {stmt} for {ticker}: {e}')
-
-    return stock_data
+    return reader.get_model_data(ticker, min_price_points=252, max_price_age_days=30, max_rate_age_days=30)
 
 def run_valuation(registry: ModelRegistry, registry_name: str, ticker: str, stock_data: dict) -> Optional[dict]:
     try:
@@ -17,23 +17,30 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import math
 import sys
 from collections import defaultdict
 from dataclasses import dataclass
-from datetime import date, timedelta
+from datetime import date
 from pathlib import Path
 from statistics import mean, median, pstdev
 from typing import Dict, List, Optional, Tuple
 
+import pandas as pd
+
 REPO_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(REPO_ROOT / 'src'))
 
 from invest.data.db import get_connection
+from invest.signals.event_study import (
+    HORIZONS,
+    PriceMatrix,
+    annualise,
+    bootstrap_ci,
+    event_returns,
+    welch_t,
+)
 
-HORIZONS = [30, 90, 180, 365]
 CONTROL_START = '2023-01-01'
-GAP_DAYS = 7  # max forward search for a trading day
 
 
 @dataclass
@@ -82,82 +89,16 @@ def load_trades(conn, name: Optional[str], control: bool) -> List[Trade]:
     return out
 
 
-def load_prices(conn, tickers: List[str]) -> Dict[str, Dict[date, float]]:
-    """Returns {ticker: {date: close}}."""
+def load_prices(conn, tickers: List[str]) -> PriceMatrix:
+    """Daily closes of ``tickers`` as a dates × tickers matrix."""
     if not tickers:
-        return {}
+        return PriceMatrix.from_rows([])
     cur = conn.cursor()
     cur.execute(
         "SELECT ticker, date, close FROM price_history WHERE ticker = ANY(%s)",
         (list(set(tickers)),),
     )
-    out: Dict[str, Dict[date, float]] = defaultdict(dict)
-    for t, d, c in cur.fetchall():
-        if c is not None and c > 0:
-            out[t][d] = float(c)
-    return out
-
-
-def next_trading_close(
-    prices: Dict[date, float],
-    target: date,
-    gap_days: int = GAP_DAYS,
-) -> Optional[Tuple[date, float]]:
-    """First available close on or after `target` (within gap_days)."""
-    for i in range(gap_days + 1):
-        d = target + timedelta(days=i)
-        if d in prices:
-            return d, prices[d]
-    return None
-
-
-def alpha_for_trade(
-    trade: Trade,
-    stock_prices: Dict[date, float],
-    spy_prices: Dict[date, float],
-    horizon: int,
-    spy_max_date: date,
-) -> Optional[float]:
-    """Return signed alpha (log-space) for a trade-horizon, or None."""
-    if trade.tx_date + timedelta(days=horizon) > spy_max_date:
-        return None
-    p0 = next_trading_close(stock_prices, trade.tx_date)
-    p1 = next_trading_close(stock_prices, trade.tx_date + timedelta(days=horizon))
-    s0 = next_trading_close(spy_prices, trade.tx_date)
-    s1 = next_trading_close(spy_prices, trade.tx_date + timedelta(days=horizon))
-    if not (p0 and p1 and s0 and s1):
-        return None
-    stock_ret = math.log(p1[1] / p0[1])
-    spy_ret = math.log(s1[1] / s0[1])
-    if trade.direction == 'P':
-        return stock_ret - spy_ret
-    else:
-        return spy_ret - stock_ret
-
-
-def annualise(alpha: float, horizon: int) -> float:
-    """Compound a horizon-period log alpha to 365d, return decimal."""
-    return math.expm1(alpha * 365.0 / horizon)
-
-
-def welch_t(a: List[float], b: List[float]) -> Tuple[float, float, int]:
-    """Welch's two-sample t-test, normal approx for df>30. (t, p, df)."""
-    if len(a) < 2 or len(b) < 2:
-        return 0.0, 1.0, 0
-    ma, mb = mean(a), mean(b)
-    va = pstdev(a) ** 2 * len(a) / (len(a) - 1)
-    vb = pstdev(b) ** 2 * len(b) / (len(b) - 1)
-    se = math.sqrt(va / len(a) + vb / len(b))
-    if se == 0:
-        return 0.0, 1.0, 0
-    t = (ma - mb) / se
-    num = (va / len(a) + vb / len(b)) ** 2
-    den = (va / len(a)) ** 2 / (len(a) - 1) + (vb / len(b)) ** 2 / (len(b) - 1)
-    df = num / den if den > 0 else 0
-    # two-sided p via normal approx (df > 30 typically)
-    z = abs(t)
-    p = math.erfc(z / math.sqrt(2))
-    return t, p, int(df)
+    return PriceMatrix.from_rows(cur.fetchall())
 
 
 def hit_rate(alphas: List[float]) -> float:
@@ -173,23 +114,34 @@ def cluster_count(trades: List[Trade]) -> int:
 
 def compute_alphas(
     trades: List[Trade],
-    prices: Dict[str, Dict[date, float]],
-    spy: Dict[date, float],
-    spy_max: date,
+    prices: PriceMatrix,
 ) -> Dict[int, List[Tuple[Trade, float]]]:
-    """Return {horizon: [(trade, alpha), ...]}."""
+    """Return {horizon: [(trade, alpha), ...]} (all trades × horizons in one pass)."""
+    events = pd.DataFrame({
+        'ticker': [t.ticker for t in trades],
+        'date': [t.tx_date for t in trades],
+        'direction': [t.direction for t in trades],
+    })
     out = {h: [] for h in HORIZONS}
-    for t in trades:
-        sp = prices.get(t.ticker)
-        if not sp:
-            continue
-        for h in HORIZONS:
-            a = alpha_for_trade(t, sp, spy, h, spy_max)
-            if a is not None:
-                out[h].append((t, a))
+    if events.empty:
+        return out
+    study = event_returns(events, prices, HORIZONS, benchmark='SPY')
+    for h in HORIZONS:
+        alphas = study[f'alpha_{h}d'].to_numpy()
+        out[h] = [(trades[i], float(alphas[i])) for i in range(len(trades)) if alphas[i] == alphas[i]]
     return out
 
 
+def mean_ci(pairs: List[Tuple[Trade, float]]) -> str:
+    """95% cluster-bootstrap CI of the mean alpha (same-day trades resampled together)."""
+    low, high = bootstrap_ci(
+        [a for (_, a) in pairs], clusters=[t.tx_date for (t, _) in pairs]
+    )
+    if low != low:
+        return 'n/a'
+    return f'[{fmt_pct(low)}, {fmt_pct(high)}]'
+
+
 def fmt_pct(x: float) -> str:
     return f'{x * 100:+.1f}%'
 
@@ -218,7 +170,8 @@ def render_report(
     lines.append(
         '**Methodology source:** mirrors '
         '`notes/research/politician_backtest_2026.md`. See that doc for '
-        'forward-return convention, alpha sign, and Welch t-test details.'
+        'forward-return convention, alpha sign, and Welch t-test details. '
+        '95% CI: bootstrap of the mean α resampling same-day trades together.'
     )
     lines.append('')
 
@@ -252,19 +205,20 @@ def render_report(
     # Rigorous tables — buys
     lines.append(f'## Rigorous: {name} BUYS vs Control BUYS')
     lines.append('')
-    lines.append('| Horizon | n | n_eff | Hit % | Mean α | Median α | σ_α | Annualised α | Ctrl mean α | t | p |')
-    lines.append('|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|')
+    lines.append('| Horizon | n | n_eff | Hit % | Mean α | 95% CI | Median α | σ_α | Annualised α | Ctrl mean α | t | p |')
+    lines.append('|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|')
     for h in HORIZONS:
-        a = [v for (t, v) in pel_a[h] if t.direction == 'P']
+        pairs = [(t, v) for (t, v) in pel_a[h] if t.direction == 'P']
+        a = [v for (_, v) in pairs]
         ca = [v for (t, v) in ctrl_a[h] if t.direction == 'P']
         if not a:
             continue
-        clusters = len({t.tx_date for (t, v) in pel_a[h] if t.direction == 'P'})
+        clusters = len({t.tx_date for (t, _) in pairs})
         t_stat, p_val, _ = welch_t(a, ca)
         sig = pstdev(a) if len(a) > 1 else 0.0
         lines.append(
             f'| {h}d | {len(a)} | {clusters} | {hit_rate(a) * 100:.1f}% | '
-            f'{fmt_pct(mean(a))} | {fmt_pct(median(a))} | {sig:.3f} | '
+            f'{fmt_pct(mean(a))} | {mean_ci(pairs)} | {fmt_pct(median(a))} | {sig:.3f} | '
             f'{fmt_pct(annualise(mean(a), h))} | {fmt_pct(mean(ca)) if ca else "n/a"} | '
             f'{t_stat:+.2f} | {fmt_p(p_val)} |'
         )
@@ -273,19 +227,20 @@ def render_report(
     # Rigorous tables — sells
     lines.append(f'## Rigorous: {name} SELLS vs Control SELLS')
     lines.append('')
-    lines.append('| Horizon | n | n_eff | Hit % | Mean α | Median α | σ_α | Annualised α | Ctrl mean α | t | p |')
-    lines.append('|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|')
+    lines.append('| Horizon | n | n_eff | Hit % | Mean α | 95% CI | Median α | σ_α | Annualised α | Ctrl mean α | t | p |')
+    lines.append('|---|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|---:|')
     for h in HORIZONS:
-        a = [v for (t, v) in pel_a[h] if t.direction == 'S']
+        pairs = [(t, v) for (t, v) in pel_a[h] if t.direction == 'S']
+        a = [v for (_, v) in pairs]
         ca = [v for (t, v) in ctrl_a[h] if t.direction == 'S']
         if not a:
             continue
-        clusters = len({t.tx_date for (t, v) in pel_a[h] if t.direction == 'S'})
+        clusters = len({t.tx_date for (t, _) in pairs})
         t_stat, p_val, _ = welch_t(a, ca)
         sig = pstdev(a) if len(a) > 1 else 0.0
         lines.append(
             f'| {h}d | {len(a)} | {clusters} | {hit_rate(a) * 100:.1f}% | '
-            f'{fmt_pct(mean(a))} | {fmt_pct(median(a))} | {sig:.3f} | '
+            f'{fmt_pct(mean(a))} | {mean_ci(pairs)} | {fmt_pct(median(a))} | {sig:.3f} | '
             f'{fmt_pct(annualise(mean(a), h))} | {fmt_pct(mean(ca)) if ca else "n/a"} | '
             f'{t_stat:+.2f} | {fmt_p(p_val)} |'
         )
@@ -409,14 +364,14 @@ def main() -> int:
 
     tickers = list({t.ticker for t in pel + ctrl} | {'SPY'})
     prices = load_prices(conn, tickers)
-    spy = prices.get('SPY', {})
-    if not spy:
+    spy_last = prices.last_date('SPY')
+    if spy_last is None:
         print('SPY missing from price_history', file=sys.stderr)
         return 2
-    spy_max = max(spy.keys())
+    spy_max = pd.Timestamp(spy_last).date()
 
-    pel_a = compute_alphas(pel, prices, spy, spy_max)
-    ctrl_a = compute_alphas(ctrl, prices, spy, spy_max)
+    pel_a = compute_alphas(pel, prices)
+    ctrl_a = compute_alphas(ctrl, prices)
 
     out = render_report(args.name, pel_p, pel_s, ctrl_p, ctrl_s, pel_a, ctrl_a, spy_max)
     Path(args.out).write_text(out)
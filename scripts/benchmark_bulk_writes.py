@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Count database round trips of the bulk writers, row-by-row vs batched.
+
+Runs each writer against a recording connection (no Postgres needed) and
+reports statements + commits sent per 1k rows, for the old one-row-at-a-time
+path and the multi-row ``upsert_rows`` path:
+
+- ThresholdManager.record_scores          (scanner_score_history)
+- insider_db.insert_transactions          (insider_transactions)
+- polymarket_db.upsert_markets            (trump_policy_markets + history)
+- run_classic_valuations.save_to_database (valuation_results)
+
+Usage:
+    uv run python scripts/benchmark_bulk_writes.py
+    uv run python scripts/benchmark_bulk_writes.py --rows 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'src'))
+sys.path.insert(0, str(REPO_ROOT / 'scripts'))
+
+import run_classic_valuations
+
+from invest.data import insider_db, polymarket_db
+from invest.data.db import upsert_rows
+from invest.scanner import threshold_manager
+from invest.scanner.threshold_manager import ThresholdManager
+
+
+class RecordingCursor:
+    """Cursor that counts statements instead of sending them."""
+
+    def __init__(self, conn: 'RecordingConnection'):
+        self.connection = conn
+        self.rowcount = 0
+
+    def execute(self, query, params=None):
+        self.connection.statements += 1
+        self.rowcount = 1
+
+    def mogrify(self, template, args):
+        return b'(' + b','.join(repr(a).encode() for a in args) + b')'
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+
+class RecordingConnection:
+    """Connection stand-in: every execute and commit is one round trip."""
+
+    encoding = 'UTF8'
+
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return RecordingCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+
+def _scores(n):
+    return [(f'T{i:05d}', 70.0, 60.0, 55.0, 50.0, 65.0, 40.0) for i in range(n)]
+
+
+def _transactions(n):
+    return [
+        {'ticker': 'AAA', 'cik': '1', 'accession_number': f'0001-{i}',
+         'filing_date': '2026-01-02', 'transaction_date': '2026-01-01',
+         'reporter_name': 'Insider', 'transaction_type': 'P', 'shares': 100.0}
+        for i in range(n)
+    ]
+
+
+def _markets(n):
+    return [
+        {'market_id': f'm{i}', 'question': 'Q?', 'category': 'tariffs',
+         'yes_price': 0.4, 'no_price': 0.6, 'volume_total': 1e5}
+        for i in range(n)
+    ]
+
+
+def _valuations(n):
+    ok = {'suitable': True, 'fair_value': 10.0, 'current_price': 8.0,
+          'margin_of_safety': 0.2, 'upside': 25.0, 'details': {}}
+    return [(f'T{i:05d}', 'dcf', ok) for i in range(n)]
+
+
+def record_scores_row_by_row(conn, date, scores):
+    """The pre-batching record_scores: one upsert per ticker, one commit."""
+    for s in scores:
+        upsert_rows(conn, 'scanner_score_history',
+                    ('date', 'ticker', 'opportunity_score', 'quality_score', 'value_score',
+                     'growth_score', 'risk_score', 'catalyst_score'),
+                    [(date, *s)], conflict=('date', 'ticker'), update=('opportunity_score',))
+    conn.commit()
+
+
+def insert_transactions_row_by_row(conn, transactions):
+    """The pre-batching insert_transactions: one INSERT per row, one commit."""
+    for txn in transactions:
+        upsert_rows(conn, 'insider_transactions', insider_db._TRANSACTION_COLUMNS,
+                    [insider_db._transaction_row(txn)])
+    conn.commit()
+
+
+def _measure(fn) -> int:
+    conn = RecordingConnection()
+    fn(conn)
+    return conn.round_trips
+
+
+def run(rows: int) -> list[tuple[str, int, int]]:
+    """Return (writer, round trips before, round trips after) for ``rows`` rows."""
+    manager = ThresholdManager.__new__(ThresholdManager)
+
+    def record_scores_batched(conn):
+        with patch.object(threshold_manager, 'get_pooled_connection', return_value=conn):
+            manager.record_scores('2026-01-01', _scores(rows))
+
+    return [
+        ('record_scores',
+         _measure(lambda c: record_scores_row_by_row(c, '2026-01-01', _scores(rows))),
+         _measure(record_scores_batched)),
+        ('insert_transactions',
+         _measure(lambda c: insert_transactions_row_by_row(c, _transactions(rows))),
+         _measure(lambda c: insider_db.insert_transactions(c, _transactions(rows)))),
+        ('upsert_markets',
+         _measure(lambda c: [polymarket_db.upsert_market(c, m) for m in _markets(rows)]),
+         _measure(lambda c: polymarket_db.upsert_markets(c, _markets(rows)))),
+        ('save_to_database',
+         _measure(lambda c: [run_classic_valuations.save_to_database(c, *v) for v in _valuations(rows)]),
+         _measure(lambda c: run_classic_valuations.save_results_to_database(c, _valuations(rows)))),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Count round trips of bulk DB writers')
+    parser.add_argument('--rows', type=int, default=1000, help='Rows per writer (default: 1000)')
+    args = parser.parse_args()
+
+    per_1k = 1000 / args.rows
+    print(f'Round trips per 1k rows (measured on {args.rows} rows)')
+    print(f'{"writer":22} {"row-by-row":>12} {"batched":>10}')
+    print('-' * 46)
+    for name, before, after in run(args.rows):
+        print(f'{name:22} {before * per_1k:12.0f} {after * per_1k:10.1f}')
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -355,6 +355,25 @@ CREATE TABLE IF NOT EXISTS price_alarms (
     active INTEGER NOT NULL DEFAULT 1
 );
 
+-- Engineered GBM features per snapshot (see models/neural_network/training/gbm_feature_store.py)
+CREATE TABLE IF NOT EXISTS gbm_feature_store (
+    snapshot_id INTEGER NOT NULL,
+    config_version TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    sector TEXT,
+    snapshot_date DATE NOT NULL,
+    source_hash BIGINT NOT NULL,
+    features BYTEA NOT NULL,
+    PRIMARY KEY (snapshot_id, config_version)
+);
+
+CREATE TABLE IF NOT EXISTS gbm_feature_store_versions (
+    config_version TEXT PRIMARY KEY,
+    variant TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- ── Indexes ─────────────────────────────────────────────────────────────
 
 CREATE INDEX IF NOT EXISTS idx_assets_symbol ON assets(symbol);
@@ -385,3 +404,4 @@ CREATE INDEX IF NOT EXISTS idx_holdings_ticker ON fund_holdings(ticker);
 CREATE INDEX IF NOT EXISTS idx_holdings_fund_quarter ON fund_holdings(fund_cik, quarter);
 CREATE INDEX IF NOT EXISTS idx_holdings_quarter ON fund_holdings(quarter);
 CREATE INDEX IF NOT EXISTS idx_price_alarms_active ON price_alarms(active, ticker);
+CREATE INDEX IF NOT EXISTS idx_gbm_feature_store_version_date ON gbm_feature_store(config_version, snapshot_date);
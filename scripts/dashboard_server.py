@@ -35,7 +35,8 @@ LOG_PATH = REPO_ROOT / "logs" / "update_server.log"
 
 sys.path.insert(0, str(REPO_ROOT / "src"))
 
-from invest.data.db import get_connection
+from invest.data.db import get_pooled_connection, pool_stats, pooled_connection
+from invest.data.stock_data_reader import StockDataReader
 
 logger = logging.getLogger("dashboard_server")
 
@@ -168,42 +169,40 @@ update_manager = UpdateManager()
 
 def _ensure_alarm_table():
     """Create the price_alarms table if it doesn't exist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS price_alarms (
-            id SERIAL PRIMARY KEY,
-            ticker TEXT NOT NULL,
-            condition TEXT NOT NULL CHECK(condition IN ('above', 'below')),
-            target_price REAL NOT NULL,
-            created_at TEXT NOT NULL DEFAULT (TO_CHAR(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')),
-            triggered_at TEXT,
-            active INTEGER NOT NULL DEFAULT 1
-        )
-    """)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_alarms_active ON price_alarms(active, ticker)")
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS price_alarms (
+                id SERIAL PRIMARY KEY,
+                ticker TEXT NOT NULL,
+                condition TEXT NOT NULL CHECK(condition IN ('above', 'below')),
+                target_price REAL NOT NULL,
+                created_at TEXT NOT NULL DEFAULT (TO_CHAR(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')),
+                triggered_at TEXT,
+                active INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_price_alarms_active ON price_alarms(active, ticker)")
+        conn.commit()
 
 
 def _ensure_reminder_table():
     """Create the reminders table if it doesn't exist."""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS reminders (
-            id SERIAL PRIMARY KEY,
-            ticker TEXT,
-            message TEXT NOT NULL,
-            due_date TEXT NOT NULL,
-            created_at TEXT NOT NULL DEFAULT (TO_CHAR(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')),
-            acknowledged_at TEXT,
-            active INTEGER NOT NULL DEFAULT 1
-        )
-    """)
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_active ON reminders(active, due_date)")
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS reminders (
+                id SERIAL PRIMARY KEY,
+                ticker TEXT,
+                message TEXT NOT NULL,
+                due_date TEXT NOT NULL,
+                created_at TEXT NOT NULL DEFAULT (TO_CHAR(NOW() AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')),
+                acknowledged_at TEXT,
+                active INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_active ON reminders(active, due_date)")
+        conn.commit()
 
 
 class AlarmChecker:
@@ -225,46 +224,44 @@ class AlarmChecker:
             time.sleep(60)
 
     def _check_alarms(self):
-        conn = get_connection(dict_cursor=True)
-        cursor = conn.cursor()
+        with pooled_connection(dict_cursor=True) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT id, ticker, condition, target_price FROM price_alarms WHERE active = 1"
-        )
-        alarms = cursor.fetchall()
+            cursor.execute(
+                "SELECT id, ticker, condition, target_price FROM price_alarms WHERE active = 1"
+            )
+            alarms = cursor.fetchall()
 
-        if not alarms:
-            conn.close()
-            return
+            if not alarms:
+                return
 
-        tickers = list({r["ticker"] for r in alarms})
-        placeholders = ",".join("%s" for _ in tickers)
-        cursor.execute(
-            f"SELECT ticker, current_price FROM current_stock_data WHERE ticker IN ({placeholders})",
-            tickers,
-        )
-        prices = cursor.fetchall()
-        price_map = {r["ticker"]: r["current_price"] for r in prices if r["current_price"]}
-
-        now = _now_iso()
-        triggered_ids = []
-        for alarm in alarms:
-            price = price_map.get(alarm["ticker"])
-            if price is None:
-                continue
-            if alarm["condition"] == "above" and price >= alarm["target_price"]:
-                triggered_ids.append(alarm["id"])
-            elif alarm["condition"] == "below" and price <= alarm["target_price"]:
-                triggered_ids.append(alarm["id"])
-
-        if triggered_ids:
-            ph = ",".join("%s" for _ in triggered_ids)
+            tickers = list({r["ticker"] for r in alarms})
+            placeholders = ",".join("%s" for _ in tickers)
             cursor.execute(
-                f"UPDATE price_alarms SET triggered_at = %s, active = 0 WHERE id IN ({ph})",
-                [now, *triggered_ids],
+                f"SELECT ticker, current_price FROM current_stock_data WHERE ticker IN ({placeholders})",
+                tickers,
             )
-            conn.commit()
-        conn.close()
+            prices = cursor.fetchall()
+            price_map = {r["ticker"]: r["current_price"] for r in prices if r["current_price"]}
+
+            now = _now_iso()
+            triggered_ids = []
+            for alarm in alarms:
+                price = price_map.get(alarm["ticker"])
+                if price is None:
+                    continue
+                if alarm["condition"] == "above" and price >= alarm["target_price"]:
+                    triggered_ids.append(alarm["id"])
+                elif alarm["condition"] == "below" and price <= alarm["target_price"]:
+                    triggered_ids.append(alarm["id"])
+
+            if triggered_ids:
+                ph = ",".join("%s" for _ in triggered_ids)
+                cursor.execute(
+                    f"UPDATE price_alarms SET triggered_at = %s, active = 0 WHERE id IN ({ph})",
+                    [now, *triggered_ids],
+                )
+                conn.commit()
 
 
 alarm_checker = AlarmChecker()
@@ -274,112 +271,111 @@ alarm_checker = AlarmChecker()
 
 def get_db_health() -> dict:
     """Query database for freshness and health metrics."""
-    conn = get_connection(dict_cursor=True)
-    cursor = conn.cursor()
-    now = datetime.now(timezone.utc)
-
-    health: dict = {"ok": True, "generated_at": _now_iso()}
+    with pooled_connection(dict_cursor=True) as conn:
+        cursor = conn.cursor()
+        now = datetime.now(timezone.utc)
 
-    # ── Stock data freshness (use fetch_timestamp, count stale) ──
-    try:
-        cursor.execute(
-            "SELECT COUNT(*) as cnt, MIN(fetch_timestamp) as oldest, MAX(fetch_timestamp) as newest "
-            "FROM current_stock_data WHERE current_price IS NOT NULL"
-        )
-        row = cursor.fetchone()
-        cursor.execute(
-            "SELECT COUNT(*) as cnt FROM current_stock_data "
-            "WHERE current_price IS NOT NULL AND fetch_timestamp < NOW() - INTERVAL '7 days'"
-        )
-        stale_row = cursor.fetchone()
-        # p80 age: 80th percentile fetch_timestamp (ignores the ~20% oldest outliers)
-        cursor.execute(
-            "SELECT fetch_timestamp FROM current_stock_data "
-            "WHERE current_price IS NOT NULL AND fetch_timestamp IS NOT NULL "
-            "ORDER BY fetch_timestamp ASC "
-            "LIMIT 1 OFFSET (SELECT CAST(COUNT(*) * 0.2 AS INTEGER) "
-            "FROM current_stock_data WHERE current_price IS NOT NULL AND fetch_timestamp IS NOT NULL)"
-        )
-        p80_row = cursor.fetchone()
-        health["stock_data"] = {
-            "count": row["cnt"],
-            "oldest": row["oldest"],
-            "newest": row["newest"],
-            "age_hours": _hours_ago(row["oldest"], now),
-            "newest_age_hours": _hours_ago(row["newest"], now),
-            "p80_age_hours": _hours_ago(p80_row["fetch_timestamp"], now) if p80_row else None,
-            "stale_count": stale_row["cnt"],
-        }
-    except Exception as exc:
-        health["stock_data"] = {"error": str(exc)}
-        conn.rollback()
+        health: dict = {"ok": True, "generated_at": _now_iso()}
 
-    # ── Per-model valuation freshness ──
-    try:
-        cursor.execute(
-            "SELECT model_name, COUNT(*) as cnt, "
-            "SUM(CASE WHEN suitable THEN 1 ELSE 0 END) as ok_cnt, "
-            "SUM(CASE WHEN NOT suitable THEN 1 ELSE 0 END) as fail_cnt, "
-            "MIN(timestamp) as oldest, MAX(timestamp) as newest "
-            "FROM valuation_results GROUP BY model_name"
-        )
-        rows = cursor.fetchall()
-        models = {}
-        for r in rows:
-            models[r["model_name"]] = {
-                "total": r["cnt"],
-                "successful": r["ok_cnt"],
-                "failed": r["fail_cnt"],
-                "oldest": r["oldest"],
-                "newest": r["newest"],
-                "age_hours": _hours_ago(r["oldest"], now),
-                "newest_age_hours": _hours_ago(r["newest"], now),
+        # ── Stock data freshness (use fetch_timestamp, count stale) ──
+        try:
+            cursor.execute(
+                "SELECT COUNT(*) as cnt, MIN(fetch_timestamp) as oldest, MAX(fetch_timestamp) as newest "
+                "FROM current_stock_data WHERE current_price IS NOT NULL"
+            )
+            row = cursor.fetchone()
+            cursor.execute(
+                "SELECT COUNT(*) as cnt FROM current_stock_data "
+                "WHERE current_price IS NOT NULL AND fetch_timestamp < NOW() - INTERVAL '7 days'"
+            )
+            stale_row = cursor.fetchone()
+            # p80 age: 80th percentile fetch_timestamp (ignores the ~20% oldest outliers)
+            cursor.execute(
+                "SELECT fetch_timestamp FROM current_stock_data "
+                "WHERE current_price IS NOT NULL AND fetch_timestamp IS NOT NULL "
+                "ORDER BY fetch_timestamp ASC "
+                "LIMIT 1 OFFSET (SELECT CAST(COUNT(*) * 0.2 AS INTEGER) "
+                "FROM current_stock_data WHERE current_price IS NOT NULL AND fetch_timestamp IS NOT NULL)"
+            )
+            p80_row = cursor.fetchone()
+            health["stock_data"] = {
+                "count": row["cnt"],
+                "oldest": row["oldest"],
+                "newest": row["newest"],
+                "age_hours": _hours_ago(row["oldest"], now),
+                "newest_age_hours": _hours_ago(row["newest"], now),
+                "p80_age_hours": _hours_ago(p80_row["fetch_timestamp"], now) if p80_row else None,
+                "stale_count": stale_row["cnt"],
             }
-        health["models"] = models
-    except Exception as exc:
-        health["models"] = {"error": str(exc)}
-        conn.rollback()
+        except Exception as exc:
+            health["stock_data"] = {"error": str(exc)}
+            conn.rollback()
 
-    # ── SEC data freshness (now in main Postgres DB) ──
-    sec_tables = {
-        "insider": "insider_transactions",
-        "activist": "activist_stakes",
-        "holdings": "fund_holdings",
-    }
-    sec_health = {}
-    for name, table in sec_tables.items():
+        # ── Per-model valuation freshness ──
         try:
-            cursor.execute(f"SELECT COUNT(*) as cnt FROM {table}")
-            count = cursor.fetchone()["cnt"]
-            sec_health[name] = {"exists": True, "rows": count}
+            cursor.execute(
+                "SELECT model_name, COUNT(*) as cnt, "
+                "SUM(CASE WHEN suitable THEN 1 ELSE 0 END) as ok_cnt, "
+                "SUM(CASE WHEN NOT suitable THEN 1 ELSE 0 END) as fail_cnt, "
+                "MIN(timestamp) as oldest, MAX(timestamp) as newest "
+                "FROM valuation_results GROUP BY model_name"
+            )
+            rows = cursor.fetchall()
+            models = {}
+            for r in rows:
+                models[r["model_name"]] = {
+                    "total": r["cnt"],
+                    "successful": r["ok_cnt"],
+                    "failed": r["fail_cnt"],
+                    "oldest": r["oldest"],
+                    "newest": r["newest"],
+                    "age_hours": _hours_ago(r["oldest"], now),
+                    "newest_age_hours": _hours_ago(r["newest"], now),
+                }
+            health["models"] = models
         except Exception as exc:
-            sec_health[name] = {"exists": False, "error": str(exc)}
+            health["models"] = {"error": str(exc)}
             conn.rollback()
-    health["sec_data"] = sec_health
 
-    # ── Database size (PostgreSQL) ──
-    try:
-        cursor.execute("SELECT pg_database_size('invest')")
-        size_bytes = cursor.fetchone()["pg_database_size"]
-        health["db_size_mb"] = round(size_bytes / (1024 * 1024), 1)
-    except Exception as exc:
-        health["db_size_mb"] = None
-        conn.rollback()
+        # ── SEC data freshness (now in main Postgres DB) ──
+        sec_tables = {
+            "insider": "insider_transactions",
+            "activist": "activist_stakes",
+            "holdings": "fund_holdings",
+        }
+        sec_health = {}
+        for name, table in sec_tables.items():
+            try:
+                cursor.execute(f"SELECT COUNT(*) as cnt FROM {table}")
+                count = cursor.fetchone()["cnt"]
+                sec_health[name] = {"exists": True, "rows": count}
+            except Exception as exc:
+                sec_health[name] = {"exists": False, "error": str(exc)}
+                conn.rollback()
+        health["sec_data"] = sec_health
 
-    # ── Recent errors (last 20 failed valuations) ──
-    try:
-        cursor.execute(
-            "SELECT ticker, model_name, error_message, failure_reason, timestamp "
-            "FROM valuation_results WHERE NOT suitable AND error_message IS NOT NULL "
-            "ORDER BY timestamp DESC LIMIT 20"
-        )
-        rows = cursor.fetchall()
-        health["recent_errors"] = [dict(r) for r in rows]
-    except Exception as exc:
-        health["recent_errors"] = {"error": str(exc)}
-        conn.rollback()
+        # ── Database size (PostgreSQL) ──
+        try:
+            cursor.execute("SELECT pg_database_size('invest')")
+            size_bytes = cursor.fetchone()["pg_database_size"]
+            health["db_size_mb"] = round(size_bytes / (1024 * 1024), 1)
+        except Exception as exc:
+            health["db_size_mb"] = None
+            conn.rollback()
+
+        # ── Recent errors (last 20 failed valuations) ──
+        try:
+            cursor.execute(
+                "SELECT ticker, model_name, error_message, failure_reason, timestamp "
+                "FROM valuation_results WHERE NOT suitable AND error_message IS NOT NULL "
+                "ORDER BY timestamp DESC LIMIT 20"
+            )
+            rows = cursor.fetchall()
+            health["recent_errors"] = [dict(r) for r in rows]
+        except Exception as exc:
+            health["recent_errors"] = {"error": str(exc)}
+            conn.rollback()
 
-    conn.close()
     return health
 
 
@@ -501,7 +497,7 @@ async def feed_index(request: Request) -> HTMLResponse:
     policy_markets: list = []
     try:
         from invest.data.polymarket_db import get_active_markets
-        conn = get_connection()
+        conn = get_pooled_connection()
         try:
             policy_markets = get_active_markets(conn, limit=12, sort_by_24h_move=True)
         finally:
@@ -548,6 +544,11 @@ async def api_health(request: Request) -> JSONResponse:
     return JSONResponse(_json_safe(health))
 
 
+async def api_db_pool(request: Request) -> JSONResponse:
+    """Return connection-pool occupancy and checkout/wait metrics."""
+    return JSONResponse(_json_safe(pool_stats()))
+
+
 async def api_update_start(request: Request) -> JSONResponse:
     """Start an update process."""
     body = {}
@@ -585,66 +586,62 @@ async def api_alarm_create(request: Request) -> JSONResponse:
     if not ticker or condition not in ("above", "below") or not isinstance(target_price, (int, float)):
         return JSONResponse({"ok": False, "error": "Invalid parameters"}, status_code=400)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO price_alarms (ticker, condition, target_price) VALUES (%s, %s, %s) RETURNING id",
-        (ticker, condition, target_price),
-    )
-    alarm_id = cursor.fetchone()[0]
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO price_alarms (ticker, condition, target_price) VALUES (%s, %s, %s) RETURNING id",
+            (ticker, condition, target_price),
+        )
+        alarm_id = cursor.fetchone()[0]
+        conn.commit()
     return JSONResponse({"ok": True, "id": alarm_id})
 
 
 async def api_alarm_list(request: Request) -> JSONResponse:
     """List alarms, optionally filtered by ticker."""
     ticker = request.query_params.get("ticker")
-    conn = get_connection(dict_cursor=True)
-    cursor = conn.cursor()
-    if ticker:
-        cursor.execute(
-            "SELECT * FROM price_alarms WHERE ticker = %s ORDER BY active DESC, created_at DESC",
-            (ticker.upper(),),
-        )
-    else:
-        cursor.execute(
-            "SELECT * FROM price_alarms ORDER BY active DESC, created_at DESC"
-        )
-    rows = cursor.fetchall()
-    conn.close()
+    with pooled_connection(dict_cursor=True) as conn:
+        cursor = conn.cursor()
+        if ticker:
+            cursor.execute(
+                "SELECT * FROM price_alarms WHERE ticker = %s ORDER BY active DESC, created_at DESC",
+                (ticker.upper(),),
+            )
+        else:
+            cursor.execute(
+                "SELECT * FROM price_alarms ORDER BY active DESC, created_at DESC"
+            )
+        rows = cursor.fetchall()
     return JSONResponse(_json_safe({"ok": True, "alarms": [dict(r) for r in rows]}))
 
 
 async def api_alarm_delete(request: Request) -> JSONResponse:
     """Delete an alarm by id."""
     alarm_id = request.path_params["alarm_id"]
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM price_alarms WHERE id = %s", (alarm_id,))
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM price_alarms WHERE id = %s", (alarm_id,))
+        conn.commit()
     return JSONResponse({"ok": True})
 
 
 async def api_alarm_triggered(request: Request) -> JSONResponse:
     """Return alarms triggered since a given timestamp."""
     since = request.query_params.get("since")
-    conn = get_connection(dict_cursor=True)
-    cursor = conn.cursor()
-    if since:
-        cursor.execute(
-            "SELECT * FROM price_alarms WHERE triggered_at IS NOT NULL AND triggered_at > %s "
-            "ORDER BY triggered_at DESC",
-            (since,),
-        )
-    else:
-        cursor.execute(
-            "SELECT * FROM price_alarms WHERE triggered_at IS NOT NULL AND active = 0 "
-            "ORDER BY triggered_at DESC LIMIT 20"
-        )
-    rows = cursor.fetchall()
-    conn.close()
+    with pooled_connection(dict_cursor=True) as conn:
+        cursor = conn.cursor()
+        if since:
+            cursor.execute(
+                "SELECT * FROM price_alarms WHERE triggered_at IS NOT NULL AND triggered_at > %s "
+                "ORDER BY triggered_at DESC",
+                (since,),
+            )
+        else:
+            cursor.execute(
+                "SELECT * FROM price_alarms WHERE triggered_at IS NOT NULL AND active = 0 "
+                "ORDER BY triggered_at DESC LIMIT 20"
+            )
+        rows = cursor.fetchall()
     return JSONResponse(_json_safe({"ok": True, "triggered": [dict(r) for r in rows]}))
 
 
@@ -660,46 +657,43 @@ async def api_reminder_create(request: Request) -> JSONResponse:
     if not message or not due_date:
         return JSONResponse({"ok": False, "error": "message and due_date required"}, status_code=400)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO reminders (ticker, message, due_date) VALUES (%s, %s, %s) RETURNING id",
-        (ticker, message, due_date),
-    )
-    reminder_id = cursor.fetchone()[0]
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO reminders (ticker, message, due_date) VALUES (%s, %s, %s) RETURNING id",
+            (ticker, message, due_date),
+        )
+        reminder_id = cursor.fetchone()[0]
+        conn.commit()
     return JSONResponse({"ok": True, "id": reminder_id})
 
 
 async def api_reminder_list(request: Request) -> JSONResponse:
     """List reminders, optionally filtered by ticker."""
     ticker = request.query_params.get("ticker")
-    conn = get_connection(dict_cursor=True)
-    cursor = conn.cursor()
-    if ticker:
-        cursor.execute(
-            "SELECT * FROM reminders WHERE ticker = %s ORDER BY active DESC, due_date ASC",
-            (ticker.upper(),),
-        )
-    else:
-        cursor.execute("SELECT * FROM reminders ORDER BY active DESC, due_date ASC")
-    rows = cursor.fetchall()
-    conn.close()
+    with pooled_connection(dict_cursor=True) as conn:
+        cursor = conn.cursor()
+        if ticker:
+            cursor.execute(
+                "SELECT * FROM reminders WHERE ticker = %s ORDER BY active DESC, due_date ASC",
+                (ticker.upper(),),
+            )
+        else:
+            cursor.execute("SELECT * FROM reminders ORDER BY active DESC, due_date ASC")
+        rows = cursor.fetchall()
     return JSONResponse(_json_safe({"ok": True, "reminders": [dict(r) for r in rows]}))
 
 
 async def api_reminder_due(request: Request) -> JSONResponse:
     """Return active reminders where due_date <= today."""
     today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    conn = get_connection(dict_cursor=True)
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT * FROM reminders WHERE active = 1 AND due_date <= %s ORDER BY due_date ASC",
-        (today,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    with pooled_connection(dict_cursor=True) as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT * FROM reminders WHERE active = 1 AND due_date <= %s ORDER BY due_date ASC",
+            (today,),
+        )
+        rows = cursor.fetchall()
     return JSONResponse(_json_safe({"ok": True, "reminders": [dict(r) for r in rows]}))
 
 
@@ -707,25 +701,23 @@ async def api_reminder_acknowledge(request: Request) -> JSONResponse:
     """Acknowledge (dismiss) a reminder."""
     reminder_id = request.path_params["reminder_id"]
     now = _now_iso()
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE reminders SET acknowledged_at = %s, active = 0 WHERE id = %s",
-        (now, reminder_id),
-    )
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "UPDATE reminders SET acknowledged_at = %s, active = 0 WHERE id = %s",
+            (now, reminder_id),
+        )
+        conn.commit()
     return JSONResponse({"ok": True})
 
 
 async def api_reminder_delete(request: Request) -> JSONResponse:
     """Permanently delete a reminder."""
     reminder_id = request.path_params["reminder_id"]
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM reminders WHERE id = %s", (reminder_id,))
-    conn.commit()
-    conn.close()
+    with pooled_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM reminders WHERE id = %s", (reminder_id,))
+        conn.commit()
     return JSONResponse({"ok": True})
 
 
@@ -739,7 +731,7 @@ async def api_insider_history(request: Request) -> JSONResponse:
     person) from discretionary open-market sells.
     """
     ticker = request.path_params["ticker"].upper()
-    conn = get_connection()
+    conn = get_pooled_connection()
     cursor = conn.cursor()
     try:
         # Get open-market transactions
@@ -810,6 +802,64 @@ async def api_insider_history(request: Request) -> JSONResponse:
     })
 
 
+# ── Sensitivity grid API ─────────────────────────────────────────────────
+
+SENSITIVITY_MODELS = ("dcf", "multi_stage_dcf", "growth_dcf", "rim")
+_sensitivity_registry = None
+
+
+def _sensitivity_grid(model_name: str, ticker: str, x_axis: str | None, y_axis: str | None) -> dict | None:
+    """Fair-value heatmap data from the DB row; one vectorized model call.
+
+    Returns None when the ticker has no stock data in the database.
+    """
+    global _sensitivity_registry
+    if _sensitivity_registry is None:
+        from invest.valuation.model_registry import ModelRegistry
+        _sensitivity_registry = ModelRegistry()
+
+    model = _sensitivity_registry.get_model(model_name)
+    default_y, default_x = model.sensitivity_parameters[:2]
+    y_axis, x_axis = y_axis or default_y, x_axis or default_x
+    if x_axis == y_axis:
+        raise ValueError(f"x and y must be different inputs (both are {x_axis!r})")
+
+    data = StockDataReader().get_model_data(ticker)
+    if data is None:
+        return None
+    return _sensitivity_registry.sensitivity_grid(
+        model_name, ticker, {y_axis: None, x_axis: None}, data=data,
+    ).to_dict()
+
+
+async def api_sensitivity(request: Request) -> JSONResponse:
+    """Return a fair-value grid (rows = y axis, columns = x axis) for a ticker.
+
+    Query params: ``model`` (default dcf), ``x`` and ``y`` (two different
+    model inputs, default the model's usual pair, e.g. WACC rows × terminal
+    growth columns). Valued from the database, like the rest of the dashboard.
+    """
+    from starlette.concurrency import run_in_threadpool
+
+    _touch_activity()
+    ticker = request.path_params["ticker"].upper()
+    model_name = request.query_params.get("model", "dcf")
+    if model_name not in SENSITIVITY_MODELS:
+        return JSONResponse({"ok": False, "error": f"Unsupported model: {model_name}"}, status_code=400)
+    try:
+        grid = await run_in_threadpool(
+            _sensitivity_grid, model_name, ticker, request.query_params.get("x"), request.query_params.get("y"),
+        )
+    except ValueError as e:
+        return JSONResponse({"ok": False, "error": str(e)}, status_code=400)
+    except Exception as e:
+        logger.info(f"Sensitivity grid failed for {ticker} {model_name}: {e}")
+        return JSONResponse({"ok": False, "ticker": ticker, "error": str(e)})
+    if grid is None:
+        return JSONResponse({"ok": False, "ticker": ticker, "error": "No stock data in database"}, status_code=404)
+    return JSONResponse({"ok": True, **grid})
+
+
 # ── Notes (company .md files) ────────────────────────────────────────────
 
 NOTES_DIR = REPO_ROOT / "notes" / "companies"
@@ -919,6 +969,7 @@ app = Starlette(
         Route("/feed", feed_index),
         Route("/api/stocks", api_stocks),
         Route("/api/health", api_health),
+        Route("/api/db/pool", api_db_pool),
         Route("/api/update", api_update_start, methods=["POST"]),
         Route("/api/update/status", api_update_status),
         Route("/api/update/cancel", api_update_cancel, methods=["POST"]),
@@ -932,6 +983,7 @@ app = Starlette(
         Route("/api/reminders/{reminder_id:int}/acknowledge", api_reminder_acknowledge, methods=["POST"]),
         Route("/api/reminders/{reminder_id:int}", api_reminder_delete, methods=["DELETE"]),
         Route("/api/insider/{ticker}", api_insider_history),
+        Route("/api/sensitivity/{ticker}", api_sensitivity),
         Route("/api/notes/{ticker}", api_notes),
     ],
 )
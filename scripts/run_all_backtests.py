@@ -3,13 +3,20 @@
 Run all backtest strategies and generate comparison report.
 """
 
+import argparse
 import logging
-import subprocess
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'models'))
+
+from backtesting.core.sweep import run_variants
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,85 +54,29 @@ BACKTEST_CONFIGS = [
 ]
 
 
-def run_backtest(config_path: str) -> dict:
-    """
-    Run a single backtest.
-
-    Parameters
-    ----------
-    config_path : str
-        Path to YAML config file
-
-    Returns
-    -------
-    dict
-        Backtest results summary
-    """
-    logger.info(f'Running backtest: {config_path}')
-
-    cmd = [
-        'uv', 'run', 'python',
-        'models/backtesting/run_backtest.py',
-        config_path,
-        '--output-dir', 'models/backtesting/reports'
-    ]
-
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            cwd=Path(__file__).parent.parent  # repo root
-        )
-
-        logger.info(f'✅ Completed: {config_path}')
-        return {'status': 'success', 'output': result.stdout}
-
-    except subprocess.CalledProcessError as e:
-        logger.error(f'❌ Failed: {config_path}')
-        logger.error(f'Error: {e.stderr}')
-        return {'status': 'failed', 'error': str(e)}
-
-
-def parse_backtest_results(report_dir: Path) -> pd.DataFrame:
+def run_backtests(workers: int, report_dir: Path) -> pd.DataFrame:
     """
-    Parse backtest results from CSV files.
+    Run every configured backtest over one shared, preloaded price panel.
 
     Parameters
     ----------
+    workers : int
+        Worker processes
     report_dir : Path
-        Directory containing backtest report CSV files
+        Directory for each backtest's detailed CSV reports
 
     Returns
     -------
     pd.DataFrame
-        Summary of all backtest results
+        One summary row per backtest
     """
-    results = []
-
-    # Find all summary CSV files
-    summary_files = sorted(report_dir.glob('*_summary.csv'))
-
-    for file in summary_files:
-        try:
-            # Read summary data
-            pd.read_csv(file)
-
-            # Extract strategy name from filename
-            strategy_name = file.stem.replace('_summary', '').replace('_' + file.stem.split('_')[-1], '')
-
-            # Get key metrics (assuming standard format)
-            # You'll need to adjust this based on actual CSV format
-            results.append({
-                'Strategy': strategy_name,
-                'File': file.name,
-            })
+    variants = []
+    for config in BACKTEST_CONFIGS:
+        with open(REPO_ROOT / config['config']) as f:
+            variants.append((config['name'], yaml.safe_load(f)))
 
-        except Exception as e:
-            logger.warning(f'Could not parse {file}: {e}')
-
-    return pd.DataFrame(results)
+    results = run_variants(variants, workers=workers, output_dir=str(report_dir))
+    return results.rename(columns={'variant': 'Strategy'})
 
 
 def generate_comparison_report(results: pd.DataFrame) -> str:
@@ -196,18 +147,25 @@ Look for highest percentage of positive years
 
 def main():
     """Run all backtests and generate comparison."""
+    parser = argparse.ArgumentParser(description='Run all backtests and compare them')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes (default: 0 = one per backtest, up to all cores)',
+    )
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
 
     logger.info('='*60)
     logger.info('BACKTEST COMPARISON RUNNER')
     logger.info('='*60)
 
-    repo_root = Path(__file__).parent.parent
-
     # Check if model files exist
     models_to_check = [
-        repo_root / 'models' / 'neural_network' / 'training' / 'gbm_model_1y.txt',
-        repo_root / 'models' / 'neural_network' / 'training' / 'gbm_lite_model_1y.txt',
-        repo_root / 'models' / 'neural_network' / 'training' / 'gbm_opportunistic_model_3y.txt',
+        REPO_ROOT / 'models' / 'neural_network' / 'training' / 'gbm_model_1y.txt',
+        REPO_ROOT / 'models' / 'neural_network' / 'training' / 'gbm_lite_model_1y.txt',
+        REPO_ROOT / 'models' / 'neural_network' / 'training' / 'gbm_opportunistic_model_3y.txt',
     ]
 
     missing_models = [m for m in models_to_check if not m.exists()]
@@ -221,34 +179,22 @@ def main():
     logger.info('✅ All required model files found')
     logger.info(f'\nRunning {len(BACKTEST_CONFIGS)} backtests...\n')
 
-    # Run all backtests
-    for i, config in enumerate(BACKTEST_CONFIGS, 1):
-        logger.info(f'[{i}/{len(BACKTEST_CONFIGS)}] {config["name"]}')
-        result = run_backtest(config['config'])
-
-        if result['status'] == 'failed':
-            logger.error('Backtest failed. Check logs above.')
-            # Continue with other backtests even if one fails
-            continue
-
-        print()  # Blank line between runs
-
-    # Parse results
-    logger.info('\n' + '='*60)
-    logger.info('PARSING RESULTS')
-    logger.info('='*60)
-
-    report_dir = repo_root / 'models' / 'backtesting' / 'reports'
-    results_df = parse_backtest_results(report_dir)
+    # Model paths in the configs are relative to the repo root
+    os.chdir(REPO_ROOT)
+    report_dir = REPO_ROOT / 'models' / 'backtesting' / 'reports'
+    results_df = run_backtests(workers, report_dir)
 
-    logger.info(f'\nFound {len(results_df)} result files')
+    for _, row in results_df[results_df['status'] != 'success'].iterrows():
+        logger.error(f'❌ Failed: {row["Strategy"]}: {row.get("error")}')
 
     # Generate comparison report
     report = generate_comparison_report(results_df)
 
     # Save report
-    report_path = report_dir / f'comparison_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md'
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    report_path = report_dir / f'comparison_report_{stamp}.md'
     report_path.write_text(report)
+    results_df.to_csv(report_dir / f'comparison_{stamp}.csv', index=False)
 
     logger.info(f'\n✅ Comparison report saved to: {report_path}')
 
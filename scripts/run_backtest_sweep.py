@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Run a backtest config over a parameter grid and write one comparison table.
+
+All variants share a single preloaded price panel and run on a process pool.
+
+Usage:
+    uv run python scripts/run_backtest_sweep.py models/backtesting/configs/gbm_smoke_test.yaml \\
+        --grid max_positions=10,20,50 \\
+        --grid rebalance_frequency=monthly,quarterly \\
+        --grid strategy.selection_method=top_decile,top_quintile \\
+        --workers 8
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / 'models'))
+
+from backtesting.core.sweep import expand_grid, run_variants
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_grid(specs: List[str]) -> Dict[str, List[Any]]:
+    """
+    Parse ``key=v1,v2,...`` grid specs; values are read as YAML scalars.
+
+    Parameters
+    ----------
+    specs : List[str]
+        Grid specs from the command line
+
+    Returns
+    -------
+    Dict[str, List[Any]]
+        Parameter -> values
+    """
+    grid: Dict[str, List[Any]] = {}
+    for spec in specs:
+        key, sep, values = spec.partition('=')
+        if not sep or not key or not values:
+            raise ValueError(f'Invalid grid spec {spec!r}, expected key=v1,v2,...')
+        grid[key.strip()] = [yaml.safe_load(v.strip()) for v in values.split(',')]
+    return grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a backtest parameter sweep')
+    parser.add_argument('config', help='Base backtest configuration file')
+    parser.add_argument(
+        '--grid',
+        action='append',
+        default=[],
+        metavar='KEY=V1,V2',
+        help='Parameter values to sweep (repeatable; dotted keys for strategy.*)',
+    )
+    parser.add_argument(
+        '--grid-file',
+        help='YAML file mapping parameters to lists of values (merged with --grid)',
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Worker processes (default: 0 = all cores)',
+    )
+    parser.add_argument('--db-path', help='SQLite database (default: data/stock_data.db)')
+    parser.add_argument(
+        '--output-dir',
+        default='models/backtesting/reports',
+        help='Directory for the comparison table',
+    )
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        base = yaml.safe_load(f)
+
+    grid: Dict[str, List[Any]] = {}
+    if args.grid_file:
+        with open(args.grid_file) as f:
+            grid.update(yaml.safe_load(f) or {})
+    grid.update(parse_grid(args.grid))
+
+    variants = expand_grid(base, grid)
+    workers = args.workers or os.cpu_count() or 1
+    logger.info(f'{len(variants)} variants of {base.get("name", args.config)}, {workers} workers')
+
+    started = datetime.now()
+    results = run_variants(variants, workers=workers, db_path=args.db_path)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"sweep_{base.get('name', 'backtest')}_{started.strftime('%Y%m%d_%H%M%S')}"
+    csv_path = output_dir / f'{stem}.csv'
+    results.to_csv(csv_path, index=False)
+
+    failed = int((results['status'] != 'success').sum())
+    print('\n' + '=' * 60)
+    print(f'SWEEP RESULTS ({len(results)} variants, {failed} failed, {elapsed:.0f}s)')
+    print('=' * 60)
+    ok = results[results['status'] == 'success']
+    if not ok.empty:
+        columns = ['variant', 'total_return', 'annualized_return', 'sharpe_ratio',
+                   'max_drawdown', 'number_of_trades']
+        print(ok.sort_values('sharpe_ratio', ascending=False)[columns].to_string(index=False))
+    print(f'\nComparison table: {csv_path}')
+
+
+if __name__ == '__main__':
+    main()
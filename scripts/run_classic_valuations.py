@@ -7,20 +7,30 @@ This script:
 - Loads stock data from PostgreSQL database
 - Runs classic valuation models (DCF, Enhanced DCF, RIM, Simple Ratios, etc.)
 - Saves predictions to valuation_results table
+
+Stock rows and price windows are bulk-loaded in chunks, models run per ticker
+(optionally in a process pool), and results stream back to this process,
+which batches the upserts and checkpoints the last committed ticker.
+
+Usage:
+    uv run python scripts/run_classic_valuations.py
+    uv run python scripts/run_classic_valuations.py --workers 0   # all cores
+    uv run python scripts/run_classic_valuations.py --resume      # continue an interrupted run
 """
 
+import argparse
 import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
-
-import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root / 'src'))
 
-from invest.data.db import get_connection
+from invest.data.db import get_connection, upsert_rows
 from invest.data.stock_data_reader import StockDataReader
 from invest.valuation.base import ModelNotSuitableError
 from invest.valuation.model_registry import ModelRegistry
@@ -41,69 +51,116 @@ MODELS_TO_RUN = [
 CONFIDENCE_MAP = {'very_high': 0.95, 'high': 0.85, 'medium': 0.70, 'low': 0.50, 'very_low': 0.30}
 
 
+# Tickers whose results are buffered before one batched write + commit
+FLUSH_EVERY = 50
+
+# Tickers bulk-loaded (stock rows + price windows) per round of queries
+PRELOAD_CHUNK = 500
+
+# Last committed ticker of an interrupted run (removed when a run completes)
+CHECKPOINT_PATH = project_root / 'data' / 'classic_valuations_checkpoint.json'
+
+# Market-input settings shared by the per-ticker and bulk loaders
+MARKET_INPUT_KWARGS = dict(min_price_points=252, max_price_age_days=30, max_rate_age_days=30)
+
+MISSING_DATA_RESULT = {
+    'suitable': False,
+    'error': 'Stock data not found in database',
+    'reason': 'Missing stock data'
+}
+
+_SUCCESS_COLUMNS = (
+    'ticker', 'model_name', 'fair_value', 'current_price',
+    'margin_of_safety', 'upside_pct', 'suitable', 'confidence', 'details_json',
+)
+_FAILURE_COLUMNS = ('ticker', 'model_name', 'suitable', 'error_message', 'failure_reason')
+
+
 def save_to_database(conn, ticker: str, model_name: str, result: dict):
     """Save valuation result to valuation_results table."""
+    save_results_to_database(conn, [(ticker, model_name, result)])
 
-    cursor = conn.cursor()
-
-    if result.get('suitable'):
-        # Successful valuation
-        details_json = json.dumps(result.get('details', {}))
-
-        cursor.execute('''
-            INSERT INTO valuation_results (
-                ticker, model_name, fair_value, current_price,
-                margin_of_safety, upside_pct, suitable,
-                confidence, details_json
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (ticker, model_name) DO UPDATE SET
-                fair_value = EXCLUDED.fair_value,
-                current_price = EXCLUDED.current_price,
-                margin_of_safety = EXCLUDED.margin_of_safety,
-                upside_pct = EXCLUDED.upside_pct,
-                suitable = EXCLUDED.suitable,
-                confidence = EXCLUDED.confidence,
-                details_json = EXCLUDED.details_json,
-                timestamp = NOW()
-        ''', (
-            ticker,
-            model_name,
-            result['fair_value'],
-            result['current_price'],
-            result['margin_of_safety'],
-            result['upside'],
-            True,
-            CONFIDENCE_MAP.get(result.get('confidence', 'medium'), 0.70),
-            details_json
-        ))
-    else:
-        # Failed valuation
-        cursor.execute('''
-            INSERT INTO valuation_results (
-                ticker, model_name, suitable, error_message, failure_reason
-            ) VALUES (%s, %s, %s, %s, %s)
-            ON CONFLICT (ticker, model_name) DO UPDATE SET
-                suitable = EXCLUDED.suitable,
-                error_message = EXCLUDED.error_message,
-                failure_reason = EXCLUDED.failure_reason,
-                fair_value = NULL,
-                current_price = NULL,
-                margin_of_safety = NULL,
-                upside_pct = NULL,
-                confidence = NULL,
-                details_json = NULL,
-                timestamp = NOW()
-        ''', (
-            ticker,
-            model_name,
-            False,
-            result.get('error', 'Unknown error'),
-            result.get('reason', 'Unknown reason')
-        ))
 
+def save_results_to_database(conn, results: List[Tuple[str, str, dict]]):
+    """
+    Save many (ticker, model_name, result) valuations in one transaction.
+
+    Successful and failed valuations are written as two multi-row upserts
+    (a failure also clears the previous fair value), then committed once.
+    """
+    success_rows = []
+    failure_rows = []
+    for ticker, model_name, result in results:
+        if result.get('suitable'):
+            success_rows.append((
+                ticker,
+                model_name,
+                result['fair_value'],
+                result['current_price'],
+                result['margin_of_safety'],
+                result['upside'],
+                True,
+                CONFIDENCE_MAP.get(result.get('confidence', 'medium'), 0.70),
+                json.dumps(result.get('details', {})),
+            ))
+        else:
+            failure_rows.append((
+                ticker,
+                model_name,
+                False,
+                result.get('error', 'Unknown error'),
+                result.get('reason', 'Unknown reason'),
+            ))
+
+    upsert_rows(
+        conn, 'valuation_results', _SUCCESS_COLUMNS, success_rows,
+        conflict=('ticker', 'model_name'),
+        update=_SUCCESS_COLUMNS[2:],
+        set_sql={'timestamp': 'NOW()'},
+    )
+    upsert_rows(
+        conn, 'valuation_results', _FAILURE_COLUMNS, failure_rows,
+        conflict=('ticker', 'model_name'),
+        update=_FAILURE_COLUMNS[2:],
+        set_sql={
+            'fair_value': 'NULL',
+            'current_price': 'NULL',
+            'margin_of_safety': 'NULL',
+            'upside_pct': 'NULL',
+            'confidence': 'NULL',
+            'details_json': 'NULL',
+            'timestamp': 'NOW()',
+        },
+    )
     conn.commit()
 
 
+def flush_results(conn, pending: List[Tuple[str, str, dict]]) -> List[Tuple[str, str, dict]]:
+    """
+    Write buffered results; on a batch failure retry them one by one.
+
+    Returns the rows that could not be saved, in buffer (ticker) order.
+    """
+    failed: List[Tuple[str, str, dict]] = []
+    if not pending:
+        return failed
+    try:
+        save_results_to_database(conn, pending)
+    except Exception as e:
+        conn.rollback()
+        print(f'   Batch write failed ({e}); retrying {len(pending)} rows individually')
+        for row in pending:
+            ticker, db_name, result = row
+            try:
+                save_to_database(conn, ticker, db_name, result)
+            except Exception as row_error:
+                conn.rollback()
+                print(f'   {ticker} - {db_name}: could not save - {row_error}')
+                failed.append(row)
+    pending.clear()
+    return failed
+
+
 def load_stock_data(ticker: str, reader: StockDataReader) -> Optional[dict]:
     """
     Load stock data from database and convert to model-compatible format.
@@ -114,54 +171,7 @@ def load_stock_data(ticker: str, reader: StockDataReader) -> Optional[dict]:
     cache_data = reader.get_stock_data(ticker)
     if not cache_data:
         return None
-
-    # Convert JSON financial statements back to DataFrames
-    # Models expect: {info: dict, cashflow: DataFrame, balance_sheet: DataFrame, income: DataFrame}
-    # StockDataReader already merges financials into info, so just use it directly
-    stock_data = {
-        'info': cache_data.get('info', {}),
-        'market_data': reader.get_market_inputs(
-            ticker=ticker,
-            min_price_points=252,
-            max_price_age_days=30,
-            max_rate_age_days=30,
-        ),
-    }
-
-    # Convert cashflow from list of records to DataFrame
-    # yfinance format: rows=metrics (Free Cash Flow, etc), columns=dates (timestamps)
-    if 'cashflow' in cache_data and cache_data['cashflow']:
-        try:
-            df = pd.DataFrame(cache_data['cashflow'])
-            # Set the metric name column as index
-            if 'index' in df.columns:
-                df = df.set_index('index')
-            # No transpose needed - orient=records already has correct orientation
-            stock_data['cashflow'] = df
-        except Exception as e:
-            print(f'Warning: Could not convert cashflow for {ticker}: {e}')
-
-    # Convert balance_sheet from list of records to DataFrame
-    if 'balance_sheet' in cache_data and cache_data['balance_sheet']:
-        try:
-            df = pd.DataFrame(cache_data['balance_sheet'])
-            if 'index' in df.columns:
-                df = df.set_index('index')
-            stock_data['balance_sheet'] = df
-        except Exception as e:
-            print(f'Warning: Could not convert balance_sheet for {ticker}: {e}')
-
-    # Convert income statement from list of records to DataFrame
-    if 'income' in cache_data and cache_data['income']:
-        try:
-            df = pd.DataFrame(cache_data['income'])
-            if 'index' in df.columns:
-                df = df.set_index('index')
-            stock_data['income'] = df
-        except Exception as e:
-            print(f'Warning: Could not convert income for {ticker}: {e}')
-
-    return stock_data
+    return StockDataReader.to_model_data(cache_data, reader.get_market_inputs(ticker=ticker, **MARKET_INPUT_KWARGS))
 
 
 def run_valuation(registry: ModelRegistry, registry_name: str, ticker: str, stock_data: dict) -> Optional[dict]:
@@ -236,12 +246,132 @@ def run_valuation(registry: ModelRegistry, registry_name: str, ticker: str, stoc
         }
 
 
+def preload_universe(
+    reader: StockDataReader, tickers: List[str], conn
+) -> Dict[str, Tuple[dict, dict]]:
+    """
+    Bulk-load ``{ticker: (cache_data, market_data)}`` for a chunk of tickers.
+
+    One current_stock_data query, one query per signal family, one windowed
+    price_history query and one macro-rate lookup, whatever the chunk size.
+    Tickers without a current_stock_data row are absent.
+    """
+    cache = reader.get_stock_data_bulk(tickers, conn=conn)
+    limit = max(MARKET_INPUT_KWARGS['min_price_points'] + 50, 600)
+    prices = reader.get_recent_price_closes_bulk(list(cache), limit=limit, conn=conn)
+    macro = reader.get_latest_macro_rate('risk_free_rate')
+    return {
+        ticker: (data, StockDataReader.build_market_inputs(prices[ticker], macro, **MARKET_INPUT_KWARGS))
+        for ticker, data in cache.items()
+    }
+
+
+# Per-process registry: built once by _init_worker (or main() when serial)
+_registry: Optional[ModelRegistry] = None
+
+
+def _init_worker() -> None:
+    global _registry
+    _registry = ModelRegistry()
+
+
+def value_ticker(item: Tuple[str, Optional[dict], Optional[dict]]) -> Tuple[str, bool, List[Tuple[str, dict]]]:
+    """
+    Run every model in MODELS_TO_RUN on one preloaded ticker.
+
+    Module-level so it can run in a worker process. Returns
+    ``(ticker, found, [(db_name, result), ...])``; ``found`` is False when the
+    ticker had no stock data (every model gets the missing-data result).
+    """
+    ticker, cache_data, market_data = item
+    if not cache_data:
+        return ticker, False, [(db_name, dict(MISSING_DATA_RESULT)) for _, db_name in MODELS_TO_RUN]
+
+    stock_data = StockDataReader.to_model_data(cache_data, market_data)
+    results = []
+    for registry_name, db_name in MODELS_TO_RUN:
+        try:
+            result = run_valuation(_registry, registry_name, ticker, stock_data)
+        except Exception as e:
+            result = {
+                'suitable': False,
+                'error': str(e),
+                'reason': f'Unexpected error: {type(e).__name__}'
+            }
+        results.append((db_name, result))
+    return ticker, True, results
+
+
+def load_checkpoint(path: Path) -> Optional[str]:
+    """Last committed ticker of an interrupted run, or None."""
+    try:
+        return json.loads(path.read_text()).get('last_completed_ticker')
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_checkpoint(path: Path, ticker: str) -> None:
+    """Record ``ticker`` (and everything before it) as committed."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps({'last_completed_ticker': ticker}))
+    tmp.replace(path)
+
+
+def iter_valuations(
+    reader: StockDataReader, tickers: List[str], conn, workers: int
+) -> Iterator[Tuple[str, bool, List[Tuple[str, dict]]]]:
+    """
+    Yield ``value_ticker`` results in ticker order.
+
+    Tickers are preloaded PRELOAD_CHUNK at a time in this process; with
+    workers > 1 each chunk is fanned out to a process pool, and
+    ``Executor.map`` hands results back in submission order so the caller
+    can checkpoint a contiguous prefix.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) if workers > 1 else None
+    try:
+        for start in range(0, len(tickers), PRELOAD_CHUNK):
+            chunk = tickers[start:start + PRELOAD_CHUNK]
+            preloaded = preload_universe(reader, chunk, conn)
+            items = [(t, *preloaded.get(t, (None, None))) for t in chunk]
+            if pool is None:
+                yield from map(value_ticker, items)
+            else:
+                chunksize = max(1, len(items) // (workers * 4))
+                yield from pool.map(value_ticker, items, chunksize=chunksize)
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
 def main():
     """Run classic valuations on all stocks in database."""
+    parser = argparse.ArgumentParser(description='Run classic valuation models on all stocks')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Valuation processes (default: 1 = in-process, 0 = all cores)',
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip tickers up to the last committed one of an interrupted run',
+    )
+    parser.add_argument(
+        '--checkpoint',
+        type=Path,
+        default=CHECKPOINT_PATH,
+        help=f'Checkpoint file (default: {CHECKPOINT_PATH.relative_to(project_root)})',
+    )
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
 
     print('🚀 Running Classic Valuation Models')
     print('=' * 60)
     print(f'Models: {", ".join(db_name for _, db_name in MODELS_TO_RUN)}')
+    print(f'Workers: {workers}')
     print('=' * 60)
 
     # Initialize stock data reader
@@ -250,73 +380,71 @@ def main():
 
     # Get list of tickers from database
     print('\n📂 Loading tickers from database...')
-    registry = ModelRegistry()
+    global _registry
+    _registry = ModelRegistry()
     conn = get_connection()
     try:
+        # Sorted so a checkpointed prefix is well defined across runs
         query = 'SELECT DISTINCT ticker FROM current_stock_data WHERE current_price IS NOT NULL'
         cursor = conn.cursor()
         cursor.execute(query)
-        tickers = [row[0] for row in cursor.fetchall()]
+        # Sorted in Python, not by the DB collation, so the resume filter's
+        # string comparison agrees with the processing order
+        tickers = sorted(row[0] for row in cursor.fetchall())
         print(f'   Found {len(tickers)} tickers with price data')
 
+        if args.resume:
+            last_completed = load_checkpoint(args.checkpoint)
+            if last_completed:
+                tickers = [t for t in tickers if t > last_completed]
+                print(f'   Resuming after {last_completed}: {len(tickers)} tickers left')
+
         # Statistics
         stats = {db_name: {'success': 0, 'unsuitable': 0, 'error': 0, 'cache_miss': 0} for _, db_name in MODELS_TO_RUN}
 
         # Run valuations on each stock
         print('\n🔄 Running valuations...')
 
-        for i, ticker in enumerate(tickers):
-            # Load stock data from database
-            stock_data = load_stock_data(ticker, reader)
+        # Results are buffered and written every FLUSH_EVERY tickers
+        pending: List[Tuple[str, str, dict]] = []
+        # Rows that could not be saved; the checkpoint never moves past the
+        # first of them, so a resumed run values that ticker again
+        unsaved: List[Tuple[str, str, dict]] = []
 
-            if not stock_data:
-                # Save "no data" failure for all models
-                for _, db_name in MODELS_TO_RUN:
+        for i, (ticker, found, results) in enumerate(iter_valuations(reader, tickers, conn, workers)):
+            for db_name, result in results:
+                # Queue for the next batched write
+                pending.append((ticker, db_name, result))
+
+                if not found:
                     stats[db_name]['cache_miss'] += 1
-                    error_result = {
-                        'suitable': False,
-                        'error': 'Stock data not found in database',
-                        'reason': 'Missing stock data'
-                    }
-                    save_to_database(conn, ticker, db_name, error_result)
-                continue
-
-            # Run each model
-            for registry_name, db_name in MODELS_TO_RUN:
-                try:
-                    result = run_valuation(registry, registry_name, ticker, stock_data)
-
-                    # Save to database
-                    save_to_database(conn, ticker, db_name, result)
-
-                    if result.get('suitable', False):
-                        stats[db_name]['success'] += 1
+                elif result.get('suitable', False):
+                    stats[db_name]['success'] += 1
+                else:
+                    if 'error' in result:
+                        stats[db_name]['error'] += 1
                     else:
-                        if 'error' in result:
-                            stats[db_name]['error'] += 1
-                        else:
-                            stats[db_name]['unsuitable'] += 1
-
-                except Exception as e:
-                    conn.rollback()
-                    print(f'   [{i+1}/{len(tickers)}] {ticker} - {db_name}: Unexpected error - {str(e)}')
-                    error_result = {
-                        'suitable': False,
-                        'error': str(e),
-                        'reason': f'Unexpected error: {type(e).__name__}'
-                    }
-                    try:
-                        save_to_database(conn, ticker, db_name, error_result)
-                    except Exception:
-                        conn.rollback()
-                    stats[db_name]['error'] += 1
-
-            # Progress update
-            if (i + 1) % 50 == 0:
+                        stats[db_name]['unsuitable'] += 1
+
+            if (i + 1) % FLUSH_EVERY == 0:
+                unsaved += flush_results(conn, pending)
+                if not unsaved:
+                    save_checkpoint(args.checkpoint, ticker)
+
+                # Progress update
                 print(f'   [{i+1}/{len(tickers)}] Processed {ticker}...')
+
+        unsaved += flush_results(conn, pending)
     finally:
         conn.close()
 
+    if unsaved:
+        print(f'\n⚠️  {len(unsaved)} results could not be saved, first for {unsaved[0][0]}; '
+              f'rerun with --resume to retry from there')
+    else:
+        # The run reached the end of the universe: nothing left to resume
+        args.checkpoint.unlink(missing_ok=True)
+
     # Summary
     print('\n✅ Classic valuations complete!')
     print('=' * 60)
@@ -27,7 +27,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent.parent / 'models' / 'neural_network' / 'training'))
 
-from invest.data.db import get_connection, get_engine
+from gbm_feature_engine import normalize_by_date
+from gbm_feature_store import GBMFeatureStore
+
+from invest.data.db import get_connection
 from invest.data.stock_data_reader import StockDataReader
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -113,173 +116,36 @@ def load_gbm_model(model_path: str) -> lgb.Booster:
 
 
 def load_and_engineer_features(
-    db_path: str,
+    variant: str,
     feature_config,
-    training_module
+    training_module,
+    rebuild: bool = False
 ) -> pd.DataFrame:
-    """Load data and engineer features exactly like training."""
-    engine = get_engine()
-
-    # Build query for all required columns
-    history_cols = (
-        ['a.symbol as ticker', 'a.sector', 'fh.snapshot_date', 'fh.id as snapshot_id'] +
-        [f'fh.{col}' for col in (
-            feature_config.FUNDAMENTAL_FEATURES +
-            feature_config.MARKET_FEATURES +
-            feature_config.CASHFLOW_FEATURES
-        )]
-    )
-
-    query = f'''
-        SELECT
-            {', '.join(history_cols)}
-        FROM fundamental_history fh
-        JOIN assets a ON fh.asset_id = a.id
-        WHERE fh.vix IS NOT NULL
-        AND fh.snapshot_date >= CURRENT_DATE - INTERVAL '3 years'
-        ORDER BY a.symbol, fh.snapshot_date
-    '''
-
-    df = pd.read_sql(query, engine)
-    df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
-
-    logger.info(f'Loaded {len(df)} snapshots for feature engineering')
-
-    # Convert all numeric columns to float
-    for col in (feature_config.FUNDAMENTAL_FEATURES +
-                feature_config.MARKET_FEATURES +
-                feature_config.CASHFLOW_FEATURES):
-        df[col] = pd.to_numeric(df[col], errors='coerce')
+    """
+    Latest engineered snapshot per ticker (same features as training).
 
-    # Add price features
+    Features come from the GBM feature store; only snapshots that are new or
+    changed since the last run are engineered.
+    """
     conn = get_connection()
-    df = add_price_features(df, conn, feature_config.PRICE_FEATURES)
-    conn.close()
+    store = GBMFeatureStore(conn, variant, feature_config, training_module)
 
-    # Sort by ticker and date
-    df = df.sort_values(['ticker', 'snapshot_date']).reset_index(drop=True)
-
-    # Create computed features (same as training)
-    logger.info('Creating computed features...')
-    df['log_market_cap'] = np.log(df['market_cap'] + 1e9)
-    df['fcf_yield'] = df['free_cashflow'] / (df['market_cap'] + 1e9)
-    df['ocf_yield'] = df['operating_cashflow'] / (df['market_cap'] + 1e9)
-    df['earnings_yield'] = df['trailing_eps'] / (df['market_cap'] / df['book_value'] + 1e-9)
-
-    # Create lag features
-    df = training_module.create_lag_features(
-        df,
-        feature_config.BASE_FEATURES,
-        lags=feature_config.LAG_PERIODS
+    stats = store.refresh(force=rebuild)
+    logger.info(
+        f'Feature store {store.version}: {stats["snapshots"]} snapshots, '
+        f'{stats["tickers"]} tickers re-engineered ({stats["written"]} rows written)'
     )
-    logger.info(f'Created lag features for {len(feature_config.BASE_FEATURES)} features')
-
-    # Create change features
-    df = training_module.create_change_features(df, feature_config.BASE_FEATURES)
-    logger.info('Created change features')
 
-    # Create rolling features
-    df = training_module.create_rolling_features(
-        df,
-        feature_config.BASE_FEATURES,
-        windows=feature_config.ROLLING_WINDOWS
-    )
-    logger.info('Created rolling features')
-
-    # Add missingness flags
-    for feat in feature_config.BASE_FEATURES:
-        df[f'{feat}_missing'] = df[feat].isna().astype(int)
-
-    logger.info(f'Feature engineering complete: {len(df.columns)} columns')
-
-    # Filter to only LATEST snapshot per ticker
-    latest_df = df.loc[df.groupby('ticker')['snapshot_date'].idxmax()]
+    # Only tickers with a snapshot in the last 3 years
+    since = pd.Timestamp.today().normalize() - pd.DateOffset(years=3)
+    latest_df = store.load(since=since, latest=True)
+    conn.close()
 
-    logger.info(f'Filtered to {len(latest_df)} latest snapshots')
+    logger.info(f'Loaded {len(latest_df)} latest snapshots ({len(latest_df.columns)} columns)')
 
     return latest_df
 
 
-def add_price_features(df: pd.DataFrame, conn, price_features: list) -> pd.DataFrame:
-    """Add price-based features (same as training)."""
-    price_query = '''
-        SELECT
-            fh.id as snapshot_id,
-            ph.date,
-            ph.close,
-            ph.volume
-        FROM fundamental_history fh
-        JOIN assets a ON fh.asset_id = a.id
-        JOIN price_history ph ON a.symbol = ph.ticker
-        ORDER BY fh.id, ph.date
-    '''
-    price_df = pd.read_sql(price_query, get_engine())
-    price_df['date'] = pd.to_datetime(price_df['date'])
-
-    logger.info(f'Loaded {len(price_df)} price history records')
-
-    price_groups = price_df.groupby('snapshot_id')
-
-    def calc_price_features(row):
-        snapshot_id = row['snapshot_id']
-        snapshot_date = row['snapshot_date']
-
-        if snapshot_id not in price_groups.groups:
-            return pd.Series({feat: np.nan for feat in price_features})
-
-        snapshot_prices = price_groups.get_group(snapshot_id)
-        snapshot_prices = snapshot_prices[snapshot_prices['date'] <= snapshot_date].sort_values('date')
-
-        if len(snapshot_prices) >= 21:
-            # Get last 252 trading days (~1 year) or available data
-            recent_prices = snapshot_prices.tail(252)
-            closes = recent_prices['close'].values
-            volumes = recent_prices['volume'].values
-
-            # Calculate returns for multiple periods
-            returns_1m = (closes[-1] - closes[-21]) / closes[-21] if len(closes) >= 21 else 0.0
-            returns_3m = (closes[-1] - closes[-63]) / closes[-63] if len(closes) >= 63 else 0.0
-            returns_6m = (closes[-1] - closes[-126]) / closes[-126] if len(closes) >= 126 else 0.0
-            returns_1y = (closes[-1] - closes[0]) / closes[0] if len(closes) >= 252 else 0.0
-
-            # Calculate volatility (std of daily returns over last 60 days)
-            recent_closes = closes[-60:] if len(closes) >= 60 else closes
-            daily_returns = np.diff(recent_closes) / recent_closes[:-1]
-            volatility = np.std(daily_returns) if len(daily_returns) > 0 else 0.0
-
-            # Calculate volume trend
-            vol_avg = np.mean(volumes)
-            vol_recent = np.mean(volumes[-5:]) if len(volumes) >= 5 else vol_avg
-            volume_trend = (vol_recent - vol_avg) / (vol_avg + 1e-9) if vol_avg > 0 else 0.0
-        else:
-            # If less than 21 days, set features to nan
-            returns_1m = np.nan
-            returns_3m = np.nan
-            returns_6m = np.nan
-            returns_1y = np.nan
-            volatility = np.nan
-            volume_trend = np.nan
-
-        return pd.Series({
-            'returns_1m': returns_1m,
-            'returns_3m': returns_3m,
-            'returns_6m': returns_6m,
-            'returns_1y': returns_1y,
-            'volatility': volatility,
-            'volume_trend': volume_trend
-        })
-
-    price_features_df = df.apply(calc_price_features, axis=1)
-    df = pd.concat([df, price_features_df], axis=1)
-
-    # Fill missing values
-    for feat in price_features:
-        df[feat] = df[feat].fillna(0.0)
-
-    logger.info(f'Added price features: {", ".join(price_features)}')
-    return df
-
-
 def prepare_features(
     df: pd.DataFrame,
     feature_config,
@@ -302,11 +168,7 @@ def prepare_features(
     logger.info(f'Found {len(numeric_features)} numeric features')
 
     # Winsorize and standardize (using current data only)
-    df_norm = df.copy()
-    df_norm = training_module.winsorize_by_date(
-        df_norm, numeric_features, lower_pct=0.01, upper_pct=0.99
-    )
-    df_norm = training_module.standardize_by_date(df_norm, numeric_features)
+    df_norm = normalize_by_date(df, numeric_features, winsorize=(0.01, 0.99))
 
     # Create feature matrix
     feature_cols = numeric_features + feature_config.CATEGORICAL_FEATURES
@@ -436,6 +298,11 @@ Examples:
         required=True,
         help='Prediction horizon'
     )
+    parser.add_argument(
+        '--rebuild-features',
+        action='store_true',
+        help='Re-engineer every snapshot in the feature store, not just new or changed ones'
+    )
     args = parser.parse_args()
 
     # Get model metadata
@@ -454,7 +321,9 @@ Examples:
     model = load_gbm_model(str(model_path))
 
     # Load data and engineer features
-    df = load_and_engineer_features(db_path, feature_config, training_module)
+    df = load_and_engineer_features(
+        args.variant, feature_config, training_module, rebuild=args.rebuild_features
+    )
 
     # Prepare features
     X, feature_cols, df_norm = prepare_features(df, feature_config, training_module)
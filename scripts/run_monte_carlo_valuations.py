@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Run the Monte Carlo DCF on all stocks in database (no yfinance calls).
+
+This script:
+- Gets stock list from current_stock_data table (database is ONLY source)
+- Bulk-loads base metrics from current_stock_data and 2 years of closes from
+  price_history (for the volatility that scales the uncertainty)
+- Simulates fair-value distributions in batches of tickers (optionally in a
+  process pool)
+- Saves the median fair value and the distribution summary (percentiles,
+  confidence intervals, VaR, probability of loss) to valuation_results, so
+  the dashboard and scanner can read them without re-simulating
+
+Usage:
+    uv run python scripts/run_monte_carlo_valuations.py
+    uv run python scripts/run_monte_carlo_valuations.py --workers 0   # all cores
+    uv run python scripts/run_monte_carlo_valuations.py --iterations 20000 --seed 1
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from invest.data.db import get_connection, upsert_rows
+from invest.data.stock_data_reader import StockDataReader
+from invest.probabilistic_dcf import (
+    DEFAULT_ITERATIONS,
+    base_metrics_from_stock_data,
+    calculate_monte_carlo_dcf_batch,
+    distribution_details,
+)
+
+MODEL_NAME = 'monte_carlo_dcf'
+
+# Tickers bulk-loaded (stock rows + price windows) per round of queries
+PRELOAD_CHUNK = 500
+
+# Tickers simulated together (one vectorized batch, one pool task)
+SIMULATION_BATCH = 50
+
+# Trading days of closes for the historical volatility (~2 years)
+VOLATILITY_WINDOW = 504
+
+MISSING_DATA_RESULT = {
+    'suitable': False,
+    'error': 'Stock data not found in database',
+    'reason': 'Missing stock data'
+}
+
+_SUCCESS_COLUMNS = (
+    'ticker', 'model_name', 'fair_value', 'current_price',
+    'margin_of_safety', 'upside_pct', 'suitable', 'details_json',
+)
+_FAILURE_COLUMNS = ('ticker', 'model_name', 'suitable', 'error_message', 'failure_reason')
+
+
+def load_base_metrics(reader: StockDataReader, tickers: List[str], conn) -> Dict[str, dict]:
+    """
+    Bulk-load ``{ticker: base_metrics}`` for a chunk of tickers.
+
+    One current_stock_data load and one windowed price_history query,
+    whatever the chunk size. Tickers without a current_stock_data row are
+    absent.
+    """
+    stock_data = reader.get_stock_data_bulk(tickers, conn=conn)
+    closes = reader.get_recent_price_closes_bulk(list(stock_data), limit=VOLATILITY_WINDOW, conn=conn)
+    return {
+        ticker: base_metrics_from_stock_data(ticker, data, closes[ticker]['closes'])
+        for ticker, data in stock_data.items()
+    }
+
+
+def simulate_batch(batch: Tuple[Dict[str, dict], dict]) -> List[Tuple[str, dict]]:
+    """
+    Simulate a batch of tickers and shape each into a valuation result.
+
+    Module-level so it can run in a worker process. ``batch`` is
+    ``(base_metrics_by_ticker, simulation_kwargs)``.
+    """
+    base_metrics, kwargs = batch
+    simulated = calculate_monte_carlo_dcf_batch(base_metrics, **kwargs)
+
+    results = []
+    for ticker, result in simulated.items():
+        if 'error' in result:
+            results.append((ticker, {
+                'suitable': False,
+                'error': result['error'],
+                'reason': 'Model not suitable for this stock',
+            }))
+            continue
+        current_price = result['current_price']
+        results.append((ticker, {
+            'fair_value': float(result['fair_value']),
+            'current_price': float(current_price),
+            'margin_of_safety': float(result['margin_of_safety_median']),
+            'upside': float((result['fair_value'] / current_price - 1) * 100),
+            'suitable': True,
+            'details': distribution_details(result),
+        }))
+    return results
+
+
+def iter_valuations(reader: StockDataReader, tickers: List[str], conn, workers: int,
+                    simulation_kwargs: dict) -> Iterator[Tuple[str, dict]]:
+    """
+    Yield ``(ticker, result)`` in ticker order.
+
+    Tickers are preloaded PRELOAD_CHUNK at a time in this process and
+    simulated SIMULATION_BATCH at a time, by a process pool when workers > 1.
+    """
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for start in range(0, len(tickers), PRELOAD_CHUNK):
+            chunk = tickers[start:start + PRELOAD_CHUNK]
+            loaded = load_base_metrics(reader, chunk, conn)
+            batches = [
+                ({t: loaded[t] for t in chunk[i:i + SIMULATION_BATCH] if t in loaded}, simulation_kwargs)
+                for i in range(0, len(chunk), SIMULATION_BATCH)
+            ]
+            simulated = {}
+            for results in (map(simulate_batch, batches) if pool is None else pool.map(simulate_batch, batches)):
+                simulated.update(results)
+            for ticker in chunk:
+                yield ticker, simulated.get(ticker, dict(MISSING_DATA_RESULT))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def save_results_to_database(conn, results: List[Tuple[str, dict]]):
+    """
+    Save many (ticker, result) valuations in one transaction.
+
+    Successful and failed valuations are written as two multi-row upserts
+    (a failure also clears the previous fair value), then committed once.
+    """
+    success_rows = []
+    failure_rows = []
+    for ticker, result in results:
+        if result.get('suitable'):
+            success_rows.append((
+                ticker,
+                MODEL_NAME,
+                result['fair_value'],
+                result['current_price'],
+                result['margin_of_safety'],
+                result['upside'],
+                True,
+                json.dumps(result['details']),
+            ))
+        else:
+            failure_rows.append((
+                ticker,
+                MODEL_NAME,
+                False,
+                result.get('error', 'Unknown error'),
+                result.get('reason', 'Unknown reason'),
+            ))
+
+    upsert_rows(
+        conn, 'valuation_results', _SUCCESS_COLUMNS, success_rows,
+        conflict=('ticker', 'model_name'),
+        update=_SUCCESS_COLUMNS[2:],
+        set_sql={'timestamp': 'NOW()', 'confidence': 'NULL'},
+    )
+    upsert_rows(
+        conn, 'valuation_results', _FAILURE_COLUMNS, failure_rows,
+        conflict=('ticker', 'model_name'),
+        update=_FAILURE_COLUMNS[2:],
+        set_sql={
+            'fair_value': 'NULL',
+            'current_price': 'NULL',
+            'margin_of_safety': 'NULL',
+            'upside_pct': 'NULL',
+            'confidence': 'NULL',
+            'details_json': 'NULL',
+            'timestamp': 'NOW()',
+        },
+    )
+    conn.commit()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Run the Monte Carlo DCF on all stocks in database."""
+    parser = argparse.ArgumentParser(description='Run the Monte Carlo DCF on all stocks')
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Simulation processes (default: 1 = in-process, 0 = all cores)',
+    )
+    parser.add_argument('--iterations', type=int, default=DEFAULT_ITERATIONS, help='Scenarios per ticker')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed of the scenarios (default: 0, so unchanged data gives unchanged values)',
+    )
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+    simulation_kwargs = {'iterations': args.iterations, 'seed': args.seed}
+
+    print('🎲 Running Monte Carlo DCF')
+    print('=' * 60)
+    print(f'Iterations: {args.iterations:,} | Seed: {args.seed} | Workers: {workers}')
+    print('=' * 60)
+
+    reader = StockDataReader()
+    conn = get_connection()
+    stats = {'success': 0, 'unsuitable': 0, 'cache_miss': 0}
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT DISTINCT ticker FROM current_stock_data WHERE current_price IS NOT NULL ORDER BY ticker'
+        )
+        tickers = [row[0] for row in cursor.fetchall()]
+        print(f'\n📂 Found {len(tickers)} tickers with price data')
+
+        pending: List[Tuple[str, dict]] = []
+        for i, (ticker, result) in enumerate(iter_valuations(reader, tickers, conn, workers, simulation_kwargs)):
+            pending.append((ticker, result))
+            if result.get('suitable'):
+                stats['success'] += 1
+            elif result.get('reason') == MISSING_DATA_RESULT['reason']:
+                stats['cache_miss'] += 1
+            else:
+                stats['unsuitable'] += 1
+
+            if len(pending) >= SIMULATION_BATCH:
+                save_results_to_database(conn, pending)
+                pending.clear()
+                print(f'   [{i+1}/{len(tickers)}] Processed {ticker}...')
+
+        save_results_to_database(conn, pending)
+    finally:
+        conn.close()
+
+    print('\n✅ Monte Carlo DCF complete!')
+    print(f'Success: {stats["success"]} | Unsuitable: {stats["unsuitable"]} | Cache miss: {stats["cache_miss"]}')
+    print(f'💾 Saved to database: valuation_results table (model_name={MODEL_NAME!r})')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,6 +19,8 @@ Usage:
     uv run python scripts/run_opportunity_scan.py --preview
     uv run python scripts/run_opportunity_scan.py --status
     uv run python scripts/run_opportunity_scan.py --weekly-report
+    uv run python scripts/run_opportunity_scan.py --workers 0   # score on all cores
+    uv run python scripts/run_opportunity_scan.py --vectorized  # NumPy array scoring
 """
 
 from __future__ import annotations
@@ -92,6 +94,17 @@ def main() -> int:
         default=180,
         help='How many days back to look when --source is politician-pass-* (default: 180)',
     )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Scoring processes (default: 1 = serial, 0 = all cores)',
+    )
+    parser.add_argument(
+        '--vectorized',
+        action='store_true',
+        help='Score the universe as NumPy array operations (same scores)',
+    )
     parser.add_argument(
         '--quiet',
         action='store_true',
@@ -99,7 +112,7 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    scanner = OpportunityScanner()
+    scanner = OpportunityScanner(workers=args.workers, vectorized=args.vectorized)
 
     # Parse tickers if provided
     tickers = None
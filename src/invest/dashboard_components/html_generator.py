@@ -169,6 +169,21 @@ class HTMLGenerator:
       </div>
     </div>
 
+    <!-- Sensitivity Heatmap Modal -->
+    <div id="sensitivityModal" class="modal-overlay" style="display:none;" onclick="if(event.target===this)closeSensitivityModal()">
+      <div class="modal-content" style="min-width:520px; max-width:620px;">
+        <h3 style="margin:0 0 4px;">Valuation Sensitivity: <span id="sensitivityModalTicker"></span></h3>
+        <select id="sensitivityModel" onchange="loadSensitivity()" style="margin:4px 0 8px;">
+          <option value="dcf">DCF</option>
+          <option value="growth_dcf">Growth DCF</option>
+          <option value="rim">RIM</option>
+        </select>
+        <p id="sensitivityModalSubtitle" style="color:#738091; font-size:13px; margin:0 0 12px; font-family:Geist Mono,monospace;"></p>
+        <div id="sensitivityContainer" style="width:100%; overflow-x:auto;"></div>
+        <button onclick="closeSensitivityModal()" class="btn" style="margin-top:16px;">Close</button>
+      </div>
+    </div>
+
     <!-- Reminder Modal -->
     <div id="reminderModal" class="modal-overlay" style="display:none;" onclick="if(event.target===this)closeReminderModal()">
       <div class="modal-content" style="min-width:420px; max-width:520px;">
@@ -564,7 +579,7 @@ class HTMLGenerator:
         return f'''
         <tr class="stock-row {new_status}">
             <td class="rank-cell"></td>
-            <td class="ticker-cell"><span class="ticker-trigger" data-ticker="{ticker}" data-price="{current_price or 0}" onclick="toggleKebab(event, this)" title="{company_name}">{ticker} &#8942;</span><div class="kebab-menu"><div class="kebab-label">{company_name}</div><div class="kebab-label" style="color:{updated_color}; padding-top:0;">Data: {updated_str}</div><div class="kebab-label" style="color:{models_color}; padding-top:0;">Models: {models_str}</div><div class="kebab-sep"></div><a class="kebab-item" href="#" onclick="openNotes('{ticker}'); return false;">&#128196; Analysis notes</a><div class="kebab-item" onclick="openAlarmModal('{ticker}', {current_price or 0}); closeAllKebabs();">&#128276; Price alarm</div><a class="kebab-item" href="https://finance.yahoo.com/quote/{ticker}" target="_blank" rel="noopener">&#128200; Yahoo Finance</a></div></td>
+            <td class="ticker-cell"><span class="ticker-trigger" data-ticker="{ticker}" data-price="{current_price or 0}" onclick="toggleKebab(event, this)" title="{company_name}">{ticker} &#8942;</span><div class="kebab-menu"><div class="kebab-label">{company_name}</div><div class="kebab-label" style="color:{updated_color}; padding-top:0;">Data: {updated_str}</div><div class="kebab-label" style="color:{models_color}; padding-top:0;">Models: {models_str}</div><div class="kebab-sep"></div><a class="kebab-item" href="#" onclick="openNotes('{ticker}'); return false;">&#128196; Analysis notes</a><div class="kebab-item" onclick="openAlarmModal('{ticker}', {current_price or 0}); closeAllKebabs();">&#128276; Price alarm</div><div class="kebab-item" onclick="openSensitivity('{ticker}'); closeAllKebabs();">&#127777; Valuation sensitivity</div><a class="kebab-item" href="https://finance.yahoo.com/quote/{ticker}" target="_blank" rel="noopener">&#128200; Yahoo Finance</a></div></td>
             <td>{self._safe_format(current_price, prefix="$")}</td>
             <td>{status_html}</td>
             <td>{autoresearch_html}</td>
@@ -3260,6 +3275,79 @@ renderCards();
             document.getElementById('insiderModal').style.display = 'none';
         }
 
+        // ── Sensitivity Heatmap Modal ───────────────────────────────────
+        // Fair value over a grid of model inputs (WACC × terminal growth by
+        // default); cells are shaded by fair value vs the current price.
+        let sensitivityTicker = null;
+
+        function openSensitivity(ticker) {
+            if (!SERVER_MODE) { alert('Server not running. Start with: uv run python scripts/dashboard_server.py'); return; }
+            sensitivityTicker = ticker;
+            document.getElementById('sensitivityModalTicker').textContent = ticker;
+            document.getElementById('sensitivityModal').style.display = 'flex';
+            loadSensitivity();
+        }
+
+        function closeSensitivityModal() {
+            document.getElementById('sensitivityModal').style.display = 'none';
+        }
+
+        function loadSensitivity() {
+            const model = document.getElementById('sensitivityModel').value;
+            const container = document.getElementById('sensitivityContainer');
+            container.innerHTML = '<p style="color:#738091; font-size:13px;">Loading...</p>';
+            document.getElementById('sensitivityModalSubtitle').textContent = '';
+
+            fetch('/api/sensitivity/' + sensitivityTicker + '?model=' + model)
+                .then(r => r.json())
+                .then(data => {
+                    if (!data.ok) {
+                        container.innerHTML = '<p style="color:#738091;">' + (data.error || 'Not available for this stock.') + '</p>';
+                        return;
+                    }
+                    container.innerHTML = renderSensitivityTable(data);
+                })
+                .catch(() => {
+                    container.innerHTML = '<p style="color:#f87171;">Failed to load data.</p>';
+                });
+        }
+
+        function renderSensitivityTable(data) {
+            const [rowName, colName] = Object.keys(data.axes);
+            const rows = data.axes[rowName], cols = data.axes[colName];
+            const price = data.current_price;
+            const label = name => name.replace(/_/g, ' ');
+            const pct = v => (v * 100).toFixed(1) + '%';
+            const isBase = (name, v) => Math.abs(v - data.base[name]) < 1e-9;
+            document.getElementById('sensitivityModalSubtitle').textContent =
+                'Rows: ' + label(rowName) + ' \u2022 Columns: ' + label(colName) +
+                (price ? ' \u2022 Price $' + price.toFixed(2) : '');
+
+            const cellStyle = 'padding:6px 8px; text-align:right; font-family:Geist Mono,monospace; font-size:12px;';
+            let html = '<table style="border-collapse:collapse; width:100%;"><tr><th style="' + cellStyle + ' color:#738091;">' +
+                label(rowName) + ' \u00d7 ' + label(colName) + '</th>';
+            cols.forEach(c => { html += '<th style="' + cellStyle + ' color:#738091;">' + pct(c) + '</th>'; });
+            html += '</tr>';
+            rows.forEach((r, i) => {
+                html += '<tr><th style="' + cellStyle + ' color:#738091;">' + pct(r) + '</th>';
+                cols.forEach((c, j) => {
+                    const v = data.values[i][j];
+                    let bg = 'transparent', text = '\u2014';
+                    if (v !== null) {
+                        text = '$' + v.toFixed(2);
+                        if (price) {
+                            const strength = Math.min(Math.abs(v / price - 1), 1) * 0.6 + 0.08;
+                            bg = v >= price ? 'rgba(50,164,103,' + strength + ')' : 'rgba(205,66,70,' + strength + ')';
+                        }
+                    }
+                    const base = isBase(rowName, r) && isBase(colName, c) ? ' font-weight:700; outline:1px solid #e0e6ed;' : '';
+                    html += '<td style="' + cellStyle + ' background:' + bg + ';' + base + '">' + text + '</td>';
+                });
+                html += '</tr>';
+            });
+            return html + '</table>';
+        }
+
         function fmtDollar(v) {
             if (v >= 1e9) return '$' + (v / 1e9).toFixed(1) + 'B';
             if (v >= 1e6) return '$' + (v / 1e6).toFixed(1) + 'M';
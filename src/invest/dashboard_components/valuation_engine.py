@@ -32,7 +32,8 @@ class ValuationEngine:
             for model in self.model_registry.get_available_models()
         }
 
-    def run_valuation(self, ticker: str, model: str, timeout: int = 30) -> Optional[Dict]:
+    def run_valuation(self, ticker: str, model: str, timeout: int = 30,
+                      data: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
         """
         Run a single valuation model safely with timeout and error handling.
 
@@ -44,6 +45,9 @@ class ValuationEngine:
             Valuation model name ('dcf', 'rim', etc.)
         timeout : int
             Timeout in seconds for the valuation
+        data : Optional[Dict[str, Any]]
+            Pre-loaded company data (e.g. ``StockDataReader.get_model_data``);
+            fetched by the model if omitted
 
         Returns
         -------
@@ -59,7 +63,7 @@ class ValuationEngine:
         try:
             # Run valuation with timeout using ThreadPoolExecutor
             with ThreadPoolExecutor(max_workers=1) as executor:
-                future = executor.submit(self._execute_model, ticker, model)
+                future = executor.submit(self._execute_model, ticker, model, data)
                 result = future.result(timeout=timeout)
 
             if result:
@@ -80,11 +84,11 @@ class ValuationEngine:
             self.model_stats[model]['failures'] += 1
             return None
 
-    def _execute_model(self, ticker: str, model: str) -> Optional[Dict]:
+    def _execute_model(self, ticker: str, model: str, data: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
         """Execute the valuation model using the unified registry."""
         try:
             # Use the model registry to run the valuation
-            result = self.model_registry.run_valuation(model, ticker, verbose=False)
+            result = self.model_registry.run_valuation(model, ticker, verbose=False, data=data)
 
             if result and result.is_valid():
                 return result.to_dict()
@@ -10,7 +10,7 @@ import psycopg2
 import psycopg2.extras
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -113,15 +113,9 @@ def get_known_accessions(conn, ticker: str) -> Set[str]:
         return set()
 
 
-def compute_activist_signal(conn, ticker: str,
-                            lookback_days: int = 365) -> Dict[str, Any]:
-    """
-    Compute aggregate activist/passive signal for a ticker.
-
-    Returns dict with: has_data, activist_count, passive_count,
-    max_stake_pct, recent_activist_name, total_holders_5pct.
-    """
-    no_data = {
+def _no_activist_data() -> Dict[str, Any]:
+    """Fresh "no 5%+ stake filings" signal dict (one per ticker, never shared)."""
+    return {
         "has_data": False,
         "activist_count": 0,
         "passive_count": 0,
@@ -130,28 +124,15 @@ def compute_activist_signal(conn, ticker: str,
         "total_holders_5pct": 0,
     }
 
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM activist_stakes LIMIT 1")
-    except Exception:
-        conn.rollback()
-        return no_data
 
-    cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT holder_name, form_type, shares_held, percent_of_class,
-               filing_date, is_activist
-        FROM activist_stakes
-        WHERE ticker = %s AND filing_date >= %s
-        ORDER BY filing_date DESC
-    """, (ticker, cutoff))
-    rows = cur.fetchall()
-
-    if not rows:
-        return no_data
+def _aggregate_activist_rows(rows) -> Dict[str, Any]:
+    """
+    Aggregate one ticker's recent 13D/13G rows into a signal dict.
 
+    `rows` are tuples of (holder_name, form_type, shares_held,
+    percent_of_class, filing_date, is_activist) ordered by filing_date DESC.
+    Assumes `rows` is non-empty.
+    """
     activist_count = 0
     passive_count = 0
     max_stake_pct = None
@@ -179,3 +160,71 @@ def compute_activist_signal(conn, ticker: str,
         "recent_activist_name": recent_activist_name,
         "total_holders_5pct": len(holders),
     }
+
+
+def compute_activist_signal(conn, ticker: str,
+                            lookback_days: int = 365) -> Dict[str, Any]:
+    """
+    Compute aggregate activist/passive signal for a ticker.
+
+    Returns dict with: has_data, activist_count, passive_count,
+    max_stake_pct, recent_activist_name, total_holders_5pct.
+    """
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1 FROM activist_stakes LIMIT 1")
+    except Exception:
+        conn.rollback()
+        return _no_activist_data()
+
+    cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT holder_name, form_type, shares_held, percent_of_class,
+               filing_date, is_activist
+        FROM activist_stakes
+        WHERE ticker = %s AND filing_date >= %s
+        ORDER BY filing_date DESC
+    """, (ticker, cutoff))
+    rows = cur.fetchall()
+
+    if not rows:
+        return _no_activist_data()
+
+    return _aggregate_activist_rows(rows)
+
+
+def compute_all_activist_signals(conn, lookback_days: int = 365,
+                                 tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch equivalent of compute_activist_signal in one query.
+
+    Returns {ticker: signal_dict}, restricted to `tickers` when given.
+    Tickers with no recent filings are omitted; callers should default
+    those to _no_activist_data().
+    """
+    try:
+        cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        cur.execute("SELECT 1 FROM activist_stakes LIMIT 1")
+    except Exception:
+        conn.rollback()
+        return {}
+
+    cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    ticker_filter = " AND ticker = ANY(%s)" if tickers is not None else ""
+    params = (cutoff, list(tickers)) if tickers is not None else (cutoff,)
+
+    cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    cur.execute(f"""
+        SELECT ticker, holder_name, form_type, shares_held, percent_of_class,
+               filing_date, is_activist
+        FROM activist_stakes
+        WHERE filing_date >= %s{ticker_filter}
+        ORDER BY ticker, filing_date DESC
+    """, params)
+    rows_by_ticker: Dict[str, list] = {}
+    for r in cur.fetchall():
+        rows_by_ticker.setdefault(r[0], []).append(r[1:])
+
+    return {tk: _aggregate_activist_rows(rows) for tk, rows in rows_by_ticker.items()}
@@ -10,7 +10,7 @@ import psycopg2
 import psycopg2.extras
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -113,6 +113,46 @@ def get_known_doc_ids(conn, ticker: str) -> Set[str]:
         return set()
 
 
+def _no_japan_data() -> Dict[str, Any]:
+    """Fresh "no large shareholding reports" signal dict (one per ticker, never shared)."""
+    return {
+        "has_data": False,
+        "holder_count": 0,
+        "max_stake_pct": None,
+        "recent_holder_name": None,
+        "total_reports": 0,
+    }
+
+
+def _aggregate_japan_rows(rows) -> Dict[str, Any]:
+    """
+    Aggregate one ticker's recent EDINET rows into a signal dict.
+
+    `rows` are tuples of (holder_name, shares_held, percent_of_class,
+    report_date, report_type) ordered by report_date DESC.
+    Assumes `rows` is non-empty.
+    """
+    holders = set()
+    max_pct = None
+    recent_holder = None
+
+    for holder_name, shares, pct, date, rtype in rows:
+        holders.add(holder_name)
+        if recent_holder is None:
+            recent_holder = holder_name
+        if pct is not None:
+            if max_pct is None or pct > max_pct:
+                max_pct = pct
+
+    return {
+        "has_data": True,
+        "holder_count": len(holders),
+        "max_stake_pct": round(max_pct, 2) if max_pct is not None else None,
+        "recent_holder_name": recent_holder,
+        "total_reports": len(rows),
+    }
+
+
 def compute_japan_signal(conn, ticker: str,
                          lookback_days: int = 365) -> Dict[str, Any]:
     """
@@ -121,20 +161,12 @@ def compute_japan_signal(conn, ticker: str,
     Returns dict with: has_data, holder_count, max_stake_pct,
     recent_holder_name, total_reports.
     """
-    no_data = {
-        "has_data": False,
-        "holder_count": 0,
-        "max_stake_pct": None,
-        "recent_holder_name": None,
-        "total_reports": 0,
-    }
-
     try:
         cur = conn.cursor()
         cur.execute("SELECT 1 FROM japan_large_stakes LIMIT 1")
     except Exception:
         conn.rollback()
-        return no_data
+        return _no_japan_data()
 
     cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
 
@@ -148,24 +180,40 @@ def compute_japan_signal(conn, ticker: str,
     rows = cur.fetchall()
 
     if not rows:
-        return no_data
+        return _no_japan_data()
 
-    holders = set()
-    max_pct = None
-    recent_holder = None
+    return _aggregate_japan_rows(rows)
 
-    for holder_name, shares, pct, date, rtype in rows:
-        holders.add(holder_name)
-        if recent_holder is None:
-            recent_holder = holder_name
-        if pct is not None:
-            if max_pct is None or pct > max_pct:
-                max_pct = pct
 
-    return {
-        "has_data": True,
-        "holder_count": len(holders),
-        "max_stake_pct": round(max_pct, 2) if max_pct is not None else None,
-        "recent_holder_name": recent_holder,
-        "total_reports": len(rows),
-    }
+def compute_all_japan_signals(conn, lookback_days: int = 365,
+                              tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch equivalent of compute_japan_signal in one query.
+
+    Returns {ticker: signal_dict}, restricted to `tickers` when given.
+    Tickers with no recent reports are omitted; callers should default
+    those to _no_japan_data().
+    """
+    try:
+        cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        cur.execute("SELECT 1 FROM japan_large_stakes LIMIT 1")
+    except Exception:
+        conn.rollback()
+        return {}
+
+    cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    ticker_filter = " AND ticker = ANY(%s)" if tickers is not None else ""
+    params = (cutoff, list(tickers)) if tickers is not None else (cutoff,)
+
+    cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    cur.execute(f"""
+        SELECT ticker, holder_name, shares_held, percent_of_class, report_date, report_type
+        FROM japan_large_stakes
+        WHERE report_date >= %s{ticker_filter}
+        ORDER BY ticker, report_date DESC
+    """, params)
+    rows_by_ticker: Dict[str, list] = {}
+    for r in cur.fetchall():
+        rows_by_ticker.setdefault(r[0], []).append(r[1:])
+
+    return {tk: _aggregate_japan_rows(rows) for tk, rows in rows_by_ticker.items()}
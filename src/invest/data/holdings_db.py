@@ -10,7 +10,7 @@ import psycopg2
 import psycopg2.extras
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List, Optional, Set
 
 logger = logging.getLogger(__name__)
 
@@ -117,15 +117,9 @@ def get_known_accessions(conn, fund_cik: str) -> Set[str]:
         return set()
 
 
-def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
-    """
-    Compute aggregate institutional holdings signal for a ticker.
-
-    Returns dict with: has_data, smart_money_holders, total_smart_money_shares,
-    total_smart_money_value_usd, quarter_change, notable_holders,
-    new_positions, exited_positions.
-    """
-    no_data = {
+def _no_holdings_data() -> Dict[str, Any]:
+    """Fresh "no smart money holders" signal dict (one per ticker, never shared)."""
+    return {
         "has_data": False,
         "smart_money_holders": 0,
         "total_smart_money_shares": 0,
@@ -136,12 +130,69 @@ def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
         "exited_positions": [],
     }
 
+
+def _aggregate_holdings_rows(latest_rows, prev_rows=None) -> Dict[str, Any]:
+    """
+    Aggregate one ticker's 13F rows into a signal dict.
+
+    `latest_rows` are (fund_name, fund_cik, shares, value_usd) tuples for the
+    ticker's most recent quarter; `prev_rows` are (fund_name, fund_cik,
+    shares) tuples for the quarter before, or None if there is none.
+    Assumes `latest_rows` is non-empty.
+    """
+    total_shares = 0.0
+    total_value = 0.0
+    holders = []
+
+    for fund_name, fund_cik, shares, value_usd in latest_rows:
+        holders.append(fund_name)
+        if shares:
+            total_shares += shares
+        if value_usd:
+            total_value += value_usd
+
+    # Compare with previous quarter if available
+    quarter_change = None
+    new_positions = []
+    exited_positions = []
+
+    if prev_rows is not None:
+        prev_holders = {r[0] for r in prev_rows}
+        latest_holders = {r[0] for r in latest_rows}
+        prev_total = sum(r[2] for r in prev_rows if r[2])
+
+        new_positions = sorted(latest_holders - prev_holders)
+        exited_positions = sorted(prev_holders - latest_holders)
+
+        if prev_total > 0:
+            quarter_change = round(total_shares - prev_total)
+
+    return {
+        "has_data": True,
+        "smart_money_holders": len(holders),
+        "total_smart_money_shares": round(total_shares),
+        "total_smart_money_value_usd": round(total_value),
+        "quarter_change": quarter_change,
+        "notable_holders": sorted(set(holders)),
+        "new_positions": new_positions,
+        "exited_positions": exited_positions,
+    }
+
+
+def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
+    """
+    Compute aggregate institutional holdings signal for a ticker.
+
+    Returns dict with: has_data, smart_money_holders, total_smart_money_shares,
+    total_smart_money_value_usd, quarter_change, notable_holders,
+    new_positions, exited_positions.
+    """
     try:
         cur = conn.cursor()
         cur.execute("SELECT 1 FROM fund_holdings LIMIT 1")
     except Exception:
         conn.rollback()
-        return no_data
+        return _no_holdings_data()
 
     # Get the two most recent quarters for this ticker
     cur = conn.cursor()
@@ -154,7 +205,7 @@ def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
     quarters = cur.fetchall()
 
     if not quarters:
-        return no_data
+        return _no_holdings_data()
 
     latest_q = quarters[0][0]
     prev_q = quarters[1][0] if len(quarters) > 1 else None
@@ -168,24 +219,9 @@ def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
     latest_rows = cur.fetchall()
 
     if not latest_rows:
-        return no_data
-
-    total_shares = 0.0
-    total_value = 0.0
-    holders = []
-
-    for fund_name, fund_cik, shares, value_usd in latest_rows:
-        holders.append(fund_name)
-        if shares:
-            total_shares += shares
-        if value_usd:
-            total_value += value_usd
-
-    # Compare with previous quarter if available
-    quarter_change = None
-    new_positions = []
-    exited_positions = []
+        return _no_holdings_data()
 
+    prev_rows = None
     if prev_q:
         cur.execute("""
             SELECT fund_name, fund_cik, shares
@@ -194,23 +230,50 @@ def compute_holdings_signal(conn, ticker: str) -> Dict[str, Any]:
         """, (ticker, prev_q))
         prev_rows = cur.fetchall()
 
-        prev_holders = {r[0] for r in prev_rows}
-        latest_holders = {r[0] for r in latest_rows}
-        prev_total = sum(r[2] for r in prev_rows if r[2])
+    return _aggregate_holdings_rows(latest_rows, prev_rows)
 
-        new_positions = sorted(latest_holders - prev_holders)
-        exited_positions = sorted(prev_holders - latest_holders)
 
-        if prev_total > 0:
-            quarter_change = round(total_shares - prev_total)
+def compute_all_holdings_signals(conn,
+                                 tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch equivalent of compute_holdings_signal in one query.
+
+    A DENSE_RANK window keeps each ticker's two most recent quarters, so the
+    per-ticker "latest vs previous quarter" comparison is preserved. Returns
+    {ticker: signal_dict}, restricted to `tickers` when given; tickers with
+    no holdings are omitted (default those to _no_holdings_data()).
+    """
+    try:
+        cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+        cur.execute("SELECT 1 FROM fund_holdings LIMIT 1")
+    except Exception:
+        conn.rollback()
+        return {}
+
+    ticker_filter = " AND ticker = ANY(%s)" if tickers is not None else ""
+    params = (list(tickers),) if tickers is not None else ()
+
+    cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    cur.execute(f"""
+        SELECT ticker, q_rank, fund_name, fund_cik, shares, value_usd
+        FROM (
+            SELECT ticker, fund_name, fund_cik, shares, value_usd,
+                   DENSE_RANK() OVER (PARTITION BY ticker ORDER BY quarter DESC) AS q_rank
+            FROM fund_holdings
+            WHERE ticker != ''{ticker_filter}
+        ) ranked
+        WHERE q_rank <= 2
+    """, params)
+
+    latest_by_ticker: Dict[str, list] = {}
+    prev_by_ticker: Dict[str, list] = {}
+    for ticker, q_rank, fund_name, fund_cik, shares, value_usd in cur.fetchall():
+        if q_rank == 1:
+            latest_by_ticker.setdefault(ticker, []).append((fund_name, fund_cik, shares, value_usd))
+        else:
+            prev_by_ticker.setdefault(ticker, []).append((fund_name, fund_cik, shares))
 
     return {
-        "has_data": True,
-        "smart_money_holders": len(holders),
-        "total_smart_money_shares": round(total_shares),
-        "total_smart_money_value_usd": round(total_value),
-        "quarter_change": quarter_change,
-        "notable_holders": sorted(set(holders)),
-        "new_positions": new_positions,
-        "exited_positions": exited_positions,
+        tk: _aggregate_holdings_rows(latest_rows, prev_by_ticker.get(tk))
+        for tk, latest_rows in latest_by_ticker.items()
     }
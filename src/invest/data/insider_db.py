@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+from .db import upsert_rows
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
@@ -60,30 +62,48 @@ def ensure_schema(conn) -> None:
     conn.commit()
 
 
+_TRANSACTION_COLUMNS = (
+    "ticker", "cik", "accession_number", "filing_date", "transaction_date",
+    "reporter_name", "reporter_title", "transaction_type", "shares",
+    "price_per_share", "shares_owned_after", "is_open_market",
+)
+
+
+def _transaction_row(txn: Dict[str, Any]) -> tuple:
+    """Column values for one insider_transactions row."""
+    return (
+        txn["ticker"], txn["cik"], txn["accession_number"],
+        txn["filing_date"], txn["transaction_date"],
+        txn["reporter_name"], txn.get("reporter_title", ""),
+        txn["transaction_type"], txn["shares"],
+        txn.get("price_per_share"), txn.get("shares_owned_after"),
+        txn.get("is_open_market", 0),
+    )
+
+
 def insert_transactions(conn, transactions: List[Dict[str, Any]]) -> int:
-    """Insert transactions, ignoring duplicates. Returns count inserted."""
-    inserted = 0
-    cur = conn.cursor()
+    """Insert transactions, ignoring duplicates. Returns count inserted.
+
+    Written as multi-row INSERTs; if the batch fails (e.g. one malformed
+    row), falls back to row-by-row so the good rows still land.
+    """
+    rows = []
     for txn in transactions:
         try:
-            cur.execute("""
-                INSERT INTO insider_transactions
-                (ticker, cik, accession_number, filing_date, transaction_date,
-                 reporter_name, reporter_title, transaction_type, shares,
-                 price_per_share, shares_owned_after, is_open_market)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT DO NOTHING
-            """, (
-                txn["ticker"], txn["cik"], txn["accession_number"],
-                txn["filing_date"], txn["transaction_date"],
-                txn["reporter_name"], txn.get("reporter_title", ""),
-                txn["transaction_type"], txn["shares"],
-                txn.get("price_per_share"), txn.get("shares_owned_after"),
-                txn.get("is_open_market", 0),
-            ))
-            inserted += cur.rowcount
-        except Exception:
-            conn.rollback()
+            rows.append(_transaction_row(txn))
+        except KeyError as exc:
+            logger.warning("Skipping insider transaction missing %s", exc)
+
+    try:
+        inserted = upsert_rows(conn, "insider_transactions", _TRANSACTION_COLUMNS, rows)
+    except Exception:
+        conn.rollback()
+        inserted = 0
+        for row in rows:
+            try:
+                inserted += upsert_rows(conn, "insider_transactions", _TRANSACTION_COLUMNS, [row])
+            except Exception:
+                conn.rollback()
     conn.commit()
     return inserted
 
@@ -269,13 +289,15 @@ def compute_insider_signal(conn, ticker: str,
     return signal
 
 
-def compute_all_insider_signals(conn, lookback_days: int = 180) -> Dict[str, Dict[str, Any]]:
+def compute_all_insider_signals(conn, lookback_days: int = 180,
+                                tickers: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
     """
     Batch equivalent of compute_insider_signal for every ticker in one pass.
 
     Replaces ~4 queries-per-ticker with 3 total queries, returning
-    {ticker: signal_dict}. Tickers with no recent open-market activity are
-    omitted; callers should default those to _no_insider_data().
+    {ticker: signal_dict}, restricted to `tickers` when given. Tickers with
+    no recent open-market activity are omitted; callers should default those
+    to _no_insider_data().
     """
     try:
         cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
@@ -286,38 +308,40 @@ def compute_all_insider_signals(conn, lookback_days: int = 180) -> Dict[str, Dic
 
     now = datetime.utcnow()
     cutoff = (now - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    ticker_filter = " AND ticker = ANY(%s)" if tickers is not None else ""
+    ticker_params = (list(tickers),) if tickers is not None else ()
 
     # 1) Recent open-market rows for all tickers (drives main aggregation).
     cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
-    cur.execute("""
+    cur.execute(f"""
         SELECT ticker, transaction_type, shares, price_per_share, transaction_date,
                reporter_name, is_open_market
         FROM insider_transactions
-        WHERE transaction_date >= %s AND is_open_market = 1
+        WHERE transaction_date >= %s AND is_open_market = 1{ticker_filter}
         ORDER BY ticker, transaction_date DESC
-    """, (cutoff,))
+    """, (cutoff, *ticker_params))
     rows_by_ticker: Dict[str, list] = {}
     for r in cur.fetchall():
         rows_by_ticker.setdefault(r[0], []).append(r[1:])
 
     # 2) Full-history earliest date + count per ticker (trend baseline gate).
-    cur.execute("""
+    cur.execute(f"""
         SELECT ticker, MIN(transaction_date), COUNT(*)
         FROM insider_transactions
-        WHERE is_open_market = 1
+        WHERE is_open_market = 1{ticker_filter}
         GROUP BY ticker
-    """)
+    """, ticker_params)
     history = {r[0]: (r[1], r[2]) for r in cur.fetchall()}
 
     # 3) Full-history recent-vs-prior buy/sell counts per ticker.
-    cur.execute("""
+    cur.execute(f"""
         SELECT ticker, transaction_type,
                CASE WHEN transaction_date >= %s THEN 'recent' ELSE 'prior' END AS period,
                COUNT(*) AS cnt
         FROM insider_transactions
-        WHERE is_open_market = 1
+        WHERE is_open_market = 1{ticker_filter}
         GROUP BY ticker, transaction_type, period
-    """, (cutoff,))
+    """, (cutoff, *ticker_params))
     trend_counts: Dict[str, Dict[str, int]] = {}
     for tk, tx_type, period, cnt in cur.fetchall():
         d = trend_counts.setdefault(
@@ -332,12 +332,14 @@ def compute_politician_signal(
 def compute_all_politician_signals(
     conn,
     lookback_days: int = 180,
+    tickers: List[str] | None = None,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Batch equivalent of compute_politician_signal for every ticker in one query.
 
-    Returns {ticker: signal_dict}. Tickers with no recent trades are omitted;
-    callers should default those to _no_politician_data().
+    Returns {ticker: signal_dict}, restricted to `tickers` when given.
+    Tickers with no recent trades are omitted; callers should default those
+    to _no_politician_data().
     """
     try:
         cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
@@ -347,14 +349,16 @@ def compute_all_politician_signals(
         return {}
 
     cutoff = (datetime.utcnow() - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+    ticker_filter = ' AND ticker = ANY(%s)' if tickers is not None else ''
+    params = (cutoff, list(tickers)) if tickers is not None else (cutoff,)
     cur = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
-    cur.execute("""
+    cur.execute(f"""
         SELECT ticker, politician_name, transaction_type, transaction_date,
                amount_min, amount_max
         FROM politician_trades
-        WHERE transaction_date >= %s
+        WHERE transaction_date >= %s{ticker_filter}
         ORDER BY ticker, transaction_date DESC
-    """, (cutoff,))
+    """, params)
     rows_by_ticker: Dict[str, list] = {}
     for r in cur.fetchall():
         rows_by_ticker.setdefault(r[0], []).append(r[1:])
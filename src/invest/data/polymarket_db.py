@@ -18,6 +18,8 @@ from typing import Any, Dict, List
 
 import psycopg2.extras
 
+from .db import upsert_rows
+
 logger = logging.getLogger(__name__)
 
 # Alert threshold — any 24h Yes-price move of this size in percentage points
@@ -208,8 +210,93 @@ def upsert_market(conn, market: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def get_yes_prices_24h_ago(conn, market_ids: List[str]) -> Dict[str, float]:
+    """Batch form of get_yes_price_24h_ago: {market_id: yes_price} in one query.
+
+    Markets with no snapshot in the [12h, 36h] window are absent.
+    """
+    if not market_ids:
+        return {}
+    cur = conn.cursor()
+    now = datetime.now(timezone.utc)
+    lower = now - timedelta(hours=36)
+    upper = now - timedelta(hours=12)
+    cur.execute("""
+        SELECT DISTINCT ON (market_id) market_id, yes_price
+        FROM trump_policy_price_history
+        WHERE market_id = ANY(%s)
+          AND recorded_at BETWEEN %s AND %s
+          AND yes_price IS NOT NULL
+        ORDER BY market_id,
+                 ABS(EXTRACT(EPOCH FROM (recorded_at - (NOW() - INTERVAL '24 hours'))))
+    """, (list(market_ids), lower, upper))
+    return {row[0]: float(row[1]) for row in cur.fetchall()}
+
+
+_MARKET_COLUMNS = (
+    'market_id', 'question', 'category',
+    'current_yes_price', 'current_no_price',
+    'previous_yes_price', 'yes_price_24h_ago',
+    'volume_24h', 'volume_total', 'liquidity',
+    'close_date', 'slug', 'url', 'tags', 'metadata',
+    'last_updated',
+)
+
+
 def upsert_markets(conn, markets: List[Dict[str, Any]]) -> int:
-    """Bulk upsert. Returns count processed."""
+    """Bulk upsert. Returns count processed.
+
+    Same end state as calling upsert_market for each market, but as a
+    constant number of statements: one 24h-snapshot lookup, multi-row
+    upserts into trump_policy_markets and price-history appends, one commit.
+    If the batch fails, falls back to upsert_market per market so one bad
+    row only loses itself.
+    """
+    if not markets:
+        return 0
+    try:
+        yes_24h = get_yes_prices_24h_ago(conn, [m['market_id'] for m in markets])
+        upsert_rows(
+            conn, 'trump_policy_markets', _MARKET_COLUMNS,
+            [
+                (
+                    m['market_id'], m.get('question', ''), m.get('category', 'other'),
+                    m.get('yes_price'), m.get('no_price'),
+                    None, yes_24h.get(m['market_id']),
+                    m.get('volume_24h', 0), m.get('volume_total', 0),
+                    m.get('liquidity', 0),
+                    m.get('close_date'),
+                    m.get('slug'), m.get('url'),
+                    m.get('tags') or [], json.dumps(m.get('raw') or {}),
+                )
+                for m in markets
+            ],
+            conflict=('market_id',),
+            update=[c for c in _MARKET_COLUMNS
+                    if c not in ('market_id', 'previous_yes_price', 'last_updated')],
+            # previous_yes_price is only meaningful for an existing row: on
+            # insert it stays NULL, on update it takes the pre-update price.
+            set_sql={
+                'previous_yes_price': 'trump_policy_markets.current_yes_price',
+                'last_updated': 'NOW()',
+            },
+            template='(' + ', '.join(['%s'] * 14) + ', %s::jsonb, NOW())',
+        )
+        upsert_rows(
+            conn, 'trump_policy_price_history',
+            ('market_id', 'yes_price', 'no_price', 'volume_total'),
+            [
+                (m['market_id'], m.get('yes_price'), m.get('no_price'),
+                 m.get('volume_total', 0))
+                for m in markets
+            ],
+        )
+        conn.commit()
+        return len(markets)
+    except Exception as exc:
+        logger.warning('Bulk market upsert failed (%s); retrying one by one', exc)
+        conn.rollback()
+
     count = 0
     for m in markets:
         try:
@@ -9,9 +9,10 @@ import logging
 from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 
+import pandas as pd
 from psycopg2.extras import RealDictCursor
 
-from .db import get_connection
+from .db import get_pooled_connection
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,7 @@ class StockDataReader:
         pass
 
     def _conn(self, dict_cursor=False):
-        return get_connection(dict_cursor=dict_cursor)
+        return get_pooled_connection(dict_cursor=dict_cursor)
 
     def get_stock_data(self, ticker: str, conn=None) -> Optional[Dict[str, Any]]:
         """Get stock data for a single ticker.
@@ -49,6 +50,171 @@ class StockDataReader:
                 conn.close()
             return None
 
+        data = self._row_to_stock_data(row)
+        data['insider'] = self.get_insider_signal(ticker, conn=conn)
+        data['activist'] = self.get_activist_signal(ticker, conn=conn)
+        data['holdings'] = self.get_holdings_signal(ticker, conn=conn)
+        data['japan_stakes'] = self.get_japan_signal(ticker, conn=conn)
+        data['politician'] = self.get_politician_signal(ticker, conn=conn)
+
+        if own:
+            conn.close()
+        return data
+
+    def get_stock_data_bulk(self, tickers: List[str], conn=None) -> Dict[str, Dict[str, Any]]:
+        """Get stock data for many tickers in a constant number of queries.
+
+        Same per-ticker dict shape as :meth:`get_stock_data`, but the
+        ``current_stock_data`` rows come from one ``ticker = ANY(...)`` query
+        and each sub-signal family (insider, activist, holdings, japan,
+        politician) from one set-based ``compute_all_*_signals`` query,
+        instead of ~6 queries per ticker.
+
+        Parameters
+        ----------
+        tickers : list of str
+            Tickers to load. Tickers missing from ``current_stock_data`` are
+            absent from the result (``get_stock_data`` returns None for them).
+        conn : optional
+            Connection to reuse; the caller owns its lifecycle. Same
+            requirements as for :meth:`get_stock_data`.
+
+        Returns
+        -------
+        dict
+            ``{ticker: data}`` in the order of ``tickers``.
+        """
+        if not tickers:
+            return {}
+
+        own = conn is None
+        if own:
+            conn = self._conn()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                'SELECT * FROM current_stock_data WHERE ticker = ANY(%s)', (list(tickers),)
+            )
+            rows = {row['ticker']: row for row in cursor.fetchall()}
+            cursor.close()
+
+            found = [t for t in tickers if t in rows]
+            if not found:
+                return {}
+            signals = self._load_signal_families(conn, found)
+
+            result = {}
+            for ticker in found:
+                data = self._row_to_stock_data(rows[ticker])
+                for key, (by_ticker, no_data) in signals.items():
+                    data[key] = by_ticker[ticker] if ticker in by_ticker else no_data()
+                result[ticker] = data
+            return result
+        finally:
+            if own:
+                conn.close()
+
+    def _load_signal_families(self, conn, tickers: List[str]) -> Dict[str, tuple]:
+        """Batch-load every sub-signal family for ``tickers``.
+
+        Returns ``{data_key: (signals_by_ticker, no_data_factory)}``. A family
+        whose query fails degrades to "no data" for every ticker, mirroring
+        the per-ticker ``get_*_signal`` helpers.
+        """
+        from .activist_db import _no_activist_data, compute_all_activist_signals
+        from .edinet_db import _no_japan_data, compute_all_japan_signals
+        from .holdings_db import _no_holdings_data, compute_all_holdings_signals
+        from .insider_db import _no_insider_data, compute_all_insider_signals
+        from .politician_db import _no_politician_data, compute_all_politician_signals
+
+        families = {
+            'insider': (compute_all_insider_signals, _no_insider_data),
+            'activist': (compute_all_activist_signals, _no_activist_data),
+            'holdings': (compute_all_holdings_signals, _no_holdings_data),
+            'japan_stakes': (compute_all_japan_signals, _no_japan_data),
+            'politician': (compute_all_politician_signals, _no_politician_data),
+        }
+        loaded = {}
+        for key, (compute_all, no_data) in families.items():
+            try:
+                by_ticker = compute_all(conn, tickers=tickers)
+            except Exception:
+                logger.warning('Bulk %s signal query failed — defaulting to no data', key)
+                conn.rollback()
+                by_ticker = {}
+            loaded[key] = (by_ticker, no_data)
+        return loaded
+
+    def get_model_data(self, ticker: str, **market_kwargs) -> Optional[Dict[str, Any]]:
+        """Get a ticker's data in the format the valuation models take.
+
+        :meth:`get_stock_data` plus :meth:`get_market_inputs`, converted by
+        :meth:`to_model_data`, so it can be passed straight to
+        ``ValuationModel.value_company_with_data`` or the registry's
+        ``data=`` arguments without any network access.
+
+        Parameters
+        ----------
+        ticker : str
+            Stock ticker.
+        **market_kwargs
+            Forwarded to :meth:`get_market_inputs`.
+
+        Returns
+        -------
+        dict or None
+            None when the ticker has no ``current_stock_data`` row.
+        """
+        stock_data = self.get_stock_data(ticker)
+        if not stock_data:
+            return None
+        return self.to_model_data(stock_data, self.get_market_inputs(ticker, **market_kwargs))
+
+    @staticmethod
+    def to_model_data(stock_data: Dict[str, Any], market_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Convert a :meth:`get_stock_data` result to the valuation-model input format.
+
+        The reader keeps the financial statements as the stored lists of
+        records (one record per line item, keyed by ``index``); the models
+        expect yfinance-shaped DataFrames (rows = line items, columns =
+        period dates). Statements that are missing or can't be converted are
+        left out, as when yfinance has none.
+
+        Parameters
+        ----------
+        stock_data : dict
+            :meth:`get_stock_data` / :meth:`get_stock_data_bulk` entry.
+        market_data : dict, optional
+            :meth:`get_market_inputs` / :meth:`build_market_inputs` result.
+
+        Returns
+        -------
+        dict
+            ``ticker``, ``info``, ``financials``, ``market_data`` and the
+            ``cashflow`` / ``balance_sheet`` / ``income`` DataFrames.
+        """
+        ticker = stock_data.get('ticker')
+        model_data = {
+            'ticker': ticker,
+            'info': stock_data.get('info', {}),
+            'financials': stock_data.get('financials', {}),
+            'market_data': market_data,
+        }
+        for statement in ('cashflow', 'balance_sheet', 'income'):
+            records = stock_data.get(statement)
+            if not records:
+                continue
+            try:
+                frame = pd.DataFrame(records)
+                if 'index' in frame.columns:
+                    frame = frame.set_index('index')
+                model_data[statement] = frame
+            except Exception as e:
+                logger.warning('Could not convert %s for %s: %s', statement, ticker, e)
+        return model_data
+
+    def _row_to_stock_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """Shape a ``current_stock_data`` row into the reader's data dict (no sub-signals)."""
         # JSONB columns come back as Python objects (no json.loads needed)
         cashflow_data = row['cashflow_json'] if row['cashflow_json'] else []
         balance_sheet_data = row['balance_sheet_json'] if row['balance_sheet_json'] else []
@@ -69,7 +235,7 @@ class StockDataReader:
                         elif item['index'] == 'Operating Cash Flow' and value and not (isinstance(value, float) and value != value):
                             operating_cashflow = value
 
-        data = {
+        return {
             'ticker': row['ticker'],
             'info': {
                 'currentPrice': row['current_price'],
@@ -125,17 +291,8 @@ class StockDataReader:
             'balance_sheet': balance_sheet_data,
             'income': income_data,
             'fetch_timestamp': row['fetch_timestamp'],
-            'insider': self.get_insider_signal(ticker, conn=conn),
-            'activist': self.get_activist_signal(ticker, conn=conn),
-            'holdings': self.get_holdings_signal(ticker, conn=conn),
-            'japan_stakes': self.get_japan_signal(ticker, conn=conn),
-            'politician': self.get_politician_signal(ticker, conn=conn),
         }
 
-        if own:
-            conn.close()
-        return data
-
     def get_all_tickers(self) -> List[str]:
         """Get list of all tickers in the database."""
         conn = self._conn()
@@ -318,10 +475,57 @@ class StockDataReader:
             logger.warning('price_history query failed for %s — returning empty result', ticker)
             return empty
 
+        return self._closes_from_rows(list(reversed(rows)))
+
+    def get_recent_price_closes_bulk(
+        self, tickers: List[str], limit: int = 600, conn=None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Batch form of :meth:`get_recent_price_closes` in one windowed query.
+
+        Returns ``{ticker: closes}`` for every requested ticker (tickers
+        without prices get the empty result).
+        """
+        result = {ticker: self._closes_from_rows([]) for ticker in tickers}
+        if not tickers:
+            return result
+
+        own = conn is None
+        if own:
+            conn = self._conn()
+        try:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            cursor.execute(
+                'SELECT ticker, date, close FROM ('
+                '  SELECT ticker, date, close, ROW_NUMBER() OVER ('
+                '    PARTITION BY ticker ORDER BY date DESC) AS rn'
+                '  FROM price_history'
+                '  WHERE ticker = ANY(%s) AND close IS NOT NULL'
+                ') recent WHERE rn <= %s ORDER BY ticker, date',
+                (list(tickers), limit),
+            )
+            by_ticker: Dict[str, list] = {}
+            for row in cursor.fetchall():
+                by_ticker.setdefault(row['ticker'], []).append(row)
+            cursor.close()
+        except Exception:
+            logger.warning('bulk price_history query failed — returning empty results')
+            # A borrowed connection must stay usable for the caller's next statement
+            conn.rollback()
+            return result
+        finally:
+            if own:
+                conn.close()
+
+        for ticker, rows in by_ticker.items():
+            result[ticker] = self._closes_from_rows(rows)
+        return result
+
+    @staticmethod
+    def _closes_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Shape date-ascending price_history rows into the closes dict."""
         if not rows:
             return {'closes': [], 'dates': [], 'last_date': None, 'price_points': 0}
 
-        rows = list(reversed(rows))
         closes = [float(row['close']) for row in rows if row['close'] is not None]
         dates_list = []
         for row in rows:
@@ -377,6 +581,29 @@ class StockDataReader:
     ) -> Dict[str, Any]:
         """Get robust market inputs for structural valuation models."""
         prices = self.get_recent_price_closes(ticker, limit=max(min_price_points + 50, 600))
+        macro = self.get_latest_macro_rate('risk_free_rate')
+        return self.build_market_inputs(
+            prices, macro,
+            min_price_points=min_price_points,
+            max_price_age_days=max_price_age_days,
+            max_rate_age_days=max_rate_age_days,
+        )
+
+    @staticmethod
+    def build_market_inputs(
+        prices: Dict[str, Any],
+        macro: Optional[Dict[str, Any]],
+        min_price_points: int = 252,
+        max_price_age_days: int = 30,
+        max_rate_age_days: int = 30,
+    ) -> Dict[str, Any]:
+        """
+        Market inputs from already-loaded closes and risk-free rate.
+
+        ``prices`` is a :meth:`get_recent_price_closes` result and ``macro`` a
+        :meth:`get_latest_macro_rate` result, so bulk callers can load both
+        once for a whole universe.
+        """
         closes = prices.get('closes', [])
         last_price_date = prices.get('last_date')
         price_age_days = None
@@ -391,7 +618,6 @@ class StockDataReader:
                 price_age_days = None
                 price_is_fresh = False
 
-        macro = self.get_latest_macro_rate('risk_free_rate')
         risk_free_rate = None
         rate_source = 'default_config'
         rate_date = None
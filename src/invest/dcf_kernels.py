@@ -0,0 +1,200 @@
+"""
+Vectorized DCF kernels shared by the DCF-family models.
+
+Every model in the DCF family does the same three things: compound a cash
+flow along a path of yearly growth rates, discount the projected flows, and
+add a Gordon-growth terminal value. These kernels do it with NumPy
+broadcasting, so the same call values one company (scalar inputs and a 1-D
+growth path) or a whole universe (``(tickers,)`` inputs and a
+``(tickers, years)`` growth path), and a sensitivity grid is just one more
+leading axis.
+
+Shapes
+------
+``growth_rates`` has the projection years on its last axis; every other
+argument broadcasts against its leading axes. For example ``initial`` of
+shape ``(tickers,)``, ``growth_rates`` of shape ``(tickers, years)`` and a
+scalar ``discount_rate`` give ``(tickers,)`` values.
+
+Cash flows are compounded year by year (``fcf *= 1 + g``), in the same order
+as the original per-model loops, so projected flows match them bit for bit.
+Discounting is not bit-identical: discount factors use NumPy's ``power`` and
+the discounted flows are added with NumPy's pairwise summation rather than
+the builtin ``sum()``, so present, terminal and enterprise values agree with
+the old scalar loops to within 1e-12 relative (typically a few ULPs).
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+def stage_growth_rates(stages: Sequence[Tuple[float, int]]) -> np.ndarray:
+    """
+    Growth path of consecutive constant-growth stages.
+
+    Parameters
+    ----------
+    stages : sequence of (float, int)
+        ``(growth_rate, years)`` of each stage, in order.
+
+    Returns
+    -------
+    np.ndarray
+        1-D array of ``sum(years)`` yearly growth rates.
+    """
+    return np.concatenate([np.full(years, rate, dtype=float) for rate, years in stages] or [np.empty(0)])
+
+
+def _compound(initial, growth_rates) -> np.ndarray:
+    """Cash flow path ``(..., years + 1)`` whose first column is the initial flow."""
+    growth = 1 + np.asarray(growth_rates, dtype=float)
+    initial = np.asarray(initial, dtype=float)[..., None]
+    shape = np.broadcast_shapes(initial.shape, growth.shape[:-1] + (1,))
+    path = np.empty(shape[:-1] + (growth.shape[-1] + 1,))
+    path[..., :1] = initial
+    path[..., 1:] = growth
+    return np.cumprod(path, axis=-1, out=path)
+
+
+def project_cash_flows(initial, growth_rates) -> np.ndarray:
+    """
+    Compound an initial cash flow along a growth path.
+
+    Parameters
+    ----------
+    initial : float or array-like
+        Base-year cash flow, shape ``(...)``.
+    growth_rates : array-like
+        Yearly growth rates, shape ``(..., years)``.
+
+    Returns
+    -------
+    np.ndarray
+        Projected cash flows for years ``1..years``, shape ``(..., years)``.
+    """
+    return _compound(initial, growth_rates)[..., 1:]
+
+
+def discount_factors(discount_rate, years: int, first_year: int = 1) -> np.ndarray:
+    """
+    Compounding divisors ``(1 + r) ** t`` for ``t = first_year .. first_year + years - 1``.
+
+    Parameters
+    ----------
+    discount_rate : float or array-like
+        Annual discount rate, shape ``(...)``.
+    years : int
+        Number of years.
+    first_year : int, default 1
+        Exponent of the first year.
+
+    Returns
+    -------
+    np.ndarray
+        Shape ``(..., years)``.
+    """
+    periods = np.arange(first_year, first_year + years)
+    return (1 + np.asarray(discount_rate, dtype=float)[..., None]) ** periods
+
+
+def present_values(cash_flows, discount_rate, first_year: int = 1) -> np.ndarray:
+    """
+    Present value of each projected cash flow.
+
+    Parameters
+    ----------
+    cash_flows : array-like
+        Cash flows, shape ``(..., years)``; the first one falls in ``first_year``.
+    discount_rate : float or array-like
+        Annual discount rate, shape ``(...)``.
+    first_year : int, default 1
+        Year of the first cash flow.
+
+    Returns
+    -------
+    np.ndarray
+        Discounted cash flows, shape ``(..., years)``.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    return cash_flows / discount_factors(discount_rate, cash_flows.shape[-1], first_year)
+
+
+def terminal_value(final_cash_flow, discount_rate, terminal_growth) -> np.ndarray:
+    """
+    Gordon-growth value, at the end of the projection, of all later cash flows.
+
+    Parameters
+    ----------
+    final_cash_flow : float or array-like
+        Cash flow of the last projected year.
+    discount_rate : float or array-like
+        Annual discount rate; must exceed ``terminal_growth``.
+    terminal_growth : float or array-like
+        Perpetual growth rate after the projection.
+
+    Returns
+    -------
+    np.ndarray
+        ``final_cash_flow * (1 + g) / (r - g)``, broadcast over the inputs.
+    """
+    final_cash_flow = np.asarray(final_cash_flow, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    terminal_growth = np.asarray(terminal_growth, dtype=float)
+    return final_cash_flow * (1 + terminal_growth) / (discount_rate - terminal_growth)
+
+
+def dcf_valuation(
+    initial,
+    growth_rates,
+    discount_rate,
+    terminal_growth,
+    details: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Value cash flows compounded along a growth path plus a terminal value.
+
+    Parameters
+    ----------
+    initial : float or array-like
+        Base-year cash flow, shape ``(...)``.
+    growth_rates : array-like
+        Yearly growth rates, shape ``(..., years)``; ``years`` may be 0.
+    discount_rate : float or array-like
+        Annual discount rate, shape ``(...)``. Callers check it exceeds
+        ``terminal_growth`` (rows where it does not are not meaningful).
+    terminal_growth : float or array-like
+        Perpetual growth rate after the projection, shape ``(...)``.
+    details : bool, default False
+        Also return the per-year ``cash_flows`` and ``pv_cash_flows``
+        (shape ``(..., years)``).
+
+    Returns
+    -------
+    dict
+        ``present_value`` (sum of the discounted projected flows),
+        ``terminal_value``, ``pv_terminal`` and ``enterprise_value``
+        (shape ``(...)``), plus the per-year arrays when ``details``.
+    """
+    path = _compound(initial, growth_rates)
+    cash_flows = path[..., 1:]
+    years = cash_flows.shape[-1]
+    discount_rate = np.asarray(discount_rate, dtype=float)
+
+    factors = discount_factors(discount_rate, years + 1, first_year=0)
+    pv_cash_flows = cash_flows / factors[..., 1:]
+    present_value = pv_cash_flows.sum(axis=-1)
+
+    terminal = terminal_value(path[..., -1], discount_rate, terminal_growth)
+    pv_terminal = terminal / factors[..., -1]
+
+    valuation = {
+        'present_value': present_value,
+        'terminal_value': terminal,
+        'pv_terminal': pv_terminal,
+        'enterprise_value': present_value + pv_terminal,
+    }
+    if details:
+        valuation['cash_flows'] = cash_flows
+        valuation['pv_cash_flows'] = pv_cash_flows
+    return valuation
@@ -26,6 +26,7 @@ from .config.logging_config import (
     log_error_with_context,
     log_valuation_result,
 )
+from .dcf_kernels import present_values, project_cash_flows
 from .error_handling import create_error_context, handle_valuation_error
 from .exceptions import InsufficientDataError, ModelNotSuitableError
 
@@ -379,36 +380,23 @@ def _project_dividend_and_growth(
     base_fcf: float, dividend_metrics: Dict, growth_rates: List[float], projection_years: int
 ) -> Dict:
     """Project future dividends and cash flows based on capital allocation."""
-    projections = {
-        "fcf_projections": [],
-        "dividend_projections": [],
-        "reinvestment_projections": [],
-        "years": list(range(1, projection_years + 1)),
-    }
-
-    current_fcf = base_fcf
-    current_dividend_per_share = dividend_metrics["dividend_per_share"]
     payout_ratio = dividend_metrics["payout_ratio"]
+    fcf_projections = project_cash_flows(base_fcf, growth_rates)
 
-    for i, growth_rate in enumerate(growth_rates):
-        # Grow FCF
-        current_fcf *= 1 + growth_rate
-        projections["fcf_projections"].append(current_fcf)
-
-        # Calculate dividends based on payout ratio
-        total_dividends = current_fcf * payout_ratio
-        projections["dividend_projections"].append(total_dividends)
-
-        # Calculate reinvestment
-        reinvestment = current_fcf * (1 - payout_ratio)
-        projections["reinvestment_projections"].append(reinvestment)
-
-        # Grow dividend per share (assuming constant share count)
-        current_dividend_per_share *= 1 + growth_rate * payout_ratio
+    # Dividend per share grows at the paid-out share of FCF growth
+    # (assuming constant share count)
+    dividend_per_share = [dividend_metrics["dividend_per_share"]] + project_cash_flows(
+        dividend_metrics["dividend_per_share"], np.asarray(growth_rates, dtype=float) * payout_ratio
+    ).tolist()
 
-    projections["final_dividend_per_share"] = current_dividend_per_share
-
-    return projections
+    return {
+        "fcf_projections": fcf_projections.tolist(),
+        # Dividends based on payout ratio, the rest is reinvested
+        "dividend_projections": (fcf_projections * payout_ratio).tolist(),
+        "reinvestment_projections": (fcf_projections * (1 - payout_ratio)).tolist(),
+        "years": list(range(1, projection_years + 1)),
+        "final_dividend_per_share": dividend_per_share[-1],
+    }
 
 
 def _calculate_present_values(
@@ -423,15 +411,10 @@ def _calculate_present_values(
     """Calculate present values of dividend and growth components."""
 
     # Present value of projected dividends
-    dividend_pv = sum(
-        div / (1 + discount_rate) ** (i + 1)
-        for i, div in enumerate(projections["dividend_projections"])
-    )
+    dividend_pv = float(present_values(projections["dividend_projections"], discount_rate).sum())
 
     # Present value of projected FCF (for growth component)
-    fcf_pv = sum(
-        fcf / (1 + discount_rate) ** (i + 1) for i, fcf in enumerate(projections["fcf_projections"])
-    )
+    fcf_pv = float(present_values(projections["fcf_projections"], discount_rate).sum())
 
     # Terminal value using Gordon Growth Model
     final_fcf = projections["fcf_projections"][-1]
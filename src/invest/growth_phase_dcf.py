@@ -19,10 +19,12 @@ Author: Multi-stage growth modeling
 
 from typing import Dict, Optional
 
+import numpy as np
 import yfinance as yf
 
 from .config.constants import VALUATION_DEFAULTS
 from .config.logging_config import get_logger, log_data_fetch, log_valuation_result
+from .dcf_kernels import present_values, project_cash_flows, stage_growth_rates
 from .error_handling import create_error_context
 from .exceptions import InsufficientDataError, ModelNotSuitableError
 
@@ -370,42 +372,24 @@ def _determine_growth_phases(
 
 def _project_multi_stage_cashflows(fcf: float, growth_phases: Dict) -> Dict:
     """Project cash flows through multiple growth phases."""
-    projections = {
-        "high_growth_fcf": [],
-        "transition_fcf": [],
-        "all_fcf": [],
-        "years": [],
-        "growth_rates": [],
-    }
-
-    current_fcf = fcf
-    year = 0
-
-    # High growth phase
-    high_growth_rate = growth_phases["high_growth_rate"]
-    for i in range(growth_phases["high_growth_years"]):
-        year += 1
-        current_fcf *= (1 + high_growth_rate)
-        projections["high_growth_fcf"].append(current_fcf)
-        projections["all_fcf"].append(current_fcf)
-        projections["years"].append(year)
-        projections["growth_rates"].append(high_growth_rate)
-
-    # Transition phase
-    for i, transition_rate in enumerate(growth_phases["transition_rates"]):
-        year += 1
-        current_fcf *= (1 + transition_rate)
-        projections["transition_fcf"].append(current_fcf)
-        projections["all_fcf"].append(current_fcf)
-        projections["years"].append(year)
-        projections["growth_rates"].append(transition_rate)
-
-    # Terminal FCF (first year of terminal phase)
-    terminal_fcf = current_fcf * (1 + growth_phases["terminal_growth"])
-    projections["terminal_fcf"] = terminal_fcf
-    projections["final_projection_fcf"] = current_fcf
+    high_growth_years = growth_phases["high_growth_years"]
+    growth_rates = np.concatenate([
+        stage_growth_rates([(growth_phases["high_growth_rate"], high_growth_years)]),
+        np.asarray(growth_phases["transition_rates"], dtype=float),
+    ])
+    all_fcf = project_cash_flows(fcf, growth_rates).tolist()
+    final_projection_fcf = all_fcf[-1] if all_fcf else fcf
 
-    return projections
+    return {
+        "high_growth_fcf": all_fcf[:high_growth_years],
+        "transition_fcf": all_fcf[high_growth_years:],
+        "all_fcf": all_fcf,
+        "years": list(range(1, len(all_fcf) + 1)),
+        "growth_rates": growth_rates.tolist(),
+        # Terminal FCF (first year of terminal phase)
+        "terminal_fcf": final_projection_fcf * (1 + growth_phases["terminal_growth"]),
+        "final_projection_fcf": final_projection_fcf,
+    }
 
 
 def _calculate_multi_stage_present_values(
@@ -418,18 +402,10 @@ def _calculate_multi_stage_present_values(
 ) -> Dict:
     """Calculate present values for each growth phase."""
 
-    # Present value of high growth phase
-    high_growth_pv = sum(
-        fcf / (1 + discount_rate) ** (i + 1)
-        for i, fcf in enumerate(projections["high_growth_fcf"])
-    )
-
-    # Present value of transition phase
-    transition_start_year = growth_phases["high_growth_years"] + 1
-    transition_pv = sum(
-        fcf / (1 + discount_rate) ** (transition_start_year + i)
-        for i, fcf in enumerate(projections["transition_fcf"])
-    )
+    # Present value of the high growth and transition phases
+    pv_fcf = present_values(projections["all_fcf"], discount_rate)
+    high_growth_pv = float(pv_fcf[:len(projections["high_growth_fcf"])].sum())
+    transition_pv = float(pv_fcf[len(projections["high_growth_fcf"]):].sum())
 
     # Terminal value using Gordon Growth Model
     terminal_fcf = projections["terminal_fcf"]
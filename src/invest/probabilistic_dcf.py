@@ -11,6 +11,12 @@ Key Benefits:
 - Identifies most sensitive assumptions
 - Professional-grade probabilistic analysis
 
+Scenarios are evaluated as arrays (scenarios × projection years in one
+broadcasted computation), and ``calculate_monte_carlo_dcf_batch`` values a
+whole universe in one pass from already-extracted base metrics. With a seed,
+each ticker's scenarios are reproducible and do not depend on which other
+tickers are in the batch.
+
 Output Example:
 - Fair Value: $45.67 (Median)
 - 68% Confidence Range: $38.12 - $52.34
@@ -19,12 +25,14 @@ Output Example:
 - Key risk factors: Revenue growth uncertainty, margin compression risk
 """
 
-from typing import Dict, List
+import zlib
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import yfinance as yf
 
 from .config.logging_config import get_logger, log_data_fetch, log_valuation_result
+from .dcf_kernels import dcf_valuation
 from .error_handling import create_error_context
 from .exceptions import InsufficientDataError, ModelNotSuitableError
 
@@ -34,6 +42,31 @@ logger = get_logger(__name__)
 DEFAULT_ITERATIONS = 10000
 PROJECTION_YEARS = 10
 
+# Annual volatility when price history is missing
+DEFAULT_VOLATILITY = 0.25
+
+# Percentiles of the fair-value distribution reported with the results
+FAIR_VALUE_PERCENTILES = [1, 5, 10, 25, 50, 75, 90, 95, 99]
+
+# Economic factors tend to be correlated:
+# [revenue growth, FCF margin, discount rate, terminal growth]
+SHOCK_CORRELATION = np.array([
+    [1.0, 0.3, -0.2, 0.1],   # Revenue growth vs [growth, margin, discount, terminal]
+    [0.3, 1.0, -0.1, 0.2],   # Margin vs others
+    [-0.2, -0.1, 1.0, -0.3], # Discount rate vs others (negative correlation)
+    [0.1, 0.2, -0.3, 1.0]    # Terminal growth vs others
+])
+
+# Scenario bounds (low, high)
+REVENUE_GROWTH_BOUNDS = (-0.5, 1.0)  # -50% to 100%
+FCF_MARGIN_BOUNDS = (0.01, 0.30)     # 1% to 30%
+DISCOUNT_RATE_BOUNDS = (0.05, 0.25)  # 5% to 25%
+TERMINAL_GROWTH_BOUNDS = (0.0, 0.06) # 0% to 6%
+MIN_GROWTH_SPREAD = 0.01             # terminal growth stays this far below the discount rate
+
+# Array elements per batch chunk (tickers × iterations × projection years)
+MAX_CHUNK_ELEMENTS = 1 << 22
+
 
 def calculate_monte_carlo_dcf(
     ticker: str,
@@ -47,6 +80,7 @@ def calculate_monte_carlo_dcf(
     base_discount_rate: float = 0.12,
     base_terminal_growth: float = 0.025,
     use_correlation: bool = True,  # Model correlation between variables
+    seed: Optional[int] = None,
     verbose: bool = True,
 ) -> Dict:
     """
@@ -79,6 +113,8 @@ def calculate_monte_carlo_dcf(
         Base terminal growth rate before uncertainty, default 2.5%
     use_correlation : bool
         Whether to model correlations between variables, default True
+    seed : int, optional
+        Seed for reproducible scenarios (same as in a batch), default random
     verbose : bool
         Whether to print detailed results, default True
 
@@ -103,14 +139,128 @@ def calculate_monte_carlo_dcf(
 
     # Extract base financial metrics
     base_metrics = _extract_base_metrics(info, financials, cashflow, ticker)
+    _check_base_metrics(ticker, base_metrics)
+
+    uncertainty = {
+        'revenue_growth_uncertainty': revenue_growth_uncertainty,
+        'margin_uncertainty': margin_uncertainty,
+        'discount_rate_uncertainty': discount_rate_uncertainty,
+        'terminal_growth_uncertainty': terminal_growth_uncertainty,
+    }
+
+    # Run Monte Carlo simulation
+    simulation_results = _run_monte_carlo_simulation(
+        base_metrics=base_metrics,
+        iterations=iterations,
+        projection_years=projection_years,
+        base_discount_rate=base_discount_rate,
+        base_terminal_growth=base_terminal_growth,
+        use_correlation=use_correlation,
+        seed=seed,
+        **uncertainty,
+    )
+
+    results = _compile_results(
+        ticker, base_metrics, simulation_results, iterations, confidence_levels, uncertainty
+    )
+
+    if verbose:
+        _print_monte_carlo_analysis(results, ticker)
+
+    return results
+
+
+def calculate_monte_carlo_dcf_batch(
+    base_metrics: Dict[str, Dict],
+    iterations: int = DEFAULT_ITERATIONS,
+    confidence_levels: List[float] = [0.68, 0.95],
+    revenue_growth_uncertainty: float = 0.05,
+    margin_uncertainty: float = 0.02,
+    discount_rate_uncertainty: float = 0.02,
+    terminal_growth_uncertainty: float = 0.01,
+    projection_years: int = PROJECTION_YEARS,
+    base_discount_rate: float = 0.12,
+    base_terminal_growth: float = 0.025,
+    use_correlation: bool = True,
+    seed: Optional[int] = None,
+) -> Dict[str, Dict]:
+    """
+    Monte Carlo DCF of many tickers in one vectorized pass.
+
+    Takes base metrics that were already extracted (the keys
+    ``_extract_base_metrics`` returns), so no data is fetched here. All
+    tickers' scenarios are evaluated together, in chunks of at most
+    ``MAX_CHUNK_ELEMENTS`` array elements.
+
+    Parameters
+    ----------
+    base_metrics : Dict[str, Dict]
+        Ticker -> base metrics (revenue, current_price, shares_outstanding,
+        fcf_margin, revenue_growth, annual_volatility, ...)
+    iterations, confidence_levels, revenue_growth_uncertainty, margin_uncertainty,
+    discount_rate_uncertainty, terminal_growth_uncertainty, projection_years,
+    base_discount_rate, base_terminal_growth, use_correlation
+        As in ``calculate_monte_carlo_dcf``
+    seed : int, optional
+        Seed for reproducible scenarios. Each ticker's scenarios depend only
+        on the seed and the ticker, so they match ``calculate_monte_carlo_dcf``
+        with the same seed.
+
+    Returns
+    -------
+    Dict[str, Dict]
+        Ticker -> results as returned by ``calculate_monte_carlo_dcf``, or
+        ``{'ticker', 'error'}`` for tickers that could not be valued
+    """
+    uncertainty = {
+        'revenue_growth_uncertainty': revenue_growth_uncertainty,
+        'margin_uncertainty': margin_uncertainty,
+        'discount_rate_uncertainty': discount_rate_uncertainty,
+        'terminal_growth_uncertainty': terminal_growth_uncertainty,
+    }
+
+    results: Dict[str, Dict] = {}
+    valid: Dict[str, Dict] = {}
+    for ticker, metrics in base_metrics.items():
+        try:
+            _check_base_metrics(ticker, metrics)
+            valid[ticker] = metrics
+        except (InsufficientDataError, ModelNotSuitableError) as e:
+            logger.warning(f"Monte Carlo DCF skipped for {ticker}: {e}", extra={"ticker": ticker})
+            results[ticker] = {'ticker': ticker, 'error': str(e)}
+
+    simulations = _simulate_scenarios(
+        list(valid.values()),
+        iterations=iterations,
+        projection_years=projection_years,
+        base_discount_rate=base_discount_rate,
+        base_terminal_growth=base_terminal_growth,
+        use_correlation=use_correlation,
+        seed=seed,
+        **uncertainty,
+    )
+
+    for (ticker, metrics), simulation in zip(valid.items(), simulations):
+        try:
+            results[ticker] = _compile_results(
+                ticker, metrics, simulation, iterations, confidence_levels, uncertainty
+            )
+        except ModelNotSuitableError as e:
+            logger.warning(f"Monte Carlo DCF failed for {ticker}: {e}", extra={"ticker": ticker})
+            results[ticker] = {'ticker': ticker, 'error': str(e)}
+
+    return {ticker: results[ticker] for ticker in base_metrics}
 
+
+def _check_base_metrics(ticker: str, base_metrics: Dict) -> None:
+    """Raise if a ticker's base metrics can't support a Monte Carlo DCF."""
     # Validate we have essential data
     missing_data = []
-    if not base_metrics['revenue']:
+    if not base_metrics.get('revenue'):
         missing_data.append("revenue")
-    if not base_metrics['current_price']:
+    if not base_metrics.get('current_price'):
         missing_data.append("current_price")
-    if not base_metrics['shares_outstanding']:
+    if not base_metrics.get('shares_outstanding'):
         missing_data.append("shares_outstanding")
 
     if missing_data:
@@ -131,20 +281,16 @@ def calculate_monte_carlo_dcf(
         )
         # Continue with warning rather than fail - Monte Carlo can handle this
 
-    # Run Monte Carlo simulation
-    simulation_results = _run_monte_carlo_simulation(
-        base_metrics=base_metrics,
-        iterations=iterations,
-        revenue_growth_uncertainty=revenue_growth_uncertainty,
-        margin_uncertainty=margin_uncertainty,
-        discount_rate_uncertainty=discount_rate_uncertainty,
-        terminal_growth_uncertainty=terminal_growth_uncertainty,
-        projection_years=projection_years,
-        base_discount_rate=base_discount_rate,
-        base_terminal_growth=base_terminal_growth,
-        use_correlation=use_correlation,
-    )
 
+def _compile_results(
+    ticker: str,
+    base_metrics: Dict,
+    simulation_results: Dict,
+    iterations: int,
+    confidence_levels: List[float],
+    uncertainty: Dict[str, float],
+) -> Dict:
+    """Statistics, risk metrics and sensitivity of one ticker's simulated fair values."""
     # Calculate confidence intervals and statistics
     analysis_results = _analyze_monte_carlo_results(
         simulation_results=simulation_results,
@@ -166,8 +312,9 @@ def calculate_monte_carlo_dcf(
         'fair_value_mean': analysis_results['mean_value'],
         'fair_value_std': analysis_results['std_value'],
 
-        # Confidence intervals
+        # Confidence intervals and percentiles of the distribution
         'confidence_intervals': analysis_results['confidence_intervals'],
+        'fair_value_quantiles': analysis_results['quantiles'],
 
         # Risk metrics
         'downside_risk': analysis_results['downside_risk'],
@@ -189,10 +336,10 @@ def calculate_monte_carlo_dcf(
         # Model inputs and assumptions
         'base_metrics': base_metrics,
         'uncertainty_assumptions': {
-            'revenue_growth_std': revenue_growth_uncertainty,
-            'margin_std': margin_uncertainty,
-            'discount_rate_std': discount_rate_uncertainty,
-            'terminal_growth_std': terminal_growth_uncertainty,
+            'revenue_growth_std': uncertainty['revenue_growth_uncertainty'],
+            'margin_std': uncertainty['margin_uncertainty'],
+            'discount_rate_std': uncertainty['discount_rate_uncertainty'],
+            'terminal_growth_std': uncertainty['terminal_growth_uncertainty'],
         },
 
         # Raw simulation data for advanced analysis
@@ -209,33 +356,130 @@ def calculate_monte_carlo_dcf(
         "Monte Carlo DCF",
         results['fair_value'],
         margin_of_safety=results['margin_of_safety_median'],
-        confidence_range=results['confidence_intervals'][0.68]['range_pct'],
+        confidence_range=results['confidence_intervals'].get(0.68, {}).get('range_pct'),
         probability_of_loss=results['probability_of_loss'],
         iterations=iterations
     )
 
-    if verbose:
-        _print_monte_carlo_analysis(results, ticker)
-
     return results
 
 
+def distribution_details(results: Dict) -> Dict:
+    """
+    JSON-ready summary of a Monte Carlo result, for storing with the valuation.
+
+    Keeps the distribution statistics (percentiles, confidence intervals,
+    value at risk, probabilities) and the main inputs, so readers of
+    ``valuation_results.details_json`` don't need to re-simulate.
+    """
+    base_metrics = results['base_metrics']
+    return {
+        'iterations': int(results['iterations']),
+        'fair_value_median': float(results['fair_value']),
+        'fair_value_mean': float(results['fair_value_mean']),
+        'fair_value_std': float(results['fair_value_std']),
+        'quantiles': {f"p{q:02d}": float(v) for q, v in results['fair_value_quantiles'].items()},
+        'confidence_intervals': {
+            f"{level:.0%}": {key: float(value) for key, value in interval.items()}
+            for level, interval in results['confidence_intervals'].items()
+        },
+        'value_at_risk_5pct': float(results['value_at_risk_5pct']),
+        'value_at_risk_1pct': float(results['value_at_risk_1pct']),
+        'probability_of_loss': float(results['probability_of_loss']),
+        'probability_of_50pct_upside': float(results['probability_of_50pct_upside']),
+        'downside_risk': float(results['downside_risk']),
+        'upside_potential': float(results['upside_potential']),
+        'margin_of_safety_median': float(results['margin_of_safety_median']),
+        'margin_of_safety_std': float(results['margin_of_safety_std']),
+        'inputs': {
+            key: float(base_metrics[key])
+            for key in ('revenue', 'fcf_margin', 'revenue_growth', 'annual_volatility')
+        },
+        'uncertainty_assumptions': results['uncertainty_assumptions'],
+    }
+
+
+def base_metrics_from_stock_data(ticker: str, stock_data: Dict, closes: List[float]) -> Dict:
+    """
+    Base metrics from a database stock row instead of live yfinance calls.
+
+    Parameters
+    ----------
+    ticker : str
+        Stock ticker symbol
+    stock_data : Dict
+        Stock data as ``StockDataReader`` returns it (``info`` and
+        ``financials`` dicts in yfinance naming)
+    closes : List[float]
+        Recent daily closes, oldest first (e.g. from ``price_history``), for
+        the historical volatility
+
+    Returns
+    -------
+    Dict
+        Same keys as the yfinance-based extraction
+    """
+    # Missing database columns come back as None: let the defaults apply
+    info = {
+        key: value
+        for key, value in {**stock_data.get('financials', {}), **stock_data.get('info', {})}.items()
+        if value is not None
+    }
+    return _base_metrics(
+        ticker,
+        info,
+        revenue=info.get('totalRevenue'),
+        free_cash_flow=info.get('freeCashflow'),
+        annual_volatility=_annual_volatility(closes),
+    )
+
 
 def _extract_base_metrics(info: Dict, financials, cashflow, ticker: str) -> Dict:
     """Extract base financial metrics for Monte Carlo analysis."""
 
+    # Revenue and profitability
+    revenue = info.get('totalRevenue')
+    if not revenue and not financials.empty and 'Total Revenue' in financials.index:
+        revenue = financials.loc['Total Revenue'].iloc[0]
+
+    # Free cash flow
+    free_cash_flow = info.get('freeCashflow')
+    if not free_cash_flow and not cashflow.empty and 'Free Cash Flow' in cashflow.index:
+        free_cash_flow = cashflow.loc['Free Cash Flow'].iloc[0]
+
+    # Historical volatility for uncertainty scaling
+    try:
+        hist = yf.download(ticker, period="2y", progress=False, auto_adjust=True)
+        annual_volatility = _annual_volatility(np.asarray(hist['Close'], dtype=float).ravel()) if not hist.empty else DEFAULT_VOLATILITY
+    except Exception as e:
+        logger.debug(
+            f"Could not calculate volatility for {ticker}",
+            extra={"ticker": ticker, "error": str(e), "fallback_volatility": DEFAULT_VOLATILITY}
+        )
+        annual_volatility = DEFAULT_VOLATILITY
+
+    return _base_metrics(ticker, info, revenue, free_cash_flow, annual_volatility)
+
+
+def _annual_volatility(closes) -> float:
+    """Annualized volatility of daily returns (DEFAULT_VOLATILITY without enough closes)."""
+    closes = np.asarray(closes, dtype=float)
+    closes = closes[np.isfinite(closes)]
+    if len(closes) < 3:
+        return DEFAULT_VOLATILITY
+    daily_returns = closes[1:] / closes[:-1] - 1
+    return float(np.std(daily_returns, ddof=1) * np.sqrt(252))
+
+
+def _base_metrics(ticker: str, info: Dict, revenue, free_cash_flow, annual_volatility: float) -> Dict:
+    """Base metrics from yfinance-style info plus the resolved revenue, FCF and volatility."""
+
     # Current market data
     current_price = info.get('currentPrice') or info.get('regularMarketPrice')
     shares_outstanding = info.get('sharesOutstanding')
 
     # Financial metrics
     market_cap = info.get('marketCap')
-    info.get('enterpriseValue')
-
-    # Revenue and profitability
-    revenue = info.get('totalRevenue')
-    if not revenue and not financials.empty and 'Total Revenue' in financials.index:
-        revenue = financials.loc['Total Revenue'].iloc[0]
 
     # Margins
     profit_margin = info.get('profitMargins', 0.1)  # Default 10%
@@ -245,32 +489,12 @@ def _extract_base_metrics(info: Dict, financials, cashflow, ticker: str) -> Dict
     revenue_growth = info.get('revenueGrowth', 0.05)  # Default 5%
     earnings_growth = info.get('earningsGrowth', revenue_growth)
 
-    # Free cash flow
-    free_cash_flow = info.get('freeCashflow')
-    if not free_cash_flow and not cashflow.empty and 'Free Cash Flow' in cashflow.index:
-        free_cash_flow = cashflow.loc['Free Cash Flow'].iloc[0]
-
     # FCF margin calculation
     fcf_margin = 0.08  # Default 8%
     if free_cash_flow and revenue and revenue > 0:
         fcf_margin = free_cash_flow / revenue
         fcf_margin = max(0.02, min(0.25, fcf_margin))  # Clamp between 2-25%
 
-    # Historical volatility for uncertainty scaling
-    try:
-        hist = yf.download(ticker, period="2y", progress=False, auto_adjust=True)
-        if not hist.empty:
-            daily_returns = hist['Close'].pct_change().dropna()
-            annual_volatility = float(daily_returns.std().iloc[0] * np.sqrt(252)) if hasattr(daily_returns.std(), 'iloc') else float(daily_returns.std() * np.sqrt(252))
-        else:
-            annual_volatility = 0.25  # Default 25%
-    except Exception as e:
-        logger.debug(
-            f"Could not calculate volatility for {ticker}",
-            extra={"ticker": ticker, "error": str(e), "fallback_volatility": 0.25}
-        )
-        annual_volatility = 0.25
-
     return {
         'ticker': ticker,
         'current_price': current_price,
@@ -299,135 +523,174 @@ def _run_monte_carlo_simulation(
     base_discount_rate: float,
     base_terminal_growth: float,
     use_correlation: bool,
+    seed: Optional[int] = None,
 ) -> Dict:
     """Run the core Monte Carlo simulation."""
+    return _simulate_scenarios(
+        [base_metrics],
+        iterations=iterations,
+        revenue_growth_uncertainty=revenue_growth_uncertainty,
+        margin_uncertainty=margin_uncertainty,
+        discount_rate_uncertainty=discount_rate_uncertainty,
+        terminal_growth_uncertainty=terminal_growth_uncertainty,
+        projection_years=projection_years,
+        base_discount_rate=base_discount_rate,
+        base_terminal_growth=base_terminal_growth,
+        use_correlation=use_correlation,
+        seed=seed,
+    )[0]
+
+
+def _ticker_rng(ticker: str, seed: Optional[int]) -> np.random.Generator:
+    """Random generator of one ticker's scenarios (independent of other tickers)."""
+    if seed is None:
+        return np.random.default_rng()
+    return np.random.default_rng([seed, zlib.crc32(str(ticker).encode())])
 
+
+def _scenario_inputs(
+    base_metrics: Dict,
+    rng: np.random.Generator,
+    iterations: int,
+    revenue_growth_uncertainty: float,
+    margin_uncertainty: float,
+    discount_rate_uncertainty: float,
+    terminal_growth_uncertainty: float,
+    base_discount_rate: float,
+    base_terminal_growth: float,
+    use_correlation: bool,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Randomized (revenue growth, FCF margin, discount rate, terminal growth)
+    of each scenario, within bounds and with terminal growth below the
+    discount rate.
+    """
     # Scale uncertainty based on company volatility
     volatility_multiplier = min(2.0, base_metrics['annual_volatility'] / 0.20)  # Scale vs 20% baseline
 
-    adj_revenue_growth_std = revenue_growth_uncertainty * volatility_multiplier
-    adj_margin_std = margin_uncertainty * volatility_multiplier
+    stds = np.array([
+        revenue_growth_uncertainty * volatility_multiplier,
+        margin_uncertainty * volatility_multiplier,
+        discount_rate_uncertainty,
+        terminal_growth_uncertainty,
+    ])
 
-    # Storage for results
-    fair_values = []
-    margins_of_safety = []
-
-    # Generate correlated random variables if requested
+    # Standard normal shocks, correlated if requested
+    shocks = rng.standard_normal((iterations, 4))
     if use_correlation:
-        # Economic factors tend to be correlated
-        correlation_matrix = np.array([
-            [1.0, 0.3, -0.2, 0.1],   # Revenue growth vs [growth, margin, discount, terminal]
-            [0.3, 1.0, -0.1, 0.2],   # Margin vs others
-            [-0.2, -0.1, 1.0, -0.3], # Discount rate vs others (negative correlation)
-            [0.1, 0.2, -0.3, 1.0]    # Terminal growth vs others
-        ])
-
-        # Generate multivariate normal samples
-        random_samples = np.random.multivariate_normal(
-            mean=[0, 0, 0, 0],
-            cov=correlation_matrix,
-            size=iterations
-        )
-    else:
-        # Independent random variables
-        random_samples = np.random.normal(0, 1, (iterations, 4))
+        shocks = shocks @ np.linalg.cholesky(SHOCK_CORRELATION).T
+    shocks *= stds
 
-    # Run simulation
-    for i in range(iterations):
-        try:
-            # Generate random scenario
-            if use_correlation:
-                growth_shock = random_samples[i, 0] * adj_revenue_growth_std
-                margin_shock = random_samples[i, 1] * adj_margin_std
-                discount_shock = random_samples[i, 2] * discount_rate_uncertainty
-                terminal_shock = random_samples[i, 3] * terminal_growth_uncertainty
-            else:
-                growth_shock = np.random.normal(0, adj_revenue_growth_std)
-                margin_shock = np.random.normal(0, adj_margin_std)
-                discount_shock = np.random.normal(0, discount_rate_uncertainty)
-                terminal_shock = np.random.normal(0, terminal_growth_uncertainty)
-
-            # Apply shocks to base assumptions
-            scenario_revenue_growth = base_metrics['revenue_growth'] + growth_shock
-            scenario_fcf_margin = base_metrics['fcf_margin'] + margin_shock
-            scenario_discount_rate = base_discount_rate + discount_shock
-            scenario_terminal_growth = base_terminal_growth + terminal_shock
-
-            # Ensure reasonable bounds
-            scenario_revenue_growth = max(-0.5, min(1.0, scenario_revenue_growth))  # -50% to 100%
-            scenario_fcf_margin = max(0.01, min(0.30, scenario_fcf_margin))        # 1% to 30%
-            scenario_discount_rate = max(0.05, min(0.25, scenario_discount_rate))  # 5% to 25%
-            scenario_terminal_growth = max(0.0, min(0.06, scenario_terminal_growth)) # 0% to 6%
-
-            # Ensure terminal growth < discount rate
-            scenario_terminal_growth = min(scenario_terminal_growth, scenario_discount_rate - 0.01)
-
-            # Run single DCF scenario
-            fair_value = _single_dcf_scenario(
-                base_revenue=base_metrics['revenue'],
-                shares_outstanding=base_metrics['shares_outstanding'],
-                revenue_growth=scenario_revenue_growth,
-                fcf_margin=scenario_fcf_margin,
-                discount_rate=scenario_discount_rate,
-                terminal_growth=scenario_terminal_growth,
-                projection_years=projection_years,
-            )
+    # Apply shocks to base assumptions, within reasonable bounds
+    revenue_growth = np.clip(base_metrics['revenue_growth'] + shocks[:, 0], *REVENUE_GROWTH_BOUNDS)
+    fcf_margin = np.clip(base_metrics['fcf_margin'] + shocks[:, 1], *FCF_MARGIN_BOUNDS)
+    discount_rate = np.clip(base_discount_rate + shocks[:, 2], *DISCOUNT_RATE_BOUNDS)
+    terminal_growth = np.clip(base_terminal_growth + shocks[:, 3], *TERMINAL_GROWTH_BOUNDS)
 
-            # Calculate margin of safety
-            margin_of_safety = (fair_value - base_metrics['current_price']) / base_metrics['current_price']
+    # Ensure terminal growth < discount rate
+    terminal_growth = np.minimum(terminal_growth, discount_rate - MIN_GROWTH_SPREAD)
 
-            fair_values.append(fair_value)
-            margins_of_safety.append(margin_of_safety)
+    return revenue_growth, fcf_margin, discount_rate, terminal_growth
 
-        except Exception as e:
-            # Handle individual scenario failures gracefully
-            logger.debug(
-                f"Monte Carlo scenario {i} failed",
-                extra={"ticker": base_metrics['ticker'], "scenario": i, "error": str(e)}
-            )
-            continue
 
-    return {
-        'fair_values': np.array(fair_values),
-        'margins_of_safety': np.array(margins_of_safety),
-    }
+def _simulate_scenarios(
+    base_metrics: List[Dict],
+    iterations: int,
+    revenue_growth_uncertainty: float,
+    margin_uncertainty: float,
+    discount_rate_uncertainty: float,
+    terminal_growth_uncertainty: float,
+    projection_years: int,
+    base_discount_rate: float,
+    base_terminal_growth: float,
+    use_correlation: bool,
+    seed: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Simulated fair values and margins of safety of several tickers.
 
+    Scenario inputs are drawn per ticker; the DCF itself runs on
+    (tickers × iterations) arrays, a chunk of tickers at a time.
+    """
+    if not base_metrics:
+        return []
+
+    inputs = np.array([
+        _scenario_inputs(
+            metrics,
+            _ticker_rng(metrics.get('ticker', i), seed),
+            iterations,
+            revenue_growth_uncertainty,
+            margin_uncertainty,
+            discount_rate_uncertainty,
+            terminal_growth_uncertainty,
+            base_discount_rate,
+            base_terminal_growth,
+            use_correlation,
+        )
+        for i, metrics in enumerate(base_metrics)
+    ])  # (tickers, 4, iterations)
+
+    revenue = np.array([m['revenue'] for m in base_metrics], dtype=float)
+    shares = np.array([m['shares_outstanding'] for m in base_metrics], dtype=float)
+    price = np.array([m['current_price'] for m in base_metrics], dtype=float)
+
+    fair_values = np.empty((len(base_metrics), iterations))
+    chunk = max(1, MAX_CHUNK_ELEMENTS // max(1, iterations * projection_years))
+    for lo in range(0, len(base_metrics), chunk):
+        rows = slice(lo, lo + chunk)
+        fair_values[rows] = _dcf_scenarios(
+            base_revenue=revenue[rows, None],
+            shares_outstanding=shares[rows, None],
+            revenue_growth=inputs[rows, 0],
+            fcf_margin=inputs[rows, 1],
+            discount_rate=inputs[rows, 2],
+            terminal_growth=inputs[rows, 3],
+            projection_years=projection_years,
+        )
 
-def _single_dcf_scenario(
-    base_revenue: float,
-    shares_outstanding: float,
-    revenue_growth: float,
-    fcf_margin: float,
-    discount_rate: float,
-    terminal_growth: float,
-    projection_years: int,
-) -> float:
-    """Calculate DCF for a single Monte Carlo scenario."""
+    # Calculate margin of safety
+    margins_of_safety = (fair_values - price[:, None]) / price[:, None]
 
-    if not shares_outstanding or shares_outstanding <= 0:
-        raise ValueError("Invalid shares outstanding")
+    return [
+        {'fair_values': fair_values[i], 'margins_of_safety': margins_of_safety[i]}
+        for i in range(len(base_metrics))
+    ]
 
-    # Project free cash flows
-    present_value = 0
-    current_revenue = base_revenue
 
-    for year in range(1, projection_years + 1):
-        # Revenue growth with gradual decay toward terminal growth
-        decay_factor = max(0.1, 1 - (year - 1) / projection_years)
-        year_growth = terminal_growth + (revenue_growth - terminal_growth) * decay_factor
+def _dcf_scenarios(
+    base_revenue: np.ndarray,
+    shares_outstanding: np.ndarray,
+    revenue_growth: np.ndarray,
+    fcf_margin: np.ndarray,
+    discount_rate: np.ndarray,
+    terminal_growth: np.ndarray,
+    projection_years: int,
+) -> np.ndarray:
+    """
+    Fair value per share of every scenario (inputs broadcast together).
 
-        current_revenue *= (1 + year_growth)
-        fcf = current_revenue * fcf_margin
+    Revenue growth decays linearly from the scenario's growth toward terminal
+    growth (decay factor floored at 0.1); the projected FCFs and a Gordon
+    terminal value are discounted at the scenario's rate. Scenarios with
+    non-positive shares outstanding are NaN.
+    """
+    years = np.arange(1, projection_years + 1)
+    decay_factor = np.maximum(0.1, 1 - (years - 1) / projection_years)
 
-        present_value += fcf / ((1 + discount_rate) ** year)
+    revenue_growth = np.asarray(revenue_growth, dtype=float)[..., None]
+    terminal_growth = np.asarray(terminal_growth, dtype=float)
 
-    # Terminal value
-    terminal_fcf = current_revenue * fcf_margin * (1 + terminal_growth)
-    terminal_value = terminal_fcf / (discount_rate - terminal_growth)
-    present_value += terminal_value / ((1 + discount_rate) ** projection_years)
+    # scenarios × years; FCF is a constant margin of revenue, so it grows
+    # with revenue from base_revenue * fcf_margin
+    year_growth = terminal_growth[..., None] + (revenue_growth - terminal_growth[..., None]) * decay_factor
+    base_fcf = np.asarray(base_revenue, dtype=float) * np.asarray(fcf_margin, dtype=float)
+    present_value = dcf_valuation(base_fcf, year_growth, discount_rate, terminal_growth)['enterprise_value']
 
     # Fair value per share
-    return present_value / shares_outstanding
+    shares_outstanding = np.asarray(shares_outstanding, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(shares_outstanding > 0, present_value / shares_outstanding, np.nan)
 
 
 def _analyze_monte_carlo_results(
@@ -487,6 +750,9 @@ def _analyze_monte_carlo_results(
     var_5pct = np.percentile(fair_values, 5)  # 5% worst case
     var_1pct = np.percentile(fair_values, 1)  # 1% worst case
 
+    # Distribution summary
+    quantiles = dict(zip(FAIR_VALUE_PERCENTILES, np.percentile(fair_values, FAIR_VALUE_PERCENTILES)))
+
     # Margin of safety statistics
     margin_of_safety_median = np.median(margins_of_safety)
     margin_of_safety_mean = np.mean(margins_of_safety)
@@ -497,6 +763,7 @@ def _analyze_monte_carlo_results(
         'mean_value': mean_value,
         'std_value': std_value,
         'confidence_intervals': confidence_intervals,
+        'quantiles': quantiles,
         'downside_risk': downside_risk,
         'upside_potential': upside_potential,
         'prob_loss': prob_loss,
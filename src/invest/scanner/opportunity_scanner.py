@@ -52,7 +52,9 @@ class OpportunityScanner:
     def __init__(
         self,
         weights: Optional[Dict[str, float]] = None,
-        db_path: Optional[Path] = None
+        db_path: Optional[Path] = None,
+        workers: int = 1,
+        vectorized: bool = False
     ):
         """
         Initialize the opportunity scanner.
@@ -63,7 +65,15 @@ class OpportunityScanner:
             Custom component weights for scoring
         db_path : Path, optional
             Path to SQLite database
+        workers : int
+            Scoring processes passed to ``ScoringEngine.score_universe``
+            (1 = serial, 0 = all cores)
+        vectorized : bool
+            Use the NumPy array scoring backend (same scores to float
+            rounding, no per-component details)
         """
+        self.workers = workers
+        self.vectorized = vectorized
         self.scoring_engine = ScoringEngine(weights=weights)
         self.threshold_manager = ThresholdManager(db_path=db_path)
         self.notifier = TelegramNotifier()
@@ -102,7 +112,9 @@ class OpportunityScanner:
         logger.info(f"Scanning {len(tickers)} stocks for {date}")
 
         # Score all stocks
-        all_scores = self.scoring_engine.score_universe(tickers)
+        all_scores = self.scoring_engine.score_universe(
+            tickers, workers=self.workers, vectorized=self.vectorized
+        )
         logger.info(f"Scored {len(all_scores)} stocks successfully")
 
         # Get dynamic threshold
@@ -217,7 +229,9 @@ class OpportunityScanner:
         if tickers is None:
             tickers = self.reader.get_all_tickers()
 
-        scores = self.scoring_engine.score_universe(tickers)
+        scores = self.scoring_engine.score_universe(
+            tickers, workers=self.workers, vectorized=self.vectorized
+        )
         return scores[:limit]
 
     def backtest_threshold(
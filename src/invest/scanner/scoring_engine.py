@@ -7,11 +7,17 @@ A stock with P/E=19 isn't discarded - it just scores slightly lower than P/E=17.
 
 import logging
 import math
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, List
 
 from ..data.stock_data_reader import StockDataReader
-from ..valuation.db_utils import get_db_connection, get_latest_predictions
+from ..valuation.db_utils import (
+    get_db_connection,
+    get_latest_predictions,
+    get_latest_predictions_bulk,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +61,21 @@ class ScoringEngine:
         'catalyst': 0.15,
     }
 
+    # Sector stability scores used by score_risk (unknown sectors: 50)
+    SECTOR_RISK_SCORES = {
+        'Consumer Staples': 80,
+        'Utilities': 75,
+        'Healthcare': 70,
+        'Communication Services': 60,
+        'Industrials': 55,
+        'Consumer Discretionary': 50,
+        'Technology': 50,
+        'Materials': 45,
+        'Financials': 45,
+        'Energy': 40,
+        'Real Estate': 55,
+    }
+
     def __init__(self, weights: Optional[Dict[str, float]] = None):
         """
         Initialize scoring engine with optional custom weights.
@@ -195,6 +216,30 @@ class ScoringEngine:
         High accruals → earnings driven by accounting, not cash (Enron-style).
         Low/negative accruals → earnings backed by real cash flows.
         """
+        accruals, details = self._accrual_ratio(data)
+        if accruals is None:
+            return None, details
+
+        # Score: accruals 0.10 (10%) = poor, 0.03 = good, -0.05 = excellent
+        # Using inverse normalization: lower accruals → higher score
+        accrual_pct = accruals * 100
+        accrual_score = self.normalize(accrual_pct, -5, 3, 10, inverse=True)
+
+        return accrual_score, {
+            'accrual_ratio': round(accruals, 4),
+            'accrual_pct': round(accrual_pct, 2),
+            'score': round(accrual_score, 1),
+            **details,
+            'quality': 'high' if accruals < 0.03 else 'moderate' if accruals < 0.07 else 'low',
+        }
+
+    @staticmethod
+    def _accrual_ratio(data: Dict[str, Any]) -> tuple[Optional[float], Dict[str, Any]]:
+        """
+        Compute (Net Income - Operating Cash Flow) / Total Assets.
+
+        Returns (accruals, inputs) or (None, {'status': reason}).
+        """
         import json
 
         # Extract multi-year income data
@@ -247,24 +292,12 @@ class ScoringEngine:
             return None, {'status': 'invalid_total_assets'}
 
         accruals = (net_income - operating_cf) / total_assets
-
-        # Score: accruals 0.10 (10%) = poor, 0.03 = good, -0.05 = excellent
-        # Using inverse normalization: lower accruals → higher score
-        accrual_pct = accruals * 100
-        accrual_score = self.normalize(accrual_pct, -5, 3, 10, inverse=True)
-
-        details = {
-            'accrual_ratio': round(accruals, 4),
-            'accrual_pct': round(accrual_pct, 2),
-            'score': round(accrual_score, 1),
+        return accruals, {
             'net_income': net_income,
             'operating_cashflow': operating_cf,
             'total_assets': total_assets,
-            'quality': 'high' if accruals < 0.03 else 'moderate' if accruals < 0.07 else 'low',
         }
 
-        return accrual_score, details
-
     def score_value(
         self,
         data: Dict[str, Any],
@@ -351,20 +384,7 @@ class ScoringEngine:
 
         # Sector-based risk adjustment
         sector = data.get('info', {}).get('sector', '')
-        sector_risk = {
-            'Consumer Staples': 80,
-            'Utilities': 75,
-            'Healthcare': 70,
-            'Communication Services': 60,
-            'Industrials': 55,
-            'Consumer Discretionary': 50,
-            'Technology': 50,
-            'Materials': 45,
-            'Financials': 45,
-            'Energy': 40,
-            'Real Estate': 55,
-        }
-        sector_score = sector_risk.get(sector, 50)
+        sector_score = self.SECTOR_RISK_SCORES.get(sector, 50)
         scores.append(sector_score)
         details['sector_stability'] = {'value': sector, 'score': sector_score}
 
@@ -633,9 +653,8 @@ class ScoringEngine:
             Stock ticker symbol
         conn : optional
             An open DB connection to reuse for this ticker's reads. If None, a
-            fresh connection is opened and closed here. Passing one shared
-            connection (see ``score_universe``) avoids ~7 connection handshakes
-            per ticker, which otherwise stalls a full scan over the SSH tunnel.
+            pooled connection is checked out and returned here. To score many
+            tickers use ``score_universe``, which bulk-loads them instead.
 
         Returns
         -------
@@ -657,6 +676,30 @@ class ScoringEngine:
         if own_conn:
             conn.close()
 
+        return self.score_loaded(ticker, data, valuations)
+
+    def score_loaded(
+        self,
+        ticker: str,
+        data: Dict[str, Any],
+        valuations: Dict[str, Any]
+    ) -> OpportunityScore:
+        """
+        Score a stock from already-loaded data (no DB access).
+
+        Parameters
+        ----------
+        ticker : str
+            Stock ticker symbol
+        data : dict
+            Stock data in the ``StockDataReader.get_stock_data`` shape
+        valuations : dict
+            Latest predictions in the ``get_latest_predictions`` shape
+
+        Returns
+        -------
+        OpportunityScore
+        """
         # Calculate component scores
         quality_score, quality_details = self.score_quality(data)
         value_score, value_details = self.score_value(data, valuations)
@@ -673,6 +716,35 @@ class ScoringEngine:
             catalyst_score * self.weights['catalyst']
         )
 
+        return self._build_score(
+            ticker, data, valuations,
+            opportunity_score=opportunity_score,
+            components={
+                'quality': quality_score,
+                'value': value_score,
+                'growth': growth_score,
+                'risk': risk_score,
+                'catalyst': catalyst_score,
+            },
+            component_details={
+                'quality': quality_details,
+                'value': value_details,
+                'growth': growth_details,
+                'risk': risk_details,
+                'catalyst': catalyst_details,
+            },
+        )
+
+    @staticmethod
+    def _build_score(
+        ticker: str,
+        data: Dict[str, Any],
+        valuations: Dict[str, Any],
+        opportunity_score: float,
+        components: Dict[str, float],
+        component_details: Dict[str, Any]
+    ) -> OpportunityScore:
+        """Assemble an OpportunityScore (display metrics, fair values, rounding)."""
         # Extract key metrics for display
         info = data.get('info', {})
         financials = data.get('financials', {})
@@ -706,26 +778,25 @@ class ScoringEngine:
             ticker=ticker,
             company_name=info.get('longName') or info.get('shortName') or ticker,
             opportunity_score=round(opportunity_score, 1),
-            quality_score=round(quality_score, 1),
-            value_score=round(value_score, 1),
-            growth_score=round(growth_score, 1),
-            risk_score=round(risk_score, 1),
-            catalyst_score=round(catalyst_score, 1),
+            quality_score=round(components['quality'], 1),
+            value_score=round(components['value'], 1),
+            growth_score=round(components['growth'], 1),
+            risk_score=round(components['risk'], 1),
+            catalyst_score=round(components['catalyst'], 1),
             current_price=info.get('currentPrice') or data.get('price_data', {}).get('current_price') or 0,
             dcf_fair_value=dcf_fv,
             rim_fair_value=rim_fv,
             ensemble_fair_value=ensemble_fv,
             key_metrics=key_metrics,
-            component_details={
-                'quality': quality_details,
-                'value': value_details,
-                'growth': growth_details,
-                'risk': risk_details,
-                'catalyst': catalyst_details,
-            }
+            component_details=component_details
         )
 
-    def score_universe(self, tickers: List[str]) -> List[OpportunityScore]:
+    def score_universe(
+        self,
+        tickers: List[str],
+        workers: int = 1,
+        vectorized: bool = False
+    ) -> List[OpportunityScore]:
         """
         Score all stocks in a universe.
 
@@ -733,34 +804,69 @@ class ScoringEngine:
         ----------
         tickers : list
             List of ticker symbols
+        workers : int
+            Scoring processes. 1 (default) scores in-process; N > 1 bulk-loads
+            once here, then shards the loaded data across N worker processes;
+            0 uses every core. The result is identical to the serial path.
+        vectorized : bool
+            Score the whole universe as NumPy array operations (see
+            ``vectorized_scoring``) instead of ticker by ticker. Scores match
+            to float rounding; ``component_details`` is left empty.
+            ``workers`` is ignored.
 
         Returns
         -------
         list
             Sorted list of OpportunityScore objects (highest first)
         """
-        scores = []
-        # One shared connection for the whole universe instead of ~7 per ticker.
-        # autocommit=True keeps every read in its own statement, so a failure on
-        # one ticker can't poison the connection for the rest and no long-lived
-        # transaction is held open across the scan.
+        # Bulk-load the whole universe up front: one current_stock_data query,
+        # one query per sub-signal family and one for valuations, instead of
+        # ~7 per ticker. autocommit=True keeps every read in its own statement,
+        # so a failing query can't poison the connection for the rest and no
+        # long-lived transaction is held open across the scan.
         conn = get_db_connection()
         conn.autocommit = True
         try:
-            for ticker in tickers:
-                try:
-                    score = self.score_stock(ticker, conn=conn)
-                except Exception as e:
-                    logger.warning(f"Scoring failed for {ticker}: {e}")
-                    continue
-                if score:
-                    scores.append(score)
+            data_by_ticker = self.reader.get_stock_data_bulk(tickers, conn=conn)
+            valuations_by_ticker = get_latest_predictions_bulk(conn, list(data_by_ticker))
         finally:
             conn.close()
 
+        items = [
+            (ticker, data_by_ticker[ticker], valuations_by_ticker.get(ticker, {}))
+            for ticker in tickers
+            if data_by_ticker.get(ticker)
+        ]
+
+        if vectorized:
+            from .vectorized_scoring import score_items
+            scores = score_items(items, self.weights)
+            scores.sort(key=lambda x: x.opportunity_score, reverse=True)
+            return scores
+
+        if workers == 0:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(items))
+
+        if workers > 1:
+            # Contiguous shards, merged back in submission order, so the
+            # pre-sort sequence (and therefore the stable sort) matches serial.
+            shard_size = -(-len(items) // (workers * 4))
+            shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = [
+                    score
+                    for shard_scores in pool.map(_score_shard, [self] * len(shards), shards)
+                    for score in shard_scores
+                ]
+            scores = [score for score in results if score is not None]
+        else:
+            scores = [score for score in _score_shard(self, items) if score is not None]
+
         # Sort by opportunity score (highest first)
         scores.sort(key=lambda x: x.opportunity_score, reverse=True)
         return scores
+
     def score_growth(self, data: Dict[str, Any]) -> tuple[float, Dict[str, Any]]:
         """
         Score growth potential.
@@ -772,36 +878,9 @@ class ScoringEngine:
         scores = []
         valid_growth_data = False
 
-        financials = data.get('financials', {})
-        income_json = data.get('income') or data.get('income_json')
-        
-        # Helper to calculate CAGR
-        def calculate_cagr(start_val, end_val, years):
-            if start_val is None or end_val is None or start_val <= 0 or end_val <= 0 or years <= 0:
-                return None
-            return (end_val / start_val) ** (1 / years) - 1
+        rev_cagr, earn_cagr = self._growth_cagrs(data)
 
         # 1. Revenue Growth (CAGR Priority)
-        rev_cagr = None
-        
-        if income_json:
-            import json
-            try:
-                if isinstance(income_json, str):
-                    income_data = json.loads(income_json)
-                else:
-                    income_data = income_json
-                
-                rev_row = next((row for row in income_data if row.get("index") in ["Total Revenue", "Operating Revenue"]), None)
-                if rev_row:
-                    dates = sorted([k for k in rev_row.keys() if k != "index"], reverse=True)
-                    if len(dates) >= 4:
-                        latest_rev = rev_row[dates[0]]
-                        past_rev = rev_row[dates[3]]
-                        rev_cagr = calculate_cagr(past_rev, latest_rev, 3)
-            except Exception:
-                pass
-
         if rev_cagr is not None:
             rg_score = self.normalize(rev_cagr * 100, 0, 10, 25)
             scores.append(rg_score)
@@ -814,30 +893,6 @@ class ScoringEngine:
             details['revenue_growth'] = None
 
         # 2. Earnings Growth (CAGR Priority)
-        earn_cagr = None
-        if income_json:
-            import json
-            try:
-                if isinstance(income_json, str):
-                    income_data = json.loads(income_json)
-                else:
-                    income_data = income_json
-                
-                ni_row = next((row for row in income_data if row.get("index") in ["Net Income", "Net Income Common Stockholders"]), None)
-                if ni_row:
-                    dates = sorted([k for k in ni_row.keys() if k != "index"], reverse=True)
-                    if len(dates) >= 4:
-                        latest_ni = ni_row[dates[0]]
-                        past_ni = ni_row[dates[3]]
-                        if past_ni > 0:
-                            earn_cagr = calculate_cagr(past_ni, latest_ni, 3)
-                        elif latest_ni > 0:
-                            earn_cagr = 0.5 
-                        else:
-                            earn_cagr = -0.1 
-            except Exception:
-                pass
-
         if earn_cagr is not None:
             eg_score = self.normalize(earn_cagr * 100, 0, 12, 30)
             scores.append(eg_score)
@@ -861,4 +916,82 @@ class ScoringEngine:
              return 0.0, details
 
         final_score = sum(scores) / len(scores) if scores else 0.0
-        return final_score, details
\ No newline at end of file
+        return final_score, details
+
+    @staticmethod
+    def _growth_cagrs(data: Dict[str, Any]) -> tuple[Optional[float], Optional[float]]:
+        """3-year revenue and earnings CAGR from the income statement (None if unavailable)."""
+        import json
+
+        income_json = data.get('income') or data.get('income_json')
+
+        # Helper to calculate CAGR
+        def calculate_cagr(start_val, end_val, years):
+            if start_val is None or end_val is None or start_val <= 0 or end_val <= 0 or years <= 0:
+                return None
+            return (end_val / start_val) ** (1 / years) - 1
+
+        rev_cagr = None
+        earn_cagr = None
+        if not income_json:
+            return rev_cagr, earn_cagr
+
+        try:
+            if isinstance(income_json, str):
+                income_data = json.loads(income_json)
+            else:
+                income_data = income_json
+
+            rev_row = next((row for row in income_data if row.get("index") in ["Total Revenue", "Operating Revenue"]), None)
+            if rev_row:
+                dates = sorted([k for k in rev_row.keys() if k != "index"], reverse=True)
+                if len(dates) >= 4:
+                    latest_rev = rev_row[dates[0]]
+                    past_rev = rev_row[dates[3]]
+                    rev_cagr = calculate_cagr(past_rev, latest_rev, 3)
+        except Exception:
+            pass
+
+        try:
+            if isinstance(income_json, str):
+                income_data = json.loads(income_json)
+            else:
+                income_data = income_json
+
+            ni_row = next((row for row in income_data if row.get("index") in ["Net Income", "Net Income Common Stockholders"]), None)
+            if ni_row:
+                dates = sorted([k for k in ni_row.keys() if k != "index"], reverse=True)
+                if len(dates) >= 4:
+                    latest_ni = ni_row[dates[0]]
+                    past_ni = ni_row[dates[3]]
+                    if past_ni > 0:
+                        earn_cagr = calculate_cagr(past_ni, latest_ni, 3)
+                    elif latest_ni > 0:
+                        earn_cagr = 0.5
+                    else:
+                        earn_cagr = -0.1
+        except Exception:
+            pass
+
+        return rev_cagr, earn_cagr
+
+
+def _score_shard(
+    engine: ScoringEngine,
+    items: List[tuple]
+) -> List[Optional[OpportunityScore]]:
+    """
+    Score a shard of pre-loaded ``(ticker, data, valuations)`` items.
+
+    Module-level so it can run in a worker process (the engine is pickled
+    with its weights); returns None in place of any ticker whose scoring
+    raised, keeping positions aligned with ``items``.
+    """
+    scores: List[Optional[OpportunityScore]] = []
+    for ticker, data, valuations in items:
+        try:
+            scores.append(engine.score_loaded(ticker, data, valuations))
+        except Exception as e:
+            logger.warning(f"Scoring failed for {ticker}: {e}")
+            scores.append(None)
+    return scores
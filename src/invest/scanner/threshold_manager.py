@@ -5,12 +5,13 @@ Adjusts the notification threshold to maintain an average of ~1 notification per
 The scoring formula never changes - only "how good does an opportunity need to be today?"
 """
 
+from contextlib import closing
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, List, Tuple
 
-from invest.data.db import get_connection
+from invest.data.db import get_pooled_connection, upsert_rows
 
 
 @dataclass
@@ -50,63 +51,62 @@ class ThresholdManager:
         Parameters
         ----------
         db_path : Path, optional
-            Ignored (kept for backward compatibility). Connections come from get_connection().
+            Ignored (kept for backward compatibility). Connections come from the shared pool.
         """
         self._ensure_tables()
 
     def _ensure_tables(self) -> None:
         """Create scanner tables if they don't exist."""
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Threshold history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scanner_threshold_history (
-                id SERIAL PRIMARY KEY,
-                date TEXT NOT NULL,
-                threshold REAL NOT NULL,
-                best_score REAL,
-                stocks_above INTEGER DEFAULT 0,
-                notification_sent INTEGER DEFAULT 0,
-                notified_ticker TEXT,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(date)
-            )
-        ''')
-
-        # Score history table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scanner_score_history (
-                id SERIAL PRIMARY KEY,
-                date TEXT NOT NULL,
-                ticker TEXT NOT NULL,
-                opportunity_score REAL NOT NULL,
-                quality_score REAL,
-                value_score REAL,
-                growth_score REAL,
-                risk_score REAL,
-                catalyst_score REAL,
-                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(date, ticker)
-            )
-        ''')
-
-        # Create indexes
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_threshold_date
-            ON scanner_threshold_history(date)
-        ''')
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_score_date_ticker
-            ON scanner_score_history(date, ticker)
-        ''')
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_score_opportunity
-            ON scanner_score_history(opportunity_score DESC)
-        ''')
-
-        conn.commit()
-        conn.close()
+        with closing(get_pooled_connection()) as conn:
+            cursor = conn.cursor()
+
+            # Threshold history table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scanner_threshold_history (
+                    id SERIAL PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    threshold REAL NOT NULL,
+                    best_score REAL,
+                    stocks_above INTEGER DEFAULT 0,
+                    notification_sent INTEGER DEFAULT 0,
+                    notified_ticker TEXT,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(date)
+                )
+            ''')
+
+            # Score history table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scanner_score_history (
+                    id SERIAL PRIMARY KEY,
+                    date TEXT NOT NULL,
+                    ticker TEXT NOT NULL,
+                    opportunity_score REAL NOT NULL,
+                    quality_score REAL,
+                    value_score REAL,
+                    growth_score REAL,
+                    risk_score REAL,
+                    catalyst_score REAL,
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(date, ticker)
+                )
+            ''')
+
+            # Create indexes
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_threshold_date
+                ON scanner_threshold_history(date)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_score_date_ticker
+                ON scanner_score_history(date, ticker)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_score_opportunity
+                ON scanner_score_history(opportunity_score DESC)
+            ''')
+
+            conn.commit()
 
     def get_current_threshold(self) -> float:
         """
@@ -114,15 +114,14 @@ class ThresholdManager:
 
         If no history exists, starts at midpoint between MIN and MAX.
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        with closing(get_pooled_connection()) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT threshold FROM scanner_threshold_history
-            ORDER BY date DESC LIMIT 1
-        ''')
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute('''
+                SELECT threshold FROM scanner_threshold_history
+                ORDER BY date DESC LIMIT 1
+            ''')
+            row = cursor.fetchone()
 
         if row:
             return row[0]
@@ -144,34 +143,32 @@ class ThresholdManager:
         float
             Notifications per week
         """
-        conn = get_connection()
-        cursor = conn.cursor()
+        with closing(get_pooled_connection()) as conn:
+            cursor = conn.cursor()
 
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-        cursor.execute('''
-            SELECT COUNT(*) FROM scanner_threshold_history
-            WHERE date >= %s AND notification_sent = 1
-        ''', (cutoff_date,))
+            cursor.execute('''
+                SELECT COUNT(*) FROM scanner_threshold_history
+                WHERE date >= %s AND notification_sent = 1
+            ''', (cutoff_date,))
 
-        count = cursor.fetchone()[0]
-        conn.close()
+            count = cursor.fetchone()[0]
 
         weeks = days / 7
         return count / weeks if weeks > 0 else 0
 
     def get_days_since_last_notification(self) -> int:
         """Get number of days since last notification was sent."""
-        conn = get_connection()
-        cursor = conn.cursor()
+        with closing(get_pooled_connection()) as conn:
+            cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT date FROM scanner_threshold_history
-            WHERE notification_sent = 1
-            ORDER BY date DESC LIMIT 1
-        ''')
-        row = cursor.fetchone()
-        conn.close()
+            cursor.execute('''
+                SELECT date FROM scanner_threshold_history
+                WHERE notification_sent = 1
+                ORDER BY date DESC LIMIT 1
+            ''')
+            row = cursor.fetchone()
 
         if not row:
             return 999  # Never notified
@@ -263,30 +260,29 @@ class ThresholdManager:
         notified_ticker : str, optional
             Ticker that was notified (if any)
         """
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT INTO scanner_threshold_history
-            (date, threshold, best_score, stocks_above, notification_sent, notified_ticker)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (date) DO UPDATE SET
-                threshold = EXCLUDED.threshold,
-                best_score = EXCLUDED.best_score,
-                stocks_above = EXCLUDED.stocks_above,
-                notification_sent = EXCLUDED.notification_sent,
-                notified_ticker = EXCLUDED.notified_ticker
-        ''', (
-            date,
-            threshold,
-            best_score,
-            stocks_above,
-            1 if notification_sent else 0,
-            notified_ticker
-        ))
-
-        conn.commit()
-        conn.close()
+        with closing(get_pooled_connection()) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                INSERT INTO scanner_threshold_history
+                (date, threshold, best_score, stocks_above, notification_sent, notified_ticker)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (date) DO UPDATE SET
+                    threshold = EXCLUDED.threshold,
+                    best_score = EXCLUDED.best_score,
+                    stocks_above = EXCLUDED.stocks_above,
+                    notification_sent = EXCLUDED.notification_sent,
+                    notified_ticker = EXCLUDED.notified_ticker
+            ''', (
+                date,
+                threshold,
+                best_score,
+                stocks_above,
+                1 if notification_sent else 0,
+                notified_ticker
+            ))
+
+            conn.commit()
 
     def record_scores(
         self,
@@ -303,26 +299,18 @@ class ThresholdManager:
         scores : list
             List of (ticker, opportunity, quality, value, growth, risk, catalyst) tuples
         """
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        for s in scores:
-            cursor.execute('''
-                INSERT INTO scanner_score_history
-                (date, ticker, opportunity_score, quality_score, value_score,
-                 growth_score, risk_score, catalyst_score)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (date, ticker) DO UPDATE SET
-                    opportunity_score = EXCLUDED.opportunity_score,
-                    quality_score = EXCLUDED.quality_score,
-                    value_score = EXCLUDED.value_score,
-                    growth_score = EXCLUDED.growth_score,
-                    risk_score = EXCLUDED.risk_score,
-                    catalyst_score = EXCLUDED.catalyst_score
-            ''', (date, *s))
-
-        conn.commit()
-        conn.close()
+        with closing(get_pooled_connection()) as conn:
+            upsert_rows(
+                conn,
+                'scanner_score_history',
+                ('date', 'ticker', 'opportunity_score', 'quality_score', 'value_score',
+                 'growth_score', 'risk_score', 'catalyst_score'),
+                [(date, *s) for s in scores],
+                conflict=('date', 'ticker'),
+                update=('opportunity_score', 'quality_score', 'value_score',
+                        'growth_score', 'risk_score', 'catalyst_score'),
+            )
+            conn.commit()
 
     def get_threshold_history(self, days: int = 30) -> List[dict]:
         """
@@ -338,21 +326,20 @@ class ThresholdManager:
         list
             List of history records
         """
-        conn = get_connection(dict_cursor=True)
-        cursor = conn.cursor()
+        with closing(get_pooled_connection(dict_cursor=True)) as conn:
+            cursor = conn.cursor()
 
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+            cutoff_date = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
 
-        cursor.execute('''
-            SELECT date, threshold, best_score, stocks_above,
-                   notification_sent, notified_ticker
-            FROM scanner_threshold_history
-            WHERE date >= %s
-            ORDER BY date DESC
-        ''', (cutoff_date,))
+            cursor.execute('''
+                SELECT date, threshold, best_score, stocks_above,
+                       notification_sent, notified_ticker
+                FROM scanner_threshold_history
+                WHERE date >= %s
+                ORDER BY date DESC
+            ''', (cutoff_date,))
 
-        history = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+            history = [dict(row) for row in cursor.fetchall()]
 
         return history
 
@@ -382,19 +369,18 @@ class ThresholdManager:
         list
             List of score records
         """
-        conn = get_connection(dict_cursor=True)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT ticker, opportunity_score, quality_score, value_score,
-                   growth_score, risk_score, catalyst_score
-            FROM scanner_score_history
-            WHERE date = %s
-            ORDER BY opportunity_score DESC
-            LIMIT %s
-        ''', (date, limit))
-
-        scores = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        with closing(get_pooled_connection(dict_cursor=True)) as conn:
+            cursor = conn.cursor()
+
+            cursor.execute('''
+                SELECT ticker, opportunity_score, quality_score, value_score,
+                       growth_score, risk_score, catalyst_score
+                FROM scanner_score_history
+                WHERE date = %s
+                ORDER BY opportunity_score DESC
+                LIMIT %s
+            ''', (date, limit))
+
+            scores = [dict(row) for row in cursor.fetchall()]
 
         return scores
@@ -0,0 +1,443 @@
+"""
+Vectorized cross-sectional scoring for the Opportunity Scanner.
+
+The per-stock path (``ScoringEngine.score_loaded``) calls the scalar
+``normalize`` curve a few dozen times per ticker. Here the universe is first
+flattened into one ticker × metric matrix (values plus a presence mask), and
+every curve, component average and the weighted composite is then evaluated
+as NumPy array operations over whole columns.
+
+Scores agree with the per-stock path to float rounding: each component
+averages the same present terms, but adds them as plain float64 rather than
+with the builtin ``sum()``, so a score can differ from the scalar one in the
+last bit (and, rarely, a rounded display score by 0.1). Building the matrix
+is the only per-ticker Python work, so re-scoring the same universe under
+different weights (``composite_scores``) is a handful of array ops.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..valuation.consensus import compute_consensus_from_dicts
+from .scoring_engine import OpportunityScore, ScoringEngine
+
+logger = logging.getLogger(__name__)
+
+COMPONENTS = ('quality', 'value', 'growth', 'risk', 'catalyst')
+
+METRICS = (
+    # Quality / risk (financials)
+    'roe', 'current_ratio', 'debt_equity', 'operating_margin', 'profit_margin',
+    'accrual_ratio', 'debt_equity_float', 'current_ratio_float', 'sector_score',
+    # Value
+    'pe', 'pb', 'consensus_upside',
+    # Growth
+    'revenue_cagr', 'earnings_cagr', 'price_trend_30d',
+    # Catalyst (price)
+    'current_price', 'price_52w_high', 'price_52w_low',
+    # Insider
+    'insider_has_data', 'insider_buy_count', 'insider_sell_count', 'insider_net_buy_pct',
+    'insider_cluster', 'insider_recency', 'insider_dollars', 'insider_sell_trend',
+    # Activist (13D/13G)
+    'activist_has_data', 'activist_count', 'activist_passive_count',
+    'activist_max_stake', 'activist_total_holders',
+    # Smart money (13F)
+    'holdings_has_data', 'holdings_holders', 'holdings_new', 'holdings_exited',
+    'holdings_quarter_change',
+    # Japan (EDINET)
+    'japan_has_data', 'japan_holder_count', 'japan_max_stake', 'japan_reports',
+)
+
+
+@dataclass
+class MetricMatrix:
+    """
+    Ticker × metric matrix for a scored universe.
+
+    ``values[i, j]`` holds metric ``METRICS[j]`` for ``tickers[i]`` and
+    ``present[i, j]`` records whether the scalar path would have had it
+    (a present value may still be NaN, which scores neutral like ``normalize``).
+    """
+    tickers: List[str]
+    values: np.ndarray
+    present: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def column(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (values, present) for one metric."""
+        j = METRICS.index(name)
+        return self.values[:, j], self.present[:, j]
+
+
+def normalize_array(
+    values: np.ndarray,
+    min_val: float,
+    target: float,
+    max_val: float,
+    inverse: bool = False
+) -> np.ndarray:
+    """
+    Array form of ``ScoringEngine.normalize`` (same curve, same float ops).
+
+    NaN inputs score a neutral 50, like missing data in the scalar version.
+    """
+    value = np.asarray(values, dtype=float)
+
+    if inverse:
+        value = min_val + max_val - value
+        target = min_val + max_val - target
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if min_val > 0:
+            below = np.maximum(0, 20 * (value / min_val))
+        else:
+            below = np.zeros_like(value)
+
+        progress = (value - min_val) / (target - min_val)
+        lower = 20 + progress * progress * (3 - 2 * progress) * 50
+
+        progress = (value - target) / (max_val - target)
+        upper = 70 + progress * progress * (3 - 2 * progress) * 30
+
+    scores = np.select(
+        [value <= min_val, value >= max_val, value <= target],
+        [below, 100.0, lower],
+        upper,
+    )
+    scores[np.isnan(value)] = 50.0
+    return scores
+
+
+class _Accumulator:
+    """Running ``sum(scores) / len(scores)`` over the present terms of one average."""
+
+    def __init__(self, n: int):
+        self.total = np.zeros(n)
+        self.count = np.zeros(n)
+
+    def add(self, scores: np.ndarray, present: Optional[np.ndarray] = None) -> None:
+        if present is None:
+            present = np.ones(self.total.shape, dtype=bool)
+        self.total = np.where(present, self.total + scores, self.total)
+        self.count += present
+
+    def mean(self, default: float) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.count > 0, self.total / self.count, default)
+
+
+def _to_float(value: Any) -> Tuple[float, bool]:
+    """(value, present) with the scalar path's float() coercion; None -> absent."""
+    if value is None:
+        return math.nan, False
+    try:
+        return float(value), True
+    except (ValueError, TypeError):
+        return math.nan, False
+
+
+def _extract_row(data: Dict[str, Any], valuations: Dict[str, Any]) -> Dict[str, Tuple[float, bool]]:
+    """Flatten one ticker's loaded data into {metric: (value, present)}."""
+    financials = data.get('financials', {})
+    info = data.get('info', {})
+    price_data = data.get('price_data', {})
+    row: Dict[str, Tuple[float, bool]] = {}
+
+    row['roe'] = _to_float(financials.get('returnOnEquity'))
+    row['current_ratio'] = _to_float(financials.get('currentRatio'))
+    row['debt_equity'] = _to_float(financials.get('debtToEquity'))
+    row['operating_margin'] = _to_float(financials.get('operatingMargins'))
+    row['profit_margin'] = _to_float(financials.get('profitMargins'))
+    accruals, _ = ScoringEngine._accrual_ratio(data)
+    row['accrual_ratio'] = _to_float(accruals)
+
+    # score_risk coerces with float() and drops unparsable values
+    row['debt_equity_float'] = row['debt_equity']
+    row['current_ratio_float'] = row['current_ratio']
+    sector = info.get('sector', '')
+    row['sector_score'] = (float(ScoringEngine.SECTOR_RISK_SCORES.get(sector, 50)), True)
+
+    pe, pe_present = _to_float(financials.get('trailingPE'))
+    row['pe'] = (pe, pe_present and pe > 0)
+    pb, pb_present = _to_float(financials.get('priceToBook'))
+    row['pb'] = (pb, pb_present and pb > 0)
+
+    current_price = info.get('currentPrice') or price_data.get('current_price')
+    consensus = compute_consensus_from_dicts(valuations, current_price) if current_price else None
+    if consensus is not None:
+        row['consensus_upside'] = (consensus.margin_of_safety * 100, True)
+    else:
+        row['consensus_upside'] = (math.nan, False)
+
+    rev_cagr, earn_cagr = ScoringEngine._growth_cagrs(data)
+    row['revenue_cagr'] = _to_float(rev_cagr)
+    row['earnings_cagr'] = _to_float(earn_cagr)
+    row['price_trend_30d'] = _to_float(price_data.get('price_trend_30d'))
+
+    # Price levels: truthiness (non-zero, non-None) is what score_catalyst checks
+    row['current_price'] = _to_float(current_price or None)
+    row['price_52w_high'] = _to_float(price_data.get('price_52w_high') or None)
+    row['price_52w_low'] = _to_float(price_data.get('price_52w_low') or None)
+
+    insider = data.get('insider', {})
+    row['insider_has_data'] = (1.0, bool(insider.get('has_data')))
+    row['insider_buy_count'] = _to_float(insider.get('buy_count', 0))
+    row['insider_sell_count'] = _to_float(insider.get('sell_count', 0))
+    row['insider_net_buy_pct'] = (_to_float(insider.get('net_buy_pct', 0.0))[0], True)
+    row['insider_cluster'] = (_to_float(insider.get('cluster_score', 0))[0], True)
+    row['insider_recency'] = _to_float(insider.get('recency_days'))
+    row['insider_dollars'] = (_to_float(insider.get('dollar_conviction', 0.0))[0], True)
+    row['insider_sell_trend'] = _to_float(insider.get('sell_trend'))
+
+    activist = data.get('activist', {})
+    row['activist_has_data'] = (1.0, bool(activist.get('has_data')))
+    row['activist_count'] = (_to_float(activist.get('activist_count', 0))[0], True)
+    row['activist_passive_count'] = (_to_float(activist.get('passive_count', 0))[0], True)
+    row['activist_max_stake'] = _to_float(activist.get('max_stake_pct'))
+    row['activist_total_holders'] = (_to_float(activist.get('total_holders_5pct', 0))[0], True)
+
+    holdings = data.get('holdings', {})
+    exited = holdings.get('exited_positions', []) or []
+    quarter_change = holdings.get('quarter_change')
+    row['holdings_has_data'] = (1.0, bool(holdings.get('has_data')))
+    row['holdings_holders'] = (_to_float(holdings.get('smart_money_holders', 0))[0], True)
+    row['holdings_new'] = (float(len(holdings.get('new_positions', []) or [])), True)
+    row['holdings_exited'] = (float(len(exited)), bool(exited))
+    row['holdings_quarter_change'] = (
+        _to_float(quarter_change)[0],
+        quarter_change is not None and quarter_change != 0,
+    )
+
+    japan = data.get('japan_stakes', {})
+    row['japan_has_data'] = (1.0, bool(japan.get('has_data')))
+    row['japan_holder_count'] = (_to_float(japan.get('holder_count', 0))[0], True)
+    row['japan_max_stake'] = _to_float(japan.get('max_stake_pct'))
+    row['japan_reports'] = (_to_float(japan.get('total_reports', 0))[0], True)
+
+    return row
+
+
+def build_metric_matrix(
+    items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]]
+) -> Tuple[MetricMatrix, List[Tuple[str, Dict[str, Any], Dict[str, Any]]]]:
+    """
+    Build the metric matrix from pre-loaded ``(ticker, data, valuations)`` items.
+
+    Returns the matrix and the items it covers; a ticker whose data cannot be
+    flattened is logged and dropped, as a failing ticker is in the scalar path.
+    """
+    kept = []
+    rows = []
+    for ticker, data, valuations in items:
+        try:
+            rows.append(_extract_row(data, valuations))
+        except Exception as e:
+            logger.warning(f"Scoring failed for {ticker}: {e}")
+            continue
+        kept.append((ticker, data, valuations))
+
+    values = np.full((len(rows), len(METRICS)), np.nan)
+    present = np.zeros((len(rows), len(METRICS)), dtype=bool)
+    for i, row in enumerate(rows):
+        for j, name in enumerate(METRICS):
+            values[i, j], present[i, j] = row[name]
+
+    return MetricMatrix(tickers=[t for t, _, _ in kept], values=values, present=present), kept
+
+
+def _score_quality(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    roe, has_roe = m.column('roe')
+    acc.add(normalize_array(roe * 100, 5, 15, 30), has_roe)
+    cr, has_cr = m.column('current_ratio')
+    acc.add(normalize_array(cr, 0.8, 1.5, 3.0), has_cr)
+    de, has_de = m.column('debt_equity')
+    acc.add(normalize_array(de, 0, 0.5, 2.0, inverse=True), has_de)
+    om, has_om = m.column('operating_margin')
+    acc.add(normalize_array(om * 100, 0, 15, 40), has_om)
+    pm, has_pm = m.column('profit_margin')
+    acc.add(normalize_array(pm * 100, 0, 10, 30), has_pm)
+    accruals, has_accruals = m.column('accrual_ratio')
+    acc.add(normalize_array(accruals * 100, -5, 3, 10, inverse=True), has_accruals)
+    return acc.mean(50.0)
+
+
+def _score_value(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    pe, has_pe = m.column('pe')
+    acc.add(normalize_array(pe, 8, 15, 30, inverse=True), has_pe)
+    pb, has_pb = m.column('pb')
+    acc.add(normalize_array(pb, 1, 2.5, 5, inverse=True), has_pb)
+    ratio_avg = acc.mean(50.0)
+
+    upside, has_upside = m.column('consensus_upside')
+    blended = ratio_avg * 0.5 + normalize_array(upside, -20, 20, 50) * 0.5
+    return np.where(has_upside, blended, ratio_avg)
+
+
+def _score_growth(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    rev, has_rev = m.column('revenue_cagr')
+    acc.add(normalize_array(rev * 100, 0, 10, 25), has_rev)
+    earn, has_earn = m.column('earnings_cagr')
+    acc.add(normalize_array(earn * 100, 0, 12, 30), has_earn)
+    trend, has_trend = m.column('price_trend_30d')
+    acc.add(normalize_array(trend * 100, -10, 5, 15) * 0.5, has_trend)
+    # No fundamental growth data at all -> forced fail, as in score_growth
+    return np.where(has_rev | has_earn, acc.mean(0.0), 0.0)
+
+
+def _score_risk(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    de, has_de = m.column('debt_equity_float')
+    acc.add(normalize_array(de, 0, 0.5, 2.0, inverse=True), has_de)
+    cr, has_cr = m.column('current_ratio_float')
+    acc.add(normalize_array(cr, 0.5, 1.5, 3.0), has_cr)
+    sector, _ = m.column('sector_score')
+    acc.add(sector)
+    return acc.mean(50.0)
+
+
+def _score_insider(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    buy, _ = m.column('insider_buy_count')
+    sell, _ = m.column('insider_sell_count')
+    acc.add(normalize_array(m.column('insider_net_buy_pct')[0], -2.0, 0.2, 1.0))
+    acc.add(normalize_array(m.column('insider_cluster')[0], 0, 2, 4))
+    recency, has_recency = m.column('insider_recency')
+    acc.add(normalize_array(recency, 0, 60, 180, inverse=True), has_recency)
+    acc.add(normalize_array(m.column('insider_dollars')[0], 0, 1_000_000, 5_000_000))
+    sell_trend, has_sell_trend = m.column('insider_sell_trend')
+    acc.add(normalize_array(sell_trend, 0.0, 0.7, 1.5, inverse=True), has_sell_trend & (sell > 0))
+    final = acc.mean(50.0)
+
+    # Sell-only caps: 25 at/above normal selling (or unknown), 45 well below it
+    sells_only = (buy == 0) & (sell > 0)
+    hard_cap = ~has_sell_trend | (sell_trend >= 0.7)
+    final = np.where(sells_only & hard_cap, np.minimum(final, 25.0), final)
+    final = np.where(sells_only & ~hard_cap, np.minimum(final, 45.0), final)
+    return final
+
+
+def _score_activist(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    acc.add(normalize_array(m.column('activist_count')[0], 0, 1, 3) * 1.5)
+    acc.add(normalize_array(m.column('activist_passive_count')[0], 0, 2, 5))
+    stake, has_stake = m.column('activist_max_stake')
+    acc.add(normalize_array(stake, 5, 10, 25), has_stake)
+    acc.add(normalize_array(m.column('activist_total_holders')[0], 0, 2, 5))
+    return acc.mean(50.0)
+
+
+def _score_smart_money(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    acc.add(normalize_array(m.column('holdings_holders')[0], 0, 3, 10))
+    acc.add(normalize_array(m.column('holdings_new')[0], 0, 1, 3) * 1.3)
+    exited, has_exited = m.column('holdings_exited')
+    acc.add(normalize_array(exited, 0, 1, 3, inverse=True), has_exited)
+    change, has_change = m.column('holdings_quarter_change')
+    acc.add(np.where(change > 0, 70.0, 30.0), has_change)
+    return acc.mean(50.0)
+
+
+def _score_japan(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    acc.add(normalize_array(m.column('japan_holder_count')[0], 0, 2, 5))
+    stake, has_stake = m.column('japan_max_stake')
+    acc.add(normalize_array(stake, 5, 10, 25), has_stake)
+    acc.add(normalize_array(m.column('japan_reports')[0], 0, 2, 6))
+    return acc.mean(50.0)
+
+
+def _score_catalyst(m: MetricMatrix) -> np.ndarray:
+    acc = _Accumulator(len(m))
+    price, has_price = m.column('current_price')
+    high, has_high = m.column('price_52w_high')
+    low, has_low = m.column('price_52w_low')
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discount = (high - price) / high * 100
+        buffer = (price - low) / low * 100
+    acc.add(normalize_array(discount, 0, 15, 40), has_price & has_high & (high > 0))
+    acc.add(normalize_array(buffer, 0, 30, 80) * 0.5, has_price & has_low & (low > 0))
+
+    trend, has_trend = m.column('price_trend_30d')
+    trend_pct = trend * 100
+    trend_score = np.select(
+        [(-5 <= trend_pct) & (trend_pct <= 5), trend_pct < -15, trend_pct > 15],
+        [70.0, 40.0, 50.0],
+        60.0,
+    )
+    acc.add(trend_score, has_trend)
+
+    acc.add(_score_insider(m), m.column('insider_has_data')[1])
+    acc.add(_score_activist(m), m.column('activist_has_data')[1])
+    acc.add(_score_smart_money(m), m.column('holdings_has_data')[1])
+    acc.add(_score_japan(m), m.column('japan_has_data')[1])
+    return acc.mean(50.0)
+
+
+def component_scores(matrix: MetricMatrix) -> Dict[str, np.ndarray]:
+    """Unweighted 0-100 component scores, one array per component."""
+    return {
+        'quality': _score_quality(matrix),
+        'value': _score_value(matrix),
+        'growth': _score_growth(matrix),
+        'risk': _score_risk(matrix),
+        'catalyst': _score_catalyst(matrix),
+    }
+
+
+def composite_scores(
+    components: Dict[str, np.ndarray],
+    weights: Dict[str, float]
+) -> np.ndarray:
+    """
+    Weighted composite opportunity score.
+
+    Components don't depend on the weights, so sweeping weight configurations
+    only repeats this step.
+    """
+    return (
+        components['quality'] * weights['quality'] +
+        components['value'] * weights['value'] +
+        components['growth'] * weights['growth'] +
+        components['risk'] * weights['risk'] +
+        components['catalyst'] * weights['catalyst']
+    )
+
+
+def score_items(
+    items: List[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+    weights: Dict[str, float]
+) -> List[OpportunityScore]:
+    """
+    Score pre-loaded ``(ticker, data, valuations)`` items in one pass.
+
+    Returns OpportunityScore objects in item order, matching
+    ``ScoringEngine.score_loaded`` to float rounding except that
+    ``component_details`` is left empty (the per-term breakdown is what the
+    array path avoids building).
+    """
+    matrix, kept = build_metric_matrix(items)
+    if not kept:
+        return []
+
+    components = component_scores(matrix)
+    opportunity = composite_scores(components, weights)
+
+    return [
+        ScoringEngine._build_score(
+            ticker, data, valuations,
+            opportunity_score=float(opportunity[i]),
+            components={name: float(components[name][i]) for name in COMPONENTS},
+            component_details={},
+        )
+        for i, (ticker, data, valuations) in enumerate(kept)
+    ]
@@ -0,0 +1,420 @@
+"""
+Event study engine — forward alpha of trade-signal events vs a benchmark.
+
+Backs the numbers in ``SIGNAL_GATES`` for any signal family: politician
+PTRs, insider Form 4s, 13D/13G filings, 13F positions, Truth Social ticker
+mentions. An event is a ``(ticker, date, direction)`` row; prices are a
+dates × tickers close matrix.
+
+Convention (as in notes/research/politician_backtest_2026.md): the entry
+close is the first close on or after the event date, the exit close the first
+on or after event date + horizon, both within ``GAP_DAYS`` calendar days, for
+the stock and the benchmark alike. Alpha is the log return difference, signed
+by direction (a sell earns alpha when the stock lags the benchmark). Horizons
+ending after the benchmark's last close are dropped.
+
+Instead of probing a dict day by day for every trade, each ticker column gets
+a "next row with a close" index once, and every entry/exit lookup for all
+events and horizons is a ``searchsorted`` into the date axis plus one gather.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from invest.signals.gates import GateResult
+
+HORIZONS = [30, 90, 180, 365]
+GAP_DAYS = 7  # max forward search for a trading day
+
+# Direction labels -> sign (Form 4 / PTR transaction codes and plain words)
+DIRECTION_SIGNS = {'P': 1, 'S': -1, 'buy': 1, 'sell': -1}
+
+# Bootstrap replicates x observations drawn per batch (bounds memory)
+BOOTSTRAP_BATCH_CELLS = 5_000_000
+
+
+@dataclass
+class PriceMatrix:
+    """Daily closes, dates × tickers (NaN where a ticker has no close)."""
+
+    dates: np.ndarray  # datetime64[D], sorted and unique
+    tickers: List[str]
+    closes: np.ndarray  # float64, (len(dates), len(tickers))
+
+    def __post_init__(self) -> None:
+        self._columns = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self._next_rows: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, object, Optional[float]]]) -> 'PriceMatrix':
+        """Build from ``(ticker, date, close)`` rows; non-positive or missing closes are dropped."""
+        df = pd.DataFrame(list(rows), columns=['ticker', 'date', 'close'])
+        df['close'] = pd.to_numeric(df['close'], errors='coerce')
+        df['date'] = pd.to_datetime(df['date'], errors='coerce')
+        df = df[(df['close'] > 0) & df['date'].notna()]
+        wide = df.pivot_table(index='date', columns='ticker', values='close', aggfunc='last')
+        return cls(
+            dates=wide.index.to_numpy(dtype='datetime64[D]'),
+            tickers=[str(t) for t in wide.columns],
+            closes=wide.to_numpy(dtype=float),
+        )
+
+    def columns(self, tickers: Sequence[str]) -> np.ndarray:
+        """Column of each ticker (-1 if not in the matrix)."""
+        return np.array([self._columns.get(t, -1) for t in tickers], dtype=np.int64)
+
+    def last_date(self, ticker: str) -> Optional[np.datetime64]:
+        """Date of a ticker's last close, or None."""
+        col = self._columns.get(ticker)
+        if col is None:
+            return None
+        rows = np.flatnonzero(~np.isnan(self.closes[:, col]))
+        return self.dates[rows[-1]] if len(rows) else None
+
+    def _next_close_rows(self) -> np.ndarray:
+        """Per column, the first row at or after each row that has a close (n if none)."""
+        if self._next_rows is None:
+            n = len(self.dates)
+            rows = np.where(~np.isnan(self.closes), np.arange(n)[:, None], n)
+            rows = np.minimum.accumulate(rows[::-1], axis=0)[::-1]
+            # Sentinel row for targets after the last date
+            self._next_rows = np.vstack([rows, np.full((1, rows.shape[1]), n)])
+        return self._next_rows
+
+    def closes_on_or_after(self, columns: np.ndarray, targets: np.ndarray,
+                           gap_days: int = GAP_DAYS) -> np.ndarray:
+        """
+        First close on or after each target date, within ``gap_days``.
+
+        Parameters
+        ----------
+        columns : np.ndarray
+            Ticker column per lookup (-1 for unknown tickers)
+        targets : np.ndarray
+            datetime64[D] target date per lookup (same shape as ``columns``)
+        gap_days : int
+            How many calendar days after the target a close may be
+
+        Returns
+        -------
+        np.ndarray
+            Closes, NaN where no close was found
+        """
+        n = len(self.dates)
+        out = np.full(targets.shape, np.nan)
+        if n == 0:
+            return out
+        known = columns >= 0
+        start = np.searchsorted(self.dates, targets, side='left')
+        rows = self._next_close_rows()[start[known], columns[known]]
+        found = rows < n
+        in_gap = np.zeros_like(found)
+        in_gap[found] = (self.dates[rows[found]] - targets[known][found]) <= np.timedelta64(gap_days, 'D')
+        values = np.full(rows.shape, np.nan)
+        values[in_gap] = self.closes[rows[in_gap], columns[known][in_gap]]
+        out[known] = values
+        return out
+
+
+def direction_signs(directions: pd.Series) -> np.ndarray:
+    """+1 / -1 per event from 'P'/'S'/'buy'/'sell' labels or signed numbers (0 if unknown)."""
+    if pd.api.types.is_numeric_dtype(directions):
+        return np.sign(directions.fillna(0).to_numpy(dtype=float))
+    return directions.map(DIRECTION_SIGNS).fillna(0).to_numpy(dtype=float)
+
+
+def event_returns(
+    events: pd.DataFrame,
+    prices: PriceMatrix,
+    horizons: Sequence[int] = HORIZONS,
+    benchmark: str = 'SPY',
+    gap_days: int = GAP_DAYS,
+) -> pd.DataFrame:
+    """
+    Forward returns and benchmark-relative alpha of every event at every horizon.
+
+    Parameters
+    ----------
+    events : pd.DataFrame
+        One row per event with 'ticker', 'date' and 'direction' columns
+        (extra columns are kept)
+    prices : PriceMatrix
+        Closes of the event tickers and the benchmark
+    horizons : Sequence[int]
+        Calendar-day horizons
+    benchmark : str
+        Benchmark ticker in ``prices``
+    gap_days : int
+        Max calendar days between a target date and the close used for it
+
+    Returns
+    -------
+    pd.DataFrame
+        ``events`` plus ``return_{h}d``, ``benchmark_{h}d`` (log returns) and
+        ``alpha_{h}d`` (signed log alpha) per horizon, NaN where a close is
+        missing or the horizon ends after the benchmark's last close
+    """
+    out = events.copy().reset_index(drop=True)
+    event_dates = pd.to_datetime(out['date']).to_numpy(dtype='datetime64[D]')
+    signs = direction_signs(out['direction'])
+    stock_cols = prices.columns(out['ticker'].tolist())
+    bench_cols = np.full(len(out), prices.columns([benchmark])[0])
+    bench_end = prices.last_date(benchmark)
+
+    offsets = np.array(horizons, dtype='timedelta64[D]')
+    exit_dates = event_dates[:, None] + offsets[None, :]
+
+    # Entry and exit closes of all events and horizons, one gather each
+    stock_entry = prices.closes_on_or_after(stock_cols, event_dates, gap_days)
+    bench_entry = prices.closes_on_or_after(bench_cols, event_dates, gap_days)
+    stock_exit = prices.closes_on_or_after(
+        np.repeat(stock_cols[:, None], len(horizons), axis=1), exit_dates, gap_days
+    )
+    bench_exit = prices.closes_on_or_after(
+        np.repeat(bench_cols[:, None], len(horizons), axis=1), exit_dates, gap_days
+    )
+
+    stock_ret = np.log(stock_exit / stock_entry[:, None])
+    bench_ret = np.log(bench_exit / bench_entry[:, None])
+    alpha = signs[:, None] * (stock_ret - bench_ret)
+
+    observable = np.isfinite(alpha) & (signs[:, None] != 0)
+    if bench_end is None:
+        observable[:] = False
+    else:
+        observable &= exit_dates <= bench_end
+    alpha[~observable] = np.nan
+
+    columns = {}
+    for j, h in enumerate(horizons):
+        columns[f'return_{h}d'] = stock_ret[:, j]
+        columns[f'benchmark_{h}d'] = bench_ret[:, j]
+        columns[f'alpha_{h}d'] = alpha[:, j]
+    return pd.concat([out, pd.DataFrame(columns, index=out.index)], axis=1)
+
+
+def annualise(alpha: float, horizon: int) -> float:
+    """Compound a horizon-period log alpha to 365d, return decimal."""
+    return math.expm1(alpha * 365.0 / horizon)
+
+
+def welch_t(a: np.ndarray, b: np.ndarray) -> Tuple[float, float, int]:
+    """Welch's two-sample t-test, normal approx for df>30. (t, p, df)."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if len(a) < 2 or len(b) < 2:
+        return 0.0, 1.0, 0
+    va, vb = a.var(ddof=1) / len(a), b.var(ddof=1) / len(b)
+    se = math.sqrt(va + vb)
+    if se == 0:
+        return 0.0, 1.0, 0
+    t = (a.mean() - b.mean()) / se
+    den = va ** 2 / (len(a) - 1) + vb ** 2 / (len(b) - 1)
+    df = (va + vb) ** 2 / den if den > 0 else 0
+    # two-sided p via normal approx (df > 30 typically)
+    p = math.erfc(abs(t) / math.sqrt(2))
+    return float(t), p, int(df)
+
+
+def one_sample_t(a: np.ndarray) -> Tuple[float, float, int]:
+    """t-test of mean alpha vs zero, normal approx. (t, p, df)."""
+    a = np.asarray(a, dtype=float)
+    if len(a) < 2:
+        return 0.0, 1.0, 0
+    se = a.std(ddof=1) / math.sqrt(len(a))
+    if se == 0:
+        return 0.0, 1.0, 0
+    t = a.mean() / se
+    return float(t), math.erfc(abs(t) / math.sqrt(2)), len(a) - 1
+
+
+def bootstrap_ci(
+    values: np.ndarray,
+    clusters: Optional[np.ndarray] = None,
+    n_boot: int = 10_000,
+    ci: float = 0.95,
+    seed: int = 0,
+) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Observations (e.g. per-event alphas)
+    clusters : np.ndarray, optional
+        Cluster label per observation (e.g. event date). Whole clusters are
+        resampled, so same-day batches don't count as independent evidence
+    n_boot : int
+        Bootstrap replicates
+    ci : float
+        Coverage of the interval
+    seed : int
+        Random seed
+
+    Returns
+    -------
+    Tuple[float, float]
+        (low, high); NaN for fewer than two observations (or clusters)
+    """
+    values = np.asarray(values, dtype=float)
+    if clusters is None:
+        sums, counts = values, np.ones(len(values))
+    else:
+        codes, _ = pd.factorize(pd.Series(clusters))
+        sums = np.bincount(codes, weights=values)
+        counts = np.bincount(codes).astype(float)
+    k = len(sums)
+    if k < 2:
+        return math.nan, math.nan
+
+    rng = np.random.default_rng(seed)
+    means = np.empty(n_boot)
+    batch = max(1, BOOTSTRAP_BATCH_CELLS // k)
+    for start in range(0, n_boot, batch):
+        stop = min(start + batch, n_boot)
+        draws = rng.integers(0, k, size=(stop - start, k))
+        means[start:stop] = sums[draws].sum(axis=1) / counts[draws].sum(axis=1)
+
+    tail = (1 - ci) / 2 * 100
+    low, high = np.percentile(means, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+@dataclass(frozen=True)
+class AlphaSummary:
+    """Alpha statistics of one event set at one horizon."""
+
+    horizon: int
+    n: int
+    n_effective: int   # distinct clusters (event dates by default)
+    hit_rate: float
+    mean: float        # mean log alpha over the horizon
+    median: float
+    std: float
+    annualised: float
+    ci_low: float      # bootstrap CI of the mean (cluster-resampled)
+    ci_high: float
+    t: float           # vs control (Welch) or vs zero without a control
+    p_value: float
+    control_mean: Optional[float]
+
+
+def summarize(
+    study: pd.DataFrame,
+    horizon: int,
+    control: Optional[pd.DataFrame] = None,
+    cluster_col: str = 'date',
+    n_boot: int = 10_000,
+    ci: float = 0.95,
+    seed: int = 0,
+) -> Optional[AlphaSummary]:
+    """
+    Summarize the ``alpha_{horizon}d`` column of an ``event_returns`` frame.
+
+    Parameters
+    ----------
+    study, control : pd.DataFrame
+        ``event_returns`` output for the signal and (optionally) a control
+        population; without a control the t-test is against zero alpha
+    horizon : int
+        Horizon to summarize
+    cluster_col : str
+        Column whose distinct values count as independent observations
+    n_boot, ci, seed
+        Bootstrap settings (see ``bootstrap_ci``)
+
+    Returns
+    -------
+    AlphaSummary or None
+        None when no event has an alpha at this horizon
+    """
+    column = f'alpha_{horizon}d'
+    observed = study[study[column].notna()]
+    if observed.empty:
+        return None
+    alphas = observed[column].to_numpy(dtype=float)
+    clusters = observed[cluster_col].to_numpy() if cluster_col else None
+
+    control_alphas = None
+    if control is not None:
+        control_alphas = control[column].dropna().to_numpy(dtype=float)
+        t, p, _ = welch_t(alphas, control_alphas)
+    else:
+        t, p, _ = one_sample_t(alphas)
+
+    low, high = bootstrap_ci(alphas, clusters, n_boot=n_boot, ci=ci, seed=seed)
+    mean_alpha = float(alphas.mean())
+    return AlphaSummary(
+        horizon=horizon,
+        n=len(alphas),
+        n_effective=len(pd.unique(clusters)) if clusters is not None else len(alphas),
+        hit_rate=float((alphas > 0).mean()),
+        mean=mean_alpha,
+        median=float(np.median(alphas)),
+        std=float(alphas.std()),
+        annualised=annualise(mean_alpha, horizon),
+        ci_low=low,
+        ci_high=high,
+        t=t,
+        p_value=p,
+        control_mean=float(control_alphas.mean()) if control_alphas is not None and len(control_alphas) else None,
+    )
+
+
+def gate_result(
+    summary: AlphaSummary,
+    caveat: str,
+    passes: Optional[bool] = None,
+    max_p_value: float = 0.05,
+    backtested_at: Optional[date] = None,
+) -> GateResult:
+    """
+    ``SIGNAL_GATES`` entry for a summary.
+
+    ``passes`` defaults to the alpha bar: positive mean alpha, p below
+    ``max_p_value`` and a bootstrap interval above zero. It is a proposal;
+    the registry entry is still curated by hand (see signal_inventory.md).
+    """
+    if passes is None:
+        passes = summary.mean > 0 and summary.p_value < max_p_value and summary.ci_low > 0
+    return GateResult(
+        passes=bool(passes),
+        alpha=round(summary.annualised, 3),
+        horizon=f'{summary.horizon}d',
+        p_value=round(summary.p_value, 3),
+        n_nominal=summary.n,
+        n_effective=summary.n_effective,
+        caveat=caveat,
+        last_backtested_at=(backtested_at or date.today()).isoformat(),
+    )
+
+
+def summarize_by(
+    study: pd.DataFrame,
+    keys: Sequence[str],
+    horizons: Sequence[int] = HORIZONS,
+    control: Optional[pd.DataFrame] = None,
+    **kwargs,
+) -> Dict[Tuple, List[AlphaSummary]]:
+    """
+    ``summarize`` per group of ``keys`` (e.g. name and direction) and horizon.
+
+    When a control is given, each group is compared against the control
+    events with the same direction(s) as the group's events.
+    """
+    results: Dict[Tuple, List[AlphaSummary]] = {}
+    for group, frame in study.groupby(list(keys), sort=True, dropna=False):
+        group = group if isinstance(group, tuple) else (group,)
+        group_control = control
+        if control is not None:
+            group_control = control[control['direction'].isin(frame['direction'].unique())]
+        summaries = [summarize(frame, h, control=group_control, **kwargs) for h in horizons]
+        results[group] = [s for s in summaries if s is not None]
+    return results
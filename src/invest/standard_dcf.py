@@ -28,6 +28,7 @@ from .config.logging_config import (
     log_data_fetch,
     log_error_with_context,
 )
+from .dcf_kernels import present_values, project_cash_flows, terminal_value
 from .error_handling import create_error_context, handle_valuation_error
 from .exceptions import InsufficientDataError, ModelNotSuitableError
 
@@ -47,12 +48,7 @@ def project_fcfs(initial_fcf: float, growth_rates: list[float]) -> list[float]:
     Returns:
         list[float]: Projected FCF values for each year.
     """
-    fcfs = []
-    fcf = initial_fcf
-    for g in growth_rates:
-        fcf *= 1 + g
-        fcfs.append(fcf)
-    return fcfs
+    return project_cash_flows(initial_fcf, growth_rates).tolist()
 
 
 def discounted_sum(values: list[float], rate: float) -> float:
@@ -66,7 +62,7 @@ def discounted_sum(values: list[float], rate: float) -> float:
     Returns:
         float: Sum of discounted cash flows.
     """
-    return sum(v / (1 + rate) ** (i + 1) for i, v in enumerate(values))
+    return float(present_values(values, rate).sum())
 
 
 def calculate_dcf(
@@ -224,7 +220,7 @@ def calculate_dcf(
         fcfs = project_fcfs(base_fcf, growth_rates)
 
         # Terminal Value: Using the Gordon Growth Model.
-        TV = fcfs[-1] * (1 + terminal_growth) / (discount_rate - terminal_growth)
+        TV = float(terminal_value(fcfs[-1], discount_rate, terminal_growth))
         tv_pv = TV / ((1 + discount_rate) ** projection_years)
 
         # NPV of projected FCFs (years 1 to projection_years).
@@ -6,7 +6,7 @@ offering a common interface and consistent error handling across different
 valuation approaches.
 """
 
-from .base import ValuationModel, ValuationResult
+from .base import SensitivityGrid, ValuationModel, ValuationResult
 from .dcf_model import DCFModel, EnhancedDCFModel, MultiStageDCFModel
 from .model_registry import ModelRegistry
 from .ratios_model import SimpleRatiosModel
@@ -16,6 +16,7 @@ from .rim_model import RIMModel
 __all__ = [
     'ValuationModel',
     'ValuationResult',
+    'SensitivityGrid',
     'DCFModel',
     'EnhancedDCFModel',
     'MultiStageDCFModel',
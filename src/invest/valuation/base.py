@@ -9,13 +9,20 @@ import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..exceptions import InsufficientDataError, ModelNotSuitableError, ValuationError
 from .model_requirements import FieldRequirement, ModelDataRequirements
 
 logger = logging.getLogger(__name__)
 
+# Default sensitivity axis: this many points, one step apart, centred on the
+# base-case value (every varied input is a rate, so a step is 1 percentage point)
+SENSITIVITY_POINTS = 5
+SENSITIVITY_STEP = 0.01
+
 
 @dataclass
 class ValuationResult:
@@ -68,6 +75,48 @@ class ValuationResult:
         )
 
 
+@dataclass
+class SensitivityGrid:
+    """
+    Fair value per share of one company over a grid of model inputs.
+
+    ``values[i, j, ...]`` is the fair value with the first varied input at
+    ``axes[first][i]``, the second at ``axes[second][j]``, and so on; every
+    other input keeps its base-case value from ``base``. Cells where the model
+    is undefined (e.g. discount rate <= terminal growth) are NaN.
+    """
+    ticker: str
+    model: str
+    axes: Dict[str, np.ndarray]
+    values: np.ndarray
+    base: Dict[str, float] = field(default_factory=dict)
+    current_price: Optional[float] = None
+
+    def to_frame(self):
+        """Return a 2-D grid as a DataFrame (first axis as index, second as columns)."""
+        import pandas as pd
+
+        if self.values.ndim != 2:
+            raise ValueError(f'to_frame() needs a 2-D grid, got {self.values.ndim} axes')
+        (row_name, rows), (column_name, columns) = self.axes.items()
+        return pd.DataFrame(
+            self.values,
+            index=pd.Index(rows, name=row_name),
+            columns=pd.Index(columns, name=column_name),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary format for JSON serialization (NaN cells become None)."""
+        return {
+            'ticker': self.ticker,
+            'model': self.model,
+            'axes': {name: values.tolist() for name, values in self.axes.items()},
+            'values': np.where(np.isfinite(self.values), self.values, None).tolist(),
+            'base': self.base,
+            'current_price': self.current_price,
+        }
+
+
 class ValuationModel(ABC):
     """
     Abstract base class for all valuation models.
@@ -182,10 +231,42 @@ class ValuationModel(ABC):
         ValuationError
             If calculation fails
         """
-        try:
-            # Fetch company data
-            data = self._fetch_data(ticker)
+        return self.value_company_with_data(ticker, self._fetch_data(ticker), verbose=verbose)
+
+    def value_company_with_data(self, ticker: str, data: Dict[str, Any], verbose: bool = False) -> ValuationResult:
+        """
+        Value a company from data the caller already has.
+
+        Same as ``value_company`` without the fetch, so one data load can
+        feed every model. ``StockDataReader.get_model_data`` (or
+        ``StockDataReader.to_model_data``) gives this format from the
+        database, with no network access.
+
+        Parameters
+        ----------
+        ticker : str
+            Stock ticker symbol
+        data : Dict[str, Any]
+            Company data in the ``_fetch_data`` format (``info``, ``income``,
+            ``balance_sheet``, ``cashflow``, ...)
+        verbose : bool
+            Whether to enable verbose logging
+
+        Returns
+        -------
+        ValuationResult
+            The valuation result
 
+        Raises
+        ------
+        ModelNotSuitableError
+            If this model is not appropriate for this company
+        InsufficientDataError
+            If required data is not available
+        ValuationError
+            If calculation fails
+        """
+        try:
             # Check if model is suitable
             if not self.is_suitable(ticker, data):
                 raise ModelNotSuitableError(self.name, ticker, 'Model not suitable for this company')
@@ -269,6 +350,88 @@ class ValuationModel(ABC):
         except Exception as e:
             raise InsufficientDataError(ticker, ['data_fetch_failed']) from e
 
+    # Inputs sensitivity_grid() can vary, the usual heatmap pair first. Empty
+    # for models without a vectorized core calculation. A model that lists
+    # any must also implement:
+    #   _sensitivity_base(ticker, data) -> Dict[str, float]
+    #       base-case value of every input listed here;
+    #   _fair_value_grid(ticker, data, parameters) -> np.ndarray
+    #       fair value per share for ``parameters`` holding every listed
+    #       input as a broadcastable array; the result has their broadcast
+    #       shape, NaN where the model is undefined.
+    sensitivity_parameters: Tuple[str, ...] = ()
+
+    def sensitivity_grid(
+        self,
+        ticker: str,
+        data: Dict[str, Any],
+        axes: Mapping[str, Optional[Sequence[float]]],
+    ) -> SensitivityGrid:
+        """
+        Evaluate the model over a grid of inputs in one vectorized call.
+
+        Parameters
+        ----------
+        ticker : str
+            Stock ticker symbol
+        data : Dict[str, Any]
+            Company financial data (fetched once by the caller)
+        axes : Mapping[str, Optional[Sequence[float]]]
+            Inputs to vary, in axis order, each mapped to its values, or to
+            None for SENSITIVITY_POINTS values SENSITIVITY_STEP apart around
+            the base case. Names must be in ``sensitivity_parameters``.
+
+        Returns
+        -------
+        SensitivityGrid
+            Fair values of shape ``(len(axis_1), len(axis_2), ...)``
+
+        Raises
+        ------
+        ValueError
+            If the model has no sensitivity support or an axis is unknown
+        ModelNotSuitableError
+            If this model is not appropriate for this company
+        InsufficientDataError
+            If required data is not available
+        """
+        if not axes:
+            raise ValueError('sensitivity_grid() needs at least one axis')
+        unknown = [name for name in axes if name not in self.sensitivity_parameters]
+        if unknown:
+            supported = ', '.join(self.sensitivity_parameters) or 'none'
+            raise ValueError(f'{self.name} cannot vary {", ".join(unknown)}. Supported: {supported}')
+
+        if not self.is_suitable(ticker, data):
+            raise ModelNotSuitableError(self.name, ticker, 'Model not suitable for this company')
+        self._validate_inputs(ticker, data)
+
+        base = self._sensitivity_base(ticker, data)
+        offsets = (np.arange(SENSITIVITY_POINTS) - SENSITIVITY_POINTS // 2) * SENSITIVITY_STEP
+        labels = {
+            name: base[name] + offsets if values is None else np.asarray(values, dtype=float).ravel()
+            for name, values in axes.items()
+        }
+
+        # Each varied input gets its own axis; the others stay scalars
+        parameters = {name: np.asarray(value, dtype=float) for name, value in base.items()}
+        for axis, (name, values) in enumerate(labels.items()):
+            shape = [1] * len(labels)
+            shape[axis] = len(values)
+            parameters[name] = values.reshape(shape)
+
+        shape = tuple(len(values) for values in labels.values())
+        values = np.broadcast_to(self._fair_value_grid(ticker, data, parameters), shape).copy()
+        current_price = self._safe_float(data.get('info', {}).get('currentPrice'), None)
+        return SensitivityGrid(
+            ticker=ticker,
+            model=self.name,
+            axes=labels,
+            values=values,
+            base=base,
+            current_price=current_price,
+        )
+
     def _safe_get(self, data: Dict, key: str, default: Any = None) -> Any:
         """Safely get value from data dictionary with fallback."""
         return data.get(key, default)
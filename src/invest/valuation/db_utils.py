@@ -7,14 +7,14 @@ database source of truth for all model outputs.
 
 import json
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from invest.data.db import get_connection
+from invest.data.db import get_pooled_connection
 
 
 def get_db_connection(db_path=None):
-    """Get database connection. db_path accepted for backward compatibility but ignored."""
-    return get_connection()
+    """Get a pooled database connection. db_path accepted for backward compatibility but ignored."""
+    return get_pooled_connection()
 
 
 def save_classic_prediction(
@@ -169,20 +169,68 @@ def get_latest_predictions(
 
     cursor.execute(query, params)
     for row in cursor.fetchall():
-        name, fair_value, margin, upside, suitable, error_message, reason, details_json, confidence, timestamp = row
+        name = row[0]
         if name in results:
             continue
-        details = details_json if isinstance(details_json, dict) else (json.loads(details_json) if details_json else {})
-        results[name] = {
-            'fair_value': fair_value,
-            'margin_of_safety': margin,
-            'upside_pct': upside,
-            'confidence': confidence,
-            'suitable': bool(suitable),
-            'error_message': error_message,
-            'failure_reason': reason,
-            'details': details,
-            'timestamp': timestamp
-        }
+        results[name] = _prediction_from_row(row)
 
     return results
+
+
+def get_latest_predictions_bulk(
+    conn,
+    tickers: List[str],
+    model_name: Optional[str] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch equivalent of get_latest_predictions in one query.
+
+    Returns {ticker: {model_name: prediction}}; every requested ticker is
+    present (with an empty dict when it has no predictions).
+    """
+    results: Dict[str, Dict[str, Any]] = {ticker: {} for ticker in tickers}
+    if not tickers:
+        return results
+
+    cursor = conn.cursor()
+    query = '''
+        SELECT ticker, model_name, fair_value, margin_of_safety, upside_pct,
+               suitable, error_message, failure_reason, details_json,
+               confidence, timestamp
+        FROM valuation_results
+        WHERE ticker = ANY(%s)
+    '''
+    params: list = [list(tickers)]
+
+    if model_name:
+        query += ' AND model_name = %s'
+        params.append(model_name)
+
+    query += ' ORDER BY timestamp DESC'
+
+    cursor.execute(query, params)
+    for row in cursor.fetchall():
+        by_model = results.setdefault(row[0], {})
+        name = row[1]
+        if name in by_model:
+            continue
+        by_model[name] = _prediction_from_row(row[1:])
+
+    return results
+
+
+def _prediction_from_row(row) -> Dict[str, Any]:
+    """Shape a (model_name, fair_value, ..., timestamp) valuation_results row."""
+    _, fair_value, margin, upside, suitable, error_message, reason, details_json, confidence, timestamp = row
+    details = details_json if isinstance(details_json, dict) else (json.loads(details_json) if details_json else {})
+    return {
+        'fair_value': fair_value,
+        'margin_of_safety': margin,
+        'upside_pct': upside,
+        'confidence': confidence,
+        'suitable': bool(suitable),
+        'error_message': error_message,
+        'failure_reason': reason,
+        'details': details,
+        'timestamp': timestamp
+    }
@@ -11,7 +11,10 @@ All inherit from the base ValuationModel class for consistency.
 
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from ..config.constants import VALUATION_DEFAULTS
+from ..dcf_kernels import dcf_valuation, project_cash_flows, stage_growth_rates
 from ..exceptions import InsufficientDataError, ModelNotSuitableError
 from .base import ValuationModel, ValuationResult
 
@@ -41,6 +44,8 @@ class DCFModel(ValuationModel):
         - sector: Company sector for sector-specific assumptions
     """
 
+    sensitivity_parameters = ('wacc', 'terminal_growth', 'growth_rate')
+
     def __init__(self):
         super().__init__('dcf')
         self.projection_years = VALUATION_DEFAULTS.DCF_PROJECTION_YEARS
@@ -90,21 +95,18 @@ class DCFModel(ValuationModel):
         growth_rate = self._estimate_growth_rate(data)
         terminal_growth = VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE
 
-        # Project future cash flows
-        projected_fcfs = self._project_cash_flows(fcf, growth_rate, self.projection_years)
-
-        # Calculate terminal value
         if wacc <= terminal_growth:
             raise ModelNotSuitableError('dcf', ticker, f'WACC ({wacc:.2%}) <= terminal growth ({terminal_growth:.2%})')
-        terminal_fcf = projected_fcfs[-1] * (1 + terminal_growth)
-        terminal_value = terminal_fcf / (wacc - terminal_growth)
 
-        # Discount everything to present value
-        pv_fcfs = [fcf / (1 + wacc)**i for i, fcf in enumerate(projected_fcfs, 1)]
-        pv_terminal = terminal_value / (1 + wacc)**self.projection_years
-
-        # Calculate enterprise value
-        enterprise_value = sum(pv_fcfs) + pv_terminal
+        # Project future cash flows, discount them and add the terminal value
+        valuation = dcf_valuation(
+            fcf, stage_growth_rates([(growth_rate, self.projection_years)]), wacc, terminal_growth, details=True
+        )
+        projected_fcfs = valuation['cash_flows'].tolist()
+        pv_fcfs = valuation['pv_cash_flows'].tolist()
+        terminal_value = float(valuation['terminal_value'])
+        pv_terminal = float(valuation['pv_terminal'])
+        enterprise_value = float(valuation['enterprise_value'])
 
         # Convert to equity value
         equity_value = self._convert_to_equity_value(enterprise_value, data)
@@ -147,6 +149,33 @@ class DCFModel(ValuationModel):
 
         return result
 
+    def _sensitivity_base(self, ticker: str, data: Dict[str, Any]) -> Dict[str, float]:
+        """Base-case WACC, terminal growth and growth rate."""
+        return {
+            'wacc': self._estimate_wacc(data),
+            'terminal_growth': VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE,
+            'growth_rate': self._estimate_growth_rate(data),
+        }
+
+    def _fair_value_grid(self, ticker: str, data: Dict[str, Any], parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        """Vectorized ``_calculate_valuation`` fair value (NaN where WACC <= terminal growth)."""
+        wacc = parameters['wacc']
+        terminal_growth = parameters['terminal_growth']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valuation = dcf_valuation(
+                self._get_free_cash_flow(data),
+                self._sensitivity_growth_rates(parameters['growth_rate']),
+                wacc,
+                terminal_growth,
+            )
+        equity_value = self._convert_to_equity_value(valuation['enterprise_value'], data)
+        fair_value = equity_value / self._get_shares_outstanding(data)
+        return np.where(wacc > terminal_growth, fair_value, np.nan)
+
+    def _sensitivity_growth_rates(self, growth_rate: np.ndarray) -> np.ndarray:
+        """Yearly growth path ``(..., years)`` for an array of growth rates."""
+        return growth_rate[..., None] * np.ones(self.projection_years)
+
     def _get_free_cash_flow(self, data: Dict[str, Any]) -> Optional[float]:
         """Calculate or extract free cash flow."""
         cashflow = data.get('cashflow')
@@ -231,14 +260,7 @@ class DCFModel(ValuationModel):
 
     def _project_cash_flows(self, initial_fcf: float, growth_rate: float, years: int) -> List[float]:
         """Project future cash flows."""
-        projected = []
-        fcf = initial_fcf
-
-        for year in range(years):
-            fcf *= (1 + growth_rate)
-            projected.append(fcf)
-
-        return projected
+        return project_cash_flows(initial_fcf, stage_growth_rates([(growth_rate, years)])).tolist()
 
     def _convert_to_equity_value(self, enterprise_value: float, data: Dict[str, Any]) -> float:
         """Convert enterprise value to equity value."""
@@ -320,6 +342,12 @@ class MultiStageDCFModel(DCFModel):
         self.high_growth_years = 5
         self.moderate_growth_years = 5
 
+    def _sensitivity_growth_rates(self, growth_rate: np.ndarray) -> np.ndarray:
+        """High growth, then half of it for the moderate-growth years."""
+        years = np.arange(self.high_growth_years + self.moderate_growth_years)
+        high_growth = growth_rate[..., None]
+        return np.where(years < self.high_growth_years, high_growth, high_growth * 0.5)
+
     def _calculate_valuation(self, ticker: str, data: Dict[str, Any]) -> ValuationResult:
         """Multi-stage DCF calculation."""
         # Extract inputs
@@ -331,29 +359,23 @@ class MultiStageDCFModel(DCFModel):
         moderate_growth = high_growth * 0.5  # Half the initial growth
         terminal_growth = VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE
 
-        # Project cash flows in stages
-        high_growth_fcfs = self._project_cash_flows(fcf, high_growth, self.high_growth_years)
-
-        # Start moderate growth from last high growth FCF
-        moderate_growth_fcfs = self._project_cash_flows(
-            high_growth_fcfs[-1], moderate_growth, self.moderate_growth_years
-        )
-
-        # Calculate terminal value
         if wacc <= terminal_growth:
             raise ModelNotSuitableError('multi_stage_dcf', ticker, f'WACC ({wacc:.2%}) <= terminal growth ({terminal_growth:.2%})')
-        terminal_fcf = moderate_growth_fcfs[-1] * (1 + terminal_growth)
-        terminal_value = terminal_fcf / (wacc - terminal_growth)
-
-        # Discount all cash flows
-        total_years = self.high_growth_years + self.moderate_growth_years
-        all_fcfs = high_growth_fcfs + moderate_growth_fcfs
-
-        pv_fcfs = [fcf / (1 + wacc)**i for i, fcf in enumerate(all_fcfs, 1)]
-        pv_terminal = terminal_value / (1 + wacc)**total_years
 
-        # Calculate enterprise value
-        enterprise_value = sum(pv_fcfs) + pv_terminal
+        # Project cash flows in stages (moderate growth starts from the last
+        # high growth FCF), discount them and add the terminal value
+        growth_rates = stage_growth_rates([
+            (high_growth, self.high_growth_years),
+            (moderate_growth, self.moderate_growth_years),
+        ])
+        valuation = dcf_valuation(fcf, growth_rates, wacc, terminal_growth, details=True)
+        all_fcfs = valuation['cash_flows'].tolist()
+        high_growth_fcfs = all_fcfs[:self.high_growth_years]
+        moderate_growth_fcfs = all_fcfs[self.high_growth_years:]
+        pv_fcfs = valuation['pv_cash_flows'].tolist()
+        terminal_value = float(valuation['terminal_value'])
+        pv_terminal = float(valuation['pv_terminal'])
+        enterprise_value = float(valuation['enterprise_value'])
 
         # Convert to per-share value
         equity_value = self._convert_to_equity_value(enterprise_value, data)
@@ -104,13 +104,13 @@ class EnsembleModel(ValuationModel):
         if not selected_models:
             raise InsufficientDataError(ticker, ['suitable_models'])
 
-        # Run all selected models
+        # Run all selected models on the ensemble's data (no refetch per model)
         individual_results = {}
         for model_name in selected_models:
             try:
                 # Import registry dynamically to avoid circular imports
                 from . import model_registry
-                result = model_registry.run_valuation(model_name, ticker, verbose=False)
+                result = model_registry.run_valuation(model_name, ticker, verbose=False, data=data)
                 if result and result.is_valid():
                     individual_results[model_name] = result
                 else:
@@ -200,9 +200,9 @@ class EnsembleModel(ValuationModel):
         """Intelligently select models based on company characteristics."""
 
         info = data.get('info', {})
-        sector = info.get('sector', '').lower()
-        industry = info.get('industry', '').lower()
-        market_cap = info.get('marketCap', 0)
+        sector = (info.get('sector') or '').lower()
+        industry = (info.get('industry') or '').lower()
+        market_cap = info.get('marketCap') or 0
 
         selected_models = []
 
@@ -335,8 +335,8 @@ class EnsembleModel(ValuationModel):
                     pass
 
             # Check 2: Industry characteristics (known reinvestment-heavy sectors)
-            sector = info.get('sector', '').lower()
-            industry = info.get('industry', '').lower()
+            sector = (info.get('sector') or '').lower()
+            industry = (info.get('industry') or '').lower()
 
             reinvestment_keywords = [
                 'e-commerce', 'retail', 'fulfillment', 'logistics', 'transportation',
@@ -16,6 +16,7 @@ from typing import Any, Dict, Optional
 import numpy as np
 
 from ..config.constants import VALUATION_DEFAULTS
+from ..dcf_kernels import dcf_valuation, stage_growth_rates
 from ..exceptions import InsufficientDataError, ModelNotSuitableError
 from .base import ValuationResult
 from .dcf_model import DCFModel
@@ -24,6 +25,8 @@ from .dcf_model import DCFModel
 class GrowthAdjustedDCFModel(DCFModel):
     """Growth-Adjusted DCF that separates maintenance from growth CapEx."""
 
+    sensitivity_parameters = ('wacc', 'terminal_growth', 'roic')
+
     def __init__(self):
         super().__init__()
         self.name = 'growth_dcf'
@@ -113,18 +116,19 @@ class GrowthAdjustedDCFModel(DCFModel):
         wacc = self._estimate_wacc(data)
         terminal_growth = VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE
 
-        projected_normalized_fcfs = self._project_cash_flows(normalized_fcf, terminal_growth, self.projection_years)
-
         # Step 4: Value the base business (from normalized FCF)
         if wacc <= terminal_growth:
             raise ModelNotSuitableError('growth_dcf', ticker, f'WACC ({wacc:.2%}) <= terminal growth ({terminal_growth:.2%})')
-        terminal_normalized_fcf = projected_normalized_fcfs[-1] * (1 + terminal_growth)
-        terminal_value_base = terminal_normalized_fcf / (wacc - terminal_growth)
-
-        pv_normalized_fcfs = [fcf / (1 + wacc)**i for i, fcf in enumerate(projected_normalized_fcfs, 1)]
-        pv_terminal_base = terminal_value_base / (1 + wacc)**self.projection_years
+        base_valuation = dcf_valuation(
+            normalized_fcf, stage_growth_rates([(terminal_growth, self.projection_years)]),
+            wacc, terminal_growth, details=True,
+        )
+        projected_normalized_fcfs = base_valuation['cash_flows'].tolist()
+        pv_normalized_fcfs = base_valuation['pv_cash_flows'].tolist()
+        terminal_value_base = float(base_valuation['terminal_value'])
+        pv_terminal_base = float(base_valuation['pv_terminal'])
 
-        base_business_value = sum(pv_normalized_fcfs) + pv_terminal_base
+        base_business_value = float(base_valuation['enterprise_value'])
 
         # Step 5: Value growth investments separately
         growth_investment_value = self._value_growth_investments(growth_capex, data)
@@ -180,6 +184,44 @@ class GrowthAdjustedDCFModel(DCFModel):
 
         return result
 
+    def _sensitivity_base(self, ticker: str, data: Dict[str, Any]) -> Dict[str, float]:
+        """Base-case WACC, terminal growth and ROIC."""
+        return {
+            'wacc': self._estimate_wacc(data),
+            'terminal_growth': VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE,
+            'roic': self._calculate_roic(data),
+        }
+
+    def _fair_value_grid(self, ticker: str, data: Dict[str, Any], parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        """Vectorized ``_calculate_valuation`` fair value (NaN where WACC <= terminal growth)."""
+        capex_breakdown = self._separate_maintenance_growth_capex(data)
+        normalized_fcf = self._get_operating_cash_flow(data) - capex_breakdown['maintenance_capex']
+        if normalized_fcf <= 0:
+            raise ModelNotSuitableError('growth_dcf', ticker, f'Negative normalized FCF ({normalized_fcf:,.0f}) - cannot produce meaningful DCF valuation')
+
+        wacc = parameters['wacc']
+        terminal_growth = parameters['terminal_growth']
+        roic = parameters['roic']
+
+        growth_capex = capex_breakdown['growth_capex']
+        spread = wacc - terminal_growth
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # Base business grows at terminal growth (see _calculate_valuation)
+            base_business_value = dcf_valuation(
+                normalized_fcf, terminal_growth[..., None] * np.ones(self.projection_years), wacc, terminal_growth,
+            )['enterprise_value']
+
+            # Growth investments as in _value_growth_investments
+            growth_investment_value = 0.0
+            if growth_capex > 0:
+                growth_investment_value = np.where(
+                    (roic > 0) & (spread > 0), growth_capex * (roic * 0.8) / spread, 0.0
+                )
+
+        equity_value = self._convert_to_equity_value(base_business_value + growth_investment_value, data)
+        fair_value = equity_value / self._get_shares_outstanding(data)
+        return np.where(spread > 0, fair_value, np.nan)
+
     def _separate_maintenance_growth_capex(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Separate total CapEx into maintenance and growth components.
@@ -6,9 +6,9 @@ making it easy to discover, instantiate, and manage different valuation approach
 """
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
-from .base import ValuationModel, ValuationResult
+from .base import SensitivityGrid, ValuationModel, ValuationResult
 from .dcf_model import DCFModel, EnhancedDCFModel, MultiStageDCFModel
 from .ensemble_model import EnsembleModel
 from .growth_dcf_model import GrowthAdjustedDCFModel
@@ -229,7 +229,8 @@ class ModelRegistry:
 
         return self._model_instances[model_name]
 
-    def run_valuation(self, model_name: str, ticker: str, verbose: bool = False) -> Optional[ValuationResult]:
+    def run_valuation(self, model_name: str, ticker: str, verbose: bool = False,
+                      data: Dict[str, Any] = None) -> Optional[ValuationResult]:
         """
         Run a valuation using the specified model.
 
@@ -241,6 +242,8 @@ class ModelRegistry:
             Stock ticker symbol
         verbose : bool
             Whether to enable verbose logging
+        data : Dict[str, Any], optional
+            Pre-fetched company data; the model fetches its own if omitted
 
         Returns
         -------
@@ -251,7 +254,10 @@ class ModelRegistry:
             model = self.get_model(model_name)
             self._model_stats[model_name]['runs'] += 1
 
-            result = model.value_company(ticker, verbose=verbose)
+            if data is None:
+                result = model.value_company(ticker, verbose=verbose)
+            else:
+                result = model.value_company_with_data(ticker, data, verbose=verbose)
 
             if result and result.is_valid():
                 self._model_stats[model_name]['successes'] += 1
@@ -267,16 +273,21 @@ class ModelRegistry:
             logger.error(f'{model_name} valuation failed for {ticker}: {str(e)}')
             return None
 
-    def run_all_suitable_models(self, ticker: str, verbose: bool = False) -> Dict[str, ValuationResult]:
+    def run_all_suitable_models(self, ticker: str, verbose: bool = False,
+                                data: Dict[str, Any] = None) -> Dict[str, ValuationResult]:
         """
         Run all models that are suitable for the given ticker.
 
+        Data is fetched once (unless given) and shared by every model.
+
         Parameters
         ----------
         ticker : str
             Stock ticker symbol
         verbose : bool
             Whether to enable verbose logging
+        data : Dict[str, Any], optional
+            Pre-fetched company data
 
         Returns
         -------
@@ -285,14 +296,15 @@ class ModelRegistry:
         """
         results = {}
 
-        # First, fetch data once to check model suitability
-        try:
-            # Use any model to fetch data (they all use similar data sources)
-            sample_model = self.get_model('simple_ratios')  # Least demanding model
-            data = sample_model._fetch_data(ticker)
-        except Exception as e:
-            logger.error(f'Failed to fetch data for {ticker}: {str(e)}')
-            return results
+        # First, fetch data once for every model
+        if data is None:
+            try:
+                # Use any model to fetch data (they all use similar data sources)
+                sample_model = self.get_model('simple_ratios')  # Least demanding model
+                data = sample_model._fetch_data(ticker)
+            except Exception as e:
+                logger.error(f'Failed to fetch data for {ticker}: {str(e)}')
+                return results
 
         # Test each model for suitability and run if appropriate
         for model_name in self.get_available_models():
@@ -300,7 +312,7 @@ class ModelRegistry:
                 model = self.get_model(model_name)
 
                 if model.is_suitable(ticker, data):
-                    result = self.run_valuation(model_name, ticker, verbose)
+                    result = self.run_valuation(model_name, ticker, verbose, data=data)
                     if result:
                         results[model_name] = result
                 else:
@@ -313,6 +325,52 @@ class ModelRegistry:
 
         return results
 
+    def sensitivity_grid(
+        self,
+        model_name: str,
+        ticker: str,
+        axes: Mapping[str, Optional[Sequence[float]]],
+        data: Dict[str, Any] = None,
+    ) -> SensitivityGrid:
+        """
+        Fair value of a ticker over a grid of model inputs (e.g. WACC × terminal growth).
+
+        Data is fetched once and the model's core calculation is evaluated
+        over the whole grid in one vectorized call.
+
+        Parameters
+        ----------
+        model_name : str
+            Name of the model to use (one with ``sensitivity_parameters``,
+            e.g. 'dcf', 'multi_stage_dcf', 'growth_dcf', 'rim')
+        ticker : str
+            Stock ticker symbol
+        axes : Mapping[str, Optional[Sequence[float]]]
+            Inputs to vary, in axis order, mapped to their values (None for a
+            default span around the base case), e.g.
+            ``{'wacc': [0.08, 0.09, 0.10], 'terminal_growth': None}``
+        data : Dict[str, Any], optional
+            Pre-fetched company data
+
+        Returns
+        -------
+        SensitivityGrid
+            Labelled fair values, one axis per entry of ``axes``
+
+        Raises
+        ------
+        ValueError
+            If the model is unknown, has no sensitivity support or an axis is unknown
+        ModelNotSuitableError
+            If the model is not appropriate for this company
+        InsufficientDataError
+            If required data is not available
+        """
+        model = self.get_model(model_name)
+        if data is None:
+            data = model._fetch_data(ticker)
+        return model.sensitivity_grid(ticker, data, axes)
+
     def get_model_recommendations(self, ticker: str, data: Dict[str, Any] = None) -> List[str]:
         """
         Get recommended models for a specific ticker based on its characteristics.
@@ -341,9 +399,9 @@ class ModelRegistry:
 
         # Check company characteristics
         info = data.get('info', {})
-        sector = info.get('sector', '').lower()
-        industry = info.get('industry', '').lower()
-        market_cap = info.get('marketCap', 0)
+        sector = (info.get('sector') or '').lower()
+        industry = (info.get('industry') or '').lower()
+        market_cap = info.get('marketCap') or 0
 
         # Always recommend ensemble first if we can get multiple models
         potential_models = []
@@ -457,8 +515,8 @@ class ModelRegistry:
                     pass
 
             # Check 2: Industry characteristics (known reinvestment-heavy sectors)
-            sector = info.get('sector', '').lower()
-            industry = info.get('industry', '').lower()
+            sector = (info.get('sector') or '').lower()
+            industry = (info.get('industry') or '').lower()
 
             reinvestment_keywords = [
                 'e-commerce', 'retail', 'fulfillment', 'logistics', 'transportation',
@@ -526,17 +584,25 @@ def get_model(model_name: str) -> ValuationModel:
     """Get a model instance from the global registry."""
     return _registry.get_model(model_name)
 
-def run_valuation(model_name: str, ticker: str, verbose: bool = False) -> Optional[ValuationResult]:
+def run_valuation(model_name: str, ticker: str, verbose: bool = False,
+                  data: Dict[str, Any] = None) -> Optional[ValuationResult]:
     """Run a valuation using the global registry."""
-    return _registry.run_valuation(model_name, ticker, verbose)
+    return _registry.run_valuation(model_name, ticker, verbose, data=data)
 
 def get_available_models() -> List[str]:
     """Get available models from the global registry."""
     return _registry.get_available_models()
 
-def run_all_suitable_models(ticker: str, verbose: bool = False) -> Dict[str, ValuationResult]:
+def run_all_suitable_models(ticker: str, verbose: bool = False,
+                            data: Dict[str, Any] = None) -> Dict[str, ValuationResult]:
     """Run all suitable models from the global registry."""
-    return _registry.run_all_suitable_models(ticker, verbose)
+    return _registry.run_all_suitable_models(ticker, verbose, data=data)
+
+def sensitivity_grid(model_name: str, ticker: str,
+                     axes: Mapping[str, Optional[Sequence[float]]],
+                     data: Dict[str, Any] = None) -> SensitivityGrid:
+    """Evaluate a model over a grid of inputs using the global registry."""
+    return _registry.sensitivity_grid(model_name, ticker, axes, data=data)
 
 def get_registry_stats() -> Dict[str, Any]:
     """Get statistics from the global registry."""
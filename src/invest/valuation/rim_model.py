@@ -7,7 +7,10 @@ and mature businesses where traditional DCF may not be suitable.
 
 from typing import Any, Dict, Optional
 
+import numpy as np
+
 from ..config.constants import VALUATION_DEFAULTS
+from ..dcf_kernels import present_values, project_cash_flows
 from ..exceptions import InsufficientDataError, ModelNotSuitableError
 from .base import ValuationModel, ValuationResult
 
@@ -15,6 +18,8 @@ from .base import ValuationModel, ValuationResult
 class RIMModel(ValuationModel):
     """Residual Income Model for equity valuation."""
 
+    sensitivity_parameters = ('cost_of_equity', 'terminal_growth', 'roe')
+
     def __init__(self):
         super().__init__('rim')
         self.projection_years = VALUATION_DEFAULTS.RIM_PROJECTION_YEARS
@@ -153,6 +158,37 @@ class RIMModel(ValuationModel):
 
         return result
 
+    def _sensitivity_base(self, ticker: str, data: Dict[str, Any]) -> Dict[str, float]:
+        """Base-case cost of equity, terminal growth and ROE."""
+        return {
+            'cost_of_equity': self._estimate_cost_of_equity(data),
+            'terminal_growth': VALUATION_DEFAULTS.TERMINAL_GROWTH_RATE,
+            'roe': self._calculate_roe(data),
+        }
+
+    def _fair_value_grid(self, ticker: str, data: Dict[str, Any], parameters: Dict[str, np.ndarray]) -> np.ndarray:
+        """Vectorized ``_calculate_valuation`` fair value (NaN where cost of equity <= terminal growth)."""
+        book_equity = self._get_book_equity(data)
+        cost_of_equity = parameters['cost_of_equity']
+        terminal_growth = parameters['terminal_growth']
+        roe = parameters['roe']
+        roe_spread = roe - cost_of_equity
+
+        # Book value grows by retained earnings (as in _project_book_values)
+        retained = roe * VALUATION_DEFAULTS.RETENTION_RATIO
+        book_values = project_cash_flows(book_equity, retained[..., None] * np.ones(self.projection_years))
+        pv_residual_incomes = present_values(roe_spread[..., None] * book_values, cost_of_equity).sum(axis=-1)
+
+        # Terminal value, fading the spread toward the cost of equity
+        terminal_residual_income = roe_spread * VALUATION_DEFAULTS.ROE_FADE_RATE * book_values[..., -1] * (1 + terminal_growth)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terminal_value = terminal_residual_income / (cost_of_equity - terminal_growth)
+        pv_terminal = terminal_value / (1 + cost_of_equity)**self.projection_years
+
+        equity_value = book_equity + pv_residual_incomes + pv_terminal
+        fair_value = equity_value / self._get_shares_outstanding(data)
+        return np.where(cost_of_equity > terminal_growth, fair_value, np.nan)
+
     def _get_book_equity(self, data: Dict[str, Any]) -> Optional[float]:
         """Get book value of equity from balance sheet."""
         balance_sheet = data.get('balance_sheet')
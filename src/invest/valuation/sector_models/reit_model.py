@@ -38,8 +38,8 @@ class REITModel(ValuationModel):
             info = data.get('info', {})
 
             # Check if it's classified as a REIT
-            sector = info.get('sector', '').lower()
-            industry = info.get('industry', '').lower()
+            sector = (info.get('sector') or '').lower()
+            industry = (info.get('industry') or '').lower()
 
             # Look for REIT indicators
             is_reit = (
@@ -38,8 +38,8 @@ class TechModel(ValuationModel):
         try:
             info = data.get('info', {})
 
-            sector = info.get('sector', '').lower()
-            industry = info.get('industry', '').lower()
+            sector = (info.get('sector') or '').lower()
+            industry = (info.get('industry') or '').lower()
 
             # Technology sector indicators
             tech_keywords = [
@@ -40,8 +40,8 @@ class UtilityModel(ValuationModel):
         try:
             info = data.get('info', {})
 
-            sector = info.get('sector', '').lower()
-            industry = info.get('industry', '').lower()
+            sector = (info.get('sector') or '').lower()
+            industry = (info.get('industry') or '').lower()
 
             # Utility sector indicators
             utility_keywords = [
@@ -1,16 +1,19 @@
 """
 Pytest configuration and shared fixtures for the investment analysis testing suite.
 """
+import sqlite3
 import sys
 import tempfile
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pandas as pd
 import pytest
 import yaml
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "models"))
 
 
 def pytest_collection_modifyitems(config, items):
@@ -383,6 +386,38 @@ def international_config():
     }
 
 
+def _statement(rows, values):
+    """A financial statement frame as the valuation models take it (newest year first)."""
+    columns = pd.to_datetime(["2023-12-31", "2022-12-31", "2021-12-31", "2020-12-31"])
+    return pd.DataFrame(values, index=rows, columns=columns)
+
+
+@pytest.fixture
+def company_data():
+    """Model-ready data of a growing mid-cap, suitable for DCF, growth DCF, RIM and ensemble."""
+    return {
+        "ticker": "TEST",
+        "info": {
+            "beta": 1.0, "sharesOutstanding": 1e9, "currentPrice": 40.0, "marketCap": 4e10,
+            "sector": "Industrials", "trailingPE": 25.0, "priceToBook": 5.0, "trailingEps": 1.6,
+            "bookValue": 8.0, "returnOnEquity": 0.18,
+        },
+        "income": _statement(
+            ["Total Revenue", "Net Income", "Operating Income"],
+            [[14e9, 12.5e9, 11e9, 10e9], [1.5e9, 1.4e9, 1.3e9, 1.2e9], [2.4e9, 2.2e9, 2e9, 1.8e9]],
+        ),
+        "cashflow": _statement(
+            ["Free Cash Flow", "Operating Cash Flow", "Capital Expenditure", "Depreciation And Amortization"],
+            [[1.6e9, 1.5e9, 1.3e9, 1.2e9], [2.4e9, 2.2e9, 2e9, 1.8e9],
+             [-0.8e9, -0.7e9, -0.7e9, -0.6e9], [0.3e9, 0.3e9, 0.3e9, 0.3e9]],
+        ),
+        "balance_sheet": _statement(
+            ["Stockholders Equity", "Total Assets", "Cash And Cash Equivalents", "Total Debt"],
+            [[8e9] * 4, [14e9] * 4, [1e9] * 4, [2e9] * 4],
+        ),
+    }
+
+
 @pytest.fixture
 def temp_config_file(basic_config):
     """Create a temporary configuration file."""
@@ -528,3 +563,38 @@ def mock_data_providers(mock_stock_data, mock_sp500_tickers, mock_japanese_ticke
                         "intl_data": mock_intl_data,
                         "market_tickers": mock_market_tickers,
                     }
+
+
+@pytest.fixture(scope="session")
+def backtest_db(tmp_path_factory):
+    """
+    Small synthetic market database shared by the backtesting tests.
+
+    Built with ``backtesting.data.synthetic.generate_market_db`` (prices from
+    2011 to 2023, quarterly snapshots, 1y forward returns, late listings and
+    delistings), then roughened with the gaps real data has: a stock without
+    sector or industry, a trading halt, NULL closes and volumes, snapshots
+    without VIX or profit margins and forward returns without a value.
+    """
+    from backtesting.data.synthetic import generate_market_db
+
+    market = generate_market_db(
+        str(tmp_path_factory.mktemp("backtest") / "stock_data.db"),
+        n_tickers=16, years=10, start_date="2011-01-01", history_years=3,
+        late_listing_rate=0.2, delisting_rate=0.2, seed=1,
+    )
+
+    conn = sqlite3.connect(market.db_path)
+    conn.execute("UPDATE assets SET sector = NULL, industry = NULL WHERE symbol = ?", (market.tickers[2],))
+    conn.execute(
+        "DELETE FROM price_history WHERE ticker = ? AND date BETWEEN '2017-05-01' AND '2017-08-01'",
+        (market.tickers[4],),
+    )
+    conn.execute("UPDATE price_history SET close = NULL WHERE rowid % 97 = 0")
+    conn.execute("UPDATE price_history SET volume = NULL WHERE rowid % 89 = 0")
+    conn.execute("UPDATE fundamental_history SET vix = NULL WHERE id % 11 = 0")
+    conn.execute("UPDATE fundamental_history SET profit_margins = NULL WHERE id % 5 = 0")
+    conn.execute("UPDATE forward_returns SET return_pct = NULL WHERE id % 19 = 0")
+    conn.commit()
+    conn.close()
+    return market
@@ -0,0 +1,117 @@
+"""
+Tests for the synthetic-data benchmark harness (backtesting.core.benchmark,
+backtesting.data.synthetic).
+
+The generated database must have the shape the backtester reads (point-in-time
+snapshots, matured forward returns, delistings), and each benchmark case must
+report its timing, memory and SQL counts.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('lightgbm')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core.benchmark import (
+    SqlCounter,
+    append_report,
+    parse_scale,
+    run_benchmarks,
+    run_case,
+)
+from backtesting.data.synthetic import generate_market_db, market_summary
+
+
+def _table(path, query):
+    conn = sqlite3.connect(path)
+    try:
+        return pd.read_sql(query, conn)
+    finally:
+        conn.close()
+
+
+def test_synthetic_market(tmp_path):
+    market = generate_market_db(str(tmp_path / 'a.db'), n_tickers=40, years=2, history_years=2,
+                                delisting_rate=0.2, seed=3)
+
+    assert market_summary(market.db_path) == market
+    assert len(market.tickers) == 40
+    assert market.start_date == pd.Timestamp('2014-01-01')
+
+    prices = _table(market.db_path, 'SELECT ticker, date, close FROM price_history')
+    assert len(prices) == market.price_rows
+    assert (prices['close'] > 0).all()
+    last = pd.to_datetime(prices.groupby('ticker')['date'].max())
+    assert last[market.benchmark] == market.end_date
+    assert (last < market.end_date - pd.Timedelta(days=7)).any()  # some delistings
+
+    snapshots = _table(market.db_path, '''
+        SELECT fh.id, fh.snapshot_date, fr.return_pct
+        FROM fundamental_history fh LEFT JOIN forward_returns fr ON fr.snapshot_id = fh.id
+    ''')
+    assert len(snapshots) == market.snapshot_rows
+    dates = pd.to_datetime(snapshots['snapshot_date'])
+    assert dates.dt.is_quarter_end.all()
+    matured = dates + pd.Timedelta(days=365) <= market.end_date
+    assert snapshots.loc[~matured, 'return_pct'].isna().all()
+    assert snapshots.loc[matured, 'return_pct'].notna().mean() > 0.8
+
+    again = generate_market_db(str(tmp_path / 'b.db'), n_tickers=40, years=2, history_years=2,
+                                delisting_rate=0.2, seed=3)
+    pd.testing.assert_frame_equal(
+        _table(again.db_path, 'SELECT ticker, date, close FROM price_history'), prices,
+    )
+
+
+def test_sql_counter(tmp_path):
+    path = str(tmp_path / 'c.db')
+    with SqlCounter() as sql:
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE t (x)')
+        conn.execute('SELECT * FROM t').fetchall()
+        conn.close()
+    sqlite3.connect(path).execute('SELECT * FROM t')  # not counted
+
+    assert (sql.connections, sql.statements, sql.selects) == (1, 2, 1)
+    assert parse_scale('500x5') == (500, 5)
+    with pytest.raises(ValueError):
+        parse_scale('500')
+
+
+def test_benchmark_cases(tmp_path):
+    # One case in a spawned process, as the runner does
+    results = run_benchmarks(scales=[(30, 2)], strategies=['market_cap'], workdir=str(tmp_path))
+    assert results[0]['status'] == 'success'
+
+    case = {'n_tickers': 30, 'years': 2, 'seed': 0, 'workdir': str(tmp_path),
+            'rebalance_frequency': 'quarterly'}
+    panel = run_case({**case, 'strategy': 'screening', 'data_mode': 'panel'})
+    query = run_case({**case, 'strategy': 'screening', 'data_mode': 'query'})
+
+    for result in results + [panel, query]:
+        assert result['status'] == 'success', result.get('error')
+        assert result['wall_time_s'] > 0
+        assert result['peak_rss_mb'] > 0
+        assert result['sql_statements'] > 0
+        assert result['trades'] > 0
+    assert panel['rebalances'] == query['rebalances'] == 8
+    # The panel provider preloads; the query provider queries per rebalance
+    assert panel['sql_statements'] < query['sql_statements'] / 10
+
+    output = tmp_path / 'results.json'
+    append_report(results, str(output), {'scales': ['30x2']})
+    append_report([panel, query], str(output))
+    with open(output) as f:
+        runs = json.load(f)['runs']
+    assert [len(run['results']) for run in runs] == [1, 2]
+    assert runs[0]['settings'] == {'scales': ['30x2']}
+    assert runs[0]['machine']['cpu_count'] >= 1
@@ -0,0 +1,127 @@
+"""
+Tests for the daily equity curve kernel (backtesting.core.equity).
+
+Vectorized daily NAV must equal valuing each day's holdings one by one, and
+the backtest metrics derived from it must be consistent with the curve.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core.equity import DailyEquityCurve
+from backtesting.core.metrics import PerformanceMetrics
+
+
+def _portfolio_values() -> pd.DataFrame:
+    return pd.DataFrame([
+        {'date': pd.Timestamp('2022-01-01'), 'value': 1000.0, 'cash': 100.0, 'holdings': {'AAA': 5.0, 'BBB': 10.0}},
+        {'date': pd.Timestamp('2022-02-01'), 'value': 1010.0, 'cash': 1010.0, 'holdings': {}},
+        {'date': pd.Timestamp('2022-03-01'), 'value': 1010.0, 'cash': 10.0, 'holdings': {'BBB': 8.0, 'GONE': 3.0}},
+        {'date': pd.Timestamp('2022-04-02'), 'value': 990.0, 'cash': 5.0, 'holdings': {'AAA': 2.0, 'BBB': 4.0}},
+        {'date': pd.Timestamp('2022-06-30'), 'value': 1050.0, 'cash': 0.0, 'holdings': {}, 'is_liquidation': True},
+    ])
+
+
+def _closes() -> pd.DataFrame:
+    rng = np.random.default_rng(5)
+    days = pd.bdate_range('2021-12-20', '2022-06-30')
+    closes = pd.DataFrame({
+        'AAA': 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days)))),
+        'BBB': 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days)))),
+        'SPY': 400 * np.exp(np.cumsum(rng.normal(0, 0.01, len(days)))),
+    }, index=days)
+    closes.iloc[rng.random(closes.shape) < 0.05] = np.nan
+    return closes
+
+
+def _reference_values(portfolio_values, closes) -> pd.Series:
+    """Value each day from its period's holdings and the last known closes."""
+    dates = list(portfolio_values['date'])
+    days = sorted(set(closes.index[(closes.index >= dates[0]) & (closes.index < dates[-1])]) | set(dates[:-1]))
+    values = {}
+    for day in days:
+        period = max(i for i, d in enumerate(dates) if d <= day)
+        row = portfolio_values.iloc[period]
+        value = row['cash']
+        for ticker, shares in row['holdings'].items():
+            if ticker in closes.columns:
+                known = closes.loc[:day, ticker].dropna()
+                value += shares * (known.iloc[-1] if len(known) else 0.0)
+        values[day] = value
+    values[dates[-1]] = portfolio_values['value'].iloc[-1]
+    return pd.Series(values)
+
+
+def test_values_match_per_day_valuation():
+    portfolio_values, closes = _portfolio_values(), _closes()
+    curve = DailyEquityCurve(portfolio_values, closes)
+    expected = _reference_values(portfolio_values, closes)
+
+    np.testing.assert_array_equal(curve.values.index, expected.index)
+    np.testing.assert_allclose(curve.values.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    # 2022-01-01 is a holiday: positions are valued at the last close before it
+    assert curve.values.loc['2022-01-01'] == pytest.approx(expected.loc[pd.Timestamp('2022-01-01')])
+    # Cash-only period
+    assert (curve.values.loc['2022-02-01':'2022-02-28'] == 1010.0).all()
+
+
+def test_drawdown_and_traded_value():
+    portfolio_values, closes = _portfolio_values(), _closes()
+    curve = DailyEquityCurve(portfolio_values, closes)
+    values = _reference_values(portfolio_values, closes)
+
+    expected_dd = (values / values.cummax() - 1).min()
+    assert curve.drawdown().min() == pytest.approx(expected_dd, rel=1e-12)
+
+    last_close = closes.ffill()
+    price = lambda t, d: last_close.loc[:d, t].iloc[-1] if t in last_close else 0.0  # noqa: E731
+    expected_traded = (
+        5 * price('AAA', '2022-01-01') + 10 * price('BBB', '2022-01-01') +   # initial buy
+        5 * price('AAA', '2022-02-01') + 10 * price('BBB', '2022-02-01') +   # sell everything
+        8 * price('BBB', '2022-03-01') + 3 * price('GONE', '2022-03-01') +   # buy
+        2 * price('AAA', '2022-04-02') + 4 * price('BBB', '2022-04-02') +    # rotate
+        3 * price('GONE', '2022-04-02')
+    )
+    assert curve.traded_value() == pytest.approx(expected_traded, rel=1e-12)
+
+
+def test_metrics_use_the_curve():
+    portfolio_values, closes = _portfolio_values(), _closes()
+    curve = DailyEquityCurve(portfolio_values, closes)
+    benchmark = closes[['SPY']].rename(columns={'SPY': 'Close'})
+
+    metrics = PerformanceMetrics.calculate(portfolio_values, 1000.0, benchmark, equity_curve=curve)
+
+    assert metrics['intra_period_max_drawdown'] == pytest.approx(curve.drawdown().min() * 100)
+    assert metrics['intra_period_max_drawdown'] <= metrics['max_drawdown']
+
+    years = (portfolio_values['date'].iloc[-1] - portfolio_values['date'].iloc[0]).days / 365.25
+    assert metrics['turnover'] == pytest.approx(curve.traded_value() / 2 / (curve.values.mean() * years))
+
+    spy = closes['SPY'].dropna()
+    common = curve.values.index.intersection(spy.index)
+    aligned = pd.concat([curve.values.loc[common].pct_change(), spy.loc[common].pct_change()], axis=1).dropna()
+    expected_beta = aligned.cov().iloc[0, 1] / aligned.iloc[:, 1].var()
+    assert metrics['beta'] == pytest.approx(expected_beta, rel=1e-9)
+
+
+def test_rolling_metrics_over_daily_values():
+    portfolio_values, closes = _portfolio_values(), _closes()
+    curve = DailyEquityCurve(portfolio_values, closes)
+
+    rolling = PerformanceMetrics.calculate_rolling_metrics(portfolio_values, window=20, equity_curve=curve)
+
+    returns = curve.values.pct_change().reset_index(drop=True)
+    expected_sharpe = (returns - 0.02 / 252).rolling(20).mean() / returns.rolling(20).std() * np.sqrt(252)
+    assert len(rolling) == len(curve.values)
+    pd.testing.assert_series_equal(rolling['rolling_sharpe'], expected_sharpe, check_names=False)
+    assert rolling['rolling_sortino'].dropna().size > 0
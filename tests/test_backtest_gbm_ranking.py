@@ -0,0 +1,174 @@
+"""
+Tests for GBMRankingStrategy's precomputed feature pipeline.
+
+Features served from the once-engineered snapshot history and the price
+panel must match the per-rebalance SQL pipeline they replace.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+lgb = pytest.importorskip('lightgbm')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.strategies.gbm_ranking import GBMRankingStrategy
+from gbm_feature_config import (
+    BASE_FEATURES,
+    CASHFLOW_FEATURES,
+    CATEGORICAL_FEATURES,
+    FUNDAMENTAL_FEATURES,
+    LAG_PERIODS,
+    MARKET_FEATURES,
+    PRICE_FEATURES,
+    ROLLING_WINDOWS,
+)
+from train_gbm_stock_ranker import (
+    create_change_features,
+    create_lag_features,
+    create_rolling_features,
+    standardize_by_date,
+    winsorize_by_date,
+)
+
+RAW_COLUMNS = FUNDAMENTAL_FEATURES + MARKET_FEATURES + CASHFLOW_FEATURES
+DATES = ['2018-06-30', '2020-01-15', '2021-11-30', '2023-03-31']
+
+
+@pytest.fixture(scope='module')
+def model_path(tmp_path_factory) -> str:
+    rng = np.random.default_rng(0)
+    path = str(tmp_path_factory.mktemp('model') / 'model.txt')
+    booster = lgb.train({'verbose': -1}, lgb.Dataset(rng.random((50, 3)), rng.random(50)), 2)
+    booster.save_model(path)
+    return path
+
+
+def _reference_price_features(df, conn, as_of_date):
+    """Per-ticker price features, as the strategy computed them before."""
+    for feat in PRICE_FEATURES:
+        df[feat] = 0.0
+    for ticker in df['ticker'].unique():
+        prices = pd.read_sql(
+            'SELECT date, close, volume FROM price_history WHERE ticker = ? AND date >= ? AND date <= ? ORDER BY date',
+            conn,
+            params=(ticker, (as_of_date - pd.Timedelta(days=365)).strftime('%Y-%m-%d'), as_of_date.strftime('%Y-%m-%d')),
+            parse_dates=['date'],
+            index_col='date',
+        )
+        if len(prices) < 20:
+            continue
+        current_price = prices['close'].iloc[-1]
+        for feat, days in [('returns_1m', 21), ('returns_3m', 63), ('returns_6m', 126), ('returns_1y', 252)]:
+            if len(prices) >= days:
+                df.loc[df['ticker'] == ticker, feat] = (current_price / prices['close'].iloc[-days] - 1) * 100
+        daily_returns = prices['close'].pct_change().dropna()
+        if len(daily_returns) > 0:
+            df.loc[df['ticker'] == ticker, 'volatility'] = daily_returns.std() * np.sqrt(252) * 100
+        if len(prices) >= 120:
+            recent_volume = prices['volume'].iloc[-20:].mean()
+            historical_volume = prices['volume'].iloc[-120:-20].mean()
+            if historical_volume > 0:
+                df.loc[df['ticker'] == ticker, 'volume_trend'] = recent_volume / historical_volume
+    return df
+
+
+def _reference_features(db_path, as_of_date, min_snapshots):
+    """Features re-engineered from SQL for one rebalance date."""
+    conn = sqlite3.connect(db_path)
+    filing_lag_date = as_of_date - pd.Timedelta(days=60)
+    cols = (
+        ['a.symbol as ticker', 'a.sector', 's.snapshot_date', 's.id as snapshot_id'] +
+        [f's.{col}' for col in RAW_COLUMNS]
+    )
+    df = pd.read_sql(f'''
+        SELECT {', '.join(cols)}
+        FROM fundamental_history s JOIN assets a ON s.asset_id = a.id
+        WHERE s.snapshot_date <= '{filing_lag_date.strftime('%Y-%m-%d')}' AND s.vix IS NOT NULL
+        ORDER BY a.symbol, s.snapshot_date
+    ''', conn)
+    df['snapshot_date'] = pd.to_datetime(df['snapshot_date'])
+    for col in RAW_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    df = _reference_price_features(df, conn, filing_lag_date)
+    conn.close()
+    if len(df) == 0:
+        return pd.DataFrame()
+
+    df = df.sort_values(['ticker', 'snapshot_date']).reset_index(drop=True)
+    df['log_market_cap'] = np.log(df['market_cap'].fillna(1e9) + 1e9)
+    df['fcf_yield'] = df['free_cashflow'].fillna(0) / (df['market_cap'].fillna(1e9) + 1e9)
+    df['ocf_yield'] = df['operating_cashflow'].fillna(0) / (df['market_cap'].fillna(1e9) + 1e9)
+    df['earnings_yield'] = df['trailing_eps'].fillna(0) / (df['market_cap'].fillna(1e9) / df['book_value'].fillna(1) + 1e-9)
+    df = create_lag_features(df, BASE_FEATURES, lags=LAG_PERIODS)
+    df = create_change_features(df, BASE_FEATURES)
+    df = create_rolling_features(df, BASE_FEATURES, windows=ROLLING_WINDOWS)
+    for feat in BASE_FEATURES:
+        df[f'{feat}_missing'] = df[feat].isna().astype(int)
+
+    latest_df = df.groupby('ticker').tail(1).reset_index(drop=True)
+    numeric_features = [
+        col for col in latest_df.columns
+        if col not in CASHFLOW_FEATURES + CATEGORICAL_FEATURES + ['ticker', 'snapshot_date', 'snapshot_id']
+        and latest_df[col].dtype in [np.float64, np.int64, np.float32, np.int32]
+    ]
+    latest_df = winsorize_by_date(latest_df, numeric_features, lower_pct=0.01, upper_pct=0.99)
+    latest_df = standardize_by_date(latest_df, numeric_features)
+    latest_df['sector'] = latest_df['sector'].fillna('Unknown').astype('category')
+    counts = df.groupby('ticker').size()
+    return latest_df[latest_df['ticker'].isin(counts[counts >= min_snapshots].index)]
+
+
+@pytest.mark.parametrize('model_type', ['full', 'lite'])
+def test_features_match_per_date_pipeline(backtest_db, model_path, model_type):
+    strategy = GBMRankingStrategy({'model_path': model_path, 'model_type': model_type, 'db_path': backtest_db.db_path})
+
+    for date in pd.to_datetime(['2015-01-01'] + DATES):
+        got = strategy._load_and_engineer_features(date)
+        expected = _reference_features(backtest_db.db_path, date, strategy.min_snapshots)
+        if expected.empty:
+            assert got.empty
+            continue
+        got, expected = got.reset_index(drop=True), expected.reset_index(drop=True)
+        pd.testing.assert_frame_equal(got, expected, check_exact=False, rtol=1e-7, atol=1e-5)
+        # VIX and yields are market-wide, so standardizing their near-equal values
+        # leaves ~1e-6 of summation-order noise; every stock-level column is exact
+        stock_columns = [c for c in got.columns if not c.startswith(tuple(MARKET_FEATURES))]
+        pd.testing.assert_frame_equal(
+            got[stock_columns], expected[stock_columns], check_exact=False, rtol=1e-7, atol=1e-9,
+        )
+
+
+def test_signals_score_every_ticker(backtest_db, model_path, tmp_path):
+    date = pd.Timestamp(DATES[-1])
+    strategy = GBMRankingStrategy({'model_path': model_path, 'model_type': 'lite', 'db_path': backtest_db.db_path})
+    features = strategy._load_and_engineer_features(date)
+    feature_cols = [
+        col for col in features.columns
+        if col not in CASHFLOW_FEATURES + CATEGORICAL_FEATURES + ['ticker', 'snapshot_date', 'snapshot_id']
+    ] + CATEGORICAL_FEATURES
+
+    rng = np.random.default_rng(1)
+    booster = lgb.train(
+        {'verbose': -1, 'min_data_in_leaf': 1},
+        lgb.Dataset(features[feature_cols], rng.random(len(features))),
+        3,
+    )
+    booster.save_model(str(tmp_path / 'model.txt'))
+
+    strategy = GBMRankingStrategy({
+        'model_path': str(tmp_path / 'model.txt'), 'model_type': 'lite', 'db_path': backtest_db.db_path,
+        'selection_method': 'top_n', 'num_positions': 3, 'min_prediction': -np.inf,
+    })
+    weights = strategy.generate_signals({}, {}, date)
+
+    assert len(weights) == 3
+    assert set(weights) <= set(features['ticker'])
+    assert sum(weights.values()) == pytest.approx(1.0)
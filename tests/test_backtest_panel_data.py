@@ -0,0 +1,206 @@
+"""
+Tests for the panel-mode backtest data provider (backtesting.data.panel).
+
+Every call must return what the query-per-call HistoricalDataProvider
+returns on the same database, and a full backtest must come out identical
+in both data modes.
+"""
+
+from __future__ import annotations
+
+import math
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core.benchmark import SqlCounter
+from backtesting.core.engine import Backtester
+from backtesting.data.historical import HistoricalDataProvider
+from backtesting.data.panel import FundamentalPanel, PanelDataProvider
+
+# Stocks of the shared database list, delist and halt inside this window
+START = pd.Timestamp('2016-07-01')
+END = pd.Timestamp('2018-12-31')
+
+
+def _providers(market):
+    query = HistoricalDataProvider(db_path=market.db_path)
+    panel = PanelDataProvider(market.tickers + [market.benchmark], START - pd.Timedelta(days=365), END,
+                              db_path=market.db_path)
+    return query, panel
+
+
+def _assert_same(a, b):
+    """Deep equality treating NaN == NaN."""
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            _assert_same(a[key], b[key])
+    elif isinstance(a, float) and math.isnan(a):
+        assert isinstance(b, float) and math.isnan(b)
+    else:
+        assert a == b
+
+
+@pytest.mark.parametrize('date', ['2016-07-01', '2017-06-15', '2018-03-20', '2018-12-31'])
+def test_data_as_of_matches_query_provider(backtest_db, date):
+    tickers = backtest_db.tickers
+    query, panel = _providers(backtest_db)
+    date = pd.Timestamp(date)
+
+    expected = query.get_data_as_of(date, tickers, lookback_days=365)
+    got = panel.get_data_as_of(date, tickers, lookback_days=365)
+
+    pd.testing.assert_frame_equal(
+        got['price_history'], expected['price_history'], check_index_type=False, check_freq=False
+    )
+    _assert_same(got['current_prices'], expected['current_prices'])
+    _assert_same(got['fundamentals'], expected['fundamentals'])
+    _assert_same(got['financial_metrics'], expected['financial_metrics'])
+    assert got['dropped_tickers'] == expected['dropped_tickers']
+
+
+def test_same_date_snapshots_rank_by_id():
+    # Unordered SELECT: row order must not decide which snapshot is latest
+    records = [
+        {'symbol': 'AAA', 'snapshot_date': '2021-03-31', 'id': 7, 'market_cap': 3.0},
+        {'symbol': 'AAA', 'snapshot_date': '2020-12-31', 'id': 9, 'market_cap': 1.0},
+        {'symbol': 'AAA', 'snapshot_date': '2021-03-31', 'id': 4, 'market_cap': 2.0},
+    ]
+    for rows in (records, records[::-1]):
+        panel = FundamentalPanel(rows, {}, ['AAA'])
+        latest, previous = panel.as_of(['AAA'], pd.Timestamp('2021-06-30'))
+        assert [panel.records[latest[0]]['id'], panel.records[previous[0]]['id']] == [7, 4]
+
+
+def test_price_lookups_match_query_provider(backtest_db):
+    tickers = backtest_db.tickers
+    query, panel = _providers(backtest_db)
+
+    for date in pd.to_datetime(['2016-01-04', '2017-06-14', '2018-05-17', '2018-07-04', '2018-12-31']):
+        assert panel.get_prices(tickers, date) == query.get_prices(tickers, date)
+        assert panel.get_available_tickers_as_of(date, tickers) == query.get_available_tickers_as_of(date, tickers)
+        for ticker in tickers + ['UNKNOWN']:
+            assert panel._get_single_price(ticker, date) == query._get_single_price(ticker, date)
+
+    for ticker in [backtest_db.benchmark] + tickers:
+        pd.testing.assert_frame_equal(
+            panel.get_price_history(ticker, START, END),
+            query.get_price_history(ticker, START, END),
+            check_index_type=False,
+            check_freq=False,
+        )
+
+
+def test_tickers_outside_the_universe_are_loaded_on_demand(backtest_db):
+    query, _ = _providers(backtest_db)
+    a, b, c = backtest_db.tickers[:3]
+    panel = PanelDataProvider([a], START, END, db_path=backtest_db.db_path)
+    date = pd.Timestamp('2018-06-30')
+
+    assert panel.get_prices([a, b], date) == query.get_prices([a, b], date)
+    _assert_same(
+        panel._get_fundamentals_as_of([c, 'UNKNOWN'], date),
+        query._get_fundamentals_as_of([c, 'UNKNOWN'], date),
+    )
+
+
+def test_query_provider_reads_fundamentals_in_one_query(backtest_db):
+    tickers = backtest_db.tickers
+    query = HistoricalDataProvider(db_path=backtest_db.db_path)
+    date = pd.Timestamp('2018-06-30')
+    query._get_fundamentals_as_of(tickers, date)  # reads the assets metadata
+
+    with SqlCounter() as sql:
+        fundamentals = query._get_fundamentals_as_of(tickers + ['UNKNOWN'], date)
+    # One window query for the snapshots, one for the prices of the P/E fallback
+    assert sql.selects <= 2
+
+    # Same as the latest two snapshots per ticker, queried one by one
+    conn = sqlite3.connect(backtest_db.db_path)
+    for asset_id, ticker in enumerate(tickers, start=1):
+        latest = conn.execute('''
+            SELECT pe_ratio, market_cap FROM fundamental_history
+            WHERE asset_id = ? AND snapshot_date <= '2018-05-16'
+            ORDER BY snapshot_date DESC LIMIT 1
+        ''', (asset_id,)).fetchone()
+        assert fundamentals[ticker]['market_cap'] == latest[1]
+        if latest[0] is not None:
+            assert fundamentals[ticker]['pe_ratio'] == latest[0]
+    conn.close()
+    assert fundamentals['UNKNOWN'] == {'sector': None, 'industry': None}
+
+
+class _FailingSecondChunk:
+    """A connection whose second fundamentals window query fails."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.chunks = 0
+
+    def execute(self, sql, *args):
+        if 'ROW_NUMBER' in sql:
+            self.chunks += 1
+            if self.chunks == 2:
+                raise sqlite3.OperationalError('database is locked')
+        return self._conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def test_failed_fundamentals_chunk_keeps_the_other_chunks(backtest_db, monkeypatch):
+    import backtesting.data.historical as historical
+
+    tickers = backtest_db.tickers
+    date = pd.Timestamp('2018-06-30')
+    expected = HistoricalDataProvider(db_path=backtest_db.db_path)._get_fundamentals_as_of(tickers, date)
+
+    connect = sqlite3.connect
+    monkeypatch.setattr(historical, 'TICKER_CHUNK', 4)
+    monkeypatch.setattr(historical.sqlite3, 'connect', lambda *a, **kw: _FailingSecondChunk(connect(*a, **kw)))
+    fundamentals = HistoricalDataProvider(db_path=backtest_db.db_path)._get_fundamentals_as_of(tickers, date)
+
+    # Asset ids follow the ticker order, so the second chunk is tickers[4:8]
+    assert all(fundamentals[t] == {} for t in tickers[4:8])
+    for ticker in tickers[:4] + tickers[8:]:
+        assert fundamentals[ticker] == expected[ticker]
+        assert fundamentals[ticker] != {}
+
+
+class _MomentumStrategy:
+    """Equal-weight the two best 3-month performers."""
+
+    def generate_signals(self, market_data, current_portfolio, date):
+        metrics = market_data['financial_metrics']
+        ranked = sorted(
+            (t for t, m in metrics.items() if m.get('return_3m') is not None),
+            key=lambda t: metrics[t]['return_3m'],
+            reverse=True,
+        )
+        return {t: 0.5 for t in ranked[:2]}
+
+
+def test_backtest_is_identical_in_both_data_modes(backtest_db):
+    tickers = backtest_db.tickers
+    config = {
+        'start_date': str(START.date()),
+        'end_date': str(END.date()),
+        'rebalance_frequency': 'monthly',
+        'universe': tickers,
+    }
+    summaries = []
+    for mode in ['query', 'panel']:
+        backtester = Backtester({**config, 'data_mode': mode})
+        backtester.data_provider.db_path = backtest_db.db_path
+        if mode == 'panel':
+            assert isinstance(backtester.data_provider, PanelDataProvider)
+        summaries.append(backtester.run(_MomentumStrategy()).get_summary())
+
+    assert summaries[0] == summaries[1]
@@ -0,0 +1,145 @@
+"""
+Tests for the array-backed portfolio (backtesting.core.portfolio).
+
+Vectorized rebalances must book the same trades, cash, positions and cost
+basis as rebalancing one position at a time: sells first, then buys in
+target order while the remaining cash covers each buy with its costs.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core.portfolio import TRADE_DTYPE, Portfolio
+
+TC, SLIP = 0.001, 0.002
+
+
+class ReferencePortfolio:
+    """Position-by-position rebalancing, as the dict-based portfolio did it."""
+
+    def __init__(self, cash):
+        self.cash = cash
+        self.holdings, self.cost_basis, self.trades = {}, {}, []
+
+    def value(self, prices):
+        return self.cash + sum(s * prices.get(t, 0.0) for t, s in self.holdings.items())
+
+    def sell(self, ticker, shares, price):
+        value = shares * price * (1 - SLIP)
+        self.cash += value - value * TC
+        self.holdings[ticker] -= shares
+        if self.holdings[ticker] < 0.001:
+            del self.holdings[ticker], self.cost_basis[ticker]
+        self.trades.append((ticker, 'sell', shares, value, value * TC))
+
+    def buy(self, ticker, shares, price):
+        value = shares * price * (1 + SLIP)
+        self.cash -= value + value * TC
+        old = self.holdings.get(ticker, 0.0)
+        self.holdings[ticker] = old + shares
+        self.cost_basis[ticker] = (self.cost_basis.get(ticker, 0.0) * old + value) / (old + shares)
+        self.trades.append((ticker, 'buy', shares, value, value * TC))
+
+    def rebalance(self, weights, prices):
+        total = self.value(prices)
+        target = {t: total * w / prices[t] for t, w in weights.items()}
+        for ticker in list(self.holdings):
+            if self.holdings[ticker] > target.get(ticker, 0):
+                self.sell(ticker, self.holdings[ticker] - target.get(ticker, 0), prices[ticker])
+        for ticker, shares in target.items():
+            current = self.holdings.get(ticker, 0)
+            if shares > current and (shares - current) * prices[ticker] * (1 + TC + SLIP) <= self.cash:
+                self.buy(ticker, shares - current, prices[ticker])
+
+
+def _rebalances(seed: int, n_tickers: int = 60, n_days: int = 40):
+    rng = np.random.default_rng(seed)
+    tickers = [f'T{i:03d}' for i in range(n_tickers)]
+    prices = 20 * np.exp(np.cumsum(rng.normal(0, 0.03, (n_days, n_tickers)), axis=0))
+    for day in range(n_days):
+        chosen = rng.choice(n_tickers, rng.integers(1, 25), replace=False)
+        weights = rng.dirichlet(np.ones(len(chosen))) * rng.uniform(0.8, 1.0)
+        yield (
+            pd.Timestamp('2022-01-03') + pd.Timedelta(days=day),
+            {tickers[i]: float(w) for i, w in zip(chosen, weights)},
+            dict(zip(tickers, prices[day].tolist())),
+        )
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_rebalances_match_position_by_position_reference(seed):
+    portfolio = Portfolio(100_000, tickers=['T000', 'T001'], trade_capacity=4)
+    reference = ReferencePortfolio(100_000)
+
+    for date, weights, prices in _rebalances(seed):
+        trades = portfolio.rebalance(weights, prices, transaction_cost=TC, slippage=SLIP, date=date)
+        reference.rebalance(weights, prices)
+
+        assert trades.dtype == TRADE_DTYPE
+        assert (trades['date'] == date).all()
+        assert portfolio.cash == pytest.approx(reference.cash, rel=1e-9)
+        assert portfolio.get_value(prices) == pytest.approx(reference.value(prices), rel=1e-9)
+        assert portfolio.holdings.keys() == reference.holdings.keys()
+        for ticker, shares in reference.holdings.items():
+            assert portfolio.holdings[ticker] == pytest.approx(shares, rel=1e-9)
+            assert portfolio.cost_basis[ticker] == pytest.approx(reference.cost_basis[ticker], rel=1e-9)
+
+    # Sums of position values may differ in the last bit, which can add or
+    # drop trades of a few 1e-13 shares on either side
+    frame = portfolio.trades_frame()
+    assert list(frame.columns) == list(TRADE_DTYPE.names)
+    frame = frame[frame['shares'] > 1e-9]
+    expected = pd.DataFrame(reference.trades, columns=['ticker', 'action', 'shares', 'value', 'commission'])
+    expected = expected[expected['shares'] > 1e-9]
+    pd.testing.assert_frame_equal(
+        frame[expected.columns].sort_values(['ticker', 'action', 'shares'], ignore_index=True),
+        expected.sort_values(['ticker', 'action', 'shares'], ignore_index=True),
+        check_exact=False, rtol=1e-9,
+    )
+
+
+def test_buys_skip_only_what_cash_cannot_cover():
+    portfolio = Portfolio(1_000)
+    reference = ReferencePortfolio(1_000)
+    prices = {'AAA': 10.0, 'BBB': 20.0, 'CCC': 5.0, 'DDD': 1.0}
+    # Weights summing to 1 leave too little for the last buys once costs are paid
+    weights = {'AAA': 0.5, 'BBB': 0.4995, 'CCC': 0.0004, 'DDD': 0.0001}
+
+    portfolio.rebalance(weights, prices, transaction_cost=TC, slippage=SLIP)
+    reference.rebalance(weights, prices)
+
+    assert set(portfolio.holdings) == set(reference.holdings) == {'AAA', 'CCC', 'DDD'}
+    assert portfolio.cash == pytest.approx(reference.cash)
+    assert portfolio.cash >= 0
+
+    with pytest.raises(KeyError):
+        portfolio.rebalance({'EEE': 0.5}, prices)
+
+
+def test_liquidation_and_pnl():
+    portfolio = Portfolio(10_000)
+    portfolio.rebalance({'AAA': 0.45, 'BBB': 0.45}, {'AAA': 10.0, 'BBB': 50.0}, date=pd.Timestamp('2022-01-03'))
+
+    trade = portfolio._execute_sell('AAA', portfolio.holdings['AAA'], 12.0, 0.001, 0.001, pd.Timestamp('2022-02-01'))
+    assert trade.action == 'sell' and trade.ticker == 'AAA'
+    assert trade.date == pd.Timestamp('2022-02-01')
+    assert 'AAA' not in portfolio.holdings
+
+    history = portfolio.trade_history
+    assert [t.action for t in history] == ['buy', 'buy', 'sell']
+    buy = history[0]
+    assert portfolio.get_realized_pnl() == pytest.approx(trade.value - trade.commission - buy.total_cost)
+
+    shares, cost = portfolio.holdings['BBB'], portfolio.cost_basis['BBB']
+    assert portfolio.get_unrealized_pnl({'BBB': 55.0}) == pytest.approx(shares * (55.0 - cost))
+    assert portfolio.get_weights({'BBB': 55.0})['BBB'] == pytest.approx(
+        shares * 55.0 / portfolio.get_value({'BBB': 55.0})
+    )
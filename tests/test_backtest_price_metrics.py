@@ -0,0 +1,104 @@
+"""
+Tests for the vectorized screening metrics of the backtest data provider.
+
+HistoricalDataProvider._calculate_metrics_as_of computes price metrics for
+all tickers from the price matrix at once; they must match the per-ticker
+pandas code it replaced.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.data.historical import HistoricalDataProvider
+
+
+def _reference(price_history: pd.DataFrame) -> dict:
+    """The original per-ticker implementation (price metrics only)."""
+    def rsi(prices, period=14):
+        if len(prices) < period + 1:
+            return None
+        delta = prices.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        value = (100 - (100 / (1 + gain / loss))).iloc[-1]
+        return value if not pd.isna(value) else None
+
+    metrics = {}
+    for ticker in price_history.columns:
+        prices = price_history[ticker].dropna()
+        if len(prices) == 0:
+            continue
+        metrics[ticker] = {
+            'return_1m': (prices.iloc[-1] / prices.iloc[-21] - 1) * 100 if len(prices) > 21 else None,
+            'return_3m': (prices.iloc[-1] / prices.iloc[-63] - 1) * 100 if len(prices) > 63 else None,
+            'return_6m': (prices.iloc[-1] / prices.iloc[-126] - 1) * 100 if len(prices) > 126 else None,
+            'return_1y': (prices.iloc[-1] / prices.iloc[-252] - 1) * 100 if len(prices) > 252 else None,
+            'volatility': prices.pct_change().std() * np.sqrt(252) * 100,
+            'above_ma50': prices.iloc[-1] > prices.rolling(50).mean().iloc[-1] if len(prices) > 50 else None,
+            'above_ma200': prices.iloc[-1] > prices.rolling(200).mean().iloc[-1] if len(prices) > 200 else None,
+            'rsi': rsi(prices),
+        }
+    return metrics
+
+
+def _price_history(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2021-01-01', periods=260)
+    columns = {}
+    for i, n_valid in enumerate([0, 1, 2, 10, 15, 22, 64, 127, 201, 253, 260]):
+        values = np.full(len(dates), np.nan)
+        values[len(dates) - n_valid:] = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n_valid)))
+        columns[f'T{i}'] = values
+    # Gaps inside the series, a flat series (RSI 0/0) and a rising one (no losses)
+    gappy = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(dates))))
+    gappy[rng.random(len(dates)) < 0.2] = np.nan
+    columns['GAPPY'] = gappy
+    columns['FLAT'] = np.full(len(dates), 10.0)
+    columns['RISING'] = np.linspace(10, 20, len(dates))
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates, name='date'))
+
+
+def _assert_close(got: dict, expected: dict) -> None:
+    assert got.keys() == expected.keys()
+    for ticker, metrics in expected.items():
+        assert list(got[ticker]) == list(metrics), ticker
+        for name, value in metrics.items():
+            actual = got[ticker][name]
+            if value is None or isinstance(value, (bool, np.bool_)):
+                assert actual == value, (ticker, name)
+            else:
+                np.testing.assert_allclose(actual, value, rtol=1e-9, err_msg=f'{ticker} {name}')
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_price_metrics_match_per_ticker_pandas(seed):
+    price_history = _price_history(seed)
+    provider = HistoricalDataProvider(db_path=':memory:')
+
+    metrics = provider._calculate_metrics_as_of(
+        list(price_history.columns) + ['ABSENT'], price_history, {}, price_history.index[-1]
+    )
+
+    assert metrics.pop('ABSENT') == {}
+    assert metrics.pop('T0') == {}
+    _assert_close(metrics, _reference(price_history))
+
+
+def test_fundamental_metrics_are_merged_in():
+    price_history = _price_history()[['T5']]
+    provider = HistoricalDataProvider(db_path=':memory:')
+    fundamentals = {'T5': {'roe': 0.2, 'sector': 'Tech'}, 'NOPRICE': {'pe_ratio': 12.0}}
+
+    metrics = provider._calculate_metrics_as_of(['T5', 'NOPRICE'], price_history, fundamentals, None)
+
+    assert metrics['T5']['roe'] == 0.2 and metrics['T5']['sector'] == 'Tech'
+    assert 'return_1m' in metrics['T5']
+    assert metrics['NOPRICE']['pe_ratio'] == 12.0 and 'return_1m' not in metrics['NOPRICE']
@@ -0,0 +1,146 @@
+"""
+Tests for backtest parameter sweeps (backtesting.core.sweep).
+
+Variants run on the shared panel and a process pool must give the same
+summaries as running each config on its own.
+"""
+
+from __future__ import annotations
+
+import glob
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core.engine import Backtester
+from backtesting.core.sweep import create_shared_provider, expand_grid, run_variants
+
+
+class _TopMomentum:
+    """Equal-weight the ``top_n`` best 3-month performers."""
+
+    def __init__(self, top_n: int) -> None:
+        self.top_n = top_n
+
+    def generate_signals(self, market_data, current_portfolio, date):
+        metrics = market_data['financial_metrics']
+        ranked = sorted(
+            (t for t, m in metrics.items() if m.get('return_3m') is not None),
+            key=lambda t: metrics[t]['return_3m'],
+            reverse=True,
+        )[:self.top_n]
+        return {t: 1 / len(ranked) for t in ranked}
+
+
+def _momentum_factory(config):
+    return _TopMomentum(config['strategy']['top_n'])
+
+
+BASE = {
+    'name': 'momentum',
+    'start_date': '2021-01-01',
+    'end_date': '2022-12-31',
+    'universe': ['S00000', 'S00001', 'S00002', 'S00003', 'S00004'],
+    'strategy': {'top_n': 2},
+}
+
+
+def test_expand_grid():
+    variants = expand_grid(BASE, {
+        'rebalance_frequency': ['monthly', 'quarterly'],
+        'strategy.top_n': [1, 2, 3],
+    })
+
+    assert len(variants) == 6
+    label, config = variants[1]
+    assert label == 'rebalance_frequency=monthly,strategy.top_n=2'
+    assert config['name'] == 'momentum[rebalance_frequency=monthly,strategy.top_n=2]'
+    assert config['rebalance_frequency'] == 'monthly'
+    assert config['strategy'] == {'top_n': 2}
+    assert [c['strategy']['top_n'] for _, c in variants] == [1, 2, 3, 1, 2, 3]
+    assert BASE['strategy'] == {'top_n': 2}
+
+    assert expand_grid(BASE, {})[0][0] == 'base'
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_variants_match_individual_runs(backtest_db, workers):
+    variants = expand_grid(BASE, {
+        'rebalance_frequency': ['monthly', 'quarterly'],
+        'strategy.top_n': [1, 3],
+        'start_date': ['2021-01-01', '2021-07-01'],
+    })
+    results = run_variants(variants, workers=workers, db_path=backtest_db.db_path,
+                           strategy_factory=_momentum_factory)
+
+    assert list(results['variant']) == [label for label, _ in variants]
+    assert (results['status'] == 'success').all()
+
+    for (_, config), (_, row) in zip(variants, results.iterrows()):
+        backtester = Backtester({**config, 'data_mode': 'query'})
+        backtester.data_provider.db_path = backtest_db.db_path
+        results_alone = backtester.run(_momentum_factory(config))
+        for key, value in results_alone.get_summary().items():
+            assert row[key] == pytest.approx(value, rel=1e-12), key
+        assert row['benchmark_return'] == pytest.approx(
+            float(results_alone.metrics['benchmark_return']), rel=1e-12
+        )
+
+
+def test_failed_variant_is_reported(backtest_db):
+    variants = expand_grid(BASE, {'rebalance_frequency': ['weekly', 'annually']})
+    results = run_variants(variants, workers=2, db_path=backtest_db.db_path,
+                           strategy_factory=_momentum_factory)
+
+    assert list(results['status']) == ['failed', 'success']
+    assert 'Unknown rebalance frequency' in results.loc[0, 'error']
+
+
+def test_empty_universe_is_not_preloaded(backtest_db):
+    whole_db = {**BASE, 'name': 'whole_db', 'universe': []}
+
+    provider = create_shared_provider([{**BASE, 'universe': ['S00001', 'S00000']}, whole_db],
+                                      backtest_db.db_path)
+    assert provider.universe == ['S00001', 'S00000', 'SPY']
+    assert create_shared_provider([whole_db, {**BASE, 'data_mode': 'query'}], backtest_db.db_path) is None
+
+    results = run_variants([('panel', BASE), ('whole_db', whole_db)], workers=1, db_path=backtest_db.db_path,
+                           strategy_factory=_momentum_factory)
+    assert (results['status'] == 'success').all()
+
+
+def test_variants_read_their_own_database(backtest_db, tmp_path):
+    other_db = str(tmp_path / 'other.db')
+    shutil.copy(backtest_db.db_path, other_db)
+    conn = sqlite3.connect(other_db)
+    conn.execute('UPDATE price_history SET close = close * (1 + (rowid % 7) / 100.0)')
+    conn.commit()
+    conn.close()
+
+    variants = [('sweep_db', BASE), ('own_db', {**BASE, 'db_path': other_db})]
+    results = run_variants(variants, workers=2, db_path=backtest_db.db_path,
+                           strategy_factory=_momentum_factory)
+
+    for (_, config), path, (_, row) in zip(variants, [backtest_db.db_path, other_db], results.iterrows()):
+        backtester = Backtester({**config, 'db_path': path, 'data_mode': 'query'})
+        assert row['total_return'] == pytest.approx(
+            backtester.run(_momentum_factory(config)).get_summary()['total_return'], rel=1e-12
+        )
+    assert results.loc[0, 'total_return'] != results.loc[1, 'total_return']
+
+
+def test_variant_reports_written(backtest_db, tmp_path):
+    variants = expand_grid(BASE, {'strategy.top_n': [1, 2]})
+    results = run_variants(variants, workers=2, db_path=backtest_db.db_path,
+                           strategy_factory=_momentum_factory, output_dir=str(tmp_path))
+
+    for (_, config), (_, row) in zip(variants, results.iterrows()):
+        [summary] = tmp_path.glob(f"{glob.escape(config['name'])}_*_summary.csv")
+        assert pd.read_csv(summary)['total_return'].iloc[0] == pytest.approx(row['total_return'])
+        assert summary.with_name(summary.stem + '_portfolio_values.csv').exists()
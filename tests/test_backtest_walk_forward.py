@@ -0,0 +1,153 @@
+"""
+Tests for walk-forward retraining (backtesting.core.walk_forward).
+
+Each window's training rows, sliced from the once-engineered matrix, must be
+what the training pipeline builds from the data available on the cutoff, and
+checkpoints must be reused instead of retraining unchanged windows.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+lgb = pytest.importorskip('lightgbm')
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models'))
+
+from backtesting.core import walk_forward
+from backtesting.core.engine import Backtester
+from backtesting.core.walk_forward import WalkForwardRetrainer
+from backtesting.strategies.gbm_ranking import GBMRankingStrategy
+from gbm_feature_config import MARKET_FEATURES
+from train_gbm_stock_ranker import GBMStockRanker
+
+PARAMS = {
+    'objective': 'regression',
+    'num_leaves': 7,
+    'min_child_samples': 5,
+    'learning_rate': 0.1,
+    'verbose': -1,
+    'seed': 0,
+}
+
+
+def _retrainer(db_path, checkpoint_dir, **config) -> WalkForwardRetrainer:
+    return WalkForwardRetrainer(
+        {'checkpoint_dir': str(checkpoint_dir), 'min_train_samples': 50, 'params': PARAMS, **config},
+        db_path=db_path,
+    )
+
+
+def _pipeline_as_of(db_path, cutoff, tmp_path) -> pd.DataFrame:
+    """Training data built by the training pipeline from a database cut at ``cutoff``."""
+    path = str(tmp_path / 'as_of.db')
+    shutil.copy(db_path, path)
+    conn = sqlite3.connect(path)
+    day = cutoff.strftime('%Y-%m-%d')
+    conn.execute('DELETE FROM fundamental_history WHERE snapshot_date > ?', (day,))
+    conn.execute('DELETE FROM price_history WHERE date > ?', (day,))
+    conn.execute('''
+        DELETE FROM forward_returns WHERE snapshot_id NOT IN (
+            SELECT id FROM fundamental_history WHERE date(snapshot_date, '+365 days') <= ?
+        )
+    ''', (day,))
+    conn.commit()
+    conn.close()
+
+    trainer = GBMStockRanker(db_path=path, target_horizon='1y')
+    df, _, _ = trainer.prepare_training_data(trainer.engineer_features(trainer.load_data()))
+    return df.sort_values('snapshot_date', kind='mergesort').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('cutoff', ['2016-07-01', '2019-01-01'])
+def test_window_matches_pipeline_on_data_as_of_cutoff(backtest_db, tmp_path, cutoff):
+    cutoff = pd.Timestamp(cutoff)
+    retrainer = _retrainer(backtest_db.db_path, tmp_path / 'checkpoints')
+
+    window = retrainer.training_window(cutoff)
+    expected = _pipeline_as_of(backtest_db.db_path, cutoff, tmp_path)
+
+    assert (window['snapshot_date'] + pd.Timedelta(days=365) <= cutoff).all()
+    columns = ['ticker', 'snapshot_date', 'snapshot_id', 'forward_return'] + retrainer.feature_columns
+    pd.testing.assert_frame_equal(
+        window[columns], expected[columns], check_exact=False, rtol=1e-9, atol=1e-5,
+    )
+    # VIX and yields are market-wide, so standardizing their near-equal values
+    # leaves ~1e-6 of summation-order noise; every stock-level column is exact
+    stock_columns = [c for c in columns if not c.startswith(tuple(MARKET_FEATURES))]
+    pd.testing.assert_frame_equal(
+        window[stock_columns], expected[stock_columns], check_exact=False, rtol=1e-9, atol=1e-12,
+    )
+
+
+def test_checkpoints_are_reused(backtest_db, tmp_path, monkeypatch):
+    checkpoint_dir = tmp_path / 'checkpoints'
+    cutoffs = pd.to_datetime(['2018-01-01', '2018-02-01', '2020-01-01'])
+
+    retrainer = _retrainer(backtest_db.db_path, checkpoint_dir)
+    models = [retrainer.model_for(cutoff) for cutoff in cutoffs]
+
+    # 2018-02-01 sees no newly matured snapshot date
+    assert retrainer.stats == {'trained': 2, 'loaded': 0, 'reused': 1, 'skipped': 0}
+    assert models[1] is models[0]
+    assert sorted(p.name for p in checkpoint_dir.glob('gbm_*.txt')) == [
+        'gbm_1y_20180101.txt', 'gbm_1y_20200101.txt',
+    ]
+
+    # A later run neither re-engineers features nor retrains
+    def no_engineering(self):
+        raise AssertionError('training matrix should come from the cache')
+
+    monkeypatch.setattr(walk_forward.GBMStockRanker, 'load_data', no_engineering)
+    rerun = _retrainer(backtest_db.db_path, checkpoint_dir)
+    reloaded = [rerun.model_for(cutoff) for cutoff in cutoffs]
+
+    assert rerun.stats == {'trained': 0, 'loaded': 2, 'reused': 1, 'skipped': 0}
+    for model, expected in zip(reloaded, models):
+        assert model.model_to_string() == expected.model_to_string()
+
+    # Too little data: keep whatever model the strategy has
+    assert rerun.model_for(pd.Timestamp('2012-03-01')) is None
+    assert rerun.stats['skipped'] == 1
+
+
+def test_backtest_retrains_walk_forward(backtest_db, tmp_path):
+    checkpoint_dir = tmp_path / 'checkpoints'
+    backtester = Backtester({
+        'start_date': '2019-01-01',
+        'end_date': '2021-12-31',
+        'universe': backtest_db.tickers,
+        'data_mode': 'query',
+        'walk_forward': {
+            'retrain_frequency': 'annually',
+            'checkpoint_dir': str(checkpoint_dir),
+            'min_train_samples': 50,
+            'params': PARAMS,
+        },
+    })
+    backtester.data_provider.db_path = backtest_db.db_path
+    strategy = GBMRankingStrategy({
+        'model_type': 'lite', 'db_path': backtest_db.db_path,
+        'selection_method': 'top_n', 'num_positions': 3, 'min_prediction': -np.inf,
+    })
+
+    results = backtester.run(strategy)
+
+    with open(checkpoint_dir / 'manifest.json') as f:
+        manifest = json.load(f)
+    assert sorted(manifest) == ['2019-01-01', '2020-01-01', '2021-01-01']
+    for cutoff, entry in manifest.items():
+        assert pd.Timestamp(entry['last_snapshot']) + pd.Timedelta(days=365) <= pd.Timestamp(cutoff)
+    assert strategy.model.model_to_string() == lgb.Booster(
+        model_file=str(checkpoint_dir / 'gbm_1y_20210101.txt')
+    ).model_to_string()
+    assert len(results.transactions) > 0
+    assert all(holdings for holdings in results.holdings_history)
@@ -0,0 +1,141 @@
+"""
+Tests for the multi-row upsert helper (invest.data.db.upsert_rows) and the
+writers built on it. Statements are captured by a fake cursor — no Postgres.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from invest.data import insider_db, polymarket_db
+from invest.data.db import upsert_rows
+from invest.scanner import threshold_manager
+from invest.scanner.threshold_manager import ThresholdManager
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.connection = conn
+        self.rowcount = -1
+
+    def mogrify(self, template, args):
+        if isinstance(template, bytes):
+            template = template.decode()
+        return (template % tuple(repr(a) for a in args)).encode()
+
+    def execute(self, query, params=None):
+        if isinstance(query, bytes):
+            query = query.decode()
+        if self.connection.fail_on and self.connection.fail_on in query:
+            raise RuntimeError('boom')
+        self.connection.statements.append(query)
+        self.rowcount = query.count('),(') + 1 if 'VALUES' in query else 0
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+
+class FakeConn:
+    encoding = 'UTF8'
+
+    def __init__(self, fail_on=None):
+        self.statements: list[str] = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.fail_on = fail_on
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        pass
+
+
+def test_upsert_builds_one_statement_per_page():
+    conn = FakeConn()
+    rows = [(i, f'v{i}') for i in range(5)]
+    written = upsert_rows(conn, 't', ('id', 'v'), rows,
+                          conflict=('id',), update=('v',), page_size=2)
+    assert written == 5
+    assert len(conn.statements) == 3
+    assert conn.statements[0].startswith('INSERT INTO t (id, v) VALUES (0,')
+    assert conn.statements[0].endswith('ON CONFLICT (id) DO UPDATE SET v = EXCLUDED.v')
+    assert conn.commits == 0
+
+
+def test_upsert_collapses_repeated_keys_to_last_row():
+    conn = FakeConn()
+    upsert_rows(conn, 't', ('id', 'v'), [(1, 'old'), (2, 'x'), (1, 'new')],
+                conflict=('id',), update=('v',))
+    assert "'new'" in conn.statements[0]
+    assert "'old'" not in conn.statements[0]
+
+
+def test_do_nothing_and_raw_assignments():
+    conn = FakeConn()
+    upsert_rows(conn, 't', ('id',), [(1,), (1,)])
+    assert conn.statements[0].endswith('ON CONFLICT DO NOTHING')
+
+    upsert_rows(conn, 't', ('id', 'v'), [(1, 2)], conflict=('id',),
+                set_sql={'ts': 'NOW()'}, template='(%s, %s::jsonb)')
+    assert '(1, 2::jsonb)' in conn.statements[1]
+    assert conn.statements[1].endswith('DO UPDATE SET ts = NOW()')
+
+
+def test_update_without_conflict_target_rejected():
+    with pytest.raises(ValueError):
+        upsert_rows(FakeConn(), 't', ('id',), [(1,)], update=('id',))
+
+
+def test_empty_rows_send_nothing():
+    conn = FakeConn()
+    assert upsert_rows(conn, 't', ('id',), []) == 0
+    assert conn.statements == []
+
+
+def test_record_scores_is_one_statement_and_commit():
+    conn = FakeConn()
+    manager = ThresholdManager.__new__(ThresholdManager)
+    scores = [(f'T{i}', 70.0, 1.0, 2.0, 3.0, 4.0, 5.0) for i in range(250)]
+    with patch.object(threshold_manager, 'get_pooled_connection', return_value=conn):
+        manager.record_scores('2026-01-01', scores)
+    assert len(conn.statements) == 1
+    assert 'scanner_score_history' in conn.statements[0]
+    assert conn.commits == 1
+
+
+def _txn(i):
+    return {'ticker': 'AAA', 'cik': '1', 'accession_number': f'acc-{i}',
+            'filing_date': '2026-01-02', 'transaction_date': '2026-01-01',
+            'reporter_name': 'X', 'transaction_type': 'P', 'shares': 10.0}
+
+
+def test_insider_batch_falls_back_to_rows_on_failure():
+    conn = FakeConn()
+    assert insider_db.insert_transactions(conn, [_txn(i) for i in range(3)] + [{'ticker': 'bad'}]) == 3
+    assert len(conn.statements) == 1
+
+    failing = FakeConn(fail_on="'acc-1'")
+    assert insider_db.insert_transactions(failing, [_txn(i) for i in range(3)]) == 2
+    assert failing.rollbacks == 2  # the batch, then the bad row
+
+
+def test_upsert_markets_uses_constant_statements():
+    conn = FakeConn()
+    markets = [{'market_id': f'm{i}', 'question': 'Q', 'yes_price': 0.5} for i in range(40)]
+    assert polymarket_db.upsert_markets(conn, markets) == 40
+    # 24h lookup, market upsert, history append
+    assert len(conn.statements) == 3
+    assert "previous_yes_price = trump_policy_markets.current_yes_price" in conn.statements[1]
+    assert conn.commits == 1
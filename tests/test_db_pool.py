@@ -0,0 +1,178 @@
+"""
+Tests for the process-wide psycopg2 connection pool in invest.data.db.
+
+psycopg2.connect is patched with a fake connection, so these run without a
+live Postgres.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from unittest.mock import patch
+
+import psycopg2.extensions
+import psycopg2.extras
+import pytest
+
+from invest.data import db
+from invest.data.db import ConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.broken:
+            raise psycopg2.OperationalError('server closed the connection unexpectedly')
+        self.conn.queries.append(query)
+
+    def fetchone(self):
+        return (1,)
+
+    def close(self):
+        pass
+
+
+class FakeConn:
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = False
+        self.status = psycopg2.extensions.STATUS_READY
+        self.cursor_factory = None
+        self.broken = False
+        self.queries: list[str] = []
+        self.rollbacks = 0
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.status = psycopg2.extensions.STATUS_READY
+
+    def commit(self):
+        self.status = psycopg2.extensions.STATUS_READY
+
+    def close(self):
+        self.closed = 1
+
+
+@pytest.fixture
+def fake_connect():
+    created: list[FakeConn] = []
+
+    def _connect(dsn, **kwargs):
+        conn = FakeConn()
+        created.append(conn)
+        return conn
+
+    with patch.object(db.psycopg2, 'connect', side_effect=_connect):
+        yield created
+
+
+def test_min_size_connections_opened_eagerly(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=2, max_size=4)
+    assert len(fake_connect) == 2
+    assert pool.stats()['idle'] == 2
+
+
+def test_close_returns_connection_for_reuse(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=2)
+    first = pool.getconn()
+    raw = first._raw
+    first.close()
+    first.close()  # idempotent, like psycopg2
+
+    second = pool.getconn()
+    assert second._raw is raw
+    assert len(fake_connect) == 1
+    assert pool.stats()['checkouts'] == 2
+
+
+def test_returned_connection_state_is_reset(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=1)
+    conn = pool.getconn(dict_cursor=True)
+    assert conn.cursor_factory is psycopg2.extras.RealDictCursor
+    conn.autocommit = True
+    conn.close()
+
+    raw = fake_connect[0]
+    assert raw.autocommit is False
+    assert raw.cursor_factory is None
+
+
+def test_open_transaction_is_rolled_back_on_return(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=1)
+    conn = pool.getconn()
+    fake_connect[0].status = psycopg2.extensions.STATUS_BEGIN
+    conn.close()
+    assert fake_connect[0].rollbacks == 1
+
+
+def test_stale_connection_replaced_after_failed_health_check(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=1, max_size=1, health_check_interval=0)
+    fake_connect[0].broken = True
+
+    with pool.connection() as conn:
+        assert conn._raw is fake_connect[1]
+
+    stats = pool.stats()
+    assert stats['health_check_failures'] == 1
+    assert stats['connections_discarded'] == 1
+    assert fake_connect[0].closed
+
+
+def test_checkout_times_out_when_exhausted(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=1, timeout=0.05)
+    held = pool.getconn()
+    with pytest.raises(PoolTimeoutError):
+        pool.getconn()
+    assert pool.stats()['timeouts'] == 1
+    held.close()
+
+
+def test_leaked_connection_returned_on_garbage_collection(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=1, timeout=0.05)
+
+    def failing_call_site():
+        conn = pool.getconn()
+        conn.cursor()
+        raise RuntimeError('query failed before conn.close()')
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            failing_call_site()
+
+    assert pool.stats()['in_use'] == 0
+    conn = pool.getconn()
+    assert conn._raw is fake_connect[0]
+    conn.close()
+    conn.close()
+    assert pool.stats()['idle'] == 1
+
+
+def test_waiting_checkout_is_served_and_measured(fake_connect):
+    pool = ConnectionPool('postgresql://x', min_size=0, max_size=1, timeout=5)
+    held = pool.getconn()
+
+    def _release():
+        time.sleep(0.05)
+        held.close()
+
+    threading.Thread(target=_release).start()
+    with pool.connection():
+        pass
+
+    stats = pool.stats()
+    assert stats['waits'] == 1
+    assert stats['wait_seconds_max'] > 0
+    assert stats['peak_in_use'] == 1
+    assert stats['in_use'] == 0
+
+
+@pytest.mark.parametrize('min_size,max_size', [(-1, 2), (0, 0), (3, 2)])
+def test_invalid_sizes_rejected(min_size, max_size):
+    with pytest.raises(ValueError):
+        ConnectionPool('postgresql://x', min_size=min_size, max_size=max_size)
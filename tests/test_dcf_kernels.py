@@ -0,0 +1,174 @@
+"""
+Tests for the shared vectorized DCF kernels (invest.dcf_kernels) and the
+models that delegate to them.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from invest.dcf_kernels import (  # noqa: E402
+    dcf_valuation,
+    present_values,
+    project_cash_flows,
+    stage_growth_rates,
+    terminal_value,
+)
+from invest.dividend_aware_dcf import (  # noqa: E402
+    _calculate_present_values,
+    _project_dividend_and_growth,
+)
+from invest.growth_phase_dcf import (  # noqa: E402
+    _calculate_multi_stage_present_values,
+    _project_multi_stage_cashflows,
+)
+from invest.standard_dcf import discounted_sum, project_fcfs  # noqa: E402
+
+try:
+    from invest.valuation.dcf_model import DCFModel, MultiStageDCFModel
+except ImportError:  # the valuation package needs the neural network dependencies
+    DCFModel = MultiStageDCFModel = None
+
+
+def _reference_dcf(fcf, growth_rates, rate, terminal_growth):
+    """
+    The per-year loop the models used before the kernels.
+
+    Projected flows must match it exactly; discounted values only to the
+    rounding tolerance documented in ``invest.dcf_kernels``.
+    """
+    projected = []
+    for g in growth_rates:
+        fcf *= 1 + g
+        projected.append(fcf)
+    pv = [f / (1 + rate) ** i for i, f in enumerate(projected, 1)]
+    tv = projected[-1] * (1 + terminal_growth) / (rate - terminal_growth)
+    return projected, pv, tv, tv / (1 + rate) ** len(projected)
+
+
+def test_kernels_match_scalar_loop():
+    growth = [0.12, 0.1, 0.08, 0.06, 0.04]
+    projected, pv, tv, pv_tv = _reference_dcf(1e9, growth, 0.09, 0.025)
+
+    assert project_cash_flows(1e9, growth).tolist() == projected
+    np.testing.assert_allclose(present_values(projected, 0.09), pv, rtol=1e-14)
+    assert float(terminal_value(projected[-1], 0.09, 0.025)) == pytest.approx(tv, rel=1e-14)
+
+    valuation = dcf_valuation(1e9, growth, 0.09, 0.025, details=True)
+    assert valuation['cash_flows'].tolist() == projected
+    np.testing.assert_allclose(valuation['pv_cash_flows'], pv, rtol=1e-14)
+    assert float(valuation['pv_terminal']) == pytest.approx(pv_tv, rel=1e-14)
+    assert float(valuation['enterprise_value']) == pytest.approx(sum(pv) + pv_tv, rel=1e-14)
+
+    assert stage_growth_rates([(0.1, 2), (0.05, 3)]).tolist() == [0.1, 0.1, 0.05, 0.05, 0.05]
+    assert stage_growth_rates([]).shape == (0,)
+
+
+def test_universe_in_one_call():
+    rng = np.random.default_rng(0)
+    n = 200
+    fcf = rng.uniform(1e6, 1e10, n)
+    growth = rng.uniform(-0.05, 0.25, (n, 10))
+    rate = rng.uniform(0.07, 0.14, n)
+
+    batch = dcf_valuation(fcf, growth, rate, 0.025, details=True)
+    assert batch['enterprise_value'].shape == (n,)
+    assert batch['cash_flows'].shape == (n, 10)
+    assert 'cash_flows' not in dcf_valuation(fcf, growth, rate, 0.025)
+
+    for i in (0, 57, n - 1):
+        projected, pv, _, pv_tv = _reference_dcf(fcf[i], growth[i], rate[i], 0.025)
+        assert batch['enterprise_value'][i] == pytest.approx(sum(pv) + pv_tv, rel=1e-12)
+
+    # A WACC × growth grid per ticker is one more broadcast axis
+    grid = dcf_valuation(
+        fcf[:, None, None],
+        np.array([0.02, 0.05, 0.08])[None, None, :, None] * np.ones(10),
+        np.array([0.08, 0.1])[None, :, None],
+        0.025,
+    )
+    assert grid['enterprise_value'].shape == (n, 2, 3)
+    _, pv, _, pv_tv = _reference_dcf(fcf[3], [0.05] * 10, 0.1, 0.025)
+    assert grid['enterprise_value'][3, 1, 1] == pytest.approx(sum(pv) + pv_tv, rel=1e-12)
+
+    # Zero projection years value the base flow as a perpetuity
+    assert float(dcf_valuation(100.0, np.empty(0), 0.1, 0.02)['enterprise_value']) == pytest.approx(102 / 0.08)
+
+
+def _model_data():
+    years = pd.to_datetime(['2020-12-31', '2021-12-31', '2022-12-31', '2023-12-31'])
+    return {
+        'info': {'beta': 1.1, 'sharesOutstanding': 1e9, 'currentPrice': 50.0},
+        'cashflow': pd.DataFrame([[2e9, 2.2e9, 2.5e9, 3e9]], index=['Free Cash Flow'], columns=years),
+        'income': pd.DataFrame([[10e9, 11e9, 12.5e9, 14e9]], index=['Total Revenue'], columns=years),
+    }
+
+
+@pytest.mark.skipif(DCFModel is None, reason="invest.valuation not importable")
+@pytest.mark.parametrize('model_class', [DCFModel, MultiStageDCFModel])
+def test_models_match_scalar_loop(model_class):
+    model = model_class()
+    data = _model_data()
+    result = model._calculate_valuation('TEST', data)
+
+    fcf = result.inputs['free_cash_flow']
+    wacc = result.inputs['wacc']
+    if model_class is DCFModel:
+        growth = [result.inputs['growth_rate']] * model.projection_years
+    else:
+        growth = ([result.inputs['high_growth_rate']] * model.high_growth_years
+                  + [result.inputs['moderate_growth_rate']] * model.moderate_growth_years)
+    projected, pv, tv, pv_tv = _reference_dcf(fcf, growth, wacc, result.inputs['terminal_growth'])
+
+    assert result.outputs['pv_fcfs'] == pytest.approx(pv, rel=1e-14)
+    assert isinstance(result.outputs['pv_fcfs'][0], float)
+    assert isinstance(result.outputs['terminal_value'], float)
+    assert result.outputs['terminal_value'] == pytest.approx(tv, rel=1e-14)
+    assert result.enterprise_value == pytest.approx(sum(pv) + pv_tv, rel=1e-14)
+    assert result.fair_value == pytest.approx((sum(pv) + pv_tv) / 1e9, rel=1e-14)
+    if model_class is DCFModel:
+        assert result.outputs['projected_fcfs'] == projected
+    else:
+        assert result.outputs['high_growth_fcfs'] + result.outputs['moderate_growth_fcfs'] == projected
+
+
+def test_function_models_match_scalar_loop():
+    growth = [0.06 * (1 - 0.1 * i) for i in range(10)]
+    projected, pv, _, _ = _reference_dcf(5e8, growth, 0.1, 0.025)
+    assert project_fcfs(5e8, growth) == projected
+    assert discounted_sum(projected, 0.1) == pytest.approx(sum(pv), rel=1e-14)
+
+    # Multi-stage (growth phase) DCF: high growth then a declining transition
+    phases = {'high_growth_rate': 0.18, 'high_growth_years': 5, 'transition_rates': [0.15, 0.12, 0.09],
+              'transition_years': 3, 'terminal_growth': 0.025}
+    projections = _project_multi_stage_cashflows(5e8, phases)
+    growth = [0.18] * 5 + [0.15, 0.12, 0.09]
+    projected, pv, tv, pv_tv = _reference_dcf(5e8, growth, 0.1, 0.025)
+    assert projections['all_fcf'] == projected
+    assert projections['high_growth_fcf'] == projected[:5]
+    assert projections['years'] == list(range(1, 9))
+    values = _calculate_multi_stage_present_values(projections, phases, 0.1, 1e8, 2e8, 1e7)
+    assert values['high_growth_pv'] == pytest.approx(sum(pv[:5]), rel=1e-14)
+    assert values['transition_pv'] == pytest.approx(sum(pv[5:]), rel=1e-14)
+    assert values['terminal_value'] == pytest.approx(tv, rel=1e-14)
+    assert values['enterprise_value'] == pytest.approx(sum(pv) + pv_tv, rel=1e-14)
+
+    # Dividend-aware DCF: dividends are a payout share of the projected FCF
+    metrics = {'dividend_per_share': 2.0, 'payout_ratio': 0.4}
+    growth = [0.08, 0.07, 0.06, 0.05, 0.04]
+    projections = _project_dividend_and_growth(5e8, metrics, growth, 5)
+    projected, pv, tv, pv_tv = _reference_dcf(5e8, growth, 0.1, 0.025)
+    assert projections['fcf_projections'] == projected
+    assert projections['dividend_projections'] == [f * 0.4 for f in projected]
+    assert projections['reinvestment_projections'] == [f * 0.6 for f in projected]
+    assert projections['final_dividend_per_share'] == pytest.approx(2.0 * np.prod([1 + g * 0.4 for g in growth]))
+    values = _calculate_present_values(projections, 0.1, 0.025, 5, 1e8, 2e8, 1e7)
+    assert values['terminal_value'] == pytest.approx(tv, rel=1e-14)
+    assert values['dividend_pv'] == pytest.approx(0.4 * sum(pv), rel=1e-12)
+    assert values['enterprise_value'] == pytest.approx(sum(pv) + pv_tv, rel=1e-14)
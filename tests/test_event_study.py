@@ -0,0 +1,165 @@
+"""
+Tests for the vectorized event-study engine (src/invest/signals/event_study.py).
+
+The array lookups must reproduce the per-trade methodology of
+scripts/backtest_politician.py (first close within GAP_DAYS of each target
+date, alpha signed by direction, horizons past the benchmark's last close
+dropped), and the statistics must match their textbook definitions.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from invest.signals.event_study import (
+    GAP_DAYS,
+    HORIZONS,
+    PriceMatrix,
+    bootstrap_ci,
+    event_returns,
+    gate_result,
+    summarize,
+    summarize_by,
+    welch_t,
+)
+
+
+def _price_rows(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range('2020-01-01', '2023-06-30')
+    rows = []
+    for ticker in ['AAA', 'BBB', 'CCC', 'SPY']:
+        closes = 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days))))
+        for day, close in zip(days, closes):
+            if ticker == 'CCC' and day > pd.Timestamp('2021-06-30'):
+                break  # delisted
+            if rng.random() < 0.03:
+                continue  # missing day
+            rows.append((ticker, day.date(), float(close)))
+    rows.append(('AAA', date(2019, 12, 31), -1.0))  # bad close is dropped
+    return rows
+
+
+def _events(seed: int = 1, n: int = 300) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'ticker': rng.choice(['AAA', 'BBB', 'CCC', 'ZZZ'], n),
+        'date': pd.Timestamp('2019-12-20') + pd.to_timedelta(rng.integers(0, 1300, n), unit='D'),
+        'direction': rng.choice(['P', 'S'], n),
+    })
+
+
+def _reference_alpha(prices, ticker, tx_date, direction, horizon):
+    """Day-by-day probing, as backtest_politician.py used to compute it."""
+    spy = prices['SPY']
+    if tx_date + timedelta(days=horizon) > max(spy):
+        return None
+
+    def next_close(series, target):
+        for i in range(GAP_DAYS + 1):
+            if target + timedelta(days=i) in series:
+                return series[target + timedelta(days=i)]
+        return None
+
+    stock = prices.get(ticker)
+    if not stock:
+        return None
+    p0, p1 = next_close(stock, tx_date), next_close(stock, tx_date + timedelta(days=horizon))
+    s0, s1 = next_close(spy, tx_date), next_close(spy, tx_date + timedelta(days=horizon))
+    if not (p0 and p1 and s0 and s1):
+        return None
+    alpha = math.log(p1 / p0) - math.log(s1 / s0)
+    return alpha if direction == 'P' else -alpha
+
+
+def test_alphas_match_per_trade_probing():
+    rows = _price_rows()
+    nested = {}
+    for ticker, day, close in rows:
+        if close > 0:
+            nested.setdefault(ticker, {})[day] = close
+
+    events = _events()
+    study = event_returns(events, PriceMatrix.from_rows(rows))
+
+    for h in HORIZONS:
+        expected = [
+            _reference_alpha(nested, t, d.date(), direction, h)
+            for t, d, direction in events[['ticker', 'date', 'direction']].itertuples(index=False)
+        ]
+        expected = np.array([np.nan if e is None else e for e in expected])
+        np.testing.assert_allclose(study[f'alpha_{h}d'].to_numpy(), expected, rtol=1e-12, equal_nan=True)
+
+    # Unknown tickers and horizons past SPY's last close have no alpha
+    assert study.loc[events['ticker'] == 'ZZZ', 'alpha_30d'].isna().all()
+    late = events['date'] + pd.Timedelta(days=365) > pd.Timestamp('2023-06-30')
+    assert study.loc[late, 'alpha_365d'].isna().all()
+    assert study['alpha_90d'].notna().sum() > 100
+
+
+def test_bootstrap_ci():
+    rng = np.random.default_rng(4)
+    values = rng.normal(0.05, 0.2, 2000)
+
+    low, high = bootstrap_ci(values, n_boot=4000, seed=1)
+    se = values.std(ddof=1) / math.sqrt(len(values))
+    assert low == pytest.approx(values.mean() - 1.96 * se, abs=se * 0.15)
+    assert high == pytest.approx(values.mean() + 1.96 * se, abs=se * 0.15)
+    assert bootstrap_ci(values, n_boot=4000, seed=1) == (low, high)
+
+    # Same-day batches of identical alphas: resampling days widens the interval
+    clustered = np.repeat(values[:100], 20)
+    days = np.repeat(np.arange(100), 20)
+    naive = bootstrap_ci(clustered, n_boot=2000)
+    by_day = bootstrap_ci(clustered, clusters=days, n_boot=2000)
+    assert by_day[1] - by_day[0] > 3 * (naive[1] - naive[0])
+
+    assert math.isnan(bootstrap_ci(np.array([0.1]))[0])
+
+
+def test_summary_and_gate_result():
+    rng = np.random.default_rng(2)
+    study = pd.DataFrame({
+        'date': pd.Timestamp('2022-01-03') + pd.to_timedelta(rng.integers(0, 30, 80), unit='D'),
+        'direction': 'S',
+        'alpha_365d': rng.normal(0.2, 0.1, 80),
+    })
+    control = pd.DataFrame({
+        'date': pd.Timestamp('2022-01-03'),
+        'direction': rng.choice(['P', 'S'], 400),
+        'alpha_365d': rng.normal(0.0, 0.1, 400),
+    })
+
+    summary = summarize(study, 365, control=control[control['direction'] == 'S'], n_boot=2000)
+    alphas = study['alpha_365d'].to_numpy()
+    assert summary.n == 80
+    assert summary.n_effective == study['date'].nunique()
+    assert summary.mean == pytest.approx(alphas.mean())
+    assert summary.std == pytest.approx(alphas.std())
+    assert summary.annualised == pytest.approx(math.expm1(alphas.mean()))
+    assert summary.ci_low < summary.mean < summary.ci_high
+
+    sells = control.loc[control['direction'] == 'S', 'alpha_365d'].to_numpy()
+    expected_t = (alphas.mean() - sells.mean()) / math.sqrt(
+        alphas.var(ddof=1) / len(alphas) + sells.var(ddof=1) / len(sells)
+    )
+    assert summary.t == pytest.approx(expected_t)
+    assert welch_t(alphas, sells)[0] == pytest.approx(expected_t)
+
+    # summarize_by compares each group against the control events of its direction
+    grouped = summarize_by(study.assign(name='X'), ['name'], [365], control=control, n_boot=2000)
+    assert grouped[('X',)][0].t == pytest.approx(summary.t)
+
+    gate = gate_result(summary, 'synthetic', backtested_at=date(2026, 5, 1))
+    assert gate.passes is True
+    assert gate.horizon == '365d'
+    assert gate.alpha == round(summary.annualised, 3)
+    assert gate.n_effective == summary.n_effective
+    assert gate.last_backtested_at == '2026-05-01'
+
+    assert summarize(study.assign(alpha_365d=np.nan), 365) is None
@@ -0,0 +1,190 @@
+"""
+Tests for the array-backed GBM lag/change/rolling features (gbm_feature_engine).
+
+Each builder is checked against the groupby-transform implementation it
+replaced: lags and changes exactly, rolling stats to float rounding.
+"""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import linregress
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models' / 'neural_network' / 'training'))
+
+from gbm_feature_engine import (
+    add_change_features,
+    add_lag_features,
+    add_rolling_features,
+    normalize_by_date,
+)
+
+FEATURES = ['market_cap', 'pe_ratio', 'dividend_yield', 'vix']
+
+
+def _reference_lags(df, features, lags):
+    df = df.copy()
+    for feat in features:
+        for lag in lags:
+            df[f'{feat}_lag{lag}q'] = df.groupby('ticker')[feat].shift(lag)
+    return df
+
+
+def _reference_changes(df, features, yoy_lag):
+    df = df.copy()
+    for feat in features:
+        for suffix, lag in (('qoq', 1), ('yoy', yoy_lag)):
+            lag_vals = pd.to_numeric(df[f'{feat}_lag{lag}q'], errors='coerce')
+            feat_vals = pd.to_numeric(df[feat], errors='coerce')
+            df[f'{feat}_{suffix}'] = (feat_vals - lag_vals) / (lag_vals.abs().fillna(0) + 1e-9)
+    return df
+
+
+def _reference_rolling(df, features, windows, min_periods=None):
+    def rolling_slope(series):
+        if len(series) < 2:
+            return np.nan
+        try:
+            return linregress(np.arange(len(series)), series)[0]
+        except Exception:
+            return np.nan
+
+    df = df.copy()
+    for feat in features:
+        for window in windows:
+            minp = min_periods if min_periods is not None else max(1, window // 2)
+            minp_slope = min_periods if min_periods is not None else max(2, window // 2)
+            grouped = df.groupby('ticker')[feat]
+            df[f'{feat}_mean{window}q'] = grouped.transform(
+                lambda x: x.rolling(window, min_periods=minp).mean())
+            df[f'{feat}_std{window}q'] = grouped.transform(
+                lambda x: x.rolling(window, min_periods=minp).std())
+            df[f'{feat}_slope{window}q'] = grouped.transform(
+                lambda x: x.rolling(window, min_periods=minp_slope).apply(rolling_slope, raw=False))
+    return df
+
+
+def _synthetic_panel(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n in enumerate(rng.integers(1, 30, size=40)):
+        frame = pd.DataFrame({
+            'ticker': f'T{i:02d}',
+            'snapshot_date': pd.date_range('2015-03-31', periods=n, freq='QE'),
+            'market_cap': rng.lognormal(23, 1.5) * np.exp(np.cumsum(rng.normal(0, 0.1, n))),
+            'pe_ratio': rng.normal(20, 8, n),
+            # Long flat runs (non-payers) must give exact zero std/slope
+            'dividend_yield': np.where(rng.random(n) < 0.6, 0.0, rng.uniform(0, 0.05, n)),
+            'vix': np.round(rng.uniform(12, 30, n), 1),
+        })
+        for col in FEATURES:
+            frame.loc[rng.random(n) < 0.15, col] = np.nan
+        frames.append(frame)
+    df = pd.concat(frames, ignore_index=True)
+    # Interleave tickers and use a non-default index: groupby keeps per-ticker order
+    return df.sample(frac=1, random_state=seed).sort_values('snapshot_date', kind='stable').set_axis(
+        np.arange(len(df)) * 2 + 5)
+
+
+PANEL = _synthetic_panel()
+
+
+def test_lags_and_changes_match_exactly():
+    expected = _reference_changes(_reference_lags(PANEL, FEATURES, [1, 2, 4, 8]), FEATURES, 4)
+    got = add_change_features(add_lag_features(PANEL, FEATURES, [1, 2, 4, 8]), FEATURES)
+    pd.testing.assert_frame_equal(got, expected[got.columns], check_exact=True)
+    assert list(got.columns) == list(expected.columns)
+
+
+@pytest.mark.parametrize('min_periods', [None, 2])
+def test_rolling_matches_groupby_transform(min_periods):
+    expected = _reference_rolling(PANEL, FEATURES, [4, 8, 12], min_periods)
+    got = add_rolling_features(PANEL, FEATURES, [4, 8, 12], min_periods)
+    assert list(got.columns) == list(expected.columns)
+
+    for col in got.columns.difference(PANEL.columns):
+        e, g = expected[col].to_numpy(), got[col].to_numpy()
+        np.testing.assert_array_equal(np.isnan(e), np.isnan(g), err_msg=col)
+        feat = next(f for f in FEATURES if col.startswith(f'{f}_'))
+        scale = np.nanmax(np.abs(PANEL[feat]))
+        np.testing.assert_allclose(g, e, rtol=1e-9, atol=1e-12 * scale, equal_nan=True, err_msg=col)
+        if '_std' in col:
+            # Flat windows have exactly zero spread, as in pandas
+            np.testing.assert_array_equal(g[e == 0], 0.0, err_msg=col)
+
+
+def test_empty_frame():
+    empty = PANEL.iloc[:0]
+    got = add_rolling_features(add_lag_features(empty, FEATURES, [1]), FEATURES, [4])
+    assert len(got) == 0
+    assert 'vix_slope4q' in got.columns
+
+
+def _reference_winsorize(df, features, lower_pct, upper_pct):
+    df = df.copy()
+    for feat in features:
+        lower = df.groupby('snapshot_date')[feat].transform(lambda x: x.quantile(lower_pct))
+        upper = df.groupby('snapshot_date')[feat].transform(lambda x: x.quantile(upper_pct))
+        df[feat] = df[feat].clip(lower=lower, upper=upper)
+    return df
+
+
+def _reference_standardize(df, features):
+    df = df.copy()
+    for feat in features:
+        df[feat] = df.groupby('snapshot_date')[feat].transform(
+            lambda x: (x - x.mean()) / (x.std() + 1e-9))
+    return df
+
+
+def _cross_section(seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    sizes = [1, 2, 3, 7, 50, 101, 250]
+    df = pd.DataFrame({
+        'snapshot_date': np.repeat(pd.date_range('2024-01-31', periods=len(sizes), freq='ME'), sizes),
+        'pe_ratio': rng.standard_t(2, sum(sizes)) * 10,
+        'market_cap': rng.lognormal(22, 2, sum(sizes)),
+        'flag': rng.integers(0, 2, sum(sizes)).astype(float),
+        'vix': 0.0,
+    })
+    df['vix'] = df.groupby('snapshot_date').ngroup() * 1.7 + 12.3
+    df.loc[rng.random(len(df)) < 0.2, ['pe_ratio', 'market_cap']] = np.nan
+    df.loc[df['snapshot_date'] == df['snapshot_date'].iloc[3], 'market_cap'] = np.nan
+    return df.sample(frac=1, random_state=seed).set_axis(np.arange(len(df)) + 100)
+
+
+CROSS_FEATURES = ['pe_ratio', 'market_cap', 'flag', 'vix']
+
+
+@pytest.mark.parametrize('pcts', [(0.01, 0.99), (0.1, 0.75)])
+def test_winsorize_matches_quantile_clip_exactly(pcts):
+    df = _cross_section()
+    expected = _reference_winsorize(df, CROSS_FEATURES, *pcts)
+    got = normalize_by_date(df, CROSS_FEATURES, winsorize=pcts, standardize=False)
+    pd.testing.assert_frame_equal(got, expected, check_exact=True)
+
+
+def test_standardize_matches_zscore_transform():
+    df = _cross_section()
+    expected = _reference_standardize(df, CROSS_FEATURES)
+    got = normalize_by_date(df, CROSS_FEATURES, winsorize=None)
+
+    for feat in ['pe_ratio', 'market_cap', 'flag']:
+        np.testing.assert_allclose(got[feat], expected[feat], rtol=1e-9, atol=1e-9, err_msg=feat)
+    # A market-wide value (same for every row of a date) is exactly 0
+    assert (got['vix'].dropna() == 0).all()
+    np.testing.assert_allclose(got['vix'], expected['vix'], atol=1e-5)
+
+
+def test_normalize_is_winsorize_then_standardize():
+    df = _cross_section()
+    df.loc[df.index[:3], 'snapshot_date'] = pd.NaT
+    expected = _reference_standardize(_reference_winsorize(df, CROSS_FEATURES, 0.01, 0.99), CROSS_FEATURES)
+    got = normalize_by_date(df, CROSS_FEATURES + ['not_a_column'])
+    np.testing.assert_allclose(got[CROSS_FEATURES], expected[CROSS_FEATURES], atol=1e-5)
+    assert got.loc[df.index[:3], CROSS_FEATURES].isna().all().all()
@@ -0,0 +1,171 @@
+"""
+Tests for the persisted GBM feature store (gbm_feature_store).
+
+Rows read back from the store must equal a fresh run of the feature pipeline,
+and a refresh must only re-engineer tickers whose snapshots changed.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models' / 'neural_network' / 'training'))
+
+import gbm_feature_config
+import train_gbm_stock_ranker
+from gbm_feature_store import (
+    GBMFeatureStore,
+    engineer_features,
+    feature_config_version,
+    load_raw_snapshots,
+)
+
+RAW_COLUMNS = (
+    gbm_feature_config.FUNDAMENTAL_FEATURES +
+    gbm_feature_config.MARKET_FEATURES +
+    gbm_feature_config.CASHFLOW_FEATURES
+)
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD']
+
+
+def _make_db(seed: int = 0) -> sqlite3.Connection:
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(':memory:')
+
+    assets = pd.DataFrame({
+        'id': np.arange(1, len(TICKERS) + 1),
+        'symbol': TICKERS,
+        'sector': ['Tech', 'Energy', None, 'Tech'],
+    })
+    assets.to_sql('assets', conn, index=False)
+
+    dates = pd.date_range('2019-03-31', periods=16, freq='QE')
+    rows = []
+    for asset_id in assets['id']:
+        for date in dates[rng.integers(0, 4):]:
+            row = {'asset_id': asset_id, 'snapshot_date': date.strftime('%Y-%m-%d')}
+            row.update({col: rng.normal(1.0, 0.5) for col in RAW_COLUMNS})
+            row['market_cap'] = rng.uniform(1e9, 1e11)
+            if rng.random() < 0.2:
+                row['profit_margins'] = None
+            rows.append(row)
+    history = pd.DataFrame(rows)
+    history.insert(0, 'id', np.arange(1, len(history) + 1))
+    history.to_sql('fundamental_history', conn, index=False)
+
+    days = pd.bdate_range('2018-01-01', '2023-03-31')
+    prices = pd.concat([
+        pd.DataFrame({
+            'ticker': ticker,
+            'date': days.strftime('%Y-%m-%d'),
+            'close': 50 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days)))),
+            'volume': rng.integers(1, 10**6, len(days)).astype(float),
+        })
+        for ticker in TICKERS
+    ])
+    prices.to_sql('price_history', conn, index=False)
+    return conn
+
+
+def _store(conn) -> GBMFeatureStore:
+    return GBMFeatureStore(conn, 'standard', gbm_feature_config, train_gbm_stock_ranker)
+
+
+def _fresh(conn) -> pd.DataFrame:
+    raw = load_raw_snapshots(conn, gbm_feature_config)
+    return engineer_features(raw, conn, gbm_feature_config, train_gbm_stock_ranker)
+
+
+def test_loaded_rows_match_fresh_engineering():
+    conn = _make_db()
+    store = _store(conn)
+
+    stats = store.refresh()
+    assert stats['tickers'] == len(TICKERS)
+    assert stats['written'] == stats['snapshots']
+
+    pd.testing.assert_frame_equal(store.load(), _fresh(conn), check_exact=True)
+
+
+def test_refresh_only_reengineers_changed_tickers():
+    conn = _make_db()
+    store = _store(conn)
+    store.refresh()
+
+    stats = store.refresh()
+    assert (stats['tickers'], stats['written'], stats['deleted']) == (0, 0, 0)
+
+    # Change one BBB snapshot, add a DDD snapshot, delete CCC entirely
+    conn.execute('''
+        UPDATE fundamental_history SET profit_margins = 9.5
+        WHERE id = (SELECT MIN(id) FROM fundamental_history WHERE asset_id = 2)
+    ''')
+    new_row = pd.read_sql('SELECT * FROM fundamental_history WHERE asset_id = 4', conn).tail(1)
+    new_row = new_row.assign(id=10_000, snapshot_date='2023-03-31')
+    new_row.to_sql('fundamental_history', conn, index=False, if_exists='append')
+    conn.execute('DELETE FROM fundamental_history WHERE asset_id = 3')
+
+    before = store.load()['ticker'].value_counts()
+    stats = store.refresh()
+    assert stats['tickers'] == 3
+    assert stats['deleted'] == before[['BBB', 'CCC', 'DDD']].sum()
+    assert stats['written'] == before[['BBB', 'DDD']].sum() + 1
+    assert 'CCC' not in set(store.load()['ticker'])
+
+    pd.testing.assert_frame_equal(store.load(), _fresh(conn), check_exact=True)
+
+
+def test_refresh_picks_up_prices_landing_after_snapshot():
+    conn = _make_db()
+    # Today's AAA snapshot is taken before today's close is in price_history
+    conn.execute("DELETE FROM price_history WHERE ticker = 'AAA' AND date >= '2022-12-30'")
+    store = _store(conn)
+    store.refresh()
+    assert store.refresh()['tickers'] == 0
+
+    conn.execute("INSERT INTO price_history VALUES ('AAA', '2022-12-30', 80.0, 1000.0)")
+    stats = store.refresh()
+    assert stats['tickers'] == 1
+    pd.testing.assert_frame_equal(store.load(), _fresh(conn), check_exact=True)
+
+    # Once prices pass the last snapshot date, later prices don't touch its window
+    conn.execute("INSERT INTO price_history VALUES ('AAA', '2023-01-03', 81.0, 1000.0)")
+    store.refresh()
+    conn.execute("INSERT INTO price_history VALUES ('AAA', '2023-01-04', 82.0, 1000.0)")
+    assert store.refresh()['tickers'] == 0
+
+
+def test_load_filters_by_date_and_latest():
+    conn = _make_db()
+    store = _store(conn)
+    store.refresh()
+    full = store.load()
+
+    as_of = pd.Timestamp('2021-12-31')
+    latest = store.load(as_of=as_of, latest=True)
+    expected = full[full['snapshot_date'] <= as_of].groupby('ticker').tail(1).reset_index(drop=True)
+    pd.testing.assert_frame_equal(latest, expected, check_exact=True)
+
+    since = store.load(since=pd.Timestamp('2022-01-01'))
+    assert since['snapshot_date'].min() >= pd.Timestamp('2022-01-01')
+    assert since['profit_margins_missing'].dtype == np.int64
+
+
+def test_config_version_tracks_feature_config():
+    base = feature_config_version('standard', gbm_feature_config)
+    assert base == feature_config_version('standard', gbm_feature_config)
+    assert base != feature_config_version('opportunistic', gbm_feature_config)
+
+    changed = types.SimpleNamespace(**{
+        name: getattr(gbm_feature_config, name) for name in dir(gbm_feature_config)
+        if name.isupper()
+    })
+    changed.LAG_PERIODS = [1, 2]
+    assert feature_config_version('standard', changed) != base
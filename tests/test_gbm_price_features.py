@@ -0,0 +1,128 @@
+"""
+Tests for the vectorized GBM price features (gbm_price_features).
+
+The array path must reproduce the per-snapshot loop it replaced bit for bit,
+and the windowed loader must return every price row those features read.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'models' / 'neural_network' / 'training'))
+
+from gbm_price_features import (
+    PRICE_FEATURE_COLUMNS,
+    compute_price_features,
+    load_price_window,
+)
+
+
+def _reference(snapshots: pd.DataFrame, prices: pd.DataFrame, fallback: float) -> pd.DataFrame:
+    """The original per-snapshot implementation."""
+    groups = prices.groupby('ticker')
+
+    def calc(row):
+        if row['ticker'] not in groups.groups:
+            return pd.Series({f: np.nan for f in PRICE_FEATURE_COLUMNS})
+        p = groups.get_group(row['ticker'])
+        p = p[p['date'] <= row['snapshot_date']].sort_values('date')
+        if len(p) < 21:
+            return pd.Series({f: np.nan for f in PRICE_FEATURE_COLUMNS})
+        recent = p.tail(252)
+        closes = recent['close'].values
+        volumes = recent['volume'].values
+        recent_closes = closes[-60:] if len(closes) >= 60 else closes
+        daily_returns = np.diff(recent_closes) / recent_closes[:-1]
+        vol_avg = np.mean(volumes)
+        vol_recent = np.mean(volumes[-5:]) if len(volumes) >= 5 else vol_avg
+        return pd.Series({
+            'returns_1m': (closes[-1] - closes[-21]) / closes[-21],
+            'returns_3m': (closes[-1] - closes[-63]) / closes[-63] if len(closes) >= 63 else fallback,
+            'returns_6m': (closes[-1] - closes[-126]) / closes[-126] if len(closes) >= 126 else fallback,
+            'returns_1y': (closes[-1] - closes[0]) / closes[0] if len(closes) >= 252 else fallback,
+            'volatility': np.std(daily_returns),
+            'volume_trend': (vol_recent - vol_avg) / (vol_avg + 1e-9) if vol_avg > 0 else fallback,
+        })
+
+    return snapshots.apply(calc, axis=1)
+
+
+def _synthetic_prices(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, n_days in enumerate([5, 40, 80, 200, 300, 700]):
+        dates = pd.bdate_range('2020-01-01', periods=n_days)
+        frames.append(pd.DataFrame({
+            'ticker': f'T{i}',
+            'date': dates,
+            'close': 50 * np.exp(np.cumsum(rng.normal(0, 0.02, n_days))),
+            'volume': np.where(rng.random(n_days) < 0.05, 0.0, rng.integers(1, 10**7, n_days)).astype(float),
+        }))
+    # A ticker that never trades: every volume average is zero
+    frames.append(pd.DataFrame({
+        'ticker': 'ZERO',
+        'date': pd.bdate_range('2020-01-01', periods=100),
+        'close': 10.0,
+        'volume': 0.0,
+    }))
+    prices = pd.concat(frames, ignore_index=True)
+    return prices.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def _synthetic_snapshots(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    tickers = ['T0', 'T1', 'T2', 'T3', 'T4', 'T5', 'ZERO', 'MISSING']
+    dates = pd.date_range('2019-12-01', '2023-06-01', freq='7D')
+    rows = [(t, d) for t in tickers for d in rng.choice(dates, size=25, replace=False)]
+    snapshots = pd.DataFrame(rows, columns=['ticker', 'snapshot_date'])
+    return snapshots.set_index(pd.Index(np.arange(len(snapshots)) * 3 + 7))
+
+
+@pytest.mark.parametrize('fallback', [np.nan, 0.0])
+def test_matches_per_snapshot_loop(fallback):
+    prices = _synthetic_prices()
+    snapshots = _synthetic_snapshots()
+
+    expected = _reference(snapshots, prices, fallback)
+    got = compute_price_features(snapshots, prices, fallback=fallback)
+
+    assert list(got.columns) == PRICE_FEATURE_COLUMNS
+    assert got.index.equals(snapshots.index)
+    pd.testing.assert_frame_equal(got, expected[PRICE_FEATURE_COLUMNS], check_exact=True)
+
+
+def test_snapshot_on_a_trading_day_includes_that_day():
+    prices = _synthetic_prices()
+    day = prices.loc[prices['ticker'] == 'T4', 'date'].sort_values().iloc[100]
+    snapshots = pd.DataFrame({'ticker': ['T4'], 'snapshot_date': [day]})
+
+    got = compute_price_features(snapshots, prices)
+    pd.testing.assert_frame_equal(got, _reference(snapshots, prices, np.nan), check_exact=True)
+
+
+def test_sqlite_window_loads_everything_the_features_read():
+    prices = _synthetic_prices()
+    snapshots = _synthetic_snapshots()
+    # Late snapshots only, so long histories get trimmed at both ends
+    snapshots = snapshots[snapshots['snapshot_date'].between('2021-06-01', '2022-03-01')]
+
+    conn = sqlite3.connect(':memory:')
+    stored = prices.assign(date=prices['date'].dt.strftime('%Y-%m-%d'))
+    stored.to_sql('price_history', conn, index=False)
+
+    window = load_price_window(conn, snapshots)
+    conn.close()
+
+    assert len(window) < len(prices)
+    pd.testing.assert_frame_equal(
+        compute_price_features(snapshots, window),
+        compute_price_features(snapshots, prices),
+        check_exact=True,
+    )
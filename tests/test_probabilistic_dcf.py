@@ -0,0 +1,162 @@
+"""
+Tests for the vectorized Monte Carlo DCF engine (invest.probabilistic_dcf).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from invest.probabilistic_dcf import (  # noqa: E402
+    DISCOUNT_RATE_BOUNDS,
+    SHOCK_CORRELATION,
+    _dcf_scenarios,
+    _run_monte_carlo_simulation,
+    _scenario_inputs,
+    base_metrics_from_stock_data,
+    calculate_monte_carlo_dcf_batch,
+    distribution_details,
+)
+
+SETTINGS = {
+    'revenue_growth_uncertainty': 0.05,
+    'margin_uncertainty': 0.02,
+    'discount_rate_uncertainty': 0.02,
+    'terminal_growth_uncertainty': 0.01,
+    'projection_years': 10,
+    'base_discount_rate': 0.12,
+    'base_terminal_growth': 0.025,
+    'use_correlation': True,
+}
+
+
+def _metrics(ticker, **overrides):
+    metrics = {
+        'ticker': ticker,
+        'current_price': 50.0,
+        'shares_outstanding': 1e9,
+        'revenue': 2e10,
+        'fcf_margin': 0.12,
+        'revenue_growth': 0.08,
+        'annual_volatility': 0.3,
+    }
+    metrics.update(overrides)
+    return metrics
+
+
+def _reference_dcf(base_revenue, shares_outstanding, revenue_growth, fcf_margin,
+                   discount_rate, terminal_growth, projection_years):
+    """The year-by-year scalar DCF the array engine replaces."""
+    present_value = 0
+    current_revenue = base_revenue
+    for year in range(1, projection_years + 1):
+        decay_factor = max(0.1, 1 - (year - 1) / projection_years)
+        year_growth = terminal_growth + (revenue_growth - terminal_growth) * decay_factor
+        current_revenue *= (1 + year_growth)
+        present_value += current_revenue * fcf_margin / ((1 + discount_rate) ** year)
+    terminal_value = current_revenue * fcf_margin * (1 + terminal_growth) / (discount_rate - terminal_growth)
+    present_value += terminal_value / ((1 + discount_rate) ** projection_years)
+    return present_value / shares_outstanding
+
+
+@pytest.mark.parametrize('projection_years', [1, 5, 10, 15])
+def test_dcf_scenarios_match_scalar_dcf(projection_years):
+    rng = np.random.default_rng(0)
+    growth = rng.uniform(-0.5, 1.0, 200)
+    margin = rng.uniform(0.01, 0.3, 200)
+    discount = rng.uniform(0.05, 0.25, 200)
+    terminal = np.minimum(rng.uniform(0, 0.06, 200), discount - 0.01)
+
+    values = _dcf_scenarios(3e9, 1e8, growth, margin, discount, terminal, projection_years)
+    expected = [
+        _reference_dcf(3e9, 1e8, *args, projection_years)
+        for args in zip(growth, margin, discount, terminal)
+    ]
+    np.testing.assert_allclose(values, expected, rtol=1e-12)
+
+    assert np.isnan(_dcf_scenarios(3e9, 0, growth[:3], margin[:3], discount[:3], terminal[:3], 5)).all()
+
+
+def test_scenario_inputs_are_bounded_and_correlated():
+    growth, margin, discount, terminal = _scenario_inputs(
+        _metrics('AAA', revenue_growth=0.1, fcf_margin=0.15), np.random.default_rng(1), 50_000,
+        revenue_growth_uncertainty=0.05, margin_uncertainty=0.02,
+        discount_rate_uncertainty=0.02, terminal_growth_uncertainty=0.01,
+        base_discount_rate=0.12, base_terminal_growth=0.025, use_correlation=True,
+    )
+    assert DISCOUNT_RATE_BOUNDS[0] <= discount.min() and discount.max() <= DISCOUNT_RATE_BOUNDS[1]
+    assert (terminal >= 0).all() and (terminal <= discount - 0.01 + 1e-12).all()
+    assert abs(np.corrcoef(growth, discount)[0, 1] - SHOCK_CORRELATION[0, 2]) < 0.02
+    assert abs(np.corrcoef(growth, margin)[0, 1] - SHOCK_CORRELATION[0, 1]) < 0.02
+    assert abs(growth.std() - 0.05 * 1.5) < 0.003  # scaled by volatility vs 20%
+
+
+def test_seeded_simulation_is_reproducible():
+    metrics = _metrics('AAA')
+    first = _run_monte_carlo_simulation(metrics, iterations=500, seed=7, **SETTINGS)
+    again = _run_monte_carlo_simulation(metrics, iterations=500, seed=7, **SETTINGS)
+    other = _run_monte_carlo_simulation(metrics, iterations=500, seed=8, **SETTINGS)
+
+    np.testing.assert_array_equal(first['fair_values'], again['fair_values'])
+    assert not np.array_equal(first['fair_values'], other['fair_values'])
+    np.testing.assert_allclose(first['margins_of_safety'], first['fair_values'] / 50.0 - 1)
+
+
+def test_batch_matches_single_ticker_runs():
+    universe = {
+        'AAA': _metrics('AAA'),
+        'BBB': _metrics('BBB', revenue=5e9, fcf_margin=0.2, annual_volatility=0.5),
+        'NOREV': _metrics('NOREV', revenue=None),
+        'LOSS': _metrics('LOSS', revenue=-1e8),
+    }
+    results = calculate_monte_carlo_dcf_batch(universe, iterations=400, seed=3, **SETTINGS)
+
+    assert list(results) == list(universe)
+    assert 'revenue' in results['NOREV']['error']
+    assert 'negative revenue' in results['LOSS']['error']
+
+    # Scenarios depend on the seed and ticker only, not on the rest of the batch
+    alone = calculate_monte_carlo_dcf_batch({'BBB': universe['BBB']}, iterations=400, seed=3, **SETTINGS)
+    single = _run_monte_carlo_simulation(universe['BBB'], iterations=400, seed=3, **SETTINGS)
+    np.testing.assert_allclose(results['BBB']['simulation_data']['fair_values'], single['fair_values'], rtol=1e-12)
+    assert results['BBB']['fair_value'] == pytest.approx(alone['BBB']['fair_value'], rel=1e-12)
+    assert results['BBB']['fair_value'] == pytest.approx(np.median(single['fair_values']), rel=1e-12)
+
+    assert results['AAA']['fair_value'] != results['BBB']['fair_value']
+    assert set(results['AAA']['confidence_intervals']) == {0.68, 0.95}
+    assert 0 <= results['AAA']['probability_of_loss'] <= 1
+
+
+def test_base_metrics_from_database_rows():
+    stock_data = {
+        'info': {'currentPrice': 20.0, 'sharesOutstanding': 5e8, 'totalRevenue': 4e9,
+                 'freeCashflow': 6e8, 'sector': 'Energy', 'marketCap': None},
+        'financials': {'revenueGrowth': 0.12, 'profitMargins': None, 'operatingMargins': 0.2},
+    }
+    closes = 20 * np.exp(np.cumsum(np.random.default_rng(2).normal(0, 0.02, 504)))
+
+    metrics = base_metrics_from_stock_data('XOM', stock_data, list(closes))
+    assert metrics['revenue'] == 4e9
+    assert metrics['fcf_margin'] == pytest.approx(0.15)
+    assert metrics['revenue_growth'] == 0.12
+    assert metrics['profit_margin'] == 0.1  # NULL column falls back to the default
+    assert metrics['annual_volatility'] == pytest.approx(0.02 * np.sqrt(252), rel=0.1)
+
+    assert base_metrics_from_stock_data('XOM', stock_data, [])['annual_volatility'] == 0.25
+
+
+def test_distribution_details_are_json_ready():
+    results = calculate_monte_carlo_dcf_batch({'AAA': _metrics('AAA')}, iterations=2000, seed=0, **SETTINGS)
+    details = distribution_details(results['AAA'])
+
+    assert json.loads(json.dumps(details)) == details
+    quantiles = details['quantiles']
+    assert quantiles['p50'] == pytest.approx(details['fair_value_median'])
+    assert list(quantiles.values()) == sorted(quantiles.values())
+    assert details['value_at_risk_5pct'] == quantiles['p05']
+    assert set(details['confidence_intervals']) == {'68%', '95%'}
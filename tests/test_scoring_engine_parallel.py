@@ -0,0 +1,84 @@
+"""
+Tests for ScoringEngine.score_universe's process-pool mode.
+
+The universe is bulk-loaded once in the parent (stubbed here), so the worker
+processes never touch the database; the parallel result must match serial.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from invest.data.stock_data_reader import StockDataReader
+from invest.scanner import scoring_engine
+from invest.scanner.scoring_engine import ScoringEngine
+
+
+def _fake_data(i: int) -> dict:
+    return {
+        'ticker': f'T{i:03d}',
+        'info': {'currentPrice': 10.0 + i, 'sector': 'Technology', 'longName': f'Co {i}'},
+        'financials': {
+            'trailingPE': 5.0 + (i * 7) % 40,
+            'priceToBook': 0.5 + (i % 9) * 0.6,
+            'returnOnEquity': 0.02 * (i % 17),
+            'debtToEquity': 0.1 * (i % 25),
+            'currentRatio': 0.6 + 0.1 * (i % 30),
+            'operatingMargins': 0.01 * (i % 45),
+            'profitMargins': 0.01 * (i % 33),
+        },
+        'price_data': {
+            'current_price': 10.0 + i,
+            'price_52w_high': 12.0 + i * 1.1,
+            'price_52w_low': 8.0 + i * 0.5,
+            'price_trend_30d': ((i % 11) - 5) / 40,
+        },
+        'income': [
+            {'index': 'Total Revenue', '2025': 100.0 + i, '2024': 95.0, '2023': 90.0, '2022': 80.0},
+            {'index': 'Net Income', '2025': 10.0 + i % 5, '2024': 9.0, '2023': 8.0, '2022': 7.0},
+        ],
+        'cashflow': [{'index': 'Operating Cash Flow', '2025': 12.0}],
+        'balance_sheet': [{'index': 'Total Assets', '2025': 200.0}],
+        'insider': {'has_data': i % 3 == 0, 'buy_count': i % 4, 'sell_count': 1,
+                    'net_buy_pct': float(i % 7 - 3), 'cluster_score': i % 3},
+        'activist': {'has_data': False},
+        'holdings': {'has_data': False},
+        'japan_stakes': {'has_data': False},
+        'politician': {'has_data': False},
+    }
+
+
+UNIVERSE = {f'T{i:03d}': _fake_data(i) for i in range(60)}
+
+
+def _fake_bulk(self, tickers, conn=None):
+    return {t: UNIVERSE[t] for t in tickers if t in UNIVERSE}
+
+
+@pytest.fixture
+def stubbed_db():
+    with patch.object(StockDataReader, 'get_stock_data_bulk', _fake_bulk), \
+         patch.object(scoring_engine, 'get_db_connection', return_value=MagicMock()), \
+         patch.object(scoring_engine, 'get_latest_predictions_bulk',
+                      side_effect=lambda conn, tickers: {t: {} for t in tickers}):
+        yield
+
+
+@pytest.mark.parametrize('workers', [2, 4])
+def test_parallel_matches_serial(stubbed_db, workers):
+    tickers = list(UNIVERSE) + ['MISSING']
+    engine = ScoringEngine()
+
+    serial = engine.score_universe(tickers)
+    parallel = engine.score_universe(tickers, workers=workers)
+
+    assert len(serial) == len(UNIVERSE)
+    assert [s.ticker for s in parallel] == [s.ticker for s in serial]
+    assert parallel == serial
+
+
+def test_workers_capped_by_universe_size(stubbed_db):
+    scores = ScoringEngine().score_universe(['T001'], workers=8)
+    assert [s.ticker for s in scores] == ['T001']
@@ -166,6 +166,124 @@ class TestClassicValuationsScript:
                 'Income statement should be a DataFrame'
 
 
+    def _import_script(self):
+        sys.path.insert(0, str(project_root / 'src'))
+        sys.path.insert(0, str(project_root / 'scripts'))
+        import run_classic_valuations
+        return run_classic_valuations
+
+    def _bulk_reader(self, mock_stock_data, tickers):
+        reader = Mock()
+        reader.get_stock_data_bulk = Mock(side_effect=lambda ts, conn=None: {
+            t: {**mock_stock_data, 'ticker': t} for t in ts if t != 'MISSING'
+        })
+        reader.get_recent_price_closes_bulk = Mock(side_effect=lambda ts, limit=600, conn=None: {
+            t: {'closes': [150.0] * 300, 'dates': [], 'last_date': None, 'price_points': 300}
+            for t in ts
+        })
+        reader.get_latest_macro_rate = Mock(return_value=None)
+        return reader
+
+    def test_parallel_valuations_match_serial(self, mock_stock_data):
+        """Process-pool mode yields the same results, in ticker order, as in-process."""
+        script = self._import_script()
+        tickers = ['AAPL', 'MISSING', 'MSFT', 'ZZZ']
+        reader = self._bulk_reader(mock_stock_data, tickers)
+        script._init_worker()
+
+        serial = list(script.iter_valuations(reader, tickers, conn=None, workers=1))
+        parallel = list(script.iter_valuations(reader, tickers, conn=None, workers=2))
+
+        assert [t for t, _, _ in serial] == tickers
+        assert json.dumps(parallel, default=str) == json.dumps(serial, default=str)
+        missing = dict(serial[1][2])
+        assert serial[1][1] is False
+        assert all(r['reason'] == 'Missing stock data' for r in missing.values())
+        # One bulk load per preload chunk, not one per ticker
+        assert reader.get_stock_data_bulk.call_count == 2
+
+    def test_checkpoint_round_trip(self, tmp_path):
+        script = self._import_script()
+        path = tmp_path / 'nested' / 'checkpoint.json'
+        assert script.load_checkpoint(path) is None
+        script.save_checkpoint(path, 'MSFT')
+        assert script.load_checkpoint(path) == 'MSFT'
+
+    def test_flush_results_returns_unsaved_rows(self, monkeypatch):
+        script = self._import_script()
+        conn = Mock()
+
+        def save_row(conn, ticker, db_name, result):
+            if ticker == 'MSFT':
+                raise RuntimeError('value out of range')
+
+        monkeypatch.setattr(script, 'save_results_to_database', Mock(side_effect=RuntimeError('batch')))
+        monkeypatch.setattr(script, 'save_to_database', save_row)
+        pending = [('AAPL', 'dcf', {}), ('MSFT', 'dcf', {}), ('MSFT', 'rim', {}), ('ZZZ', 'dcf', {})]
+
+        assert script.flush_results(conn, pending) == [('MSFT', 'dcf', {}), ('MSFT', 'rim', {})]
+        assert pending == []
+        assert conn.rollback.call_count == 3
+
+
+class TestMonteCarloValuationsScript:
+    """Test the run_monte_carlo_valuations.py batch over the database."""
+
+    def _import_script(self):
+        sys.path.insert(0, str(project_root / 'src'))
+        sys.path.insert(0, str(project_root / 'scripts'))
+        import run_monte_carlo_valuations
+        return run_monte_carlo_valuations
+
+    def _bulk_reader(self, mock_stock_data):
+        reader = Mock()
+        reader.get_stock_data_bulk = Mock(side_effect=lambda ts, conn=None: {
+            t: {**mock_stock_data, 'ticker': t} for t in ts if t != 'MISSING'
+        })
+        reader.get_recent_price_closes_bulk = Mock(side_effect=lambda ts, limit=600, conn=None: {
+            t: {'closes': [150.0 + (i % 7) for i in range(limit)], 'dates': [], 'last_date': None,
+                'price_points': limit}
+            for t in ts
+        })
+        return reader
+
+    def test_parallel_simulations_match_serial(self, mock_stock_data):
+        script = self._import_script()
+        mock_stock_data = {**mock_stock_data, 'info': {**mock_stock_data['info'], 'totalRevenue': 4e11}}
+        tickers = ['AAPL', 'MISSING', 'MSFT']
+        reader = self._bulk_reader(mock_stock_data)
+        kwargs = {'iterations': 500, 'seed': 0}
+
+        serial = list(script.iter_valuations(reader, tickers, None, 1, kwargs))
+        parallel = list(script.iter_valuations(reader, tickers, None, 2, kwargs))
+
+        assert [t for t, _ in serial] == tickers
+        assert json.dumps(parallel) == json.dumps(serial)
+        assert serial[1][1]['reason'] == 'Missing stock data'
+        assert serial[0][1]['suitable'] and 'quantiles' in serial[0][1]['details']
+        # One bulk load per preload chunk, not one per ticker
+        assert reader.get_stock_data_bulk.call_count == 2
+        assert reader.get_recent_price_closes_bulk.call_args.kwargs['limit'] == script.VOLATILITY_WINDOW
+
+    def test_results_are_upserted_with_details(self, monkeypatch):
+        script = self._import_script()
+        calls = []
+        monkeypatch.setattr(script, 'upsert_rows', lambda conn, table, columns, rows, **kw: calls.append(rows))
+        conn = Mock()
+
+        script.save_results_to_database(conn, [
+            ('AAA', {'suitable': True, 'fair_value': 10.0, 'current_price': 8.0,
+                     'margin_of_safety': 0.25, 'upside': 25.0, 'details': {'quantiles': {'p50': 10.0}}}),
+            ('BBB', dict(script.MISSING_DATA_RESULT)),
+        ])
+
+        success, failure = calls
+        assert success[0][:2] == ('AAA', 'monte_carlo_dcf')
+        assert json.loads(success[0][-1]) == {'quantiles': {'p50': 10.0}}
+        assert failure[0][:3] == ('BBB', 'monte_carlo_dcf', False)
+        conn.commit.assert_called_once()
+
+
 class TestDataFetcherScript:
     """Test the data_fetcher.py script integration with SQLite."""
 
@@ -0,0 +1,119 @@
+"""
+Tests for the vectorized sensitivity grids of the valuation models
+(ValuationModel.sensitivity_grid, ModelRegistry.sensitivity_grid).
+
+Every cell must equal the model's own scalar valuation with that input
+overridden.
+"""
+
+import dataclasses
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+try:
+    from invest.valuation import dcf_model
+    from invest.valuation.base import SensitivityGrid
+    from invest.valuation.model_registry import ModelRegistry
+except ImportError:  # the valuation package needs the neural network dependencies
+    ModelRegistry = None
+
+pytestmark = pytest.mark.skipif(ModelRegistry is None, reason="invest.valuation not importable")
+
+
+def _scalar_fair_value(model, data, monkeypatch, **overrides):
+    """The model's own _calculate_valuation with estimated inputs overridden."""
+    with monkeypatch.context() as patch:
+        for method, value in overrides.items():
+            patch.setattr(model, method, lambda *args, value=value: value)
+        return model._calculate_valuation('TEST', data).fair_value
+
+
+@pytest.mark.parametrize('model_name', ['dcf', 'multi_stage_dcf'])
+def test_dcf_grid_matches_scalar_model(model_name, company_data, monkeypatch):
+    registry = ModelRegistry()
+    model = registry.get_model(model_name)
+    grid = registry.sensitivity_grid(
+        model_name, 'TEST', {'wacc': [0.08, 0.1, 0.12], 'growth_rate': [0.0, 0.05, 0.1, 0.15]}, data=company_data,
+    )
+
+    assert isinstance(grid, SensitivityGrid)
+    assert grid.values.shape == (3, 4)
+    assert list(grid.axes) == ['wacc', 'growth_rate']
+    assert grid.current_price == 40.0
+    for i, wacc in enumerate(grid.axes['wacc']):
+        for j, growth in enumerate(grid.axes['growth_rate']):
+            expected = _scalar_fair_value(model, company_data, monkeypatch,
+                                          _estimate_wacc=wacc, _estimate_growth_rate=growth)
+            assert grid.values[i, j] == pytest.approx(expected, rel=1e-12)
+
+    # Default axes: 5 points, 1 percentage point apart, centred on the base case
+    grid = model.sensitivity_grid('TEST', company_data, {'wacc': None, 'terminal_growth': None})
+    assert grid.values.shape == (5, 5)
+    np.testing.assert_allclose(grid.axes['wacc'] - grid.base['wacc'], [-0.02, -0.01, 0, 0.01, 0.02])
+    expected = model._calculate_valuation('TEST', company_data).fair_value
+    assert grid.values[2, 2] == pytest.approx(expected, rel=1e-12)
+
+    # Terminal growth is a constant of the scalar model
+    defaults = dataclasses.replace(dcf_model.VALUATION_DEFAULTS, TERMINAL_GROWTH_RATE=grid.axes['terminal_growth'][4])
+    monkeypatch.setattr(dcf_model, 'VALUATION_DEFAULTS', defaults)
+    assert grid.values[1, 4] == pytest.approx(
+        _scalar_fair_value(model, company_data, monkeypatch, _estimate_wacc=grid.axes['wacc'][1]), rel=1e-12,
+    )
+
+
+def test_growth_dcf_and_rim_grids(company_data, monkeypatch):
+    registry = ModelRegistry()
+
+    model = registry.get_model('growth_dcf')
+    grid = registry.sensitivity_grid('growth_dcf', 'TEST', {'wacc': [0.09, 0.11], 'roic': [0.15, 0.2, 0.25]},
+                                     data=company_data)
+    for i, wacc in enumerate(grid.axes['wacc']):
+        for j, roic in enumerate(grid.axes['roic']):
+            expected = _scalar_fair_value(model, company_data, monkeypatch, _estimate_wacc=wacc, _calculate_roic=roic)
+            assert grid.values[i, j] == pytest.approx(expected, rel=1e-12)
+
+    model = registry.get_model('rim')
+    grid = registry.sensitivity_grid('rim', 'TEST', {'cost_of_equity': [0.08, 0.1, 0.12], 'roe': [0.12, 0.18]},
+                                     data=company_data)
+    for i, cost_of_equity in enumerate(grid.axes['cost_of_equity']):
+        for j, roe in enumerate(grid.axes['roe']):
+            expected = _scalar_fair_value(model, company_data, monkeypatch,
+                                          _estimate_cost_of_equity=cost_of_equity, _calculate_roe=roe)
+            assert grid.values[i, j] == pytest.approx(expected, rel=1e-12)
+
+
+def test_grid_labels_and_errors(company_data, monkeypatch):
+    registry = ModelRegistry()
+    fetches = []
+    monkeypatch.setattr(registry.get_model('dcf'), '_fetch_data', lambda ticker: fetches.append(ticker) or company_data)
+
+    grid = registry.sensitivity_grid('dcf', 'TEST', {
+        'wacc': [0.02, 0.1], 'terminal_growth': [0.02, 0.03, 0.04], 'growth_rate': [0.0, 0.05, 0.1, 0.15],
+    })
+    assert fetches == ['TEST']
+    assert grid.values.shape == (2, 3, 4)
+    # WACC at or below terminal growth is undefined, not an error
+    assert np.isnan(grid.values[0, :2]).all() and np.isfinite(grid.values[1]).all()
+
+    payload = json.loads(json.dumps(grid.to_dict()))
+    assert payload['axes']['terminal_growth'] == [0.02, 0.03, 0.04]
+    assert payload['values'][0][0][0] is None
+
+    frame = registry.sensitivity_grid('dcf', 'TEST', {'wacc': [0.1, 0.11], 'growth_rate': [0.05]}).to_frame()
+    assert frame.index.name == 'wacc' and frame.columns.name == 'growth_rate'
+    assert frame.loc[0.1, 0.05] > frame.loc[0.11, 0.05]
+    with pytest.raises(ValueError):
+        grid.to_frame()
+
+    with pytest.raises(ValueError, match='roe'):
+        registry.sensitivity_grid('dcf', 'TEST', {'roe': None}, data=company_data)
+    with pytest.raises(ValueError, match='Supported: none'):
+        registry.sensitivity_grid('simple_ratios', 'TEST', {'wacc': None}, data=company_data)
@@ -0,0 +1,154 @@
+"""
+Tests for the set-based universe loader (StockDataReader.get_stock_data_bulk).
+
+The bulk path must return exactly the per-ticker get_stock_data() shape while
+issuing a constant number of queries. The DB is stubbed — no live Postgres.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from invest.data.activist_db import _aggregate_activist_rows, _no_activist_data
+from invest.data.holdings_db import _aggregate_holdings_rows, _no_holdings_data
+from invest.data.stock_data_reader import StockDataReader
+
+
+def _row(ticker: str, price: float) -> dict:
+    """Minimal current_stock_data row with every column the reader touches."""
+    cols = [
+        'market_cap', 'sector', 'industry', 'long_name', 'short_name', 'currency',
+        'exchange', 'country', 'shares_outstanding', 'total_revenue', 'total_cash',
+        'total_debt', 'trailing_eps', 'book_value', 'revenue_per_share', 'trailing_pe',
+        'forward_pe', 'price_to_book', 'return_on_equity', 'debt_to_equity',
+        'current_ratio', 'revenue_growth', 'earnings_growth', 'operating_margins',
+        'profit_margins', 'price_to_sales_ttm', 'price_52w_high', 'price_52w_low',
+        'avg_volume', 'price_trend_30d', 'fetch_timestamp',
+    ]
+    row = {c: None for c in cols}
+    row.update({
+        'ticker': ticker,
+        'current_price': price,
+        'long_name': f'{ticker} Inc',
+        'cashflow_json': [{'index': 'Free Cash Flow', '2025-12-31': 1e9}],
+        'balance_sheet_json': None,
+        'income_json': [],
+    })
+    return row
+
+
+ROWS = {'AAA': _row('AAA', 10.0), 'BBB': _row('BBB', 20.0)}
+INSIDER = {'AAA': {'has_data': True, 'buy_count': 3}}
+HOLDINGS = {'BBB': {'has_data': True, 'smart_money_holders': 2}}
+
+
+def _bulk_conn() -> MagicMock:
+    cursor = MagicMock()
+    cursor.fetchall.return_value = list(ROWS.values())
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn
+
+
+def _single_conn(ticker: str) -> MagicMock:
+    cursor = MagicMock()
+    cursor.fetchone.return_value = ROWS.get(ticker)
+    conn = MagicMock()
+    conn.cursor.return_value = cursor
+    return conn
+
+
+@pytest.fixture
+def stubbed_signals():
+    empty = lambda conn, tickers=None: {}  # noqa: E731
+    with patch('invest.data.insider_db.compute_all_insider_signals',
+               lambda conn, tickers=None: INSIDER), \
+         patch('invest.data.holdings_db.compute_all_holdings_signals',
+               lambda conn, tickers=None: HOLDINGS), \
+         patch('invest.data.activist_db.compute_all_activist_signals', empty), \
+         patch('invest.data.edinet_db.compute_all_japan_signals', empty), \
+         patch('invest.data.politician_db.compute_all_politician_signals', empty):
+        yield
+
+
+def _single(reader: StockDataReader, ticker: str):
+    """Per-ticker path with sub-signals stubbed to the same fixtures."""
+    from invest.data.edinet_db import _no_japan_data
+    from invest.data.insider_db import _no_insider_data
+    from invest.data.politician_db import _no_politician_data
+
+    with patch.object(reader, 'get_insider_signal',
+                      lambda t, conn=None: INSIDER.get(t, _no_insider_data())), \
+         patch.object(reader, 'get_holdings_signal',
+                      lambda t, conn=None: HOLDINGS.get(t, _no_holdings_data())), \
+         patch.object(reader, 'get_activist_signal', lambda t, conn=None: _no_activist_data()), \
+         patch.object(reader, 'get_japan_signal', lambda t, conn=None: _no_japan_data()), \
+         patch.object(reader, 'get_politician_signal', lambda t, conn=None: _no_politician_data()):
+        return reader.get_stock_data(ticker, conn=_single_conn(ticker))
+
+
+def test_bulk_matches_per_ticker_shape(stubbed_signals):
+    reader = StockDataReader()
+    bulk = reader.get_stock_data_bulk(['BBB', 'AAA'], conn=_bulk_conn())
+
+    assert list(bulk) == ['BBB', 'AAA']
+    for ticker in ('AAA', 'BBB'):
+        assert bulk[ticker] == _single(reader, ticker)
+    assert bulk['AAA']['info']['freeCashflow'] == 1e9
+
+
+def test_bulk_skips_tickers_missing_from_current_stock_data(stubbed_signals):
+    reader = StockDataReader()
+    bulk = reader.get_stock_data_bulk(['AAA', 'ZZZ'], conn=_bulk_conn())
+    assert 'ZZZ' not in bulk
+    assert reader.get_stock_data('ZZZ', conn=_single_conn('ZZZ')) is None
+
+
+def test_bulk_uses_constant_query_count(stubbed_signals):
+    conn = _bulk_conn()
+    StockDataReader().get_stock_data_bulk(['AAA', 'BBB'], conn=conn)
+    # One current_stock_data query; signal families are one call each.
+    assert conn.cursor.return_value.execute.call_count == 1
+
+
+def test_empty_universe_touches_no_connection():
+    conn = MagicMock()
+    assert StockDataReader().get_stock_data_bulk([], conn=conn) == {}
+    conn.cursor.assert_not_called()
+
+
+def test_failed_bulk_price_query_rolls_back_borrowed_connection():
+    conn = MagicMock()
+    conn.cursor.return_value.execute.side_effect = RuntimeError('statement timeout')
+
+    closes = StockDataReader().get_recent_price_closes_bulk(['AAA'], conn=conn)
+
+    assert closes == {'AAA': {'closes': [], 'dates': [], 'last_date': None, 'price_points': 0}}
+    conn.rollback.assert_called_once()
+    conn.close.assert_not_called()
+
+
+def test_holdings_aggregate_compares_quarters():
+    latest = [('Fund A', '1', 100.0, 1000.0), ('Fund B', '2', 50.0, 500.0)]
+    prev = [('Fund A', '1', 120.0), ('Fund C', '3', 10.0)]
+    out = _aggregate_holdings_rows(latest, prev)
+    assert out['new_positions'] == ['Fund B']
+    assert out['exited_positions'] == ['Fund C']
+    assert out['quarter_change'] == 20
+    assert _aggregate_holdings_rows(latest)['quarter_change'] is None
+
+
+def test_activist_aggregate_tracks_most_recent_activist():
+    rows = [
+        ('Passive LP', 'SC 13G', 1, 6.0, '2026-05-01', 0),
+        ('Elliott', 'SC 13D', 1, 9.5, '2026-04-01', 1),
+        ('Elliott', 'SC 13D', 1, 8.0, '2026-01-01', 1),
+    ]
+    out = _aggregate_activist_rows(rows)
+    assert out['recent_activist_name'] == 'Elliott'
+    assert out['activist_count'] == 2
+    assert out['passive_count'] == 1
+    assert out['max_stake_pct'] == 9.5
+    assert out['total_holders_5pct'] == 2
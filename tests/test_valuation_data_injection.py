@@ -0,0 +1,117 @@
+"""
+Tests for valuing companies from pre-loaded data
+(ValuationModel.value_company_with_data and the registry/ensemble paths
+that pass one data load to every model).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+try:
+    from invest.data.stock_data_reader import StockDataReader
+    from invest.valuation import model_registry
+    from invest.valuation.base import ModelNotSuitableError, ValuationModel
+    from invest.valuation.model_registry import ModelRegistry
+except ImportError:  # the valuation package needs the neural network dependencies
+    ModelRegistry = None
+
+pytestmark = pytest.mark.skipif(ModelRegistry is None, reason="invest.valuation not importable")
+
+
+@pytest.fixture
+def fetches(monkeypatch, company_data):
+    """Count every _fetch_data call, on any model of any registry."""
+    calls = []
+    monkeypatch.setattr(ValuationModel, '_fetch_data', lambda self, ticker: calls.append(ticker) or company_data)
+    return calls
+
+
+def test_value_company_with_data_matches_value_company(company_data, fetches):
+    model = ModelRegistry().get_model('dcf')
+
+    injected = model.value_company_with_data('TEST', company_data)
+    assert fetches == []
+    assert injected.fair_value == model.value_company('TEST').fair_value
+    assert fetches == ['TEST']
+
+    with pytest.raises(ModelNotSuitableError):
+        model.value_company_with_data('TEST', {'ticker': 'TEST', 'info': {}})
+
+
+def test_ensemble_needs_one_fetch(company_data, fetches):
+    registry = ModelRegistry()
+
+    result = registry.run_valuation('ensemble', 'TEST', data=company_data)
+    assert result is not None and len(result.constituent_models) >= 2
+    assert fetches == []
+
+    assert model_registry.run_valuation('ensemble', 'TEST').fair_value == pytest.approx(result.fair_value)
+    assert fetches == ['TEST']
+
+
+def test_run_all_suitable_models_shares_data(company_data, fetches):
+    registry = ModelRegistry()
+
+    results = registry.run_all_suitable_models('TEST', data=company_data)
+    assert {'dcf', 'ensemble'} <= set(results)
+    assert fetches == []
+
+    assert set(registry.run_all_suitable_models('TEST')) == set(results)
+    assert fetches == ['TEST']
+
+
+def test_global_sensitivity_grid_uses_passed_data(company_data, fetches):
+    axes = {'wacc': [0.09, 0.1], 'terminal_growth': [0.02, 0.03]}
+
+    grid = model_registry.sensitivity_grid('dcf', 'TEST', axes, data=company_data)
+    assert fetches == []
+
+    np.testing.assert_array_equal(model_registry.sensitivity_grid('dcf', 'TEST', axes).values, grid.values)
+    assert fetches == ['TEST']
+
+
+def _records(frame):
+    """A statement as stored in current_stock_data (data_fetcher's JSON records)."""
+    frame = frame.reset_index()
+    frame.columns = frame.columns.astype(str)
+    return frame.to_dict(orient='records')
+
+
+def test_reader_data_feeds_every_model(company_data, fetches):
+    info = company_data['info']
+    row = dict.fromkeys([
+        'industry', 'long_name', 'short_name', 'exchange', 'country', 'total_revenue', 'total_cash',
+        'revenue_per_share', 'forward_pe', 'debt_to_equity', 'current_ratio', 'revenue_growth',
+        'earnings_growth', 'operating_margins', 'profit_margins', 'price_to_sales_ttm', 'price_52w_high',
+        'price_52w_low', 'avg_volume', 'price_trend_30d', 'fetch_timestamp',
+    ])
+    row.update({
+        'ticker': 'TEST', 'current_price': info['currentPrice'], 'market_cap': info['marketCap'],
+        'sector': info['sector'], 'currency': 'USD', 'shares_outstanding': info['sharesOutstanding'],
+        'total_debt': 2e9, 'trailing_eps': info['trailingEps'], 'book_value': info['bookValue'],
+        'trailing_pe': info['trailingPE'], 'price_to_book': info['priceToBook'],
+        'return_on_equity': info['returnOnEquity'],
+        'cashflow_json': _records(company_data['cashflow']),
+        'balance_sheet_json': _records(company_data['balance_sheet']),
+        'income_json': _records(company_data['income']),
+    })
+    stock_data = StockDataReader()._row_to_stock_data(row)
+    registry = ModelRegistry()
+
+    # The reader keeps statements as JSON records, which no model can use as-is
+    assert not {'dcf', 'rim'} & set(registry.run_all_suitable_models('TEST', data=stock_data))
+
+    data = StockDataReader.to_model_data(stock_data, {'closes': []})
+    assert isinstance(data['cashflow'], pd.DataFrame)
+    assert data['cashflow'].loc['Free Cash Flow'].iloc[0] == 1.6e9
+
+    results = registry.run_all_suitable_models('TEST', data=data)
+    assert {'dcf', 'rim', 'ensemble'} <= set(results)
+    assert fetches == []
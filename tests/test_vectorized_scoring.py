@@ -0,0 +1,162 @@
+"""
+Tests for the NumPy array scoring backend (invest.scanner.vectorized_scoring).
+
+Every component and the composite must match ScoringEngine.score_loaded
+to float rounding on a synthetic universe that exercises each optional
+branch and is large enough for the two summation orders to part in the last
+bit.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from invest.scanner.scoring_engine import ScoringEngine
+from invest.scanner.vectorized_scoring import (
+    COMPONENTS,
+    build_metric_matrix,
+    component_scores,
+    composite_scores,
+    normalize_array,
+    score_items,
+)
+
+SCORE_FIELDS = ['opportunity_score'] + [f'{name}_score' for name in COMPONENTS]
+SECTORS = ['Technology', 'Utilities', 'Energy', 'Unknown', None]
+
+
+def _maybe(rng: random.Random, value, p_missing: float = 0.2):
+    return None if rng.random() < p_missing else value
+
+
+def _synthetic(i: int) -> tuple:
+    rng = random.Random(i)
+    price = _maybe(rng, rng.uniform(1, 300), 0.05)
+    years = ['2025', '2024', '2023', '2022']
+    data = {
+        'info': {'currentPrice': price, 'sector': rng.choice(SECTORS), 'longName': f'Co {i}'},
+        'financials': {
+            'trailingPE': _maybe(rng, rng.uniform(-10, 60)),
+            'priceToBook': _maybe(rng, rng.choice([rng.uniform(-1, 8), 'n/a'])),
+            'returnOnEquity': _maybe(rng, rng.uniform(-0.3, 0.5)),
+            'debtToEquity': _maybe(rng, rng.uniform(0, 4)),
+            'currentRatio': _maybe(rng, rng.uniform(0.2, 5)),
+            'operatingMargins': _maybe(rng, rng.uniform(-0.2, 0.6)),
+            'profitMargins': _maybe(rng, rng.uniform(-0.2, 0.4)),
+        },
+        'price_data': {
+            'current_price': price,
+            'price_52w_high': _maybe(rng, rng.uniform(1, 400)),
+            'price_52w_low': _maybe(rng, rng.uniform(0.5, 200)),
+            'price_trend_30d': _maybe(rng, rng.uniform(-0.3, 0.3)),
+        },
+        'income': [
+            {'index': 'Total Revenue', **{y: rng.uniform(-10, 200) for y in years}},
+            {'index': 'Net Income', **{y: rng.uniform(-20, 40) for y in years}},
+        ] if rng.random() > 0.15 else [],
+        'cashflow': [{'index': 'Operating Cash Flow', '2025': rng.uniform(-10, 50)}],
+        'balance_sheet': [{'index': 'Total Assets', '2025': rng.uniform(-5, 400)}],
+        'insider': {
+            'has_data': rng.random() < 0.6,
+            'buy_count': rng.randint(0, 3),
+            'sell_count': rng.randint(0, 3),
+            'net_buy_pct': rng.uniform(-3, 2),
+            'cluster_score': rng.randint(0, 5),
+            'recency_days': _maybe(rng, rng.randint(0, 300), 0.4),
+            'dollar_conviction': rng.uniform(0, 8e6),
+            'sell_trend': _maybe(rng, rng.uniform(0, 2.5), 0.4),
+        },
+        'activist': {
+            'has_data': rng.random() < 0.4,
+            'activist_count': rng.randint(0, 3),
+            'passive_count': rng.randint(0, 6),
+            'max_stake_pct': _maybe(rng, rng.uniform(5, 30), 0.3),
+            'total_holders_5pct': rng.randint(0, 6),
+        },
+        'holdings': {
+            'has_data': rng.random() < 0.5,
+            'smart_money_holders': rng.randint(0, 12),
+            'new_positions': ['F'] * rng.randint(0, 3),
+            'exited_positions': ['F'] * rng.randint(0, 3),
+            'quarter_change': rng.choice([None, 0, -5, 12]),
+        },
+        'japan_stakes': {
+            'has_data': rng.random() < 0.2,
+            'holder_count': rng.randint(0, 6),
+            'max_stake_pct': _maybe(rng, rng.uniform(5, 30), 0.3),
+            'total_reports': rng.randint(0, 8),
+        },
+    }
+    valuations = {}
+    if rng.random() < 0.6 and price:
+        valuations = {
+            'dcf': {'fair_value': price * rng.uniform(0.5, 2), 'suitable': True, 'confidence': 'high'},
+            'rim': {'fair_value': price * rng.uniform(0.5, 2), 'suitable': True, 'confidence': 'medium'},
+        }
+    return f'T{i:03d}', data, valuations
+
+
+ITEMS = [_synthetic(i) for i in range(2000)]
+
+
+@pytest.mark.parametrize('value', [-3.0, 0.0, 0.4, 0.8, 1.2, 1.5, 2.2, 3.0, 7.0, math.nan])
+@pytest.mark.parametrize('curve', [(0.8, 1.5, 3.0, False), (0, 0.5, 2.0, True), (-5, 3, 10, True)])
+def test_normalize_array_matches_scalar(value, curve):
+    min_val, target, max_val, inverse = curve
+    expected = ScoringEngine.normalize(value, min_val, target, max_val, inverse=inverse)
+    got = normalize_array(np.array([value]), min_val, target, max_val, inverse=inverse)[0]
+    assert got == expected
+
+
+def test_components_match_per_stock_path():
+    engine = ScoringEngine()
+    matrix, kept = build_metric_matrix(ITEMS)
+    components = component_scores(matrix)
+    opportunity = composite_scores(components, engine.weights)
+
+    assert matrix.tickers == [t for t, _, _ in ITEMS]
+    expected = {
+        'quality': [engine.score_quality(data)[0] for _, data, _ in kept],
+        'value': [engine.score_value(data, valuations)[0] for _, data, valuations in kept],
+        'growth': [engine.score_growth(data)[0] for _, data, _ in kept],
+        'risk': [engine.score_risk(data)[0] for _, data, _ in kept],
+        'catalyst': [engine.score_catalyst(data)[0] for _, data, _ in kept],
+    }
+    for name, scores in expected.items():
+        np.testing.assert_allclose(components[name], scores, rtol=1e-13, atol=0, err_msg=name)
+
+    scalar = [engine.score_loaded(ticker, data, valuations).opportunity_score
+              for ticker, data, valuations in kept]
+    np.testing.assert_allclose(np.round(opportunity, 1), scalar, atol=0.1 + 1e-9)
+
+
+def test_score_items_equals_score_loaded_except_details():
+    weights = {'quality': 0.1, 'value': 0.4, 'growth': 0.2, 'risk': 0.2, 'catalyst': 0.1}
+    engine = ScoringEngine(weights=weights)
+
+    for vec, (ticker, data, valuations) in zip(score_items(ITEMS, weights), ITEMS):
+        scalar = engine.score_loaded(ticker, data, valuations)
+        scalar.component_details = {}
+        # Rounded to 0.1, so a last-bit difference may flip a tie
+        for name in SCORE_FIELDS:
+            assert getattr(vec, name) == pytest.approx(getattr(scalar, name), abs=0.1 + 1e-9), ticker
+        assert replace(vec, **{name: 0.0 for name in SCORE_FIELDS}) == \
+            replace(scalar, **{name: 0.0 for name in SCORE_FIELDS})
+
+
+def test_weight_sweep_reuses_components():
+    matrix, _ = build_metric_matrix(ITEMS)
+    components = component_scores(matrix)
+    value_only = composite_scores(
+        components, {'quality': 0, 'value': 1, 'growth': 0, 'risk': 0, 'catalyst': 0}
+    )
+    np.testing.assert_array_equal(value_only, components['value'])
+
+
+def test_empty_universe():
+    assert score_items([], ScoringEngine.DEFAULT_WEIGHTS) == []